@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""Memory-bounded aggregation helpers for high-cardinality report dimensions."""
+
+import heapq
+import os
+import pickle
+import sys
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, wait
+
+# number of inserts used to estimate the in-memory footprint of one entry
+_SIZE_SAMPLE_ENTRIES = 256
+
+
+def _orderable(key):
+    """Return a sort key for a dimension tuple that tolerates None and mixed types.
+
+    Args:
+        key (tuple): Dimension values used as an aggregation key.
+
+    Returns:
+        tuple: A totally ordered representation of 'key'.
+    """
+
+    return tuple(
+        (True, "", 0) if value is None else (False, type(value).__name__, value)
+        for value in key
+    )
+
+
+def _approx_size(key, entry):
+    """Approximate the bytes held by one aggregation entry.
+
+    Args:
+        key (tuple): Dimension key of the entry.
+        entry (dict): Accumulated fields for the key.
+
+    Returns:
+        int: Shallow size of the key, entry, and their direct values.
+    """
+
+    size = sys.getsizeof(key) + sys.getsizeof(entry)
+    size += sum(sys.getsizeof(value) for value in key)
+    size += sum(sys.getsizeof(value) for value in entry.values())
+    return size
+
+
+def _read_run(path):
+    """Yield '(key, entry)' records from a spilled run file in key order.
+
+    Args:
+        path (str): Location of the pickled run.
+
+    Yields:
+        tuple[tuple, dict]: Aggregation records.
+    """
+
+    with open(path, "rb") as run_file:
+        while True:
+            try:
+                yield pickle.load(run_file)
+            except EOFError:
+                return
+
+
+class StringDictionary:
+    """Per-run intern table and dictionary encoder for dimension values.
+
+    Protobuf field access returns a fresh 'str' on every read, so names that
+    repeat across millions of rows (accounts, campaigns, channel types, MACs)
+    would otherwise be stored once per row. 'intern' returns one shared
+    instance per distinct value, and 'encode_key' maps a dimension tuple to a
+    tuple of small integer codes for use as an aggregation key.
+    """
+
+    def __init__(self):
+        self._codes = {}
+        self._values = []
+
+    def __len__(self):
+        return len(self._values)
+
+    def encode(self, value):
+        """Return the integer code for 'value', assigning one when new."""
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self._values)
+            self._codes[value] = code
+            self._values.append(value)
+        return code
+
+    def decode(self, code):
+        """Return the value stored under 'code'."""
+        return self._values[code]
+
+    def intern(self, value):
+        """Return the shared instance equal to 'value' ('None' passes through)."""
+        if value is None:
+            return None
+        return self._values[self.encode(value)]
+
+    def encode_key(self, values):
+        """Encode an iterable of dimension values into a tuple of codes."""
+        return tuple(self.encode(value) for value in values)
+
+    def decode_key(self, key):
+        """Decode a tuple of codes back into dimension values."""
+        values = self._values
+        return tuple(values[code] for code in key)
+
+
+def map_bounded(executor, fn, payloads, max_in_flight):
+    """Submit 'fn' over 'payloads' with at most 'max_in_flight' pending tasks.
+
+    Unlike 'Executor.map', payloads are pulled lazily, so a streaming source
+    is never buffered ahead of the workers. Results are yielded in completion
+    order.
+
+    Args:
+        executor (concurrent.futures.Executor): Pool that runs the tasks.
+        fn (Callable): Task applied to each payload.
+        payloads (Iterable): Task inputs, consumed on demand.
+        max_in_flight (int): Upper bound on submitted but unfinished tasks.
+
+    Yields:
+        Any: Task results as they complete.
+    """
+
+    pending = set()
+    try:
+        for payload in payloads:
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(executor.submit(fn, payload))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+class SpillingAggregator:
+    """Hash aggregation that spills sorted partial tables to disk.
+
+    Entries are accumulated in an in-memory dict keyed by dimension tuple.
+    Once the estimated footprint reaches 'memory_limit', the dict is sorted
+    by key and written to a temporary run file. Iterating the aggregator
+    merges every run with the in-memory remainder, summing 'additive_fields'
+    for keys that appear in more than one run. Without a limit (or when the
+    data fits) no files are written and iteration is a plain dict walk.
+
+    Args:
+        new_entry (Callable[[tuple], dict]): Builds the initial entry for a key.
+        additive_fields (Iterable[str]): Entry fields summed when partial
+            entries for the same key are combined.
+        memory_limit (int | None): Approximate byte budget for in-memory
+            entries. 'None' disables spilling.
+        spill_dir (str | None): Directory for run files (defaults to the
+            system temporary directory).
+    """
+
+    def __init__(self, new_entry, additive_fields, memory_limit=None, spill_dir=None):
+        self._new_entry = new_entry
+        self._additive_fields = tuple(additive_fields)
+        self._memory_limit = memory_limit
+        self._spill_dir = spill_dir
+        self._entries = {}
+        self._runs = []
+        self._tmpdir = None
+        self._sampled = 0
+        self._sampled_bytes = 0
+        self._max_entries = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def spilled_runs(self):
+        """int: Number of run files written so far."""
+        return len(self._runs)
+
+    def entry(self, key):
+        """Return the mutable entry for 'key', creating it when missing.
+
+        Spilling happens before a new entry is created, so the returned dict
+        stays in memory until the next call and can be updated in place.
+
+        Args:
+            key (tuple): Dimension key.
+
+        Returns:
+            dict: The accumulated fields for 'key'.
+        """
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+        return self._insert(key, self._new_entry(key))
+
+    def merge(self, key, partial):
+        """Fold a partial entry built elsewhere (e.g. a worker) into 'key'.
+
+        Args:
+            key (tuple): Dimension key.
+            partial (dict): Entry with the same layout as 'new_entry(key)'.
+        """
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self._insert(key, partial)
+        else:
+            self._combine(entry, partial)
+
+    def _insert(self, key, entry):
+        """Store a new in-memory entry, spilling first when over budget."""
+        if self._memory_limit is not None:
+            if (
+                self._max_entries is not None
+                and len(self._entries) >= self._max_entries
+            ):
+                self._spill()
+        self._entries[key] = entry
+        if self._memory_limit is not None and self._max_entries is None:
+            self._sample(key, entry)
+        return entry
+
+    def _sample(self, key, entry):
+        """Update the per-entry size estimate and derive the entry budget."""
+        self._sampled += 1
+        self._sampled_bytes += _approx_size(key, entry)
+        if self._sampled >= _SIZE_SAMPLE_ENTRIES:
+            average = max(1, self._sampled_bytes // self._sampled)
+            # dict slots and allocator overhead roughly double the shallow size
+            self._max_entries = max(1, self._memory_limit // (average * 2))
+
+    def _spill(self):
+        """Write the in-memory entries to a sorted run file and reset."""
+        if not self._entries:
+            return
+        if self._tmpdir is None:
+            self._tmpdir = tempfile.TemporaryDirectory(
+                prefix="gar-spill-", dir=self._spill_dir
+            )
+        path = os.path.join(self._tmpdir.name, f"run-{len(self._runs):05d}.pkl")
+        with open(path, "wb") as run_file:
+            for key in sorted(self._entries, key=_orderable):
+                pickle.dump(
+                    (key, self._entries[key]),
+                    run_file,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+        self._runs.append(path)
+        self._entries = {}
+
+    def _combine(self, target, partial):
+        """Fold a partial entry for the same key into 'target'."""
+        for field in self._additive_fields:
+            target[field] = target.get(field, 0) + partial.get(field, 0)
+
+    def items(self):
+        """Yield '(key, entry)' pairs with partial runs merged.
+
+        Yields:
+            tuple[tuple, dict]: One record per distinct key.
+        """
+
+        if not self._runs:
+            yield from self._entries.items()
+            return
+        in_memory = sorted(self._entries.items(), key=lambda kv: _orderable(kv[0]))
+        self._entries = {}
+        streams = [_read_run(path) for path in self._runs] + [iter(in_memory)]
+        merged = heapq.merge(*streams, key=lambda kv: _orderable(kv[0]))
+        current_key = None
+        current_entry = None
+        try:
+            for key, entry in merged:
+                if current_entry is not None and key == current_key:
+                    self._combine(current_entry, entry)
+                    continue
+                if current_entry is not None:
+                    yield current_key, current_entry
+                current_key, current_entry = key, entry
+            if current_entry is not None:
+                yield current_key, current_entry
+        finally:
+            self.close()
+
+    def values(self):
+        """Yield merged entries without their keys."""
+        for _, entry in self.items():
+            yield entry
+
+    def close(self):
+        """Remove any spilled run files."""
+        self._runs = []
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+            self._tmpdir = None
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""Incremental anomaly detection over daily performance series."""
+
+import bisect
+from datetime import date, timedelta
+
+from gar import cache
+
+# smoothing weight of the exponentially weighted mean and variance
+EWMA_ALPHA = 0.1
+# trailing observations kept per metric for the median / MAD baseline
+ROBUST_WINDOW = 28
+# observations required before a series can raise alerts
+MIN_OBSERVATIONS = 14
+# both the EWMA and the robust z-score must reach this to raise an alert
+Z_THRESHOLD = 3.0
+# MAD to standard deviation under a normal distribution
+MAD_SCALE = 1.4826
+# days of history fetched to warm up a cold state
+WARMUP_DAYS = 42
+# series with no activity for this many days are dropped from the state
+STALE_DAYS = 28
+# days of past alerts kept for display
+ALERT_RETENTION_DAYS = 30
+STATE_FORMAT_VERSION = 1
+
+DIRECTION_SPIKE = "SPIKE"
+DIRECTION_DROP = "DROP"
+
+
+def state_name(customer_id):
+    """Return the cache file name holding one account's detector state."""
+    return f"anomaly_state_{customer_id}.json"
+
+
+class MetricBaseline:
+    """Rolling statistics for one metric of one series.
+
+    The EWMA mean and variance are updated in constant time. The robust
+    baseline keeps the last 'ROBUST_WINDOW' values in insertion order and
+    in sorted order, so the median and MAD never touch older history.
+
+    Args:
+        count (int): Observations folded in so far.
+        mean (float): Exponentially weighted mean.
+        var (float): Exponentially weighted variance.
+        window (list[float] | None): Most recent values, oldest first.
+    """
+
+    def __init__(self, count=0, mean=0.0, var=0.0, window=None):
+        self.count = count
+        self.mean = mean
+        self.var = var
+        self.window = list(window or [])
+        self.ordered = sorted(self.window)
+
+    def score(self, value):
+        """Return '(ewma_z, robust_z, median)' for 'value' against the baseline.
+
+        Scores are zero while the baseline has no spread to compare against.
+        """
+
+        if not self.window:
+            return 0.0, 0.0, value
+        median = _median(self.ordered)
+        spread = self.var**0.5
+        ewma_z = (value - self.mean) / spread if spread else 0.0
+        mad = _median(sorted(abs(v - median) for v in self.ordered)) * MAD_SCALE
+        # a flat window (common for low-volume series) falls back to the EWMA spread
+        robust_scale = mad or spread
+        robust_z = (value - median) / robust_scale if robust_scale else 0.0
+        return ewma_z, robust_z, median
+
+    def update(self, value):
+        """Fold a new observation into the baseline."""
+        if self.count == 0:
+            self.mean = value
+        else:
+            diff = value - self.mean
+            increment = EWMA_ALPHA * diff
+            self.mean += increment
+            self.var = (1 - EWMA_ALPHA) * (self.var + diff * increment)
+        self.count += 1
+        self.window.append(value)
+        bisect.insort(self.ordered, value)
+        if len(self.window) > ROBUST_WINDOW:
+            oldest = self.window.pop(0)
+            del self.ordered[bisect.bisect_left(self.ordered, oldest)]
+
+    def to_dict(self):
+        """Return a JSON-serializable copy of the baseline."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "var": self.var,
+            "window": self.window,
+        }
+
+
+class AnomalyDetector:
+    """Per-account detector state: baselines for every series and metric.
+
+    A series is one entity reported per day (the account itself, or one of
+    its campaigns). Days are evaluated once, in order: 'observe_day' scores
+    each series against its baseline and then updates it, so re-running the
+    detector only costs the days added since 'end'.
+
+    Args:
+        end (date | None): Last day already evaluated.
+        account_name (str | None): Account descriptive name.
+        series (dict[str, dict] | None): Series key to
+            '{"level", "id", "name", "last_active", "metrics"}'.
+        alerts (list[dict] | None): Alerts raised within the retention window.
+    """
+
+    def __init__(self, end=None, account_name=None, series=None, alerts=None):
+        self.end = end
+        self.account_name = account_name
+        self.series = series or {}
+        self.alerts = alerts or []
+        self._baselines = {
+            key: {
+                metric: MetricBaseline(**stats)
+                for metric, stats in entry["metrics"].items()
+            }
+            for key, entry in self.series.items()
+        }
+
+    @classmethod
+    def load(cls, customer_id):
+        """Load the cached detector state for an account (empty on a cold start)."""
+        data = cache.load_json(state_name(customer_id))
+        if not data or data.get("version") != STATE_FORMAT_VERSION:
+            return cls()
+        return cls(
+            end=date.fromisoformat(data["end"]),
+            account_name=data.get("account_name"),
+            series=data["series"],
+            alerts=data["alerts"],
+        )
+
+    def save(self, customer_id):
+        """Write the detector state to the cache directory."""
+        for key, baselines in self._baselines.items():
+            self.series[key]["metrics"] = {
+                metric: baseline.to_dict() for metric, baseline in baselines.items()
+            }
+        cache.save_json(
+            state_name(customer_id),
+            {
+                "version": STATE_FORMAT_VERSION,
+                "end": self.end.isoformat(),
+                "account_name": self.account_name,
+                "series": self.series,
+                "alerts": self.alerts,
+            },
+        )
+
+    def missing_range(self, through):
+        """Return the '(start, end)' dates still to evaluate up to 'through'.
+
+        Returns:
+            tuple[date, date] | None: Inclusive window, or 'None' when the
+            state is already current.
+        """
+
+        if self.end is None:
+            return through - timedelta(days=WARMUP_DAYS - 1), through
+        if self.end >= through:
+            return None
+        return self.end + timedelta(days=1), through
+
+    def observe_day(self, day, observations, metrics):
+        """Score and fold one day of observations into the baselines.
+
+        Known series without a row for 'day' are observed as zero, so a
+        campaign that stops spending is compared against its history too.
+
+        Args:
+            day (date): Day being evaluated; must follow 'end'.
+            observations (dict[str, dict]): Series key to
+                '{"level", "id", "name", "values": {metric: value}}'.
+            metrics (dict[str, tuple[str, ...]]): Metrics tracked per level.
+
+        Returns:
+            list[dict]: Alerts raised for 'day'.
+        """
+
+        raised = []
+        for key in set(self.series) | set(observations):
+            observed = observations.get(key)
+            entry = self.series.get(key)
+            if entry is None:
+                entry = self.series[key] = {
+                    "level": observed["level"],
+                    "id": observed["id"],
+                    "name": observed["name"],
+                    "last_active": None,
+                    "metrics": {},
+                }
+                self._baselines[key] = {}
+            values = observed["values"] if observed else {}
+            if observed:
+                entry["name"] = observed["name"]
+            if any(values.values()):
+                entry["last_active"] = day.isoformat()
+            baselines = self._baselines[key]
+            for metric in metrics[entry["level"]]:
+                value = float(values.get(metric) or 0)
+                baseline = baselines.setdefault(metric, MetricBaseline())
+                if baseline.count >= MIN_OBSERVATIONS:
+                    ewma_z, robust_z, median = baseline.score(value)
+                    if min(abs(ewma_z), abs(robust_z)) >= Z_THRESHOLD and (
+                        ewma_z > 0
+                    ) == (robust_z > 0):
+                        raised.append(
+                            {
+                                "Date": day.isoformat(),
+                                "Level": entry["level"],
+                                "ID": entry["id"],
+                                "Name": entry["name"],
+                                "Metric": metric,
+                                "Value": round(value, 4),
+                                "Expected": round(baseline.mean, 4),
+                                "Median": round(median, 4),
+                                "EWMA z": round(ewma_z, 2),
+                                "Robust z": round(robust_z, 2),
+                                "Direction": (
+                                    DIRECTION_SPIKE if ewma_z > 0 else DIRECTION_DROP
+                                ),
+                            }
+                        )
+                baseline.update(value)
+        self.end = day
+        self.alerts.extend(raised)
+        return raised
+
+    def prune(self):
+        """Drop stale series and alerts that fell out of the retention window."""
+        stale_before = (self.end - timedelta(days=STALE_DAYS)).isoformat()
+        for key in [
+            key
+            for key, entry in self.series.items()
+            if (entry["last_active"] or "") < stale_before
+        ]:
+            del self.series[key]
+            del self._baselines[key]
+        keep_from = (self.end - timedelta(days=ALERT_RETENTION_DAYS - 1)).isoformat()
+        self.alerts = [alert for alert in self.alerts if alert["Date"] >= keep_from]
+
+
+def _median(ordered):
+    """Return the median of an already sorted list."""
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2
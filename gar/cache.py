@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""On-disk state shared between runs (incremental audits, cached metadata)."""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+CACHE_DIR_ENV = "GAR_CACHE_DIR"
+DEFAULT_CACHE_DIR = "~/.gar"
+
+
+def cache_dir():
+    """Return the cache directory, creating it when missing.
+
+    'GAR_CACHE_DIR' overrides the default '~/.gar'.
+
+    Returns:
+        Path: Directory holding cached state files.
+    """
+
+    path = Path(os.environ.get(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR).expanduser()
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def load_json(name, default=None):
+    """Load a cached JSON document.
+
+    Args:
+        name (str): File name inside the cache directory.
+        default (Any): Returned when the file is missing or unreadable.
+
+    Returns:
+        Any: The decoded document or 'default'.
+    """
+
+    try:
+        with open(cache_dir() / name, encoding="utf-8") as cache_file:
+            return json.load(cache_file)
+    except (OSError, ValueError):
+        # a missing or corrupt cache is treated as a cold start
+        return default
+
+
+def save_json(name, data):
+    """Atomically write a JSON document to the cache directory.
+
+    The document is written to a temporary file in the same directory and
+    renamed into place, so readers never observe a partial file.
+
+    Args:
+        name (str): File name inside the cache directory.
+        data (Any): JSON-serializable document.
+    """
+
+    directory = cache_dir()
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+            json.dump(data, tmp_file)
+        os.replace(tmp_path, directory / name)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
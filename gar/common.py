@@ -8,17 +8,20 @@ Any functions that need `prompts` do a local (lazy) import inside the function b
 from __future__ import annotations
 
 import argparse
-import csv
-import pydoc
+import heapq
+import os
 import re
 import sys
+from collections import OrderedDict
 from datetime import date, datetime, timedelta
-from decimal import ROUND_HALF_UP, Decimal
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, NamedTuple, Optional
 
 from tabulate import tabulate
 
+from gar import output, viewer
+
 # -----------------------------
 # Builtins monkey-patch for input "exit"
 # -----------------------------
@@ -54,6 +57,8 @@ PERFORMANCE_REPORT_OPTIONS = {
     "clickview",
     "paid_organic_terms",
 }
+# reports whose metric queries can select IDs only ('--id-only')
+ID_ONLY_REPORTS = {"ads", "clickview", "paid_organic_terms"}
 
 AUDIT_REPORT_OPTIONS = {
     "account_labels",
@@ -61,9 +66,13 @@ AUDIT_REPORT_OPTIONS = {
     "label_assignments",
 }
 
-BUDGET_REPORT_OPTIONS = {"budget"}
+BUDGET_REPORT_OPTIONS = {"budget", "forecast", "anomalies"}
 
-BUDGET_REPORT_MENU_OPTIONS = (("1", "Budget Report", "budget"),)
+BUDGET_REPORT_MENU_OPTIONS = (
+    ("1", "Budget Report", "budget"),
+    ("2", "Spend Forecast", "forecast"),
+    ("3", "Anomaly Alerts", "anomalies"),
+)
 
 BUDGET_REPORT_MENU_LOOKUP = {
     option: report for option, _, report in BUDGET_REPORT_MENU_OPTIONS
@@ -113,6 +122,11 @@ REPORT_OPTION_ALIASES = {
     "label_assignments": ("audit", "label_assignments"),
     "assignments": ("audit", "label_assignments"),
     "budget": ("budget", "budget"),
+    "forecast": ("budget", "forecast"),
+    "forecasts": ("budget", "forecast"),
+    "anomalies": ("budget", "anomalies"),
+    "anomaly": ("budget", "anomalies"),
+    "alerts": ("budget", "anomalies"),
 }
 
 PERFORMANCE_REPORT_MENU_OPTIONS = (
@@ -164,6 +178,16 @@ OUTPUT_CHOICES = {"csv", "table", "auto"}
 TOGGLE_INCLUDE_VALUES = {"include", "in", "yes", "y", "true", "1"}
 TOGGLE_EXCLUDE_VALUES = {"exclude", "ex", "no", "n", "false", "0"}
 
+# metric column used by --top/--min-cost when ranking each performance report
+REPORT_RANK_METRICS = {
+    "camptype": "Cost",
+    "mac": "Cost",
+    "account": "cost",
+    "ads": "Cost",
+    "clickview": "clicks",
+    "paid_organic_terms": "total cost",
+}
+
 
 # -----------------------------
 # Formula helpers
@@ -187,6 +211,95 @@ def micros_to_decimal(
     return value
 
 
+# -----------------------------
+# Ranking / ordering helpers
+# -----------------------------
+
+
+def metric_sort_value(value: Any) -> Decimal | int:
+    """Return a numeric sort key for a metric cell without float conversion."""
+    if value is None or value == "":
+        return 0
+    if isinstance(value, (int, Decimal)):
+        return value
+    return Decimal(str(value))
+
+
+def merge_sorted_results(result_sets: list[list[list]], key) -> list[list]:
+    """K-way merge per-account result lists that are already sorted by 'key'.
+
+    Args:
+        result_sets (list[list[list]]): Individually sorted table rows.
+        key (Callable): Sort key shared by every input list.
+
+    Returns:
+        list[list]: A single list ordered by 'key'.
+    """
+    if len(result_sets) == 1:
+        return result_sets[0]
+    return list(heapq.merge(*result_sets, key=key))
+
+
+def rank_rows(
+    table_data: list[list],
+    headers: list[str],
+    metric_header: str,
+    *,
+    top_n: Optional[int] = None,
+    min_value: Optional[Decimal] = None,
+) -> list[list]:
+    """Filter and select the highest-ranked rows for a metric column.
+
+    Rows below 'min_value' are dropped while preserving report order. When
+    'top_n' is set, a bounded heap selects the N largest rows, which are
+    returned in descending metric order instead of fully sorting the report.
+
+    Args:
+        table_data (list[list]): Report rows in header order.
+        headers (list[str]): Column headers for 'table_data'.
+        metric_header (str): Column used for ranking and thresholds.
+        top_n (int | None): Maximum number of rows to keep.
+        min_value (Decimal | None): Minimum metric value to keep.
+
+    Returns:
+        list[list]: The filtered (and optionally ranked) rows.
+    """
+    if metric_header not in headers:
+        print(f"Ranking metric '{metric_header}' not found; returning all rows.")
+        return table_data
+    idx = headers.index(metric_header)
+    rows = table_data
+    if min_value is not None:
+        rows = [row for row in rows if metric_sort_value(row[idx]) >= min_value]
+    if top_n is not None:
+        rows = heapq.nlargest(top_n, rows, key=lambda r: metric_sort_value(r[idx]))
+    return rows
+
+
+def apply_ranking_options(
+    table_data: list[list], headers: list[str], report_option: str, cli_args
+) -> list[list]:
+    """Apply '--top'/'--min-cost' to a finished performance report."""
+    top_n = getattr(cli_args, "top", None)
+    min_cost = getattr(cli_args, "min_cost", None)
+    if top_n is None and min_cost is None:
+        return table_data
+    metric_header = REPORT_RANK_METRICS.get(report_option)
+    if metric_header is None:
+        return table_data
+    if getattr(cli_args, "grouping_sets", False):
+        # ranking would compare subtotals with their own children
+        print("Note: --top/--min-cost are not applied to grouping-sets output.")
+        return table_data
+    ranked = rank_rows(
+        table_data, headers, metric_header, top_n=top_n, min_value=min_cost
+    )
+    print(
+        f"Ranking by '{metric_header}': kept {len(ranked)} of {len(table_data)} rows."
+    )
+    return ranked
+
+
 # -----------------------------
 # Console errors
 # -----------------------------
@@ -266,8 +379,18 @@ def sanitize_filename(name: str) -> str:
     return re.sub(r'[<>:"/\\|?*]', "", name)
 
 
-def save_csv(table_data, headers) -> None:
-    """Persist table data to a CSV in the user's home directory."""
+def save_csv(table_data, headers, output_context=None) -> None:
+    """Persist table data to a CSV.
+
+    Headless runs (an 'output_context' with 'headless' set) never prompt: the
+    file name comes from the context's template and the write is queued on
+    the background writer. Otherwise the user is asked for a file name and
+    the file is written to the context's directory (default: home).
+    """
+    if output_context is not None and output_context.headless:
+        output.submit_table(output_context, table_data, headers)
+        return
+
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     default_file_name = f"gads_report_{timestamp}.csv"
     print(f"Default file name: {default_file_name}")
@@ -284,26 +407,36 @@ def save_csv(table_data, headers) -> None:
     else:
         file_name = default_file_name
 
-    file_path = Path.home() / file_name
+    directory = output_context.directory if output_context else Path.home()
     try:
-        with open(file_path, mode="w", newline="") as file:
-            writer = csv.writer(file)
-            writer.writerow(headers)
-            writer.writerows(table_data)
+        file_path = output.write_csv_atomic(directory / file_name, headers, table_data)
         print(f"\nData saved to: {file_path}\n")
     except Exception as e:
         print(f"\nFailed to save file: {e}\n")
 
 
+# tables longer than this are printed without tabulate's full-table formatting
+TABULATE_MAX_ROWS = 2000
+
+
 def display_table(table_data, headers, auto_view: bool = False) -> None:
-    """Render tabular data via 'tabulate'."""
-    if auto_view:
-        print(tabulate(table_data, headers, tablefmt="simple_grid"))
+    """Render tabular data.
+
+    Auto view, and any run whose stdin is not a terminal, prints the table
+    ('tabulate' for small tables, streamed rows otherwise); interactive view
+    opens the paging 'viewer.TableViewer'.
+    """
+    # without a terminal on stdin the viewer would wait for input forever
+    if auto_view or not sys.stdin.isatty():
+        if len(table_data) <= TABULATE_MAX_ROWS:
+            print(tabulate(table_data, headers, tablefmt="simple_grid"))
+        else:
+            viewer.stream_table(table_data, headers)
     else:
         input(
-            "Report ready for viewing. Press ENTER to display results and 'Q' to exit output when done..."
+            "Report ready for viewing. Press ENTER to display results and 'q' to exit output when done..."
         )
-        pydoc.pager(tabulate(table_data, headers=headers, tablefmt="simple_grid"))
+        viewer.TableViewer(table_data, headers).run()
 
 
 def data_handling_options(
@@ -311,8 +444,12 @@ def data_handling_options(
     headers,
     auto_view: bool = False,
     preselected_output: Optional[str] = None,
+    output_context: Optional[output.OutputContext] = None,
 ) -> None:
-    """Handle report output mode (CSV vs. table)."""
+    """Handle report output mode (CSV vs. table).
+
+    'output_context' names CSV files and, for headless runs, skips prompts.
+    """
     if auto_view:
         if not table_data or not headers:
             print("No data to display.")
@@ -328,7 +465,7 @@ def data_handling_options(
         report_view = input("Choose 1 or 2 ('exit' to exit): ").strip().lower()
 
     if report_view in ("1", "csv"):
-        save_csv(table_data, headers)
+        save_csv(table_data, headers, output_context)
     elif report_view in ("2", "table"):
         display_table(table_data, headers)
     elif report_view == "auto":
@@ -343,12 +480,166 @@ def data_handling_options(
 # -----------------------------
 
 
-def extract_mac(campaign_name: Optional[str]) -> str:
-    """Extract MAC (suffix after the final colon) from a campaign name."""
+def extract_mac(campaign_name: Optional[str], strings=None) -> str:
+    """Extract MAC (suffix after the final colon) from a campaign name.
+
+    When a per-run 'aggregation.StringDictionary' is given the result is
+    interned, so every row of a campaign shares one MAC string.
+    """
     if not campaign_name or ":" not in campaign_name:
         return "UNDEFINED"
-    mac = campaign_name.rsplit(":", 1)[-1].strip()
-    return mac if mac else "UNDEFINED"
+    mac = campaign_name.rsplit(":", 1)[-1].strip() or "UNDEFINED"
+    return strings.intern(mac) if strings is not None else mac
+
+
+# -----------------------------
+# MAC resolution
+# -----------------------------
+
+# campaigns kept in a MacResolver cache before the least recently used is evicted
+MAC_CACHE_SIZE = 4096
+
+MAC_RULE_KINDS = ("suffix", "delimiter", "regex", "label")
+
+
+class MacRule(NamedTuple):
+    """A MAC extraction rule compiled from a '--mac-rule' spec."""
+
+    kind: str
+    spec: str
+    delimiter: Optional[str] = None
+    index: int = -1
+    pattern: Optional[re.Pattern] = None
+    prefix: Optional[str] = None
+
+
+DEFAULT_MAC_RULES = (MacRule("suffix", "suffix"),)
+
+
+def parse_mac_rule(value: Any) -> MacRule:
+    """Compile a MAC rule spec.
+
+    Supported specs:
+        suffix                 text after the final ':' (the default rule)
+        delimiter:<sep>[@<n>]  field 'n' (default: last) of the name split on 'sep'
+        regex:<pattern>        first capture group (or whole match) of 'pattern'
+        label:<prefix>         remainder of the first campaign label starting
+                               with 'prefix'
+    """
+    spec = str(value).strip()
+    kind, _, argument = spec.partition(":")
+    kind = kind.strip().lower()
+    if kind == "suffix" and not argument:
+        return MacRule("suffix", spec)
+    if kind == "delimiter" and argument:
+        match = re.fullmatch(r"(.+?)(?:@(-?\d+))?", argument, re.DOTALL)
+        index = int(match.group(2)) if match.group(2) is not None else -1
+        return MacRule("delimiter", spec, delimiter=match.group(1), index=index)
+    if kind == "regex" and argument:
+        try:
+            pattern = re.compile(argument)
+        except re.error as exc:
+            raise argparse.ArgumentTypeError(
+                f"Invalid --mac-rule regex '{argument}': {exc}"
+            ) from exc
+        return MacRule("regex", spec, pattern=pattern)
+    if kind == "label" and argument:
+        return MacRule("label", spec, prefix=argument)
+    raise argparse.ArgumentTypeError(
+        "--mac-rule expects suffix, delimiter:<sep>[@<n>], regex:<pattern>, or "
+        "label:<prefix>."
+    )
+
+
+def apply_mac_rule(
+    rule: MacRule, campaign_name: Optional[str], labels=()
+) -> Optional[str]:
+    """Return the MAC a single rule yields for a campaign, or None if it does not match."""
+    mac = None
+    if rule.kind == "label":
+        for label in labels:
+            if label.startswith(rule.prefix):
+                mac = label[len(rule.prefix) :]
+                break
+    elif not campaign_name:
+        return None
+    elif rule.kind == "suffix":
+        if ":" in campaign_name:
+            mac = campaign_name.rsplit(":", 1)[-1]
+    elif rule.kind == "delimiter":
+        if rule.delimiter in campaign_name:
+            parts = campaign_name.split(rule.delimiter)
+            if -len(parts) <= rule.index < len(parts):
+                mac = parts[rule.index]
+    elif rule.kind == "regex":
+        match = rule.pattern.search(campaign_name)
+        if match:
+            mac = match.group(1) if match.re.groups else match.group(0)
+    mac = mac.strip() if mac else ""
+    return mac or None
+
+
+class MacResolver:
+    """Resolve campaign MACs once per campaign through a bounded LRU cache.
+
+    Rules are tried in order and the first match wins; campaigns no rule
+    matches resolve to 'UNDEFINED'. Results are cached by campaign ID (or by
+    name when no ID is available), so repeated date and ad rows cost a dict
+    lookup instead of string parsing.
+
+    Args:
+        rules (Iterable[MacRule] | None): Compiled rules; defaults to the
+            colon-suffix convention used by 'extract_mac'.
+        maxsize (int): Campaigns retained before evicting the least recently
+            used entry.
+        strings (aggregation.StringDictionary | None): Optional per-run intern
+            table for resolved MACs.
+    """
+
+    def __init__(self, rules=None, maxsize: int = MAC_CACHE_SIZE, strings=None):
+        self.rules = tuple(rules) if rules else DEFAULT_MAC_RULES
+        self.maxsize = maxsize
+        self.strings = strings
+        self.campaign_labels: Dict[Any, tuple] = {}
+        self.labelled_customers: set = set()
+        self._cache: OrderedDict = OrderedDict()
+
+    @property
+    def needs_labels(self) -> bool:
+        """bool: Whether any rule reads campaign label names."""
+        return any(rule.kind == "label" for rule in self.rules)
+
+    def add_campaign_labels(self, labels_by_campaign) -> None:
+        """Register label names per campaign ID for 'label:' rules."""
+        for campaign_id, labels in labels_by_campaign.items():
+            labels = tuple(labels)
+            # workers re-register the same labels with every batch
+            if self.campaign_labels.get(campaign_id) == labels:
+                continue
+            self.campaign_labels[campaign_id] = labels
+            self._cache.pop(campaign_id, None)
+
+    def resolve(self, campaign_id, campaign_name: Optional[str]) -> str:
+        """Return the MAC for a campaign, computing it on a cache miss."""
+        cache_key = campaign_id if campaign_id else campaign_name
+        cache = self._cache
+        mac = cache.get(cache_key)
+        if mac is not None:
+            cache.move_to_end(cache_key)
+            return mac
+        labels = self.campaign_labels.get(campaign_id, ())
+        for rule in self.rules:
+            mac = apply_mac_rule(rule, campaign_name, labels)
+            if mac is not None:
+                break
+        else:
+            mac = "UNDEFINED"
+        if self.strings is not None:
+            mac = self.strings.intern(mac)
+        cache[cache_key] = mac
+        if len(cache) > self.maxsize:
+            cache.popitem(last=False)
+        return mac
 
 
 # -----------------------------
@@ -620,6 +911,133 @@ def parse_toggle_choice(value: Any) -> bool:
     )
 
 
+def parse_top_n(value: Any) -> int:
+    try:
+        top_n = int(str(value).strip())
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError("--top expects a positive integer.") from exc
+    if top_n < 1:
+        raise argparse.ArgumentTypeError("--top expects a positive integer.")
+    return top_n
+
+
+def parse_warm_budget(value: Any) -> int:
+    try:
+        budget = int(str(value).strip().replace("_", "").replace(",", ""))
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(
+            "--warm-budget expects a positive number of rows."
+        ) from exc
+    if budget < 1:
+        raise argparse.ArgumentTypeError(
+            "--warm-budget expects a positive number of rows."
+        )
+    return budget
+
+
+def parse_min_cost(value: Any) -> Decimal:
+    try:
+        min_cost = Decimal(str(value).strip())
+    except InvalidOperation as exc:
+        raise argparse.ArgumentTypeError("--min-cost expects a number.") from exc
+    if not min_cost.is_finite():
+        raise argparse.ArgumentTypeError("--min-cost expects a finite number.")
+    if min_cost < 0:
+        raise argparse.ArgumentTypeError("--min-cost cannot be negative.")
+    return min_cost
+
+
+MEMORY_UNITS = {
+    "b": 1,
+    "k": 1024,
+    "kb": 1024,
+    "m": 1024**2,
+    "mb": 1024**2,
+    "g": 1024**3,
+    "gb": 1024**3,
+}
+
+
+def parse_memory_limit(value: Any) -> int:
+    """Parse a memory budget such as '512MB' or '2g' into bytes (bare numbers are MB)."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([a-zA-Z]*)\s*", str(value))
+    unit = match.group(2).lower() if match else ""
+    if not match or (unit and unit not in MEMORY_UNITS):
+        raise argparse.ArgumentTypeError(
+            "--memory-limit expects a size such as 512MB, 2GB, or 750 (MB)."
+        )
+    limit = int(float(match.group(1)) * MEMORY_UNITS.get(unit or "mb"))
+    if limit < 1:
+        raise argparse.ArgumentTypeError("--memory-limit must be greater than zero.")
+    return limit
+
+
+def parse_processes(value: Any) -> int:
+    """Parse a decode worker count; 'auto' uses every available CPU."""
+    normalized = str(value).strip().lower()
+    if normalized == "auto":
+        return os.cpu_count() or 1
+    try:
+        processes = int(normalized)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(
+            "--processes expects a positive integer or 'auto'."
+        ) from exc
+    if processes < 1:
+        raise argparse.ArgumentTypeError(
+            "--processes expects a positive integer or 'auto'."
+        )
+    return processes
+
+
+def parse_file_template(value: Any) -> str:
+    """Validate an output file name template such as '{report}_{run_id}'."""
+    try:
+        return output.validate_template(str(value).strip())
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
+def parse_concurrency(value: Any) -> int:
+    try:
+        concurrency = int(str(value).strip())
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(
+            "--concurrency expects a positive integer."
+        ) from exc
+    if concurrency < 1:
+        raise argparse.ArgumentTypeError("--concurrency expects a positive integer.")
+    return concurrency
+
+
+def parse_fiscal_year_start(value: Any) -> int:
+    try:
+        month = int(str(value).strip())
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(
+            "--fiscal-year-start expects a month number from 1 to 12."
+        ) from exc
+    if not 1 <= month <= 12:
+        raise argparse.ArgumentTypeError(
+            "--fiscal-year-start expects a month number from 1 to 12."
+        )
+    return month
+
+
+def parse_profile_rate(value: Any) -> float:
+    try:
+        rate = float(str(value).strip())
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(
+            "--profile-rate expects a positive number of requests per second."
+        ) from exc
+    if rate <= 0:
+        raise argparse.ArgumentTypeError(
+            "--profile-rate expects a positive number of requests per second."
+        )
+    return rate
+
+
 def canonicalize_scope(raw_scope: Optional[str]) -> Optional[str]:
     if raw_scope is None:
         return None
@@ -770,6 +1188,14 @@ def determine_cli_mode(args) -> bool:
             args.include_adgroup_info is not None,
             args.include_device_type is not None,
             args.include_mac is not None,
+            args.top is not None,
+            args.min_cost is not None,
+            args.shard is not None,
+            args.explain,
+            args.grouping_sets,
+            args.store,
+            args.id_only,
+            args.warm,
         ]
     )
 
@@ -838,6 +1264,22 @@ def resolve_performance_toggles(cli_args, report_option: str) -> Dict[str, bool]
     provided_fields = getattr(cli_args, "provided_toggle_fields", set())
     forced_messages: list[str] = []
 
+    grouping_sets = getattr(cli_args, "grouping_sets", False)
+    if grouping_sets and report_option == "ads":
+        # set before prompting: grouping sets always run from the ad level up
+        if False in (cli_args.include_campaign_info, cli_args.include_adgroup_info):
+            forced_messages.append(
+                "Grouping sets include every level down to the ad. Proceeding with "
+                "campaign and ad group metadata enabled."
+            )
+        cli_args.include_campaign_info = cli_args.include_adgroup_info = True
+    elif grouping_sets and getattr(cli_args, "cli_mode", False):
+        ignored_cli_arguments.append("--grouping-sets")
+    id_only = getattr(cli_args, "id_only", False)
+    if id_only and report_option not in ID_ONLY_REPORTS:
+        if getattr(cli_args, "cli_mode", False):
+            ignored_cli_arguments.append("--id-only")
+
     for toggle_name, config in PERFORMANCE_TOGGLE_CONFIG.items():
         attr_name = config["attr"]
         allowed_reports = config["reports"]
@@ -889,6 +1331,40 @@ def resolve_performance_toggles(cli_args, report_option: str) -> Dict[str, bool]
     return toggles
 
 
+def resolve_report_options(cli_args) -> Dict[str, Any]:
+    """Collect runtime (non-toggle) keyword options for report functions."""
+    options: Dict[str, Any] = {}
+    memory_limit = getattr(cli_args, "memory_limit", None)
+    if memory_limit is not None:
+        options["memory_limit"] = memory_limit
+    mac_rules = getattr(cli_args, "mac_rules", None)
+    if mac_rules:
+        options["mac_rules"] = tuple(mac_rules)
+    concurrency = getattr(cli_args, "concurrency", None)
+    if concurrency is not None:
+        options["concurrency"] = concurrency
+    if getattr(cli_args, "incremental", False):
+        options["incremental"] = True
+    if getattr(cli_args, "grouping_sets", False):
+        options["grouping_sets"] = True
+    if getattr(cli_args, "id_only", False):
+        options["id_only"] = True
+    if getattr(cli_args, "store", False):
+        # lazy import: store builds on pipeline, which imports this module
+        from gar import store
+
+        # serves days fetched by a recent warm-up ('--warm') as well
+        options["result_store"] = store.ResultStore(fresh_hours=store.FRESH_HOURS)
+    fiscal_year_start = getattr(cli_args, "fiscal_year_start", None)
+    if fiscal_year_start is not None:
+        options["fiscal_year_start"] = fiscal_year_start
+    processes = getattr(cli_args, "processes", None)
+    # a single worker would only add serialization overhead
+    if processes is not None and processes > 1:
+        options["processes"] = processes
+    return options
+
+
 def resolve_date_details(cli_args, *, force_single: bool):
     if getattr(cli_args, "date_details", None):
         return cli_args.date_details
@@ -929,6 +1405,67 @@ def resolve_output_preference(cli_args) -> str:
     return output_mode
 
 
+def resolve_output_context(
+    cli_args, report_option: str, account_id, start_date=None, end_date=None
+) -> output.OutputContext:
+    """Build the output naming/layout context for one report run.
+
+    A run is headless when '--output' was given on the command line; the
+    run ID defaults to the start time of the process and is shared by every
+    report the run writes.
+    """
+    if not getattr(cli_args, "run_id", None):
+        cli_args.run_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+    today = date.today().isoformat()
+    return output.OutputContext(
+        report=report_option,
+        account=str(account_id) if account_id else "all",
+        start=str(start_date or today),
+        end=str(end_date or today),
+        run_id=cli_args.run_id,
+        directory=output.default_directory(getattr(cli_args, "output_dir", None)),
+        template=getattr(cli_args, "output_template", None)
+        or output.DEFAULT_FILE_TEMPLATE,
+        per_account=bool(getattr(cli_args, "per_account_dirs", False)),
+        headless=getattr(cli_args, "output", None) is not None,
+    )
+
+
+def resolve_shard_writer(
+    cli_args, output_context: output.OutputContext, report_option: str
+) -> Optional[output.ShardWriter]:
+    """Build the per-account shard writer requested with '--shard', if any."""
+    partition = getattr(cli_args, "shard", None)
+    if not partition:
+        return None
+    file_format = getattr(cli_args, "shard_format", None) or "csv"
+    if file_format == "parquet" and not output.parquet_available():
+        print(
+            "Parquet shards need the optional 'pyarrow' package (pip install pyarrow)."
+        )
+        sys.exit(1)
+    top_n = getattr(cli_args, "top", None)
+    min_cost = getattr(cli_args, "min_cost", None)
+    metric_header = REPORT_RANK_METRICS.get(report_option)
+    if getattr(cli_args, "grouping_sets", False):
+        metric_header = None
+    row_filter = None
+    if metric_header and (top_n is not None or min_cost is not None):
+
+        def row_filter(rows, headers):
+            return rank_rows(
+                rows, headers, metric_header, top_n=top_n, min_value=min_cost
+            )
+
+    return output.ShardWriter(
+        output_context,
+        partition=partition,
+        file_format=file_format,
+        writers=getattr(cli_args, "writers", None) or output.DEFAULT_SHARD_WRITERS,
+        row_filter=row_filter,
+    )
+
+
 def resolve_account_scope(cli_args, customer_dict: Dict[str, str]):
     if getattr(cli_args, "account_scope", None):
         scope = cli_args.account_scope
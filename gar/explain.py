@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+"""Dry-run plans for performance reports: GAQL, row counts, and durations."""
+
+import math
+
+from tabulate import tabulate
+
+from gar import history, pipeline, services, store
+
+# rows per search_stream response batch
+STREAM_BATCH_ROWS = 10000
+# reports whose '*_all' variant queries accounts concurrently
+CONCURRENT_REPORTS = ("account",)
+
+EXPLAIN_HEADERS = [
+    "Account name",
+    "Customer ID",
+    "Queries",
+    "Est. API rows",
+    "Est. output rows",
+    "Est. seconds",
+    "Source",
+]
+
+
+def collect_plans(
+    report_single,
+    gads_service,
+    client,
+    start_date,
+    end_date,
+    time_seg,
+    accounts_info,
+    **kwargs,
+):
+    """Build each account's report plan without executing it.
+
+    Args:
+        report_single (Callable): The report's '*_single' function.
+        gads_service (GoogleAdsService): Service passed through to the report.
+        client (GoogleAdsClient): API client passed through to the report.
+        start_date (str): Inclusive start date ('YYYY-MM-DD').
+        end_date (str): Inclusive end date ('YYYY-MM-DD').
+        time_seg (str): Time segmentation key.
+        accounts_info (dict[str, str]): Mapping of customer IDs to names.
+        **kwargs: Report toggles and run options.
+
+    Returns:
+        list[tuple[str, str, pipeline.ReportPlan]]: Plan per account.
+    """
+
+    plans = []
+    for customer_id, account_descriptive in accounts_info.items():
+        captured = []
+        report_single(
+            gads_service,
+            client,
+            start_date,
+            end_date,
+            time_seg,
+            customer_id,
+            **kwargs,
+            plan_sink=lambda cid, plan: captured.append(plan),
+        )
+        plans.extend((customer_id, account_descriptive, plan) for plan in captured)
+    return plans
+
+
+def count_rows(gads_service, client, customer_id, query):
+    """Return the number of rows 'query' would stream for an account.
+
+    Issues a paged 'search' asking for the total result count, so only the
+    first page is transferred rather than the whole result.
+    """
+
+    request = client.get_type("SearchGoogleAdsRequest")
+    request.customer_id = customer_id
+    request.query = query
+    request.return_total_results_count = True
+    response = gads_service.search(request=request)
+    return response.total_results_count
+
+
+def estimate_account(
+    gads_service, client, report, customer_id, plan, days, records, pre_query=True
+):
+    """Estimate one account's API rows, output rows, and duration.
+
+    Recorded runs of the same report and account are scaled to the window;
+    without history a counting pre-query is issued per plan query.
+
+    Returns:
+        tuple[int | None, int | None, float | None, str]: API rows, output
+        rows, seconds, and the estimate source ('history', 'count', or
+        'unknown').
+    """
+
+    recorded = history.estimate(records, report, customer_id, days)
+    if recorded is not None:
+        return (*recorded, "history")
+    if not pre_query:
+        return None, None, None, "unknown"
+    try:
+        api_rows = sum(
+            count_rows(gads_service, client, customer_id, query)
+            for query, _ in plan.queries
+        )
+    except Exception as e:
+        print(f"Row count failed for {customer_id}: {e}")
+        return None, None, None, "unknown"
+    seconds = len(
+        plan.queries
+    ) * history.QUERY_OVERHEAD_SECONDS + api_rows / history.rows_per_second(
+        records, report
+    )
+    # unaggregated plans emit one output row per API row
+    rows = api_rows if plan.dimensions is None else None
+    return api_rows, rows, seconds, "count"
+
+
+def explain_report(
+    report,
+    report_single,
+    gads_service,
+    client,
+    start_date,
+    end_date,
+    time_seg,
+    accounts_info,
+    pre_query=True,
+    **kwargs,
+):
+    """Plan a performance report and estimate its size without running it.
+
+    Args:
+        report (str): Report option keyword (for example 'ads').
+        report_single (Callable): The report's '*_single' function.
+        gads_service (GoogleAdsService): Service used for counting queries.
+        client (GoogleAdsClient): Authenticated API client.
+        start_date (str): Inclusive start date ('YYYY-MM-DD').
+        end_date (str): Inclusive end date ('YYYY-MM-DD').
+        time_seg (str): Time segmentation key.
+        accounts_info (dict[str, str]): Mapping of customer IDs to names.
+        pre_query (bool): Count rows for accounts without run history.
+        **kwargs: Report toggles and run options ('concurrency',
+            'processes', 'memory_limit', ...).
+
+    Returns:
+        list[str]: Lines describing the plan.
+    """
+
+    plans = collect_plans(
+        report_single,
+        gads_service,
+        client,
+        start_date,
+        end_date,
+        time_seg,
+        accounts_info,
+        **kwargs,
+    )
+    days = history.window_days(start_date, end_date)
+    records = history.load()
+    result_store = kwargs.get("result_store")
+    shape = store.shape_key(report, kwargs)
+    table = []
+    fetches = {}
+    for customer_id, account_descriptive, plan in plans:
+        fetch_days = days
+        if result_store is not None:
+            ranges = result_store.missing(customer_id, shape, start_date, end_date)
+            fetches[customer_id] = ranges
+            fetch_days = sum(history.window_days(*window) for window in ranges)
+        if fetch_days:
+            api_rows, rows, seconds, source = estimate_account(
+                gads_service,
+                client,
+                report,
+                customer_id,
+                plan,
+                fetch_days,
+                records,
+                pre_query=pre_query,
+            )
+            if source == "count" and fetch_days < days:
+                # counting queries cover the whole window
+                api_rows = round(api_rows * fetch_days / days)
+                seconds *= fetch_days / days
+                rows = None if rows is None else api_rows
+        else:
+            api_rows, rows, seconds, source = 0, None, 0.0, "store"
+        table.append(
+            [
+                account_descriptive,
+                customer_id,
+                len(plan.queries),
+                api_rows,
+                rows,
+                None if seconds is None else round(seconds, 1),
+                source,
+            ]
+        )
+    lines = format_explanation(
+        report, plans, table, start_date, end_date, time_seg, days, kwargs
+    )
+    if result_store is not None:
+        lines.extend(format_store_windows(plans, fetches, days))
+    return lines
+
+
+def format_store_windows(plans, fetches, days):
+    """Describe the days each account would fetch past the local store.
+
+    Args:
+        plans (list[tuple[str, str, pipeline.ReportPlan]]): Plan per account.
+        fetches (dict[str, list[tuple[str, str]]]): Missing ranges per
+            customer ID, from 'store.ResultStore.missing'.
+        days (int): Window length in days.
+
+    Returns:
+        list[str]: Lines listing the missing windows.
+    """
+
+    missing = {
+        cid: sum(history.window_days(*w) for w in r) for cid, r in fetches.items()
+    }
+    lines = [
+        f"Local store: {len(missing) * days - sum(missing.values()):,} of "
+        f"{len(missing) * days:,} account-days stored (estimates above cover "
+        "the missing days only)"
+    ]
+    names = {customer_id: name for customer_id, name, _ in plans}
+    for customer_id, ranges in fetches.items():
+        if not ranges:
+            continue
+        windows = ", ".join(
+            start if start == end else f"{start}..{end}" for start, end in ranges
+        )
+        lines.append(f"  {names[customer_id]} ({customer_id}) fetches {windows}")
+    return lines
+
+
+def _format_bytes(size):
+    return f"{size / 1024**2:,.0f} MB"
+
+
+def _known_sum(values):
+    known = [value for value in values if value is not None]
+    return sum(known), len(known) < len(values)
+
+
+def format_explanation(
+    report, plans, table, start_date, end_date, time_seg, days, options
+):
+    """Render the queries, per-account estimates, and execution settings.
+
+    Args:
+        report (str): Report option keyword.
+        plans (list[tuple[str, str, pipeline.ReportPlan]]): Plan per account.
+        table (list[list]): Estimate rows matching 'EXPLAIN_HEADERS'.
+        start_date (str): Inclusive start date.
+        end_date (str): Inclusive end date.
+        time_seg (str): Time segmentation key.
+        days (int): Window length in days.
+        options (dict): Run options passed to the report.
+
+    Returns:
+        list[str]: Lines describing the plan.
+    """
+
+    lines = [
+        f"Plan for the {report} report, {start_date} to {end_date} "
+        f"({days} days, segmented by {time_seg}), {len(table)} account(s):",
+        "",
+    ]
+    # queries only differ by customer, so each distinct query is shown once
+    accounts_by_query = {}
+    for customer_id, _, plan in plans:
+        for query, _ in plan.queries:
+            accounts_by_query.setdefault(" ".join(query.split()), []).append(
+                customer_id
+            )
+    for number, (query, accounts) in enumerate(accounts_by_query.items(), start=1):
+        lines.append(f"Query {number} ({len(accounts)} account(s)):")
+        lines.append(f"  {query}")
+    lines.append("")
+    lines.extend(tabulate(table, EXPLAIN_HEADERS, tablefmt="simple").splitlines())
+    lines.append("")
+
+    api_rows, api_partial = _known_sum([row[3] for row in table])
+    seconds, seconds_partial = _known_sum([row[5] for row in table])
+    accounts = max(1, len(table))
+    if report in CONCURRENT_REPORTS:
+        workers = min(
+            options.get("concurrency") or services.DEFAULT_CONCURRENCY, accounts
+        )
+        lines.append(f"Accounts: {workers} queried concurrently")
+        # accounts overlap, but one slow account still bounds the run
+        slowest = max((row[5] for row in table if row[5] is not None), default=0)
+        seconds = max(seconds / workers, slowest)
+    else:
+        lines.append("Accounts: queried one at a time")
+    processes = options.get("processes")
+    aggregated = any(plan.dimensions is not None for _, _, plan in plans)
+    if processes and aggregated:
+        lines.append(f"Decoding: {processes} worker processes")
+    else:
+        lines.append("Decoding: in-process")
+    memory_limit = options.get("memory_limit")
+    if memory_limit and aggregated:
+        lines.append(
+            f"Aggregation: spills sorted runs to disk beyond {_format_bytes(memory_limit)}"
+        )
+    elif aggregated:
+        lines.append("Aggregation: in memory (no --memory-limit)")
+    else:
+        lines.append("Aggregation: none, rows are passed through")
+    grouping_sets = next(
+        (plan.grouping_sets for _, _, plan in plans if plan.grouping_sets), None
+    )
+    if grouping_sets is not None:
+        levels = " > ".join(label for label, _ in grouping_sets.levels)
+        lines.append(f"Subtotals: {levels}, summed from the finest level")
+    if any(
+        isinstance(enricher, pipeline.EntityJoiner)
+        for _, _, plan in plans
+        for enricher in plan.enrichers
+    ):
+        lines.append("Entity names: joined from the metadata cache (ID-only queries)")
+    lines.append(
+        f"Stream batches: ~{math.ceil(api_rows / STREAM_BATCH_ROWS):,} "
+        f"of up to {STREAM_BATCH_ROWS:,} rows"
+    )
+    partial = " (accounts without an estimate excluded)"
+    lines.append(f"Estimated API rows: {api_rows:,}{partial if api_partial else ''}")
+    lines.append(
+        f"Estimated duration: {seconds / 60:,.1f} min"
+        f"{partial if seconds_partial else ''}"
+    )
+    return lines
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""Cached daily cost history and lightweight seasonal spend forecasts."""
+
+import calendar
+from datetime import date, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
+from gar import cache
+
+# days of daily cost kept per campaign
+HISTORY_DAYS = 182
+# trailing days re-fetched on refresh, since recent cost can still be restated
+HISTORY_OVERLAP_DAYS = 3
+# trailing days used to fit the model
+FIT_DAYS = 56
+SEASON_LENGTH = 7
+# Holt smoothing weights and trend damping
+LEVEL_ALPHA = 0.3
+TREND_BETA = 0.1
+TREND_DAMPING = 0.9
+# days covered by the "Forecast next 30d" column
+FORECAST_HORIZON_DAYS = 30
+HISTORY_FORMAT_VERSION = 1
+
+
+def history_name(customer_id):
+    """Return the cache file name holding one account's cost history."""
+    return f"cost_history_{customer_id}.json"
+
+
+class CostHistory:
+    """Daily cost per campaign for one account, aligned on a shared window.
+
+    Every series holds one integer cost in cents per day from 'start'
+    through 'end', so a refresh only has to fetch days after 'end' (plus a
+    short overlap) instead of re-pulling the full history.
+
+    Args:
+        start (date | None): First day held.
+        end (date | None): Last day held.
+        account_name (str | None): Account descriptive name.
+        campaigns (dict[str, dict] | None): Campaign ID to '{"name", "cost"}'.
+    """
+
+    def __init__(self, start=None, end=None, account_name=None, campaigns=None):
+        self.start = start
+        self.end = end
+        self.account_name = account_name
+        self.campaigns = campaigns or {}
+
+    @property
+    def days(self):
+        """int: Number of days held per series."""
+        if self.start is None:
+            return 0
+        return (self.end - self.start).days + 1
+
+    @classmethod
+    def load(cls, customer_id):
+        """Load the cached history for an account (empty on a cold start)."""
+        data = cache.load_json(history_name(customer_id))
+        if not data or data.get("version") != HISTORY_FORMAT_VERSION:
+            return cls()
+        return cls(
+            start=date.fromisoformat(data["start"]),
+            end=date.fromisoformat(data["end"]),
+            account_name=data.get("account_name"),
+            campaigns=data["campaigns"],
+        )
+
+    def save(self, customer_id):
+        """Write the history to the cache directory."""
+        cache.save_json(
+            history_name(customer_id),
+            {
+                "version": HISTORY_FORMAT_VERSION,
+                "start": self.start.isoformat(),
+                "end": self.end.isoformat(),
+                "account_name": self.account_name,
+                "campaigns": self.campaigns,
+            },
+        )
+
+    def missing_range(self, through):
+        """Return the '(start, end)' dates to fetch to bring history up to 'through'.
+
+        Returns:
+            tuple[date, date] | None: Inclusive fetch window, or 'None' when
+            the history is already current.
+        """
+
+        earliest = through - timedelta(days=HISTORY_DAYS - 1)
+        if self.end is None:
+            return earliest, through
+        if self.end >= through:
+            return None
+        start = self.end - timedelta(days=HISTORY_OVERLAP_DAYS - 1)
+        return max(start, earliest), through
+
+    def update(self, rows, fetch_start, through):
+        """Merge freshly fetched rows covering 'fetch_start'..'through'.
+
+        Days inside the fetch window are replaced, older days are kept, and
+        the window is trimmed to 'HISTORY_DAYS'.
+
+        Args:
+            rows (Iterable[dict]): Decoded rows with 'Date', 'Campaign ID',
+                'Campaign name', 'Cost', and 'Account name'.
+            fetch_start (date): First fetched day.
+            through (date): Last fetched day.
+        """
+
+        end = max(self.end, through) if self.end else through
+        start = min(self.start, fetch_start) if self.start else fetch_start
+        start = max(start, end - timedelta(days=HISTORY_DAYS - 1))
+        length = (end - start).days + 1
+        keep_until = (fetch_start - start).days  # offsets below this are kept
+        resized = {}
+        for campaign_id, series in self.campaigns.items():
+            cost = [0] * length
+            if self.start is not None:
+                shift = (self.start - start).days
+                for offset, value in enumerate(series["cost"]):
+                    target = offset + shift
+                    if 0 <= target < min(keep_until, length):
+                        cost[target] = value
+            resized[campaign_id] = {"name": series["name"], "cost": cost}
+        for row in rows:
+            offset = (date.fromisoformat(row["Date"]) - start).days
+            if offset < 0:
+                continue
+            campaign_id = str(row["Campaign ID"])
+            series = resized.get(campaign_id)
+            if series is None:
+                series = resized[campaign_id] = {"name": None, "cost": [0] * length}
+            series["name"] = row["Campaign name"]
+            series["cost"][offset] += int(row["Cost"] * 100)
+            self.account_name = row["Account name"]
+        self.start, self.end, self.campaigns = start, end, resized
+
+
+def fit_series(values, end):
+    """Fit a damped-trend model with weekday seasonality to one cost series.
+
+    Args:
+        values (list[float]): Daily cost, oldest first, ending on 'end'.
+        end (date): Day of the last value.
+
+    Returns:
+        tuple[float, float, list[float]]: Level, trend, and seasonal indices
+        keyed by 'date.weekday()'.
+    """
+
+    values = values[-FIT_DAYS:]
+    first = end - timedelta(days=len(values) - 1)
+    weekdays = [
+        (first.weekday() + offset) % SEASON_LENGTH for offset in range(len(values))
+    ]
+    season = [1.0] * SEASON_LENGTH
+    mean = sum(values) / len(values) if values else 0.0
+    if mean and len(values) >= 2 * SEASON_LENGTH:
+        totals = [0.0] * SEASON_LENGTH
+        counts = [0] * SEASON_LENGTH
+        for weekday, value in zip(weekdays, values):
+            totals[weekday] += value
+            counts[weekday] += 1
+        season = [
+            (totals[d] / counts[d]) / mean if counts[d] else 1.0
+            for d in range(SEASON_LENGTH)
+        ]
+    level = None
+    trend = 0.0
+    for weekday, value in zip(weekdays, values):
+        index = season[weekday] or 1.0
+        observed = value / index
+        if level is None:
+            level = observed
+            continue
+        previous = level
+        level = LEVEL_ALPHA * observed + (1 - LEVEL_ALPHA) * (
+            level + TREND_DAMPING * trend
+        )
+        trend = TREND_BETA * (level - previous) + (1 - TREND_BETA) * (
+            TREND_DAMPING * trend
+        )
+    return level or 0.0, trend, season
+
+
+def project(model, end, horizon):
+    """Return forecast daily costs for the 'horizon' days after 'end'."""
+    level, trend, season = model
+    forecasts = []
+    damped = 0.0
+    for step in range(1, horizon + 1):
+        damped += TREND_DAMPING**step
+        weekday = (end + timedelta(days=step)).weekday()
+        forecasts.append(max(0.0, (level + damped * trend) * season[weekday]))
+    return forecasts
+
+
+def forecast_history(history, through=None):
+    """Forecast every active campaign in 'history'.
+
+    Campaigns without spend in the fit window are skipped.
+
+    Args:
+        history (CostHistory): Refreshed account history.
+        through (date | None): Last day the forecast is fitted on; cached
+            days after it are left out. Defaults to the history's end.
+
+    Returns:
+        list[dict]: One record per campaign with trailing actuals and
+        forecast totals for the next 7 and 30 days and the rest of the month.
+    """
+
+    if history.end is None:
+        return []
+    end = history.end if through is None else min(history.end, through)
+    if end < history.start:
+        return []
+    length = (end - history.start).days + 1
+    rest_of_month = calendar.monthrange(end.year, end.month)[1] - end.day
+    steps = max(FORECAST_HORIZON_DAYS, rest_of_month)
+    records = []
+    for campaign_id, series in history.campaigns.items():
+        cents = series["cost"][:length]
+        if not any(cents[-FIT_DAYS:]):
+            continue
+        daily = project(fit_series([c / 100 for c in cents], end), end, steps)
+        records.append(
+            {
+                "Account name": history.account_name,
+                "Campaign ID": int(campaign_id),
+                "Campaign": series["name"],
+                "Last 7d cost": _cents(sum(cents[-7:])),
+                "Last 28d cost": _cents(sum(cents[-28:])),
+                "Forecast next 7d": _money(sum(daily[:7])),
+                "Forecast next 30d": _money(sum(daily[:FORECAST_HORIZON_DAYS])),
+                "Forecast rest of month": _money(sum(daily[:rest_of_month])),
+            }
+        )
+    return records
+
+
+def _cents(value):
+    """Convert integer cents to a 2dp Decimal."""
+    return (Decimal(value) / 100).quantize(Decimal("0.01"))
+
+
+def _money(value):
+    """Round a float amount to a 2dp Decimal."""
+    return Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""Run history: per-account row counts and durations of past report runs."""
+
+import threading
+import time
+from datetime import date
+
+from gar import cache
+
+HISTORY_FILE = "run_history.json"
+# newest records kept; older ones are dropped when a run is saved
+MAX_RECORDS = 5000
+# records per report and account used for an estimate
+ESTIMATE_RECORDS = 10
+# throughput assumed before any run has been recorded
+DEFAULT_ROWS_PER_SECOND = 10000.0
+# fixed cost of one streamed query (connection, first batch)
+QUERY_OVERHEAD_SECONDS = 0.5
+
+
+def window_days(start_date, end_date):
+    """Return the inclusive number of days between two ISO dates."""
+    start = date.fromisoformat(str(start_date))
+    end = date.fromisoformat(str(end_date))
+    return (end - start).days + 1
+
+
+def load():
+    """Return the recorded runs, oldest first."""
+    return cache.load_json(HISTORY_FILE, default=[])
+
+
+class RunRecorder:
+    """Collect per-account statistics during one report run.
+
+    Accounts may complete on several threads, so records are buffered under
+    a lock and written once by 'save'.
+
+    Args:
+        report (str): Report option keyword (for example 'ads').
+        start_date (str): Inclusive start date ('YYYY-MM-DD').
+        end_date (str): Inclusive end date ('YYYY-MM-DD').
+        options (dict | None): JSON-safe report options the run can be
+            replayed with ('store.shape_options'), for cache warming.
+    """
+
+    def __init__(self, report, start_date, end_date, options=None):
+        self.report = report
+        self.start = str(start_date)
+        self.end = str(end_date)
+        self.days = window_days(start_date, end_date)
+        self.options = options
+        self.records = []
+        self._lock = threading.Lock()
+
+    def record(self, customer_id, api_rows, rows, seconds, days=None):
+        """Buffer one account's API row count, output rows, and duration.
+
+        'days' is the number of days the rows cover, when only part of the
+        window was fetched ('store.ResultStore.serve'); it defaults to the
+        whole window.
+        """
+        with self._lock:
+            self.records.append(
+                {
+                    "report": self.report,
+                    "customer_id": str(customer_id),
+                    "start": self.start,
+                    "end": self.end,
+                    "days": self.days if days is None else days,
+                    "api_rows": api_rows,
+                    "rows": rows,
+                    "seconds": round(seconds, 3),
+                    "recorded_at": time.time(),
+                    "options": self.options,
+                }
+            )
+
+    def save(self):
+        """Append the buffered records to the history file.
+
+        History is bookkeeping only, so an unwritable cache directory is
+        reported and the records are dropped rather than failing the run.
+        """
+        with self._lock:
+            if not self.records:
+                return
+            records = load() + self.records
+            self.records = []
+        try:
+            cache.save_json(HISTORY_FILE, records[-MAX_RECORDS:])
+        except OSError as e:
+            print(f"Run history not saved: {e}")
+
+
+def rows_per_second(records, report=None):
+    """Return the API rows decoded per second across 'records'.
+
+    Args:
+        records (list[dict]): Recorded runs.
+        report (str | None): Restrict to one report option.
+
+    Returns:
+        float: Observed throughput, or 'DEFAULT_ROWS_PER_SECOND' without data.
+    """
+
+    rows = seconds = 0
+    for record in records:
+        if report is None or record["report"] == report:
+            rows += record["api_rows"]
+            seconds += record["seconds"]
+    if rows <= 0 or seconds <= 0:
+        return DEFAULT_ROWS_PER_SECOND
+    return rows / seconds
+
+
+def estimate(records, report, customer_id, days):
+    """Scale an account's recent runs of a report to a window length.
+
+    Args:
+        records (list[dict]): Recorded runs.
+        report (str): Report option keyword.
+        customer_id (str): Target customer ID.
+        days (int): Window length in days.
+
+    Returns:
+        tuple[int, int, float] | None: Estimated API rows, output rows, and
+        seconds, or None when the account has no history for the report.
+    """
+
+    matches = [
+        record
+        for record in records
+        if record["report"] == report and record["customer_id"] == str(customer_id)
+    ][-ESTIMATE_RECORDS:]
+    recorded_days = sum(record["days"] for record in matches)
+    if not recorded_days:
+        return None
+    scale = days / recorded_days
+    return (
+        round(sum(record["api_rows"] for record in matches) * scale),
+        round(sum(record["rows"] for record in matches) * scale),
+        sum(record["seconds"] for record in matches) * scale,
+    )
@@ -6,7 +6,54 @@ import sys
 import time
 from textwrap import dedent
 
-from gar import common, prompts, services
+from gar import (
+    common,
+    explain,
+    history,
+    output,
+    prompts,
+    services,
+    sessions,
+    store,
+    warm,
+)
+
+# report option -> report function, for one account and for every account
+PERFORMANCE_SINGLE_DISPATCH = {
+    "camptype": services.camptype_report_single,
+    "account": services.account_report_single,
+    "ads": services.ad_level_report_single,
+    "clickview": services.click_view_report_single,
+    "paid_organic_terms": services.paid_org_search_term_report_single,
+    "mac": services.mac_report_single,
+}
+PERFORMANCE_ALL_DISPATCH = {
+    "camptype": services.camptype_report_all,
+    "account": services.account_report_all,
+    "ads": services.ad_level_report_all,
+    "clickview": services.click_view_report_all,
+    "paid_organic_terms": services.paid_org_search_term_report_all,
+    "mac": services.mac_report_all,
+}
+# metric each '*_all' report orders descending within a date
+PERFORMANCE_MERGE_METRICS = {
+    "camptype": "Cost",
+    "account": "cost",
+    "ads": "Cost",
+    "clickview": "clicks",
+    "paid_organic_terms": "total clicks",
+    "mac": "Cost",
+}
+BUDGET_SINGLE_DISPATCH = {
+    "budget": services.budget_report_single,
+    "forecast": services.forecast_report_single,
+    "anomalies": services.anomaly_report_single,
+}
+BUDGET_ALL_DISPATCH = {
+    "budget": services.budget_report_all,
+    "forecast": services.forecast_report_all,
+    "anomalies": services.anomaly_report_all,
+}
 
 
 def build_parser():
@@ -27,7 +74,9 @@ def build_parser():
             Examples (can use 'gar' in place of 'main.py' if setup throug TOML config):
               python main.py --report performance:mac --date last30 --output csv --account single:1234567890
               python main.py --report performance:ads --channel-types include --ad-group include --date specific:2024-01-15
+              python main.py --report performance:paid_organic_terms --account all --top 500 --min-cost 10
               python main.py --report audit --report-option account_labels --account all --debug
+              python main.py serve --port 8765   (see 'serve --help')
             """
         ).strip(),
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -38,6 +87,28 @@ def build_parser():
         dest="yaml",
         help="Path to a YAML config file containing OAuth or Service Account credentials.",
     )
+    parser.add_argument(
+        "--profile",
+        dest="profiles",
+        action="append",
+        metavar="YAML",
+        help=(
+            "Credential profile YAML (one per manager account); repeat to report "
+            "across several MCCs at once. Accounts reachable from more than one "
+            "profile are reported once, by the first profile listing them."
+        ),
+    )
+    parser.add_argument(
+        "--profile-rate",
+        "--profile_rate",
+        dest="profile_rate",
+        type=common.parse_profile_rate,
+        metavar="N",
+        help=(
+            "API requests started per second by each --profile "
+            f"(default: {sessions.DEFAULT_PROFILE_RATE:g})."
+        ),
+    )
     parser.add_argument(
         "--report",
         help="Report scope (performance, audit, budget) optionally followed by ':<option>'.",
@@ -58,11 +129,118 @@ def build_parser():
         "--account",
         help="Account scope ('single' or 'all'), optionally with an ID (e.g., single:1234567890).",
     )
+    parser.add_argument(
+        "--fiscal-year-start",
+        "--fiscal_year_start",
+        dest="fiscal_year_start",
+        type=common.parse_fiscal_year_start,
+        metavar="MONTH",
+        help=(
+            "First month (1-12) of the fiscal year used for quarter and year "
+            "segments (default: 1, the calendar year)."
+        ),
+    )
     parser.add_argument(
         "--output",
         choices=sorted(common.OUTPUT_CHOICES),
         help="Preferred output handling for report data (csv, table, or auto).",
     )
+    parser.add_argument(
+        "--output-dir",
+        "--output_dir",
+        dest="output_dir",
+        metavar="DIR",
+        help="Directory CSV files are written to (default: your home directory).",
+    )
+    parser.add_argument(
+        "--output-template",
+        "--output_template",
+        dest="output_template",
+        type=common.parse_file_template,
+        metavar="TEMPLATE",
+        help=(
+            "CSV file name template for unattended runs using {report}, {table}, "
+            "{account}, {start}, {end}, and {run_id} (default: "
+            "'{report}_{account}_{start}_{end}_{run_id}')."
+        ),
+    )
+    parser.add_argument(
+        "--per-account-dirs",
+        "--per_account_dirs",
+        dest="per_account_dirs",
+        action="store_true",
+        help="Write each account's rows into its own <output-dir>/<customer id>/ folder.",
+    )
+    parser.add_argument(
+        "--run-id",
+        "--run_id",
+        dest="run_id",
+        metavar="ID",
+        help="Run identifier used in output file names (default: the start time).",
+    )
+    parser.add_argument(
+        "--shard",
+        choices=output.SHARD_PARTITIONS,
+        help=(
+            "Performance reports: write one file per account ('account') or per "
+            "date and account ('date') under --output-dir as each account "
+            "completes, instead of one combined output. --top/--min-cost apply "
+            "per account."
+        ),
+    )
+    parser.add_argument(
+        "--shard-format",
+        "--shard_format",
+        dest="shard_format",
+        choices=output.SHARD_FORMATS,
+        default="csv",
+        help="Shard file format (parquet requires the optional pyarrow package).",
+    )
+    parser.add_argument(
+        "--writers",
+        type=common.parse_concurrency,
+        metavar="N",
+        help=f"Shard files written in parallel (default: {output.DEFAULT_SHARD_WRITERS}).",
+    )
+    parser.add_argument(
+        "--store",
+        action="store_true",
+        help=(
+            "Performance reports: keep fetched days in a local day-partitioned "
+            "store (~/.gar/store or $GAR_CACHE_DIR/store) and query only the days "
+            f"it is missing. The last {store.SETTLE_DAYS} days are refetched unless "
+            f"fetched in the past {store.FRESH_HOURS} hours (as by --warm)."
+        ),
+    )
+    parser.add_argument(
+        "--warm",
+        action="store_true",
+        help=(
+            "Pre-fetch performance reports that recur in the run history (same "
+            "report, options, and relative window on several days) into the "
+            "--store store, then exit. Meant for an off-peak scheduled job."
+        ),
+    )
+    parser.add_argument(
+        "--warm-budget",
+        "--warm_budget",
+        dest="warm_budget",
+        type=common.parse_warm_budget,
+        metavar="ROWS",
+        help=(
+            "Estimated API rows --warm may fetch, from past runs (default: "
+            f"{warm.DEFAULT_BUDGET:,})."
+        ),
+    )
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help=(
+            "Performance reports: print the GAQL, estimated rows and duration per "
+            "account (from past runs, or a counting pre-query), and the planned "
+            "concurrency, then exit without running the report."
+        ),
+    )
     parser.add_argument(
         "--mac",
         dest="include_mac",
@@ -74,6 +252,19 @@ def build_parser():
             "The MAC report always includes MAC values."
         ),
     )
+    parser.add_argument(
+        "--mac-rule",
+        "--mac_rule",
+        dest="mac_rules",
+        action="append",
+        type=common.parse_mac_rule,
+        metavar="RULE",
+        help=(
+            "MAC extraction rule; repeat to try several in order: suffix (default, "
+            "text after the last ':'), delimiter:<sep>[@<n>], regex:<pattern>, or "
+            "label:<prefix>."
+        ),
+    )
     parser.add_argument(
         "--channel-types",
         "--channel_types",
@@ -108,6 +299,17 @@ def build_parser():
             "exclude when not specified)."
         ),
     )
+    parser.add_argument(
+        "--grouping-sets",
+        "--grouping_sets",
+        dest="grouping_sets",
+        action="store_true",
+        help=(
+            "Ads report: emit ad, ad group, campaign, and account rows together, "
+            "with subtotals computed from one fetch. A 'Level' column names each "
+            "row's level; campaign and ad group metadata are always included."
+        ),
+    )
     parser.add_argument(
         "--device",
         "--device-type",
@@ -120,6 +322,74 @@ def build_parser():
             "exclude when not specified)."
         ),
     )
+    parser.add_argument(
+        "--top",
+        dest="top",
+        type=common.parse_top_n,
+        metavar="N",
+        help=(
+            "Keep only the N highest rows by the report's ranking metric (cost; "
+            "clicks for ClickView), ordered by that metric descending."
+        ),
+    )
+    parser.add_argument(
+        "--min-cost",
+        "--min_cost",
+        dest="min_cost",
+        type=common.parse_min_cost,
+        metavar="AMOUNT",
+        help="Drop rows whose ranking metric is below AMOUNT.",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        "--memory_limit",
+        dest="memory_limit",
+        type=common.parse_memory_limit,
+        metavar="SIZE",
+        help=(
+            "Approximate memory budget for report aggregation (e.g. 512MB, 2GB). "
+            "Aggregates beyond the budget spill sorted runs to temporary files."
+        ),
+    )
+    parser.add_argument(
+        "--processes",
+        dest="processes",
+        type=common.parse_processes,
+        metavar="N",
+        help=(
+            "Decode and pre-aggregate aggregated report responses in N worker "
+            "processes ('auto' uses every CPU)."
+        ),
+    )
+    parser.add_argument(
+        "--concurrency",
+        dest="concurrency",
+        type=common.parse_concurrency,
+        metavar="N",
+        help="Number of API requests issued in parallel where supported (default: 3).",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Use the per-account metadata cache (campaigns, ad groups, labels, "
+            "campaign groups) for the label assignment audit and 'label:' MAC "
+            "rules, re-fetching only campaigns change_status reports since the "
+            "last sync (kept in ~/.gar or $GAR_CACHE_DIR; fully re-synced weekly)."
+        ),
+    )
+    parser.add_argument(
+        "--id-only",
+        "--id_only",
+        dest="id_only",
+        action="store_true",
+        help=(
+            "Ads, clickview, and paid_organic_terms reports: select only IDs and "
+            "metrics in report queries, joining account, campaign, and ad group "
+            "names and types from the per-account metadata cache (synced as for "
+            "--incremental)."
+        ),
+    )
     parser.add_argument(
         "--debug",
         action="store_true",
@@ -205,15 +475,37 @@ def init_menu(cli_args):
     if not cli_args.cli_mode:
         input("Press Enter When Ready...")
     print("Authorization in progress...")
-    gads_service, customer_service, client = services.generate_services(cli_args.yaml)
-    print("Authorization complete!\n")
-    print("Retrieving account information...")
-    full_accounts_info = services.get_accounts(gads_service, customer_service, client)
+    if cli_args.profiles:
+        # one session per profile; reports route each account to its owner
+        profile_sessions = sessions.open_sessions(
+            cli_args.profiles, rate=cli_args.profile_rate
+        )
+        gads_service = sessions.RoutingService(profile_sessions)
+        client = profile_sessions[0].client
+        print("Authorization complete!\n")
+        full_accounts_info = gads_service.accounts_info()
+    else:
+        gads_service, customer_service, client = services.generate_services(
+            cli_args.yaml
+        )
+        print("Authorization complete!\n")
+        print("Retrieving account information...")
+        full_accounts_info = services.get_accounts(
+            gads_service, customer_service, client
+        )
     customer_list, account_headers, customer_dict, num_accounts = full_accounts_info
     print(
         "\nAccount information retrieved successfully!\n"
         f"Number of accounts found: {num_accounts}\n"
     )
+    if cli_args.warm:
+        warm.warm(
+            PERFORMANCE_SINGLE_DISPATCH,
+            gads_service,
+            client,
+            budget=cli_args.warm_budget or warm.DEFAULT_BUDGET,
+        )
+        return
     common.data_handling_options(
         table_data=customer_list, headers=account_headers, auto_view=True
     )
@@ -274,6 +566,7 @@ def performance_menu(gads_service, client, full_accounts_info, cli_args):
     print(f"{report_opt.replace('_', ' ').title()} report selected...")
 
     toggles = common.resolve_performance_toggles(cli_args, report_opt)
+    report_options = common.resolve_report_options(cli_args)
     force_single_date = report_opt == "clickview"
     date_opt, start_date, end_date, time_seg = common.resolve_date_details(
         cli_args, force_single=force_single_date
@@ -296,57 +589,111 @@ def performance_menu(gads_service, client, full_accounts_info, cli_args):
         toggles=toggles,
     )
 
-    single_dispatch = {
-        "camptype": services.camptype_report_single,
-        "account": services.account_report_single,
-        "ads": services.ad_level_report_single,
-        "clickview": services.click_view_report_single,
-        "paid_organic_terms": services.paid_org_search_term_report_single,
-        "mac": services.mac_report_single,
-    }
-    all_dispatch = {
-        "camptype": services.camptype_report_all,
-        "account": services.account_report_all,
-        "ads": services.ad_level_report_all,
-        "clickview": services.click_view_report_all,
-        "paid_organic_terms": services.paid_org_search_term_report_all,
-        "mac": services.mac_report_all,
-    }
-
-    if account_scope == "single":
-        if not account_id:
-            account_id, account_name = common.get_account_properties(customer_dict)
-        start_time = time.time()
-        table_data, headers = single_dispatch[report_opt](
+    if account_scope == "single" and not account_id:
+        account_id, account_name = common.get_account_properties(customer_dict)
+    if cli_args.explain:
+        accounts = (
+            customer_dict if account_scope == "all" else {account_id: account_name}
+        )
+        lines = explain.explain_report(
+            report_opt,
+            PERFORMANCE_SINGLE_DISPATCH[report_opt],
             gads_service,
             client,
             start_date,
             end_date,
             time_seg,
-            customer_id=account_id,
+            accounts,
             **toggles,
+            **report_options,
         )
-        end_time = time.time()
-    elif account_scope == "all":
+        print("\n".join(lines))
+        return
+    output_context = common.resolve_output_context(
+        cli_args, report_opt, account_id, start_date, end_date
+    )
+    shard_writer = common.resolve_shard_writer(cli_args, output_context, report_opt)
+    if shard_writer is not None:
+        report_options["result_sink"] = shard_writer
+    # options are kept so '--warm' can replay recurring runs
+    run_history = history.RunRecorder(
+        report_opt,
+        start_date,
+        end_date,
+        options=store.shape_options({**toggles, **report_options}),
+    )
+    report_options["run_history"] = run_history
+
+    if account_scope == "single":
         start_time = time.time()
-        table_data, headers = all_dispatch[report_opt](
+        table_data, headers = PERFORMANCE_SINGLE_DISPATCH[report_opt](
             gads_service,
             client,
             start_date,
             end_date,
             time_seg,
-            customer_dict,
+            customer_id=account_id,
             **toggles,
+            **report_options,
         )
         end_time = time.time()
+    elif account_scope == "all":
+        start_time = time.time()
+        if isinstance(gads_service, sessions.RoutingService):
+            # profiles run concurrently, each under its own quota governor
+            table_data, headers = sessions.run_all(
+                PERFORMANCE_ALL_DISPATCH[report_opt],
+                gads_service,
+                start_date,
+                end_date,
+                time_seg,
+                customer_dict,
+                PERFORMANCE_MERGE_METRICS[report_opt],
+                **toggles,
+                **report_options,
+            )
+        else:
+            table_data, headers = PERFORMANCE_ALL_DISPATCH[report_opt](
+                gads_service,
+                client,
+                start_date,
+                end_date,
+                time_seg,
+                customer_dict,
+                **toggles,
+                **report_options,
+            )
+        end_time = time.time()
     else:
         print("Invalid account scope resolved; exiting.")
         sys.exit(1)
 
-    prompts.execution_time(start_time, end_time)
-    common.data_handling_options(
-        table_data, headers, auto_view=False, preselected_output=output_mode
-    )
+    # history is saved once the report is out, so it can never cost the output
+    try:
+        if shard_writer is not None:
+            # '*_all' reports already handed every account to the writer
+            if account_scope == "single" and table_data:
+                shard_writer(account_id, account_name, table_data, headers)
+            paths = shard_writer.close()
+            prompts.execution_time(start_time, time.time())
+            print(f"Wrote {len(paths)} shard file(s) under {output_context.directory}")
+            if shard_writer.failures:
+                sys.exit(1)
+            return
+
+        table_data = common.apply_ranking_options(
+            table_data, headers, report_opt, cli_args
+        )
+        prompts.execution_time(start_time, end_time)
+        common.data_handling_options(
+            table_data,
+            headers,
+            auto_view=False,
+            preselected_output=output_mode,
+            output_context=output_context,
+        )
+    finally:
+        run_history.save()
 
 
 def budget_menu(gads_service, client, full_accounts_info, cli_args):
@@ -367,7 +714,7 @@ def budget_menu(gads_service, client, full_accounts_info, cli_args):
 
     _, _, customer_dict, _ = full_accounts_info
     report_opt = common.resolve_budget_option(cli_args)
-    print("Budget report selected...")
+    print(f"{report_opt.title()} report selected...")
 
     date_opt, start_date, end_date, time_seg = common.resolve_date_details(
         cli_args, force_single=False
@@ -390,30 +737,84 @@ def budget_menu(gads_service, client, full_accounts_info, cli_args):
         toggles={},
     )
 
+    report_options = common.resolve_report_options(cli_args)
     if account_scope == "single":
         if not account_id:
             account_id, account_name = common.get_account_properties(customer_dict)
         start_time = time.time()
-        services.budget_report_single(
+        results = BUDGET_SINGLE_DISPATCH[report_opt](
             gads_service,
             client,
             start_date,
             end_date,
             time_seg,
             customer_id=account_id,
+            **report_options,
         )
         end_time = time.time()
     elif account_scope == "all":
         start_time = time.time()
-        services.budget_report_all(
-            gads_service, client, start_date, end_date, time_seg, customer_dict
+        results = BUDGET_ALL_DISPATCH[report_opt](
+            gads_service,
+            client,
+            start_date,
+            end_date,
+            time_seg,
+            customer_dict,
+            **report_options,
         )
         end_time = time.time()
     else:
-        print("End of prototype options")
-        sys.exit("Exiting - exit testing...")
+        print("Invalid account scope resolved; exiting.")
+        sys.exit(1)
 
     prompts.execution_time(start_time, end_time)
+    output_context = common.resolve_output_context(
+        cli_args, report_opt, account_id, start_date, end_date
+    )
+    if report_opt == "forecast":
+        forecast_table, forecast_headers = results
+        print(f"\nCampaign spend forecast from {end_date}:")
+        common.data_handling_options(
+            forecast_table,
+            forecast_headers,
+            auto_view=False,
+            preselected_output=output_mode,
+            output_context=output_context,
+        )
+        return
+    if report_opt == "anomalies":
+        alert_table, alert_headers = results
+        if not alert_table:
+            print(f"\nNo anomalies detected between {start_date} and {end_date}.")
+            return
+        print(f"\nAnomalies detected between {start_date} and {end_date}:")
+        common.data_handling_options(
+            alert_table,
+            alert_headers,
+            auto_view=False,
+            preselected_output=output_mode,
+            output_context=output_context,
+        )
+        return
+    budget_table, budget_headers, account_table, account_headers = results
+    print(f"\nCampaign budget pacing through {end_date}:")
+    common.data_handling_options(
+        budget_table,
+        budget_headers,
+        auto_view=False,
+        preselected_output=output_mode,
+        output_context=output_context,
+    )
+    if account_table:
+        print("\nAccount pacing:")
+        common.data_handling_options(
+            account_table,
+            account_headers,
+            auto_view=False,
+            preselected_output=output_mode,
+            output_context=output_context._replace(table="account_pacing"),
+        )
 
 
 def audit_menu(gads_service, client, full_accounts_info, cli_args):
@@ -446,12 +847,14 @@ def audit_menu(gads_service, client, full_accounts_info, cli_args):
     account_scope, account_id, account_name = common.resolve_account_scope(
         cli_args, customer_dict
     )
-    if account_scope != "single":
-        print("Audit workflows require selecting a single account.")
+    if account_scope not in ("single", "all"):
+        print("Invalid account scope resolved; exiting.")
+        sys.exit(1)
+    if account_scope == "single" and not account_id:
         account_id, account_name = common.get_account_properties(customer_dict)
-        cli_args.account_scope = "single"
         cli_args.account_id = account_id
         cli_args.account_name = account_name
+    report_options = common.resolve_report_options(cli_args)
 
     common.maybe_print_configuration_summary(
         cli_args,
@@ -459,45 +862,80 @@ def audit_menu(gads_service, client, full_accounts_info, cli_args):
         report_option=audit_opt,
         date_details=None,
         output_mode=output_mode,
-        account_scope="single",
-        account_id=cli_args.account_id,
+        account_scope=account_scope,
+        account_id=account_id,
         toggles={},
     )
 
+    output_context = common.resolve_output_context(cli_args, audit_opt, account_id)
+
     if audit_opt == "account_labels":
-        label_table, label_table_headers, label_dict = services.get_labels(
-            gads_service, client, customer_id=cli_args.account_id
-        )
+        if account_scope == "all":
+            label_table, label_table_headers, _ = services.get_labels_all(
+                gads_service, client, customer_dict, **report_options
+            )
+        else:
+            label_table, label_table_headers, label_dict = services.get_labels(
+                gads_service, client, customer_id=account_id
+            )
         common.data_handling_options(
             label_table,
             label_table_headers,
             auto_view=False,
             preselected_output=output_mode,
+            output_context=output_context,
         )
     elif audit_opt == "campaign_groups":
-        camp_group_table, camp_group_headers, camp_group_dict = (
-            services.get_campaign_groups(
-                gads_service, client, customer_id=cli_args.account_id
+        if account_scope == "all":
+            camp_group_table, camp_group_headers, _ = services.get_campaign_groups_all(
+                gads_service, client, customer_dict, **report_options
+            )
+        else:
+            camp_group_table, camp_group_headers, camp_group_dict = (
+                services.get_campaign_groups(
+                    gads_service, client, customer_id=account_id
+                )
             )
-        )
         common.data_handling_options(
             camp_group_table,
             camp_group_headers,
             auto_view=False,
             preselected_output=output_mode,
+            output_context=output_context,
         )
     elif audit_opt == "label_assignments":
-        full_audit_table, full_audit_headers, full_audit_dict = (
-            services.complete_labels_audit(
-                gads_service, client, customer_id=cli_args.account_id
+        if account_scope == "all":
+            full_audit_table, full_audit_headers, rollup_table, rollup_headers = (
+                services.complete_labels_audit_all(
+                    gads_service, client, customer_dict, **report_options
+                )
             )
-        )
+        else:
+            full_audit_table, full_audit_headers, full_audit_dict = (
+                services.complete_labels_audit(
+                    gads_service,
+                    client,
+                    customer_id=account_id,
+                    **report_options,
+                )
+            )
+            rollup_table = None
         common.data_handling_options(
             full_audit_table,
             full_audit_headers,
             auto_view=False,
             preselected_output=output_mode,
+            output_context=output_context,
         )
+        if rollup_table:
+            print("\nUnlabeled campaign rollup across accounts:")
+            common.data_handling_options(
+                rollup_table,
+                rollup_headers,
+                auto_view=False,
+                preselected_output=output_mode,
+                output_context=output_context._replace(table="unlabeled_rollup"),
+            )
     else:
         print("Invalid input, please select one of the indicated options.")
 
@@ -505,13 +943,24 @@ def audit_menu(gads_service, client, full_accounts_info, cli_args):
 def main():
     """Execute the command-line interface for the Google Ads Reporter."""
 
+    if sys.argv[1:2] == ["serve"]:
+        # lazy import: the service builds on this module's parser and dispatch
+        from gar import server
+
+        server.serve(sys.argv[2:])
+        return
     parser = build_parser()
     args = parser.parse_args()
     try:
         normalize_cli_args(parser, args)
     except ValueError as exc:
         parser.error(str(exc))
-    init_menu(args)
+    try:
+        init_menu(args)
+    finally:
+        # headless CSV writes run in the background while reports continue
+        if not output.wait_for_writes():
+            sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""Per-account entity metadata cached between runs.
+
+Campaign names, channel types, campaign groups, and label assignments,
+plus ad group names, types, and labels, change far less often than metrics.
+They are kept per account in the cache directory and refreshed by polling
+change_status since the last sync, re-fetching only the campaigns it reports
+(see 'services.sync_metadata').
+"""
+
+from datetime import datetime, timedelta
+
+from gar import cache
+
+METADATA_FORMAT_VERSION = 1
+# full re-sync bound: renamed labels and groups are not reported by change_status
+METADATA_MAX_AGE = timedelta(days=7)
+
+
+def metadata_name(customer_id):
+    """Return the cache file name holding one account's entity metadata."""
+    return f"metadata_{customer_id}.json"
+
+
+class AccountMetadata:
+    """Campaigns, ad groups, labels, and campaign groups of one account.
+
+    Label and campaign group assignments are kept as resource names, so
+    renaming a label only needs the (small) label list re-fetched.
+
+    Args:
+        customer_name (str | None): Account descriptive name.
+        synced_at (datetime | None): Start of the last sync.
+        full_sync_at (datetime | None): Start of the last full sync.
+        campaigns (dict[str, dict] | None): Campaign ID to '{"name", "type",
+            "group", "labels"}'.
+        ad_groups (dict[str, dict] | None): Ad group ID to '{"campaign_id",
+            "name", "type", "labels"}'.
+        labels (dict[str, str] | None): Label ID to name.
+        campaign_groups (dict[str, str] | None): Campaign group ID to name.
+    """
+
+    def __init__(
+        self,
+        customer_name=None,
+        synced_at=None,
+        full_sync_at=None,
+        campaigns=None,
+        ad_groups=None,
+        labels=None,
+        campaign_groups=None,
+    ):
+        self.customer_name = customer_name
+        self.synced_at = synced_at
+        self.full_sync_at = full_sync_at
+        self.campaigns = campaigns or {}
+        self.ad_groups = ad_groups or {}
+        self.labels = labels or {}
+        self.campaign_groups = campaign_groups or {}
+
+    @classmethod
+    def load(cls, customer_id):
+        """Load the cached metadata for an account (empty on a cold start)."""
+        data = cache.load_json(metadata_name(customer_id))
+        if not data or data.get("version") != METADATA_FORMAT_VERSION:
+            return cls()
+        return cls(
+            customer_name=data.get("customer_name"),
+            synced_at=datetime.fromisoformat(data["synced_at"]),
+            full_sync_at=datetime.fromisoformat(data["full_sync_at"]),
+            campaigns=data["campaigns"],
+            ad_groups=data["ad_groups"],
+            labels=data["labels"],
+            campaign_groups=data["campaign_groups"],
+        )
+
+    def save(self, customer_id):
+        """Write the metadata to the cache directory."""
+        cache.save_json(
+            metadata_name(customer_id),
+            {
+                "version": METADATA_FORMAT_VERSION,
+                "customer_name": self.customer_name,
+                "synced_at": self.synced_at.isoformat(timespec="seconds"),
+                "full_sync_at": self.full_sync_at.isoformat(timespec="seconds"),
+                "campaigns": self.campaigns,
+                "ad_groups": self.ad_groups,
+                "labels": self.labels,
+                "campaign_groups": self.campaign_groups,
+            },
+        )
+
+    def needs_full_sync(self, now):
+        """Return whether the cache is empty or older than 'METADATA_MAX_AGE'."""
+        return self.full_sync_at is None or now - self.full_sync_at > METADATA_MAX_AGE
+
+    def replace(self, campaigns, ad_groups, campaign_ids=None):
+        """Swap in freshly fetched entities.
+
+        Args:
+            campaigns (dict[str, dict]): Fetched campaign records.
+            ad_groups (dict[str, dict]): Fetched ad group records.
+            campaign_ids (Iterable[int] | None): Campaigns the fetch covered;
+                their old records (and ad groups) are dropped first, so
+                removed entities disappear. 'None' replaces everything.
+        """
+
+        if campaign_ids is None:
+            self.campaigns, self.ad_groups = dict(campaigns), dict(ad_groups)
+            return
+        stale = {str(campaign_id) for campaign_id in campaign_ids}
+        for campaign_id in stale:
+            self.campaigns.pop(campaign_id, None)
+        self.ad_groups = {
+            ad_group_id: record
+            for ad_group_id, record in self.ad_groups.items()
+            if str(record["campaign_id"]) not in stale
+        }
+        self.campaigns.update(campaigns)
+        self.ad_groups.update(ad_groups)
+
+    def unknown_references(self, campaigns, ad_groups):
+        """Return whether fetched records name a label or group not cached.
+
+        Args:
+            campaigns (dict[str, dict]): Fetched campaign records.
+            ad_groups (dict[str, dict]): Fetched ad group records.
+        """
+
+        for record in (*campaigns.values(), *ad_groups.values()):
+            for resource in record["labels"]:
+                if resource.rsplit("/", 1)[-1] not in self.labels:
+                    return True
+        return any(
+            record["group"]
+            and record["group"].rsplit("/", 1)[-1] not in self.campaign_groups
+            for record in campaigns.values()
+        )
+
+    def _label_names(self, resources):
+        names = (self.labels.get(r.rsplit("/", 1)[-1]) for r in resources)
+        return tuple(name for name in names if name)
+
+    def campaign_labels(self):
+        """Return label names per integer campaign ID, for 'label:' MAC rules."""
+        return {
+            int(campaign_id): self._label_names(record["labels"])
+            for campaign_id, record in self.campaigns.items()
+        }
+
+    def entity_names(self):
+        """Return '(name, type)' per integer campaign and ad group ID.
+
+        Returns:
+            tuple[dict[int, tuple], dict[int, tuple]]: Campaigns and ad
+            groups, for joining ID-only report rows ('pipeline.EntityJoiner').
+        """
+
+        campaigns = {
+            int(campaign_id): (record["name"], record["type"])
+            for campaign_id, record in self.campaigns.items()
+        }
+        ad_groups = {
+            int(ad_group_id): (record["name"], record["type"])
+            for ad_group_id, record in self.ad_groups.items()
+        }
+        return campaigns, ad_groups
+
+    def label_audit_records(self, customer_id):
+        """Return campaign records in the shape the label audit builds from.
+
+        Campaigns without ad groups are left out, as in a direct audit.
+        """
+
+        records = {}
+        for ad_group_id, ad_group in self.ad_groups.items():
+            campaign_id = str(ad_group["campaign_id"])
+            campaign = self.campaigns.get(campaign_id)
+            if campaign is None:
+                continue
+            record = records.get(campaign_id)
+            if record is None:
+                record = records[campaign_id] = {
+                    "customer_id": int(customer_id),
+                    "customer_name": self.customer_name,
+                    "campaign_id": int(campaign_id),
+                    "campaign_name": campaign["name"],
+                    "campaign_type": campaign["type"],
+                    "campaign_group": campaign["group"],
+                    "campaign_labels": list(campaign["labels"]),
+                    "ad_groups": [],
+                }
+            record["ad_groups"].append(
+                [
+                    int(ad_group_id),
+                    ad_group["name"],
+                    ad_group["type"],
+                    ad_group["labels"],
+                ]
+            )
+        return records
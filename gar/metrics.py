@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""Derived metrics computed from additive base sums after aggregation.
+
+Ratios such as CTR or average CPC cannot be summed, so reports only sum raw
+counters (cost, clicks, impressions, weighted impression shares) per row
+and evaluate the ratios here, once per output row. Registering a new metric
+therefore adds no work to the per-row decode and accumulate stages.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+from typing import NamedTuple
+
+CENTS = Decimal("0.01")
+MILLS = Decimal("0.001")
+RATE = Decimal("0.0001")
+
+# 'ReportMetrics' per report option
+REGISTRY = {}
+
+
+class DerivedMetric(NamedTuple):
+    """A ratio of two summed fields of an aggregate entry.
+
+    Attributes:
+        column (str): Output column the value is written to.
+        numerator (str): Summed field divided by 'denominator'.
+        denominator (str): Summed field; a zero yields 'default'.
+        places (Decimal): Quantum the result is rounded to (half up).
+        scale (int): Multiplier applied before rounding (1000 for CPM).
+        default (Decimal): Value used when the denominator is zero.
+    """
+
+    column: str
+    numerator: str
+    denominator: str
+    places: Decimal = RATE
+    scale: int = 1
+    default: Decimal = Decimal("0")
+
+    def evaluate(self, entry):
+        """Return the metric for one aggregate entry."""
+        denominator = entry.get(self.denominator) or 0
+        if not denominator:
+            return self.default
+        value = Decimal(entry.get(self.numerator) or 0) / Decimal(denominator)
+        if self.scale != 1:
+            value *= self.scale
+        return value.quantize(self.places, rounding=ROUND_HALF_UP)
+
+
+def ctr(column, clicks, impressions, default=Decimal("0")):
+    """Click-through rate: clicks per impression."""
+    return DerivedMetric(column, clicks, impressions, RATE, default=default)
+
+
+def average_cpc(column, cost, clicks):
+    """Average cost per click."""
+    return DerivedMetric(column, cost, clicks, MILLS, default=Decimal("0.000"))
+
+
+def average_cpm(column, cost, impressions):
+    """Average cost per thousand impressions."""
+    return DerivedMetric(
+        column, cost, impressions, MILLS, scale=1000, default=Decimal("0.000")
+    )
+
+
+def weighted_share(column, weight, impressions):
+    """Impression-weighted share, such as absolute top impression %."""
+    return DerivedMetric(column, weight, impressions, RATE)
+
+
+def per_query(column, total, queries):
+    """Rate per search query, such as organic clicks per query."""
+    return DerivedMetric(column, total, queries, RATE)
+
+
+class ReportMetrics(NamedTuple):
+    """How a report's metric columns combine.
+
+    Attributes:
+        additive (tuple[str, ...]): Columns (and private sums) that add up.
+        derived (tuple[DerivedMetric, ...]): Ratios, in evaluation order.
+        order_by (tuple[str, ...]): Row order of the multi-account report;
+            a leading '-' sorts descending.
+        grouping_sets (pipeline.GroupingSets | None): Subtotal levels of the
+            report's grouping-sets output, if it has one.
+        totals (tuple[tuple[str, str], ...]): '(private sum, column)' pairs
+            whose additive output column holds the private sum, rounded.
+    """
+
+    additive: tuple
+    derived: tuple
+    order_by: tuple
+    grouping_sets: object = None
+    totals: tuple = ()
+
+
+def register(report, additive, *derived, order_by=(), grouping_sets=None, totals=()):
+    """Register a report option's metrics and return its derived metrics."""
+    REGISTRY[report] = ReportMetrics(
+        tuple(additive), derived, tuple(order_by), grouping_sets, tuple(totals)
+    )
+    return derived
+
+
+def quantize(entry, fields, places):
+    """Round summed 'fields' of an entry in place (half up)."""
+    for name in fields:
+        entry[name] = entry[name].quantize(places, rounding=ROUND_HALF_UP)
+    return entry
+
+
+def derive(entry, derived):
+    """Evaluate 'derived' metrics on an aggregate entry, in order.
+
+    Private base sums (fields starting with '_') are dropped once every
+    metric has been evaluated, since they are not output columns.
+
+    Args:
+        entry (dict): Aggregate entry holding the summed base fields.
+        derived (Iterable[DerivedMetric]): Metrics to evaluate.
+
+    Returns:
+        dict: 'entry', updated in place.
+    """
+
+    for metric in derived:
+        entry[metric.column] = metric.evaluate(entry)
+    for metric in derived:
+        for name in (metric.numerator, metric.denominator):
+            if name.startswith("_"):
+                entry.pop(name, None)
+    return entry
+
+
+def accumulate(entry, row, fields):
+    """Add a decoded row's 'fields' to an aggregate entry."""
+    for name in fields:
+        value = row.get(name)
+        if value:
+            entry[name] += value
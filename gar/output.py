@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+"""Unattended report output: templated file names, atomic writes, background writer."""
+
+import atexit
+import csv
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+DEFAULT_FILE_TEMPLATE = "{report}_{account}_{start}_{end}_{run_id}"
+TEMPLATE_FIELDS = ("report", "table", "account", "start", "end", "run_id")
+ACCOUNT_ID_HEADERS = ("Customer ID", "customer id", "Customer_ID")
+
+_WRITER_STATE = {}
+
+
+class OutputContext(NamedTuple):
+    """Where and under which name a report's tables are written.
+
+    Attributes:
+        report (str): Report option keyword (for example 'mac').
+        account (str): Customer ID, or 'all' for multi-account runs.
+        start (str): Start date of the reported range.
+        end (str): End date of the reported range.
+        run_id (str): Identifier shared by every file of one run.
+        directory (Path): Root output directory.
+        template (str): File stem template using 'TEMPLATE_FIELDS'.
+        per_account (bool): Split rows into one directory per account.
+        headless (bool): Never prompt; write in the background.
+        table (str): Name of a secondary table ('' for the main table).
+    """
+
+    report: str
+    account: str
+    start: str
+    end: str
+    run_id: str
+    directory: Path
+    template: str = DEFAULT_FILE_TEMPLATE
+    per_account: bool = False
+    headless: bool = False
+    table: str = ""
+
+
+def validate_template(template):
+    """Return 'template' if it only uses known fields.
+
+    Raises:
+        ValueError: If the template references an unknown field.
+    """
+
+    for field in re.findall(r"{([^{}]*)}", template):
+        if field not in TEMPLATE_FIELDS:
+            known = ", ".join(TEMPLATE_FIELDS)
+            raise ValueError(f"Unknown file name field '{{{field}}}' (use {known}).")
+    return template
+
+
+def file_name(context, account=None, extension=".csv"):
+    """Render the file name of a table from its output context.
+
+    A secondary table is suffixed with its name unless the template places
+    '{table}' itself, so tables of one report never overwrite each other.
+
+    Args:
+        context (OutputContext): Output settings for the report.
+        account (str | None): Overrides 'context.account' (per-account files).
+        extension (str): File extension including the dot.
+
+    Returns:
+        str: Sanitized file name.
+    """
+
+    fields = context._asdict()
+    if account is not None:
+        fields["account"] = account
+    stem = context.template.format(**{f: fields[f] for f in TEMPLATE_FIELDS})
+    if context.table and "{table}" not in context.template:
+        stem = f"{stem}_{context.table}"
+    return _sanitize(stem) + extension
+
+
+def _sanitize(name):
+    """Drop characters that are invalid in file names."""
+    return re.sub(r'[<>:"/\\|?*]', "", name).strip() or "gads_report"
+
+
+def write_csv_atomic(path, headers, rows):
+    """Write a CSV via a temporary file renamed into place.
+
+    Readers (and a crashed run) never observe a partially written file.
+
+    Args:
+        path (Path): Destination file; parent directories are created.
+        headers (list[str]): Header row.
+        rows (Iterable[list]): Data rows.
+
+    Returns:
+        Path: The written file.
+    """
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as tmp_file:
+            writer = csv.writer(tmp_file)
+            writer.writerow(headers)
+            writer.writerows(rows)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return path
+
+
+def plan_files(context, table_data, headers):
+    """Split a table into '(path, rows)' pairs according to the layout.
+
+    The per-account layout groups rows by their customer ID column into
+    '<directory>/<customer id>/'; tables without one go to the run's
+    account directory.
+
+    Returns:
+        list[tuple[Path, list[list]]]: Files to write.
+    """
+
+    if not context.per_account:
+        return [(context.directory / file_name(context), table_data)]
+    account_idx = next(
+        (headers.index(h) for h in ACCOUNT_ID_HEADERS if h in headers), None
+    )
+    if account_idx is None:
+        return [(context.directory / context.account / file_name(context), table_data)]
+    groups = {}
+    for row in table_data:
+        groups.setdefault(str(row[account_idx]), []).append(row)
+    return [
+        (context.directory / account / file_name(context, account=account), rows)
+        for account, rows in groups.items()
+    ]
+
+
+def write_table(context, table_data, headers):
+    """Write a table synchronously; return the written paths."""
+    return [
+        write_csv_atomic(path, headers, rows)
+        for path, rows in plan_files(context, table_data, headers)
+    ]
+
+
+def _writer():
+    """Return the process-wide background writer, creating it on first use."""
+    executor = _WRITER_STATE.get("executor")
+    if executor is None:
+        # one thread keeps output order stable and overlaps disk I/O with the
+        # next report step
+        executor = _WRITER_STATE["executor"] = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="gar-output"
+        )
+        _WRITER_STATE["pending"] = []
+    return executor
+
+
+def submit_table(context, table_data, headers):
+    """Queue a table write on the background writer and return immediately.
+
+    The rows are written as given, so callers must not mutate them after
+    submitting.
+    """
+
+    future = _writer().submit(write_table, context, table_data, headers)
+    _WRITER_STATE["pending"].append(future)
+    return future
+
+
+def wait_for_writes():
+    """Block until queued writes finish, reporting each file or failure.
+
+    Returns:
+        bool: True when every write succeeded.
+    """
+
+    ok = True
+    for future in _WRITER_STATE.get("pending", []):
+        try:
+            for path in future.result():
+                print(f"Data saved to: {path}")
+        except Exception as e:
+            ok = False
+            print(f"Failed to save file: {e}")
+    _WRITER_STATE["pending"] = []
+    return ok
+
+
+def _shutdown():
+    executor = _WRITER_STATE.pop("executor", None)
+    if executor is not None:
+        wait_for_writes()
+        executor.shutdown(wait=True)
+
+
+atexit.register(_shutdown)
+
+
+def write_parquet_atomic(path, headers, rows):
+    """Write a Parquet file via a temporary file renamed into place.
+
+    Requires the optional 'pyarrow' package.
+
+    Returns:
+        Path: The written file.
+    """
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    columns = list(zip(*rows)) if rows else [() for _ in headers]
+    table = pa.table({h: list(values) for h, values in zip(headers, columns)})
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    os.close(fd)
+    try:
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return path
+
+
+def parquet_available():
+    """Return True when the optional 'pyarrow' dependency is installed."""
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+SHARD_PARTITIONS = ("account", "date")
+SHARD_FORMATS = ("csv", "parquet")
+# shard files written concurrently when --writers is not given
+DEFAULT_SHARD_WRITERS = 4
+DATE_HEADERS = ("Date", "date")
+
+
+class ShardWriter:
+    """Write each account's rows as soon as its report completes.
+
+    Every account becomes one file per partition: '<directory>/<customer
+    id>/' for account shards, or '<directory>/<date>/' (one file per account
+    inside) for date shards, so writers never share a file. Writes run on a
+    thread pool; once twice the pool size is in flight, 'write' waits for
+    the oldest, bounding memory to the accounts not yet on disk.
+
+    Args:
+        context (OutputContext): Naming and directory settings.
+        partition (str): 'account' or 'date'.
+        file_format (str): 'csv' or 'parquet'.
+        writers (int): Concurrent file writes.
+        row_filter (Callable | None): Applied as 'row_filter(rows, headers)'
+            to each account's rows before writing.
+    """
+
+    def __init__(
+        self,
+        context,
+        partition="account",
+        file_format="csv",
+        writers=DEFAULT_SHARD_WRITERS,
+        row_filter=None,
+    ):
+        self.context = context
+        self.partition = partition
+        self.extension = f".{file_format}"
+        self.write_file = (
+            write_parquet_atomic if file_format == "parquet" else write_csv_atomic
+        )
+        self.writers = writers
+        self.row_filter = row_filter
+        self.executor = ThreadPoolExecutor(
+            max_workers=writers, thread_name_prefix="gar-shard"
+        )
+        self.pending = []
+        self.paths = []
+        self.failures = 0
+        # accounts may complete on several threads (multi-profile runs)
+        self._lock = threading.Lock()
+
+    def shards(self, customer_id, table_data, headers):
+        """Return the '(path, rows)' shards of one account's rows."""
+        name = file_name(self.context, account=customer_id, extension=self.extension)
+        if self.partition == "account":
+            return [(self.context.directory / customer_id / name, table_data)]
+        date_idx = next((headers.index(h) for h in DATE_HEADERS if h in headers), 0)
+        groups = {}
+        for row in table_data:
+            groups.setdefault(_sanitize(str(row[date_idx])), []).append(row)
+        return [
+            (self.context.directory / day / name, rows) for day, rows in groups.items()
+        ]
+
+    def write(self, customer_id, account_descriptive, table_data, headers):
+        """Queue one account's shards; usable as a report 'result_sink'."""
+        if self.row_filter is not None:
+            table_data = self.row_filter(table_data, headers)
+        with self._lock:
+            for path, rows in self.shards(str(customer_id), table_data, headers):
+                self.pending.append(
+                    self.executor.submit(self.write_file, path, headers, rows)
+                )
+            while len(self.pending) > 2 * self.writers:
+                self._collect(self.pending.pop(0))
+
+    __call__ = write
+
+    def _collect(self, future):
+        try:
+            self.paths.append(future.result())
+        except Exception as e:
+            self.failures += 1
+            print(f"Failed to save file: {e}")
+
+    def close(self):
+        """Wait for every queued shard and stop the pool.
+
+        Returns:
+            list[Path]: Files written.
+        """
+
+        for future in self.pending:
+            self._collect(future)
+        self.pending = []
+        self.executor.shutdown(wait=True)
+        return self.paths
+
+
+def default_directory(directory: Optional[str] = None):
+    """Return the output directory ('~' when none is configured)."""
+    return Path(directory).expanduser() if directory else Path.home()
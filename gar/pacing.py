@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""Month-to-date budget pacing arithmetic for the budget report."""
+
+import calendar
+from datetime import date, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from typing import NamedTuple, Optional
+
+# Google Ads may charge up to 30.4x the average daily budget in a calendar month
+MONTHLY_BUDGET_MULTIPLIER = Decimal("30.4")
+# trailing days averaged for the spend run rate
+RUN_RATE_DAYS = 7
+# projected spend within this fraction of the monthly budget is on pace
+PACE_TOLERANCE = Decimal("0.10")
+
+PACE_OVER = "OVER"
+PACE_UNDER = "UNDER"
+PACE_ON = "ON PACE"
+PACE_NOT_PACED = "NOT PACED"
+
+
+class PacingWindow(NamedTuple):
+    """Calendar facts for pacing through 'as_of' within its month.
+
+    Attributes:
+        as_of (date): Last day of spend included (inclusive).
+        month_start (date): First day of the month containing 'as_of'.
+        days_elapsed (int): Days from 'month_start' through 'as_of'.
+        days_in_month (int): Length of the month.
+        run_rate_start (date): First day of the trailing run-rate window.
+    """
+
+    as_of: date
+    month_start: date
+    days_elapsed: int
+    days_in_month: int
+    run_rate_start: date
+
+    @property
+    def days_remaining(self) -> int:
+        """int: Days left in the month after 'as_of'."""
+        return self.days_in_month - self.days_elapsed
+
+    @property
+    def fetch_start(self) -> date:
+        """date: Earliest date needed for month-to-date and run-rate spend."""
+        return min(self.month_start, self.run_rate_start)
+
+
+def pacing_window(as_of, run_rate_days: int = RUN_RATE_DAYS) -> PacingWindow:
+    """Build the pacing window for the month containing 'as_of'.
+
+    Args:
+        as_of (date | str): Last day of spend included ('YYYY-MM-DD' accepted).
+        run_rate_days (int): Trailing days averaged for the run rate.
+
+    Returns:
+        PacingWindow: Window facts used by 'pace_columns'.
+    """
+
+    if isinstance(as_of, str):
+        as_of = date.fromisoformat(as_of)
+    return PacingWindow(
+        as_of=as_of,
+        month_start=as_of.replace(day=1),
+        days_elapsed=as_of.day,
+        days_in_month=calendar.monthrange(as_of.year, as_of.month)[1],
+        run_rate_start=as_of - timedelta(days=run_rate_days - 1),
+    )
+
+
+def monthly_budget(daily_amount: Optional[Decimal]) -> Optional[Decimal]:
+    """Return the monthly spend cap implied by a daily budget ('None' if unset)."""
+    if not daily_amount:
+        return None
+    return (daily_amount * MONTHLY_BUDGET_MULTIPLIER).quantize(
+        Decimal("0.01"), rounding=ROUND_HALF_UP
+    )
+
+
+def pace_columns(
+    mtd_cost,
+    run_rate_cost,
+    monthly_budgets,
+    window: PacingWindow,
+    run_rate_days: int = RUN_RATE_DAYS,
+    tolerance: Decimal = PACE_TOLERANCE,
+):
+    """Compute pacing columns for parallel lists of budgets in one pass.
+
+    Args:
+        mtd_cost (list[Decimal]): Month-to-date spend per budget.
+        run_rate_cost (list[Decimal]): Spend within the run-rate window.
+        monthly_budgets (list[Decimal | None]): Monthly cap per budget; 'None'
+            for budgets that cannot be paced (for example total budgets).
+        window (PacingWindow): Calendar facts shared by every budget.
+        run_rate_days (int): Length of the run-rate window.
+        tolerance (Decimal): Allowed projected deviation from the budget.
+
+    Returns:
+        dict[str, list]: 'expected', 'pace', 'run_rate', 'projected',
+        'variance', and 'status' columns aligned with the inputs.
+    """
+
+    elapsed_share = Decimal(window.days_elapsed) / Decimal(window.days_in_month)
+    remaining = Decimal(window.days_remaining)
+    days = Decimal(run_rate_days)
+    columns = {
+        "expected": [],
+        "pace": [],
+        "run_rate": [],
+        "projected": [],
+        "variance": [],
+        "status": [],
+    }
+    for mtd, recent, budget in zip(mtd_cost, run_rate_cost, monthly_budgets):
+        run_rate = (recent / days).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+        projected = (mtd + run_rate * remaining).quantize(
+            Decimal("0.01"), rounding=ROUND_HALF_UP
+        )
+        columns["run_rate"].append(run_rate)
+        columns["projected"].append(projected)
+        if budget is None:
+            columns["expected"].append(None)
+            columns["pace"].append(None)
+            columns["variance"].append(None)
+            columns["status"].append(PACE_NOT_PACED)
+            continue
+        expected = (budget * elapsed_share).quantize(
+            Decimal("0.01"), rounding=ROUND_HALF_UP
+        )
+        columns["expected"].append(expected)
+        columns["pace"].append(
+            (mtd / expected).quantize(Decimal("0.0001"), rounding=ROUND_HALF_UP)
+            if expected
+            else None
+        )
+        columns["variance"].append(projected - budget)
+        if projected > budget * (1 + tolerance):
+            columns["status"].append(PACE_OVER)
+        elif projected < budget * (1 - tolerance):
+            columns["status"].append(PACE_UNDER)
+        else:
+            columns["status"].append(PACE_ON)
+    return columns
@@ -0,0 +1,607 @@
+# -*- coding: utf-8 -*-
+"""Streaming report pipeline shared by every performance report.
+
+A report is described by a 'ReportPlan' and executed for one account as a
+chain of generator stages::
+
+    source -> decode -> enrich -> aggregate -> [subtotal] -> finalize -> sink
+
+Each stage pulls lazily from the previous one, so decoded rows are never held
+in memory beyond the aggregate. Spilling ('--memory-limit') and decode
+workers ('--processes') are implemented here once and apply to every report
+expressed as a plan.
+"""
+
+import functools
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, NamedTuple, Optional
+
+from google.ads.googleads.client import GoogleAdsClient
+
+from gar import aggregation, common
+
+# output column naming the grouping set of each row in a grouping-sets run
+LEVEL_FIELD = "Level"
+
+
+class RowSpec(NamedTuple):
+    """Row-level callables for one report.
+
+    Every field must be a module-level function: specs are pickled by
+    reference when response batches are handed to decode workers.
+
+    Attributes:
+        decode (Callable): '(row, enums, options, strings) -> dict' building a
+            header-keyed dict from one 'GoogleAdsRow'.
+        new_entry (Callable | None): '(key) -> dict' building an empty
+            aggregate entry. 'None' for reports that are not aggregated.
+        accumulate (Callable | None): '(entry, row_dict)' folding one decoded
+            row into its aggregate entry.
+        additive_fields (tuple[str, ...]): Entry fields summed when partial
+            aggregates for the same key are merged.
+    """
+
+    decode: Callable
+    new_entry: Optional[Callable] = None
+    accumulate: Optional[Callable] = None
+    additive_fields: tuple = ()
+
+
+class GroupingSets(NamedTuple):
+    """Hierarchy levels a report emits subtotal rows for.
+
+    Attributes:
+        levels (tuple[tuple[str, tuple[str, ...]], ...]): '(label,
+            dimensions)' pairs from the coarsest level to the finest. Each
+            level's dimensions extend its parent's, and the finest level's
+            are the plan's aggregation dimensions.
+        metric (str): Column ordering sibling rows, descending. Rows of the
+            coarsest level are ordered by their dimensions instead, like the
+            plain report.
+    """
+
+    levels: tuple
+    metric: str
+
+    def for_headers(self, headers):
+        """Return these levels restricted to dimensions found in 'headers'."""
+        return GroupingSets(
+            tuple(
+                (label, tuple(name for name in dimensions if name in headers))
+                for label, dimensions in self.levels
+            ),
+            self.metric,
+        )
+
+    def sort_key(self, headers, rows):
+        """Build a key ordering each subtotal row directly before its children.
+
+        Args:
+            headers (list[str]): Output columns, including 'LEVEL_FIELD'.
+            rows (list[list]): Every row of the table, used to look up the
+                metric of each row's ancestors.
+
+        Returns:
+            Callable[[list], tuple]: Key function for projected rows.
+        """
+
+        level_idx = headers.index(LEVEL_FIELD)
+        metric_idx = headers.index(self.metric)
+        depth = {label: i for i, (label, _) in enumerate(self.levels)}
+        columns = [[headers.index(name) for name in dims] for _, dims in self.levels]
+
+        def path(row, i):
+            # None sorts first, without comparing it to a value
+            return tuple(
+                (row[idx] is not None, "" if row[idx] is None else row[idx])
+                for idx in columns[i]
+            )
+
+        totals = {}
+        for row in rows:
+            i = depth[row[level_idx]]
+            totals[i, path(row, i)] = common.metric_sort_value(row[metric_idx])
+
+        def key(row):
+            i = depth[row[level_idx]]
+            parts = [path(row, 0)]
+            for j in range(1, i + 1):
+                step = path(row, j)
+                parts.append((-totals.get((j, step), 0), step))
+            # a parent's key is a prefix of its children's, so it sorts first
+            return tuple(parts)
+
+        return key
+
+
+@dataclass
+class ReportPlan:
+    """Everything the pipeline needs to run one report for one account.
+
+    Attributes:
+        row_spec (RowSpec): Row decoder and aggregation callables.
+        queries (list[tuple[str, dict]]): GAQL queries streamed in order, each
+            paired with the decoder options for its rows.
+        headers (list[str]): Output columns.
+        order_by (list[str]): Sort columns; a leading '-' sorts descending.
+        dimensions (list[str] | None): Fields forming the aggregation key.
+            'None' passes decoded rows straight through to the sink.
+        enrichers (list[Callable]): '(row_dict) -> row_dict' stages applied
+            after decoding, such as 'MacEnricher'.
+        finalize (Callable | None): '(entry) -> entry' computing derived
+            metrics once aggregation is complete.
+        grouping_sets (GroupingSets | None): Coarser levels also emitted as
+            subtotal rows, summed from the aggregate in the same pass.
+    """
+
+    row_spec: RowSpec
+    queries: list
+    headers: list
+    order_by: list
+    dimensions: Optional[list] = None
+    enrichers: list = field(default_factory=list)
+    finalize: Optional[Callable] = None
+    grouping_sets: Optional[GroupingSets] = None
+
+
+"""
+STAGES
+"""
+
+
+def source(gads_service, customer_id, query, stats=None):
+    """Stream the response batches of one GAQL query.
+
+    Args:
+        gads_service (GoogleAdsService): Service used to execute GAQL queries.
+        customer_id (str): Target customer ID.
+        query (str): GAQL query to stream.
+        stats (dict | None): Receives the streamed row count under
+            'api_rows'.
+
+    Yields:
+        SearchGoogleAdsStreamResponse: Response batches.
+    """
+
+    for batch in gads_service.search_stream(customer_id=customer_id, query=query):
+        if stats is not None:
+            stats["api_rows"] = stats.get("api_rows", 0) + len(batch.results)
+        yield batch
+
+
+def decode(batches, row_spec, enums, options, strings):
+    """Decode every row of 'batches' into a header-keyed dict.
+
+    Args:
+        batches (Iterable): Response batches exposing 'results'.
+        row_spec (RowSpec): Spec providing the row decoder.
+        enums (tuple): Enum containers returned by 'services.get_enums'.
+        options (dict): Decoder options for the query.
+        strings (aggregation.StringDictionary): Per-run intern table.
+
+    Yields:
+        dict: Decoded rows.
+    """
+
+    build_row = row_spec.decode
+    for batch in batches:
+        for row in batch.results:
+            yield build_row(row, enums, options, strings)
+
+
+def enrich(rows, enrichers):
+    """Apply each enricher to every decoded row, in order."""
+    for row in rows:
+        for enricher in enrichers:
+            row = enricher(row)
+        yield row
+
+
+def aggregate(rows, row_spec, dimensions, strings, aggregated):
+    """Fold rows into 'aggregated' under encoded dimension keys.
+
+    Args:
+        rows (Iterable[dict]): Decoded (and enriched) rows.
+        row_spec (RowSpec): Spec providing the accumulator.
+        dimensions (list[str]): Fields forming the aggregation key.
+        strings (aggregation.StringDictionary): Table used to encode keys.
+        aggregated (aggregation.SpillingAggregator): Destination aggregate.
+
+    Returns:
+        aggregation.SpillingAggregator: 'aggregated', for chaining.
+    """
+
+    accumulate = row_spec.accumulate
+    for row in rows:
+        key = strings.encode_key(row.get(field) for field in dimensions)
+        accumulate(aggregated.entry(key), row)
+    return aggregated
+
+
+def expand(aggregated, dimensions, strings):
+    """Yield aggregate entries with their decoded dimension values restored."""
+    for key, entry in aggregated.items():
+        entry.update(zip(dimensions, strings.decode_key(key)))
+        yield entry
+
+
+def subtotal(entries, row_spec, grouping_sets):
+    """Tag entries with the finest level and add subtotals of coarser levels.
+
+    Each entry is folded into its ancestors before it is yielded, since
+    finalizing an entry drops its private sums. Subtotals follow once every
+    entry has been seen; they hold far fewer keys than the finest level.
+
+    Args:
+        entries (Iterable[dict]): Expanded aggregate entries.
+        row_spec (RowSpec): Spec providing 'new_entry' and 'accumulate'.
+        grouping_sets (GroupingSets): Levels to emit.
+
+    Yields:
+        dict: Entries of every level, with 'LEVEL_FIELD' set.
+    """
+
+    *coarser, (finest, _) = grouping_sets.levels
+    totals = [{} for _ in coarser]
+    for entry in entries:
+        for (label, dimensions), level in zip(coarser, totals):
+            key = tuple(entry.get(name) for name in dimensions)
+            total = level.get(key)
+            if total is None:
+                total = level[key] = row_spec.new_entry(key)
+                total.update(zip(dimensions, key))
+                total[LEVEL_FIELD] = label
+            row_spec.accumulate(total, entry)
+        entry[LEVEL_FIELD] = finest
+        yield entry
+    for level in totals:
+        yield from level.values()
+
+
+def finalize(entries, finalizer):
+    """Apply the plan's finalizer (derived metrics) to every entry."""
+    for entry in entries:
+        yield finalizer(entry) if finalizer is not None else entry
+
+
+def sort_key(headers, order_by):
+    """Build a row sort key from 'order_by' column names.
+
+    Args:
+        headers (list[str]): Output columns.
+        order_by (list[str]): Sort columns; a leading '-' sorts descending.
+
+    Returns:
+        Callable[[list], tuple]: Key function for projected rows.
+    """
+
+    columns = [(headers.index(name.lstrip("-")), name[0] == "-") for name in order_by]
+
+    def key(row):
+        return tuple(
+            -row[idx] if descending else row[idx] for idx, descending in columns
+        )
+
+    return key
+
+
+def sink(entries, headers, order_by, grouping_sets=None):
+    """Project entries onto 'headers' and sort the resulting table.
+
+    Entries are projected as they arrive, so each dict can be released before
+    the next is finalized. With 'grouping_sets' rows are ordered by level
+    hierarchy rather than 'order_by'.
+
+    Returns:
+        list[list]: Sorted table rows.
+    """
+
+    rows = [[entry.get(h) for h in headers] for entry in entries]
+    if grouping_sets is not None:
+        rows.sort(key=grouping_sets.sort_key(headers, rows))
+    else:
+        rows.sort(key=sort_key(headers, order_by))
+    return rows
+
+
+"""
+ENRICHERS
+"""
+
+
+class MacEnricher:
+    """Enrich stage that sets the 'MAC' field from the row's campaign.
+
+    Pickles as the resolver's rules and campaign labels only, so each decode
+    worker rebuilds one resolver per rule set and keeps its cache across
+    batches.
+
+    Args:
+        resolver (common.MacResolver): Resolver used for lookups.
+    """
+
+    def __init__(self, resolver):
+        self.resolver = resolver
+
+    def __call__(self, row):
+        row["MAC"] = self.resolver.resolve(
+            row.get("Campaign ID"), row.get("Campaign name")
+        )
+        return row
+
+    def __reduce__(self):
+        resolver = self.resolver
+        labels = resolver.campaign_labels if resolver.needs_labels else None
+        return (_worker_mac_enricher, (resolver.rules, labels))
+
+
+def _worker_mac_enricher(rules, campaign_labels):
+    """Rebuild a 'MacEnricher' around a per-process resolver when unpickled."""
+    resolver = _WORKER_STATE.get(("macs", rules))
+    if resolver is None:
+        resolver = common.MacResolver(rules, strings=_worker_strings())
+        _WORKER_STATE[("macs", rules)] = resolver
+    if campaign_labels:
+        resolver.add_campaign_labels(campaign_labels)
+    return MacEnricher(resolver)
+
+
+# names and type of an entity missing from the cache (removed campaigns, PMax)
+_UNKNOWN_ENTITY = ("", "UNDEFINED")
+
+
+class EntityJoiner:
+    """Enrich stage filling the names and types ID-only queries leave out.
+
+    Must run before enrichers reading names, such as 'MacEnricher'. Pickles
+    as one serialized payload, which decode workers unpickle only when it
+    changes, rather than once per batch.
+
+    Args:
+        customer_name (str | None): Account descriptive name.
+        campaigns (dict[int, tuple[str, str]]): Campaign ID to '(name,
+            channel type)'.
+        ad_groups (dict[int, tuple[str, str]]): Ad group ID to '(name, type)'.
+    """
+
+    def __init__(self, customer_name, campaigns, ad_groups):
+        self.customer_name = customer_name or ""
+        self.campaigns = campaigns
+        self.ad_groups = ad_groups
+        self._payload = None
+
+    def __call__(self, row):
+        row["Account name"] = self.customer_name
+        row["Campaign name"], row["Campaign type"] = self.campaigns.get(
+            row.get("Campaign ID"), _UNKNOWN_ENTITY
+        )
+        row["Ad group name"], row["Ad group type"] = self.ad_groups.get(
+            row.get("Ad group ID"), _UNKNOWN_ENTITY
+        )
+        return row
+
+    def __reduce__(self):
+        if self._payload is None:
+            self._payload = pickle.dumps(
+                (self.customer_name, self.campaigns, self.ad_groups),
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        return (_worker_entity_joiner, (self._payload,))
+
+
+def _worker_entity_joiner(payload):
+    """Rebuild an 'EntityJoiner', reusing the worker's last one if unchanged."""
+    cached = _WORKER_STATE.get("entities")
+    if cached is None or cached[0] != payload:
+        cached = _WORKER_STATE["entities"] = (
+            payload,
+            EntityJoiner(*pickle.loads(payload)),
+        )
+    return cached[1]
+
+
+"""
+DECODE WORKERS
+"""
+
+
+# per-process state for decode workers, populated by '_init_decode_worker'
+_WORKER_STATE = {}
+# process pools keyed by (processes, API version, proto-plus flag)
+_DECODE_POOLS = {}
+
+
+def _get_enums(client):
+    """Return the report enum containers for 'client'."""
+    # lazy import: services builds its reports on this module
+    from gar import services
+
+    return services.get_enums(client)
+
+
+def _worker_strings():
+    """Return the worker-local intern table."""
+    return _WORKER_STATE.setdefault("strings", aggregation.StringDictionary())
+
+
+def _init_decode_worker(version, use_proto_plus):
+    """Build an offline client in a worker for enum and response decoding.
+
+    No credentials are needed: the client is only used to resolve message
+    and enum types, never to issue requests.
+    """
+
+    offline_client = GoogleAdsClient(
+        credentials=None,
+        developer_token="offline",
+        version=version,
+        use_proto_plus=use_proto_plus,
+    )
+    _WORKER_STATE["enums"] = _get_enums(offline_client)
+    _WORKER_STATE["response_type"] = type(
+        offline_client.get_type("SearchGoogleAdsStreamResponse")
+    )
+    _WORKER_STATE["use_proto_plus"] = use_proto_plus
+
+
+def _serialize_batch(batch, use_proto_plus):
+    """Serialize a search_stream response batch for a decode worker."""
+    if use_proto_plus:
+        return type(batch).serialize(batch)
+    return batch.SerializeToString()
+
+
+def _parse_batch(payload):
+    """Deserialize a response batch inside a decode worker."""
+    response_type = _WORKER_STATE["response_type"]
+    if _WORKER_STATE["use_proto_plus"]:
+        return response_type.deserialize(payload)
+    return response_type.FromString(payload)
+
+
+def _aggregate_serialized_batch(payload, row_spec, dimensions, options, enrichers):
+    """Run decode, enrich, and aggregate for one batch inside a worker.
+
+    Returns:
+        dict[tuple, dict]: Partial entries keyed by decoded dimension values,
+        since worker key codes mean nothing to the parent.
+    """
+
+    strings = _worker_strings()
+    partial = aggregation.SpillingAggregator(
+        row_spec.new_entry, row_spec.additive_fields
+    )
+    rows = decode(
+        [_parse_batch(payload)], row_spec, _WORKER_STATE["enums"], options, strings
+    )
+    aggregate(enrich(rows, enrichers), row_spec, dimensions, strings, partial)
+    return {strings.decode_key(key): entry for key, entry in partial.items()}
+
+
+def _decode_pool(client, processes):
+    """Return a cached spawn-context process pool for decode workers."""
+    use_proto_plus = getattr(client, "use_proto_plus", False)
+    version = getattr(client, "version", None)
+    pool_key = (processes, version, use_proto_plus)
+    pool = _DECODE_POOLS.get(pool_key)
+    if pool is None:
+        # spawn, not fork: forked children inherit the parent's gRPC threads
+        pool = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_decode_worker,
+            initargs=(version, use_proto_plus),
+        )
+        _DECODE_POOLS[pool_key] = pool
+    return pool
+
+
+def _aggregate_in_pool(batches, client, processes, plan, options, aggregated, strings):
+    """Fan batches out to decode workers and merge their partial aggregates.
+
+    Dimension sums are associative, so the result matches the in-process
+    path regardless of which worker handled which batch.
+    """
+
+    use_proto_plus = getattr(client, "use_proto_plus", False)
+    task = functools.partial(
+        _aggregate_serialized_batch,
+        row_spec=plan.row_spec,
+        dimensions=plan.dimensions,
+        options=options,
+        enrichers=plan.enrichers,
+    )
+    payloads = (_serialize_batch(batch, use_proto_plus) for batch in batches)
+    for partial in aggregation.map_bounded(
+        _decode_pool(client, processes), task, payloads, max_in_flight=processes * 2
+    ):
+        for values, entry in partial.items():
+            aggregated.merge(strings.encode_key(values), entry)
+
+
+"""
+RUNNER
+"""
+
+
+def run_report(
+    gads_service,
+    client,
+    customer_id,
+    plan,
+    strings,
+    memory_limit=None,
+    processes=None,
+    stats=None,
+):
+    """Execute 'plan' for one account.
+
+    Args:
+        gads_service (GoogleAdsService): Service used to execute GAQL queries.
+        client (GoogleAdsClient): API client used for enum decoding.
+        customer_id (str): Target customer ID.
+        plan (ReportPlan): Report description.
+        strings (aggregation.StringDictionary): Per-run intern table.
+        memory_limit (int | None): Aggregation budget in bytes before
+            spilling to disk.
+        processes (int | None): Decode worker count for aggregated plans;
+            'None' decodes in-process.
+        stats (dict | None): Receives the streamed API row count under
+            'api_rows'.
+
+    Returns:
+        tuple[list[list], list[str]]: Sorted table rows and headers.
+    """
+
+    # non-aggregated plans have nothing to merge, so they always decode here
+    in_pool = bool(processes) and plan.dimensions is not None
+    enums = None if in_pool else _get_enums(client)
+    if plan.dimensions is None:
+        entries = (
+            row
+            for query, options in plan.queries
+            for row in enrich(
+                decode(
+                    source(gads_service, customer_id, query, stats),
+                    plan.row_spec,
+                    enums,
+                    options,
+                    strings,
+                ),
+                plan.enrichers,
+            )
+        )
+    else:
+        aggregated = aggregation.SpillingAggregator(
+            plan.row_spec.new_entry,
+            plan.row_spec.additive_fields,
+            memory_limit=memory_limit,
+        )
+        for query, options in plan.queries:
+            batches = source(gads_service, customer_id, query, stats)
+            if in_pool:
+                _aggregate_in_pool(
+                    batches, client, processes, plan, options, aggregated, strings
+                )
+            else:
+                rows = decode(batches, plan.row_spec, enums, options, strings)
+                aggregate(
+                    enrich(rows, plan.enrichers),
+                    plan.row_spec,
+                    plan.dimensions,
+                    strings,
+                    aggregated,
+                )
+        entries = expand(aggregated, plan.dimensions, strings)
+        if plan.grouping_sets is not None:
+            entries = subtotal(entries, plan.row_spec, plan.grouping_sets)
+    rows = sink(
+        finalize(entries, plan.finalize),
+        plan.headers,
+        plan.order_by,
+        plan.grouping_sets,
+    )
+    return rows, plan.headers
@@ -39,6 +39,24 @@ def build_query(
     return query.strip()
 
 
+# entity attributes ID-only queries leave out; they are joined from the
+# account's metadata cache instead (see 'metadata.AccountMetadata')
+ENTITY_ATTRIBUTES = frozenset(
+    {
+        "customer.descriptive_name",
+        "campaign.name",
+        "campaign.advertising_channel_type",
+        "ad_group.name",
+        "ad_group.type",
+    }
+)
+
+
+def without_entity_attributes(fields):
+    """Drop entity names and types from SELECT fields or ORDER BY entries."""
+    return [field for field in fields if field.split()[0] not in ENTITY_ATTRIBUTES]
+
+
 # customer/account info
 def customer_client_query():
     """Return a GAQL query listing non-manager customer accounts."""
@@ -72,6 +90,18 @@ def label_query():
     """
 
 
+def campaign_label_query():
+    """Return a GAQL query listing label resource names per campaign."""
+
+    return """
+    SELECT
+        campaign.id,
+        campaign.labels
+    FROM campaign
+    WHERE campaign.status != 'REMOVED'
+    """
+
+
 def camp_group_query():
     """Return a GAQL query fetching enabled campaign groups."""
 
@@ -107,6 +137,76 @@ def label_audit_query():
     """
 
 
+def _campaign_filter(campaign_ids):
+    """Return an 'AND campaign.id IN (...)' clause, or '' for every campaign."""
+    if campaign_ids is None:
+        return ""
+    id_list = ", ".join(str(int(campaign_id)) for campaign_id in campaign_ids)
+    return f"\n    AND campaign.id IN ({id_list})"
+
+
+def campaign_metadata_query(campaign_ids=None):
+    """Return a GAQL query fetching campaign names, types, groups, and labels.
+
+    Args:
+        campaign_ids (Iterable[int] | None): Restrict the fetch to these
+            campaigns (used when syncing changes).
+    """
+
+    return f"""
+    SELECT
+        customer.descriptive_name,
+        campaign.id,
+        campaign.name,
+        campaign.advertising_channel_type,
+        campaign.campaign_group,
+        campaign.labels
+    FROM campaign
+    WHERE campaign.status != 'REMOVED'{_campaign_filter(campaign_ids)}
+    """
+
+
+def ad_group_metadata_query(campaign_ids=None):
+    """Return a GAQL query fetching ad group names, types, and labels.
+
+    Args:
+        campaign_ids (Iterable[int] | None): Restrict the fetch to the ad
+            groups of these campaigns.
+    """
+
+    return f"""
+    SELECT
+        campaign.id,
+        ad_group.id,
+        ad_group.name,
+        ad_group.type,
+        ad_group.labels
+    FROM ad_group
+    WHERE ad_group.status != 'REMOVED'{_campaign_filter(campaign_ids)}
+    """
+
+
+def change_status_query(since, until, limit):
+    """Return a GAQL query listing campaigns changed between two timestamps.
+
+    Args:
+        since (str): Inclusive lower bound ('YYYY-MM-DD HH:MM:SS').
+        until (str): Inclusive upper bound ('YYYY-MM-DD HH:MM:SS').
+        limit (int): Maximum rows (the API caps change_status at 10,000).
+    """
+
+    return f"""
+    SELECT
+        change_status.campaign,
+        change_status.last_change_date_time
+    FROM change_status
+    WHERE change_status.last_change_date_time >= '{since}'
+    AND change_status.last_change_date_time <= '{until}'
+    ORDER BY change_status.last_change_date_time ASC
+    LIMIT {limit}
+    """
+
+
 def camptype_report_query(start_date, end_date, time_seg_string, **kwargs):
     """Return a GAQL query for the campaign type performance report."""
 
@@ -114,6 +214,7 @@ def camptype_report_query(start_date, end_date, time_seg_string, **kwargs):
         time_seg_string,
         "customer.descriptive_name",
         "customer.id",
+        "campaign.id",
         "campaign.name",
         "campaign.advertising_channel_type",
         "metrics.cost_micros",
@@ -137,6 +238,7 @@ def mac_report_query(start_date, end_date, time_seg_string, **kwargs):
         time_seg_string,
         "customer.descriptive_name",
         "customer.id",
+        "campaign.id",
         "campaign.name",
         "campaign.advertising_channel_type",
         "metrics.cost_micros",
@@ -163,12 +265,9 @@ def account_report_query(start_date, end_date, time_seg_string, **kwargs):
         "metrics.invalid_clicks",
         "metrics.impressions",
         "metrics.interactions",
-        "metrics.ctr",
-        "metrics.average_cpc",
         "metrics.cost_micros",
         "metrics.absolute_top_impression_percentage",
         "metrics.top_impression_percentage",
-        "metrics.average_cpm",
     ]
     where_clauses = ["customer.status = 'ENABLED'"]
     order_by = [f"{time_seg_string} ASC", "customer.descriptive_name DESC"]
@@ -183,8 +282,12 @@ def account_report_query(start_date, end_date, time_seg_string, **kwargs):
 
 
 # ad_level, does not include PMax (pmax technically doesn't have 'ad groups')
-def ad_group_ad_query(start_date, end_date, time_seg_string, **kwargs):
-    """Return a GAQL query retrieving ad-level performance details."""
+def ad_group_ad_query(start_date, end_date, time_seg_string, id_only=False, **kwargs):
+    """Return a GAQL query retrieving ad-level performance details.
+
+    'id_only' selects IDs and metrics only; names and types are joined
+    locally from the metadata cache.
+    """
 
     select_fields = [
         time_seg_string,
@@ -203,9 +306,7 @@ def ad_group_ad_query(start_date, end_date, time_seg_string, **kwargs):
         "metrics.absolute_top_impression_percentage",
         "metrics.top_impression_percentage",
         "metrics.video_views",
-        "metrics.average_cpm",
         "metrics.clicks",
-        "metrics.average_cpc",
         "metrics.interactions",
         "metrics.conversions",
         "metrics.conversions_value",
@@ -216,6 +317,9 @@ def ad_group_ad_query(start_date, end_date, time_seg_string, **kwargs):
         "customer.descriptive_name ASC",
         "campaign.name ASC",
     ]
+    if id_only:
+        select_fields = without_entity_attributes(select_fields)
+        order_by = without_entity_attributes(order_by)
     return build_query(
         resource="ad_group_ad",
         select_fields=select_fields,
@@ -227,8 +331,12 @@ def ad_group_ad_query(start_date, end_date, time_seg_string, **kwargs):
 
 
 # pmax query for ads_report
-def pmax_campaign_query(start_date, end_date, time_seg_string, **kwargs):
-    """Return a GAQL query focusing on Performance Max campaign metrics."""
+def pmax_campaign_query(start_date, end_date, time_seg_string, id_only=False, **kwargs):
+    """Return a GAQL query focusing on Performance Max campaign metrics.
+
+    'id_only' selects IDs and metrics only; names and types are joined
+    locally from the metadata cache.
+    """
 
     select_fields = [
         time_seg_string,
@@ -242,10 +350,8 @@ def pmax_campaign_query(start_date, end_date, time_seg_string, **kwargs):
         "metrics.absolute_top_impression_percentage",
         "metrics.top_impression_percentage",
         "metrics.video_views",
-        "metrics.average_cpm",
         "metrics.clicks",
         "metrics.invalid_clicks",
-        "metrics.average_cpc",
         "metrics.interactions",
         "metrics.conversions",
         "metrics.conversions_value",
@@ -259,6 +365,9 @@ def pmax_campaign_query(start_date, end_date, time_seg_string, **kwargs):
         "customer.descriptive_name ASC",
         "campaign.name ASC",
     ]
+    if id_only:
+        select_fields = without_entity_attributes(select_fields)
+        order_by = without_entity_attributes(order_by)
     return build_query(
         resource="campaign",
         select_fields=select_fields,
@@ -270,8 +379,12 @@ def pmax_campaign_query(start_date, end_date, time_seg_string, **kwargs):
 
 
 # click_view
-def click_view_query(start_date, end_date, time_seg_string, **kwargs):
-    """Return a GAQL query retrieving ClickView performance data."""
+def click_view_query(start_date, end_date, time_seg_string, id_only=False, **kwargs):
+    """Return a GAQL query retrieving ClickView performance data.
+
+    'id_only' selects IDs and metrics only; names and types are joined
+    locally from the metadata cache.
+    """
 
     select_fields = [
         time_seg_string,
@@ -279,7 +392,8 @@ def click_view_query(start_date, end_date, time_seg_string, **kwargs):
         "customer.id",
         "campaign.name",
         "campaign.id",
-        "campaign.advertising_channel_type,ad_group.name",
+        "campaign.advertising_channel_type",
+        "ad_group.name",
         "ad_group.id",
         "click_view.ad_group_ad",
         "click_view.gclid",
@@ -308,6 +422,9 @@ def click_view_query(start_date, end_date, time_seg_string, **kwargs):
         "campaign.name ASC",
         "ad_group.name ASC",
     ]
+    if id_only:
+        select_fields = without_entity_attributes(select_fields)
+        order_by = without_entity_attributes(order_by)
     return build_query(
         resource="click_view",
         select_fields=select_fields,
@@ -320,9 +437,13 @@ def click_view_query(start_date, end_date, time_seg_string, **kwargs):
 
 # paid_organic_search_term_view
 def paid_organic_search_term_view_query(
-    start_date, end_date, time_seg_string, **kwargs
+    start_date, end_date, time_seg_string, id_only=False, **kwargs
 ):
-    """Return a GAQL query for paid and organic search term metrics."""
+    """Return a GAQL query for paid and organic search term metrics.
+
+    'id_only' selects IDs and metrics only; names and types are joined
+    locally from the metadata cache.
+    """
 
     select_fields = [
         time_seg_string,
@@ -338,17 +459,13 @@ def paid_organic_search_term_view_query(
         "ad_group.id",
         "ad_group.name",
         "metrics.organic_clicks",
-        "metrics.organic_clicks_per_query",
         "metrics.organic_impressions",
-        "metrics.organic_impressions_per_query",
         "metrics.organic_queries",
         "metrics.impressions",
         "metrics.combined_queries",
-        "metrics.combined_clicks_per_query",
         "metrics.combined_clicks",
         "metrics.clicks",
         "metrics.average_cpc",
-        "metrics.ctr",
     ]
     where_clauses = []
     order_by = [
@@ -357,6 +474,9 @@ def paid_organic_search_term_view_query(
         "campaign.name ASC",
         "metrics.clicks DESC",
     ]
+    if id_only:
+        select_fields = without_entity_attributes(select_fields)
+        order_by = without_entity_attributes(order_by)
     return build_query(
         resource="paid_organic_search_term_view",
         select_fields=select_fields,
@@ -365,3 +485,72 @@ def paid_organic_search_term_view_query(
         where_clauses=where_clauses,
         order_by=order_by,
     )
+
+
+# budgets
+def customer_name_query():
+    """Return a GAQL query for the account's descriptive name."""
+
+    return """
+    SELECT
+        customer.id,
+        customer.descriptive_name
+    FROM customer
+    """
+
+
+def campaign_budget_query():
+    """Return a GAQL query listing budgets of enabled campaigns."""
+
+    return """
+    SELECT
+        customer.id,
+        customer.descriptive_name,
+        campaign.id,
+        campaign_budget.id,
+        campaign_budget.name,
+        campaign_budget.period,
+        campaign_budget.amount_micros,
+        campaign_budget.total_amount_micros,
+        campaign_budget.explicitly_shared
+    FROM campaign
+    WHERE campaign.status = 'ENABLED'
+    AND campaign_budget.status = 'ENABLED'
+    """
+
+
+def budget_daily_cost_query(start_date, end_date):
+    """Return a GAQL query for daily cost per campaign budget."""
+
+    select_fields = [
+        "segments.date",
+        "campaign.id",
+        "campaign_budget.id",
+        "metrics.cost_micros",
+    ]
+    return build_query(
+        resource="campaign",
+        select_fields=select_fields,
+        start_date=start_date,
+        end_date=end_date,
+        where_clauses=["metrics.cost_micros > 0"],
+    )
+
+
+def account_budget_query():
+    """Return a GAQL query listing approved account-level budgets."""
+
+    return """
+    SELECT
+        account_budget.id,
+        account_budget.name,
+        account_budget.approved_start_date_time,
+        account_budget.approved_end_date_time,
+        account_budget.approved_spending_limit_micros,
+        account_budget.approved_spending_limit_type,
+        account_budget.adjusted_spending_limit_micros,
+        account_budget.amount_served_micros
+    FROM account_budget
+    WHERE account_budget.status = 'APPROVED'
+    ORDER BY account_budget.approved_start_date_time DESC
+    """
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""Local time-segment rollups: reports fetch days, periods are derived here.
+
+Performance reports always query 'segments.date' and map each day to its
+week, month, quarter, or year before aggregation, so one daily pull serves
+every granularity. Quarters and years can follow a fiscal calendar starting
+in any month.
+"""
+
+from datetime import date, timedelta
+
+from gar import metrics, pipeline
+
+TIME_SEGMENTS = ("date", "week", "month", "quarter", "year")
+DATE_HEADERS = ("Date", "date")
+
+
+def period_start(day, time_seg, fiscal_year_start=1):
+    """Return the first day of the period containing 'day'.
+
+    Args:
+        day (date): Calendar day.
+        time_seg (str): One of 'TIME_SEGMENTS'.
+        fiscal_year_start (int): Month (1-12) fiscal quarters and years
+            start in.
+
+    Returns:
+        date: Period start; weeks start on Monday, as in the API.
+    """
+
+    if time_seg == "date":
+        return day
+    if time_seg == "week":
+        return day - timedelta(days=day.weekday())
+    if time_seg == "month":
+        return day.replace(day=1)
+    months = 3 if time_seg == "quarter" else 12
+    offset = (day.month - fiscal_year_start) % months
+    month_index = day.year * 12 + day.month - 1 - offset
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def period_label(day_text, time_seg, fiscal_year_start=1):
+    """Label the period of an ISO day the way the API labels its segments.
+
+    Days, weeks, months, and quarters are labelled by their first day; a
+    calendar year by its number and a fiscal year as 'FY<year it ends in>'.
+    """
+
+    if time_seg == "date":
+        return day_text
+    start = period_start(date.fromisoformat(str(day_text)), time_seg, fiscal_year_start)
+    if time_seg != "year":
+        return start.isoformat()
+    if fiscal_year_start == 1:
+        return start.year
+    return f"FY{start.year + 1}"
+
+
+class PeriodRollup:
+    """Enrich stage replacing a row's day with its period label.
+
+    Labels are cached per day, since a report holds few distinct days.
+
+    Args:
+        time_seg (str): Target granularity.
+        field (str): Date field of the decoded rows.
+        fiscal_year_start (int): First month of the fiscal year.
+    """
+
+    def __init__(self, time_seg, field="Date", fiscal_year_start=1):
+        self.time_seg = time_seg
+        self.field = field
+        self.fiscal_year_start = fiscal_year_start
+        self.labels = {}
+
+    def __call__(self, row):
+        day = row[self.field]
+        label = self.labels.get(day)
+        if label is None:
+            label = self.labels[day] = period_label(
+                day, self.time_seg, self.fiscal_year_start
+            )
+        row[self.field] = label
+        return row
+
+
+def enrichers(time_seg, field="Date", fiscal_year_start=1):
+    """Return the rollup enrich stage for 'time_seg' (none for days)."""
+    if time_seg == "date":
+        return []
+    return [PeriodRollup(time_seg, field, fiscal_year_start)]
+
+
+def roll_up_table(table_data, headers, report, time_seg, fiscal_year_start=1):
+    """Roll a finished daily report table up to a coarser granularity.
+
+    Additive columns are summed per period and remaining dimensions
+    (including the level of grouping-sets output), and derived metrics are
+    re-evaluated from the sums. A private numerator with an additive output
+    column ('metrics.ReportMetrics.totals', such as total cost behind the
+    average CPC) is taken from that column's sum; other private numerators
+    (such as impression weights) are rebuilt from the daily metric and its
+    denominator, so they match to the daily rounding.
+
+    Args:
+        table_data (list[list]): Daily rows of a registered report.
+        headers (list[str]): Table headers.
+        report (str): Report option registered in 'metrics.REGISTRY'.
+        time_seg (str): Target granularity.
+        fiscal_year_start (int): First month of the fiscal year.
+
+    Returns:
+        list[list]: Rolled-up rows in the report's order.
+    """
+
+    if time_seg == "date":
+        return table_data
+    spec = metrics.REGISTRY[report]
+    date_idx = next((headers.index(h) for h in DATE_HEADERS if h in headers), 0)
+    derived = [m for m in spec.derived if m.column in headers]
+    additive = [h for h in spec.additive if h in headers]
+    computed = set(additive) | {m.column for m in derived}
+    dimensions = [h for h in headers if h not in computed]
+    totals = {name: column for name, column in spec.totals if column in additive}
+    rebuilt = [
+        m for m in derived if m.numerator not in headers and m.numerator not in totals
+    ]
+    labels = {}
+    groups = {}
+    for row in table_data:
+        values = dict(zip(headers, row))
+        day = values[headers[date_idx]]
+        if day not in labels:
+            labels[day] = period_label(day, time_seg, fiscal_year_start)
+        values[headers[date_idx]] = labels[day]
+        key = tuple(values[h] for h in dimensions)
+        entry = groups.get(key)
+        if entry is None:
+            entry = groups[key] = dict.fromkeys(additive, 0)
+            entry.update(dict.fromkeys((m.numerator for m in rebuilt), 0))
+            entry.update(zip(dimensions, key))
+        metrics.accumulate(entry, values, additive)
+        for metric in rebuilt:
+            entry[metric.numerator] += (values[metric.column] or 0) * (
+                values.get(metric.denominator) or 0
+            )
+    for entry in groups.values():
+        for name, column in totals.items():
+            entry[name] = entry[column]
+    rows = [
+        [entry.get(h) for h in headers]
+        for entry in (metrics.derive(entry, derived) for entry in groups.values())
+    ]
+    if spec.grouping_sets is not None and pipeline.LEVEL_FIELD in headers:
+        grouping_sets = spec.grouping_sets.for_headers(headers)
+        rows.sort(key=grouping_sets.sort_key(headers, rows))
+        return rows
+    order_by = [h for h in spec.order_by if h.lstrip("-") in headers]
+    rows.sort(key=pipeline.sort_key(headers, order_by))
+    return rows
@@ -0,0 +1,477 @@
+# -*- coding: utf-8 -*-
+"""Local HTTP service keeping one authenticated session and a response cache warm."""
+
+import argparse
+import json
+import os
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from gar import common, main, rollup, services
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# seconds a cached report stays fresh
+DEFAULT_CACHE_TTL = 900
+# cached reports kept before the least recently used is evicted
+DEFAULT_CACHE_ENTRIES = 128
+# query parameters that steer the service rather than the report
+CONTROL_PARAMS = {"refresh"}
+FLAG_PARAMS = {"incremental", "grouping_sets", "store", "id_only"}
+# applied to cached daily performance tables, so they never cause a new pull
+LOCAL_PARAMS = {"date", "top", "min_cost", "fiscal_year_start"}
+
+
+class ServiceSession:
+    """Authenticated API services and the account hierarchy, shared by requests.
+
+    Args:
+        gads_service (GoogleAdsService): Service used for GAQL queries.
+        customer_service (CustomerService): Service for customer lookups.
+        client (GoogleAdsClient): Authenticated API client.
+    """
+
+    def __init__(self, gads_service, customer_service, client):
+        self.gads_service = gads_service
+        self.customer_service = customer_service
+        self.client = client
+        self.accounts_info = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def connect(cls, yaml_loc=None):
+        """Authenticate once and warm the account list and enum lookups."""
+        session = cls(*services.generate_services(yaml_loc))
+        services.get_enums(session.client)
+        session.refresh_accounts()
+        return session
+
+    def refresh_accounts(self):
+        """Re-fetch the account hierarchy and return it."""
+        with self._lock:
+            self.accounts_info = services.get_accounts(
+                self.gads_service, self.customer_service, self.client
+            )
+            return self.accounts_info
+
+    @property
+    def customer_dict(self):
+        """dict[str, str]: Customer ID to account name."""
+        return self.accounts_info[2]
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of report responses with a time-to-live.
+
+    Concurrent requests for the same key wait for the first one to finish
+    instead of querying the API in parallel.
+
+    Args:
+        ttl (float): Seconds an entry stays fresh.
+        max_entries (int): Entries kept before evicting the least recent.
+    """
+
+    def __init__(self, ttl=DEFAULT_CACHE_TTL, max_entries=DEFAULT_CACHE_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def get_or_compute(self, key, compute, refresh=False):
+        """Return '(value, cached)' for 'key', computing it when stale or missing."""
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if not refresh:
+                with self._lock:
+                    entry = self._entries.get(key)
+                    if entry and time.monotonic() - entry[0] < self.ttl:
+                        self._entries.move_to_end(key)
+                        return entry[1], True
+            value = compute()
+            with self._lock:
+                self._entries[key] = (time.monotonic(), value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._key_locks.pop(evicted, None)
+            return value, False
+
+
+class RequestError(ValueError):
+    """A report request that cannot be served as given (HTTP 400)."""
+
+
+def _raise_request_error(message):
+    raise RequestError(message)
+
+
+def parse_report_request(params):
+    """Turn report query parameters into resolved CLI arguments.
+
+    Parameters mirror the command-line options without their leading dashes
+    (for example 'report=performance:mac&account=all&date=last30days').
+
+    Args:
+        params (list[tuple[str, str]]): Query parameters.
+
+    Returns:
+        argparse.Namespace: Normalized arguments with resolved date details.
+
+    Raises:
+        RequestError: If a parameter is unknown or invalid, or the report,
+            option, or account scope is missing.
+    """
+
+    parser = main.build_parser()
+    # report argument errors to the client instead of exiting the service
+    parser.error = _raise_request_error
+    argv = []
+    for name, value in params:
+        if name in CONTROL_PARAMS:
+            continue
+        flag = f"--{name.replace('_', '-')}"
+        if name in FLAG_PARAMS:
+            if common.parse_toggle_choice(value or "true"):
+                argv.append(flag)
+            continue
+        argv += [flag, value]
+    try:
+        args = parser.parse_args(argv)
+        main.normalize_cli_args(parser, args)
+    except (argparse.ArgumentError, ValueError) as exc:
+        raise RequestError(str(exc)) from exc
+    if not args.report_scope or not args.report_option:
+        raise RequestError(
+            "'report' must name a scope and option, e.g. 'budget:budget'."
+        )
+    if args.account_scope_cli not in ("single", "all"):
+        raise RequestError("'account' must be 'all' or 'single:<customer id>'.")
+    if args.account_scope_cli == "single" and not args.account_id_cli:
+        raise RequestError("'account=single' needs a customer ID ('single:<id>').")
+    if args.report_scope != "audit":
+        date_details = common.parse_date_argument(
+            args.date or "last30days",
+            force_single=args.report_option == "clickview",
+        )
+        if date_details is None:
+            raise RequestError(f"Unsupported date: {args.date}")
+        args.date_details = date_details
+    return args
+
+
+def cache_key(args, params):
+    """Key a request by its parameters and the dates they resolved to.
+
+    Performance reports are cached by day: the time segment, fiscal
+    calendar, and ranking options are left out of the key and applied to
+    the cached table by 'finish_tables'.
+    """
+
+    date_details = getattr(args, "date_details", None)
+    if args.report_scope != "performance":
+        relevant = tuple(sorted((n, v) for n, v in params if n not in CONTROL_PARAMS))
+        return relevant, date_details
+    ignored = CONTROL_PARAMS | LOCAL_PARAMS
+    relevant = tuple(sorted((n, v) for n, v in params if n not in ignored))
+    return relevant, tuple(date_details[1:3])
+
+
+def finish_tables(args, tables):
+    """Roll cached daily performance tables up and rank them for a request."""
+    if args.report_scope != "performance":
+        return tables
+    option = args.report_option
+    time_seg = args.date_details[3]
+    fiscal_year_start = getattr(args, "fiscal_year_start", None) or 1
+    finished = []
+    for table in tables:
+        rows = rollup.roll_up_table(
+            table["rows"], table["headers"], option, time_seg, fiscal_year_start
+        )
+        rows = common.apply_ranking_options(rows, table["headers"], option, args)
+        finished.append(_table(table["name"], rows, table["headers"]))
+    return finished
+
+
+def run_report(session, args):
+    """Run the requested report and return its tables.
+
+    Returns:
+        list[dict]: '{"name", "headers", "rows"}' per table.
+
+    Raises:
+        RequestError: If the customer ID is not accessible.
+    """
+
+    customer_dict = session.customer_dict
+    account_id = args.account_id_cli
+    if args.account_scope_cli == "single" and account_id not in customer_dict:
+        raise RequestError(f"Account ID {account_id} is not an accessible account.")
+    scope, option = args.report_scope, args.report_option
+    options = common.resolve_report_options(args)
+    gads_service, client = session.gads_service, session.client
+    if scope == "audit":
+        return _run_audit(session, option, account_id, options)
+    _, start_date, end_date, time_seg = args.date_details
+    if scope == "performance":
+        # cached by day; 'finish_tables' rolls up to the requested segment
+        options.pop("fiscal_year_start", None)
+        toggles = common.resolve_performance_toggles(args, option)
+        if account_id:
+            table, headers = main.PERFORMANCE_SINGLE_DISPATCH[option](
+                gads_service,
+                client,
+                start_date,
+                end_date,
+                "date",
+                customer_id=account_id,
+                **toggles,
+                **options,
+            )
+        else:
+            table, headers = main.PERFORMANCE_ALL_DISPATCH[option](
+                gads_service,
+                client,
+                start_date,
+                end_date,
+                "date",
+                customer_dict,
+                **toggles,
+                **options,
+            )
+        return [_table(option, table, headers)]
+    if account_id:
+        results = main.BUDGET_SINGLE_DISPATCH[option](
+            gads_service,
+            client,
+            start_date,
+            end_date,
+            time_seg,
+            customer_id=account_id,
+            **options,
+        )
+    else:
+        results = main.BUDGET_ALL_DISPATCH[option](
+            gads_service,
+            client,
+            start_date,
+            end_date,
+            time_seg,
+            customer_dict,
+            **options,
+        )
+    if option == "budget":
+        budget_table, budget_headers, account_table, account_headers = results
+        return [
+            _table(option, budget_table, budget_headers),
+            _table("account_pacing", account_table, account_headers),
+        ]
+    return [_table(option, *results)]
+
+
+def _run_audit(session, option, account_id, options):
+    """Run an audit for one account or all accounts and return its tables."""
+    gads_service, client = session.gads_service, session.client
+    customer_dict = session.customer_dict
+    if option == "account_labels":
+        if account_id:
+            table, headers, _ = services.get_labels(gads_service, client, account_id)
+        else:
+            table, headers, _ = services.get_labels_all(
+                gads_service, client, customer_dict, **options
+            )
+        return [_table(option, table, headers)]
+    if option == "campaign_groups":
+        if account_id:
+            table, headers, _ = services.get_campaign_groups(
+                gads_service, client, account_id
+            )
+        else:
+            table, headers, _ = services.get_campaign_groups_all(
+                gads_service, client, customer_dict, **options
+            )
+        return [_table(option, table, headers)]
+    if account_id:
+        table, headers, _ = services.complete_labels_audit(
+            gads_service, client, customer_id=account_id, **options
+        )
+        return [_table(option, table, headers)]
+    table, headers, rollup_table, rollup_headers = services.complete_labels_audit_all(
+        gads_service, client, customer_dict, **options
+    )
+    return [
+        _table(option, table, headers),
+        _table("unlabeled_rollup", rollup_table, rollup_headers),
+    ]
+
+
+def _table(name, rows, headers):
+    return {"name": name, "headers": headers, "rows": rows}
+
+
+def _json_default(value):
+    """Encode report values JSON does not know (Decimal, dates, enums)."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+class ReportRequestHandler(BaseHTTPRequestHandler):
+    """Serve '/health', '/accounts', and '/report' as JSON."""
+
+    server_version = "gar"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = parse_qsl(url.query, keep_blank_values=True)
+        refresh = common.parse_toggle_choice(dict(params).get("refresh") or "false")
+        try:
+            if url.path == "/health":
+                self._send(200, {"status": "ok", "accounts": len(self._customers())})
+            elif url.path == "/accounts":
+                session = self.server.session
+                if refresh:
+                    session.refresh_accounts()
+                _, headers, _, count = session.accounts_info
+                self._send(
+                    200,
+                    {"count": count, "accounts": self._customers(), "headers": headers},
+                )
+            elif url.path == "/report":
+                self._send(200, self._report(params, refresh))
+            else:
+                self._send(404, {"error": f"Unknown path '{url.path}'."})
+        except (RequestError, argparse.ArgumentTypeError) as exc:
+            self._send(400, {"error": str(exc)})
+        except Exception as exc:
+            self._send(500, {"error": f"{type(exc).__name__}: {exc}"})
+
+    def _customers(self):
+        return self.server.session.customer_dict
+
+    def _report(self, params, refresh):
+        args = parse_report_request(params)
+        started = time.perf_counter()
+        tables, cached = self.server.cache.get_or_compute(
+            cache_key(args, params),
+            lambda: run_report(self.server.session, args),
+            refresh=refresh,
+        )
+        tables = finish_tables(args, tables)
+        return {
+            "report": f"{args.report_scope}:{args.report_option}",
+            "date": getattr(args, "date_details", None),
+            "cached": cached,
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+            "tables": tables,
+        }
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, default=_json_default).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # Unix socket peers have no host/port pair
+        if isinstance(self.client_address, tuple):
+            return super().address_string()
+        return "unix"
+
+
+class ThreadingUnixHTTPServer(
+    socketserver.ThreadingMixIn, socketserver.UnixStreamServer
+):
+    """HTTP over a Unix domain socket, one thread per request."""
+
+    daemon_threads = True
+
+
+def make_server(session, cache, host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None):
+    """Build the HTTP server (TCP, or a Unix socket when 'socket_path' is set)."""
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = ThreadingUnixHTTPServer(socket_path, ReportRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), ReportRequestHandler)
+    server.session = session
+    server.cache = cache
+    return server
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="google-ads-reporter serve",
+        description=(
+            "Serve reports over local HTTP from one warm, authenticated session. "
+            "GET /report takes the CLI options as query parameters, e.g. "
+            "/report?report=performance:mac&account=all&date=last30days; "
+            "add refresh=1 to bypass the cache."
+        ),
+    )
+    parser.add_argument("-y", "--yaml", dest="yaml", help="Google Ads YAML config.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Bind address.")
+    parser.add_argument(
+        "--port", type=int, default=DEFAULT_PORT, help="TCP port to listen on."
+    )
+    parser.add_argument(
+        "--socket",
+        dest="socket_path",
+        metavar="PATH",
+        help="Listen on a Unix domain socket instead of TCP.",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        "--cache_ttl",
+        dest="cache_ttl",
+        type=int,
+        default=DEFAULT_CACHE_TTL,
+        metavar="SECONDS",
+        help=f"Seconds a cached report stays fresh (default: {DEFAULT_CACHE_TTL}).",
+    )
+    parser.add_argument(
+        "--cache-entries",
+        "--cache_entries",
+        dest="cache_entries",
+        type=common.parse_concurrency,
+        default=DEFAULT_CACHE_ENTRIES,
+        metavar="N",
+        help=f"Cached reports kept in memory (default: {DEFAULT_CACHE_ENTRIES}).",
+    )
+    return parser
+
+
+def serve(argv=None):
+    """Entry point for 'gar serve'."""
+    args = build_parser().parse_args(argv)
+    print("Authorization in progress...")
+    session = ServiceSession.connect(args.yaml)
+    print(f"Authorization complete; {len(session.customer_dict)} accounts loaded.")
+    server = make_server(
+        session,
+        ResponseCache(args.cache_ttl, args.cache_entries),
+        host=args.host,
+        port=args.port,
+        socket_path=args.socket_path,
+    )
+    where = args.socket_path or f"http://{args.host}:{server.server_address[1]}"
+    print(f"Serving reports on {where} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down.")
+    finally:
+        server.server_close()
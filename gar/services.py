@@ -1,9 +1,13 @@
 # -*- coding: utf-8 -*-
 """Google Ads API service utilities and report execution common."""
 
+import functools
 import os
 import sys
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from decimal import ROUND_HALF_UP, Decimal
 
 import requests
@@ -14,7 +18,18 @@ from google.api_core.exceptions import (
     Unauthenticated,
 )
 
-from gar import common, queries
+from gar import (
+    aggregation,
+    anomaly,
+    common,
+    forecast,
+    metadata,
+    metrics,
+    pacing,
+    pipeline,
+    queries,
+    rollup,
+)
 
 
 def generate_services(yaml_loc=None):
@@ -105,6 +120,54 @@ def get_accounts(gads_service, customer_service, client):
     return accounts_list, headers, protected_accounts_dict, len(protected_accounts_dict)
 
 
+# API requests issued in parallel when --concurrency is not given
+DEFAULT_CONCURRENCY = 3
+
+
+def _fan_out_accounts(fetch_single, accounts_info, concurrency=None):
+    """Run a single-account fetch across accounts on a bounded thread pool.
+
+    Accounts are submitted lazily, so at most '2 * concurrency' requests are
+    pending regardless of how many accounts the MCC holds. Failures are
+    reported per account and do not stop the run.
+
+    Args:
+        fetch_single (Callable[[str], Any]): Fetch for one customer ID.
+        accounts_info (dict[str, str]): Mapping of customer IDs to names.
+        concurrency (int | None): Accounts fetched in parallel.
+
+    Yields:
+        tuple[str, str, Any]: Customer ID, account name, and the fetch result
+        (None on failure) in completion order.
+    """
+
+    concurrency = concurrency or DEFAULT_CONCURRENCY
+
+    def run(account):
+        customer_id, account_descriptive = account
+        try:
+            return customer_id, account_descriptive, fetch_single(customer_id), None
+        except Exception as e:
+            return customer_id, account_descriptive, None, e
+
+    total = len(accounts_info)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        # progress is printed here, on the consuming thread, so lines never interleave
+        for done, (customer_id, account_descriptive, result, error) in enumerate(
+            aggregation.map_bounded(
+                executor, run, accounts_info.items(), max_in_flight=concurrency * 2
+            ),
+            start=1,
+        ):
+            if error is not None:
+                print(
+                    f"Error processing {account_descriptive} ({customer_id}): {error}"
+                )
+            else:
+                print(f"Processed {account_descriptive} ({done}/{total})")
+            yield customer_id, account_descriptive, result
+
+
 """
 DECODERS/GETTERS
 """
@@ -267,8 +330,50 @@ AUDITING REPORTS
 """
 
 
-def complete_labels_audit(gads_service, client, customer_id):
-    """Compile campaign and ad group label assignments for an account.
+# change_status only covers roughly the last 90 days and caps results at 10,000
+CHANGE_STATUS_WINDOW_DAYS = 89
+CHANGE_STATUS_LIMIT = 10000
+# change_status timestamps use the account time zone; the overlap absorbs the offset
+CHANGE_STATUS_OVERLAP = timedelta(days=1)
+CHANGE_STATUS_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+# campaign IDs per metadata sync query
+AUDIT_CAMPAIGN_CHUNK = 1000
+
+
+def _resource_name_resolver(customer_id, collection, names_by_id):
+    """Build a resolver from resource names to display names.
+
+    Names are indexed by full resource name ('customers/{customer_id}/
+    {collection}/{id}') up front, so each lookup is a single dict hit; any
+    other spelling is parsed once and cached.
+
+    Args:
+        customer_id (str): Customer owning the resources.
+        collection (str): Resource collection (for example 'labels').
+        names_by_id (dict[str, str]): Display names keyed by resource ID.
+
+    Returns:
+        Callable[[str], str]: Resolver returning 'UNDEFINED' for unknown IDs.
+    """
+
+    prefix = f"customers/{customer_id}/{collection}/"
+    index = {prefix + item_id: name for item_id, name in names_by_id.items()}
+
+    def resolve(resource_name):
+        name = index.get(resource_name)
+        if name is None:
+            name = names_by_id.get(resource_name.rsplit("/", 1)[-1], "UNDEFINED")
+            index[resource_name] = name
+        return name
+
+    return resolve
+
+
+def _fetch_label_audit_campaigns(gads_service, client, customer_id):
+    """Stream label audit rows into raw per-campaign records.
+
+    Label and campaign group assignments are kept as resource names so the
+    records can be cached between runs and resolved against fresh names.
 
     Args:
         gads_service (GoogleAdsService): Service used to run GAQL queries.
@@ -276,84 +381,291 @@ def complete_labels_audit(gads_service, client, customer_id):
         customer_id (str): Target customer ID.
 
     Returns:
-        tuple[list[list], list[str], dict]: Tabular audit data, column headers,
-        and a structured dictionary keyed by campaign and ad group IDs.
+        dict[str, dict]: Campaign records keyed by campaign ID string.
     """
 
-    # enum decoders
-    undecoded_enums = get_enums(client)
-    channel_type_enum, ad_group_type_enum, *extra = undecoded_enums
-    # get label and campaign group metadata
-    label_table, label_table_headers, label_dict = get_labels(
-        gads_service, client, customer_id
-    )
-    camp_group_table, camp_group_headers, camp_group_dict = get_campaign_groups(
-        gads_service, client, customer_id
-    )
-    # GAQL query
-    label_audit_query = queries.label_audit_query()
+    channel_type_enum, ad_group_type_enum, *extra = get_enums(client)
+    campaigns = {}
     response = gads_service.search_stream(
-        customer_id=customer_id, query=label_audit_query
+        customer_id=customer_id, query=queries.label_audit_query()
     )
-    audit_table = []
-    audit_dict = {}
     for batch in response:
         for row in batch.results:
-            # decode enum fields
-            channel_type = (
-                channel_type_enum.AdvertisingChannelType.Name(
-                    row.campaign.advertising_channel_type
+            record = campaigns.get(str(row.campaign.id))
+            if record is None:
+                channel_type = (
+                    channel_type_enum.AdvertisingChannelType.Name(
+                        row.campaign.advertising_channel_type
+                    )
+                    if hasattr(row.campaign, "advertising_channel_type")
+                    else "UNDEFINED"
                 )
-                if hasattr(row.campaign, "advertising_channel_type")
-                else "UNDEFINED"
-            )
+                record = campaigns[str(row.campaign.id)] = {
+                    "customer_id": row.customer.id,
+                    "customer_name": row.customer.descriptive_name,
+                    "campaign_id": row.campaign.id,
+                    "campaign_name": row.campaign.name,
+                    "campaign_type": channel_type,
+                    "campaign_group": row.campaign.campaign_group,
+                    "campaign_labels": list(row.campaign.labels),
+                    "ad_groups": [],
+                }
             ad_group_type = (
                 ad_group_type_enum.AdGroupType.Name(row.ad_group.type_)
                 if hasattr(row.ad_group, "type_")
                 else "UNDEFINED"
             )
-            # resolve labels
-            campaign_labels = [
-                label_dict.get(label.split("/")[-1], "UNDEFINED")
-                for label in row.campaign.labels
-            ]
-            ad_group_labels = [
-                label_dict.get(label.split("/")[-1], "UNDEFINED")
-                for label in row.ad_group.labels
-            ]
-            # campaign group name
-            campaign_group_id = row.campaign.campaign_group.split("/")[-1]
-            campaign_group_name = camp_group_dict.get(campaign_group_id, "UNDEFINED")
+            record["ad_groups"].append(
+                [
+                    row.ad_group.id,
+                    row.ad_group.name,
+                    ad_group_type,
+                    list(row.ad_group.labels),
+                ]
+            )
+    return campaigns
+
+
+def _changed_campaign_ids(gads_service, customer_id, checked_at, started_at):
+    """Return IDs of campaigns changed since the last metadata sync.
+
+    Args:
+        gads_service (GoogleAdsService): Service used to run GAQL queries.
+        customer_id (str): Target customer ID.
+        checked_at (str): ISO timestamp recorded by the previous sync.
+        started_at (datetime): Start time of the current sync.
+
+    Returns:
+        set[int] | None: Changed campaign IDs, or None when change_status
+        cannot cover the gap (too old or truncated) and a full sync is needed.
+    """
+
+    since = datetime.fromisoformat(checked_at) - CHANGE_STATUS_OVERLAP
+    if started_at - since > timedelta(days=CHANGE_STATUS_WINDOW_DAYS):
+        return None
+    change_query = queries.change_status_query(
+        since.strftime(CHANGE_STATUS_TIME_FORMAT),
+        (started_at + CHANGE_STATUS_OVERLAP).strftime(CHANGE_STATUS_TIME_FORMAT),
+        CHANGE_STATUS_LIMIT,
+    )
+    response = gads_service.search_stream(customer_id=customer_id, query=change_query)
+    changed = set()
+    row_count = 0
+    for batch in response:
+        for row in batch.results:
+            row_count += 1
+            if row.change_status.campaign:
+                changed.add(int(row.change_status.campaign.rsplit("/", 1)[-1]))
+    if row_count >= CHANGE_STATUS_LIMIT:
+        return None
+    return changed
+
+
+def _fetch_metadata_entities(gads_service, client, customer_id, campaign_ids=None):
+    """Fetch campaign and ad group metadata records for an account.
+
+    Args:
+        gads_service (GoogleAdsService): Service used to run GAQL queries.
+        client (GoogleAdsClient): Authenticated client for enum decoding.
+        customer_id (str): Target customer ID.
+        campaign_ids (list[int] | None): Restrict the fetch to these campaigns
+            and their ad groups.
+
+    Returns:
+        tuple[str | None, dict, dict]: Account name (None without campaigns),
+        campaign records, and ad group records ('metadata.AccountMetadata').
+    """
+
+    channel_type_enum, ad_group_type_enum, *extra = get_enums(client)
+    if campaign_ids is None:
+        chunks = [None]
+    else:
+        chunks = [
+            campaign_ids[i : i + AUDIT_CAMPAIGN_CHUNK]
+            for i in range(0, len(campaign_ids), AUDIT_CAMPAIGN_CHUNK)
+        ]
+    customer_name = None
+    campaigns = {}
+    ad_groups = {}
+    for chunk in chunks:
+        for batch in gads_service.search_stream(
+            customer_id=customer_id, query=queries.campaign_metadata_query(chunk)
+        ):
+            for row in batch.results:
+                customer_name = row.customer.descriptive_name
+                campaigns[str(row.campaign.id)] = {
+                    "name": row.campaign.name,
+                    "type": _channel_type(row, channel_type_enum),
+                    "group": row.campaign.campaign_group,
+                    "labels": list(row.campaign.labels),
+                }
+        for batch in gads_service.search_stream(
+            customer_id=customer_id, query=queries.ad_group_metadata_query(chunk)
+        ):
+            for row in batch.results:
+                ad_groups[str(row.ad_group.id)] = {
+                    "campaign_id": row.campaign.id,
+                    "name": row.ad_group.name,
+                    "type": (
+                        ad_group_type_enum.AdGroupType.Name(row.ad_group.type_)
+                        if hasattr(row.ad_group, "type_")
+                        else "UNDEFINED"
+                    ),
+                    "labels": list(row.ad_group.labels),
+                }
+    return customer_name, campaigns, ad_groups
+
+
+def sync_metadata(gads_service, client, customer_id, names=True):
+    """Bring an account's cached entity metadata up to date.
+
+    Campaigns reported by change_status since the last sync are re-fetched
+    with their ad groups; a cold cache, a gap change_status cannot cover, or
+    a cache older than 'metadata.METADATA_MAX_AGE' is fetched in full. Label
+    and campaign group names are re-fetched only on a full sync or when a
+    re-fetched entity references one that is not cached.
+
+    Args:
+        gads_service (GoogleAdsService): Service used to run GAQL queries.
+        client (GoogleAdsClient): Authenticated client for enum decoding.
+        customer_id (str): Target customer ID.
+        names (bool): Refresh label and campaign group names when needed;
+            callers that fetch them anyway pass False.
+
+    Returns:
+        metadata.AccountMetadata: The synced (and saved) metadata.
+    """
+
+    account_metadata = metadata.AccountMetadata.load(customer_id)
+    started_at = datetime.now()
+    changed = None
+    if not account_metadata.needs_full_sync(started_at):
+        changed = _changed_campaign_ids(
+            gads_service,
+            customer_id,
+            account_metadata.synced_at.isoformat(),
+            started_at,
+        )
+    if changed is None:
+        customer_name, campaigns, ad_groups = _fetch_metadata_entities(
+            gads_service, client, customer_id
+        )
+        account_metadata.replace(campaigns, ad_groups)
+        account_metadata.full_sync_at = started_at
+        stale_names = True
+    else:
+        customer_name, campaigns, ad_groups = None, {}, {}
+        if changed:
+            customer_name, campaigns, ad_groups = _fetch_metadata_entities(
+                gads_service, client, customer_id, sorted(changed)
+            )
+            account_metadata.replace(campaigns, ad_groups, changed)
+        print(
+            f"Metadata for {customer_id}: {len(changed)} changed campaign(s) "
+            "re-fetched."
+        )
+        stale_names = account_metadata.unknown_references(campaigns, ad_groups)
+    if customer_name is not None:
+        account_metadata.customer_name = customer_name
+    if names and stale_names:
+        _, _, account_metadata.labels = get_labels(gads_service, client, customer_id)
+        _, _, account_metadata.campaign_groups = get_campaign_groups(
+            gads_service, client, customer_id
+        )
+    account_metadata.synced_at = started_at
+    account_metadata.save(customer_id)
+    return account_metadata
+
+
+def complete_labels_audit(gads_service, client, customer_id, **kwargs):
+    """Compile campaign and ad group label assignments for an account.
+
+    Labels, campaign groups, and label assignments are fetched concurrently.
+    Campaign-level labels and groups are resolved once per campaign and
+    shared by all of its ad group rows.
+
+    Args:
+        gads_service (GoogleAdsService): Service used to run GAQL queries.
+        client (GoogleAdsClient): Authenticated client for enum decoding.
+        customer_id (str): Target customer ID.
+        **kwargs: 'incremental' audits from the account's metadata cache,
+            re-fetching only campaigns reported by change_status since the
+            last sync ('sync_metadata'); 'concurrency' sets the fetch threads.
+
+    Returns:
+        tuple[list[list], list[str], dict]: Tabular audit data, column headers,
+        and a structured dictionary keyed by campaign and ad group IDs.
+    """
+
+    incremental = kwargs.get("incremental", False)
+    concurrency = kwargs.get("concurrency") or DEFAULT_CONCURRENCY
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        # label and campaign group metadata load while assignments stream
+        labels_future = executor.submit(get_labels, gads_service, client, customer_id)
+        groups_future = executor.submit(
+            get_campaign_groups, gads_service, client, customer_id
+        )
+        if incremental:
+            account_metadata = sync_metadata(
+                gads_service, client, customer_id, names=False
+            )
+            campaigns = account_metadata.label_audit_records(customer_id)
+        else:
+            campaigns = _fetch_label_audit_campaigns(gads_service, client, customer_id)
+        _, _, label_dict = labels_future.result()
+        _, _, camp_group_dict = groups_future.result()
+    if incremental:
+        # the audit fetched every name anyway, so the cache gets them too
+        account_metadata.labels = label_dict
+        account_metadata.campaign_groups = camp_group_dict
+        account_metadata.save(customer_id)
+    resolve_label = _resource_name_resolver(customer_id, "labels", label_dict)
+    resolve_group = _resource_name_resolver(
+        customer_id, "campaignGroups", camp_group_dict
+    )
+    audit_table = []
+    audit_dict = {}
+    for record in campaigns.values():
+        # resolved once per campaign rather than once per ad group row
+        campaign_labels = [resolve_label(r) for r in record["campaign_labels"]]
+        campaign_labels_text = ", ".join(campaign_labels)
+        campaign_group_name = resolve_group(record["campaign_group"])
+        for ad_group in record["ad_groups"]:
+            ad_group_id, ad_group_name, ad_group_type, label_resources = ad_group
+            ad_group_labels = [resolve_label(r) for r in label_resources]
             # build flat row
             audit_table.append(
                 [
-                    row.customer.id,
-                    row.customer.descriptive_name,
-                    row.campaign.id,
-                    row.campaign.name,
-                    channel_type,
+                    record["customer_id"],
+                    record["customer_name"],
+                    record["campaign_id"],
+                    record["campaign_name"],
+                    record["campaign_type"],
                     campaign_group_name,
-                    ", ".join(campaign_labels),
-                    row.ad_group.id,
-                    row.ad_group.name,
+                    campaign_labels_text,
+                    ad_group_id,
+                    ad_group_name,
                     ad_group_type,
                     ", ".join(ad_group_labels),
                 ]
             )
             # build structured dict
-            audit_dict[(row.campaign.id, row.ad_group.id)] = {
-                "customer_id": row.customer.id,
-                "customer_name": row.customer.descriptive_name,
-                "campaign_id": row.campaign.id,
-                "campaign_name": row.campaign.name,
-                "campaign_type": channel_type,
+            audit_dict[(record["campaign_id"], ad_group_id)] = {
+                "customer_id": record["customer_id"],
+                "customer_name": record["customer_name"],
+                "campaign_id": record["campaign_id"],
+                "campaign_name": record["campaign_name"],
+                "campaign_type": record["campaign_type"],
                 "campaign_group": campaign_group_name,
                 "campaign_labels": campaign_labels,
-                "ad_group_id": row.ad_group.id,
-                "ad_group_name": row.ad_group.name,
+                "ad_group_id": ad_group_id,
+                "ad_group_name": ad_group_name,
                 "ad_group_type": ad_group_type,
                 "ad_group_labels": ad_group_labels,
             }
+    # the audit query's ORDER BY: streamed rows keep their order, while cached
+    # records (grouped by campaign, changed ones last) are put back into it
+    audit_table.sort(key=lambda r: (r[1] or "", r[3], r[8]))
     audit_headers = [
         "account id",
         "account name",
@@ -370,262 +682,1075 @@ def complete_labels_audit(gads_service, client, customer_id):
     return audit_table, audit_headers, audit_dict
 
 
-"""
-PERFORMANCE REPORTS
-"""
+def get_labels_all(gads_service, client, accounts_info, **kwargs):
+    """Fetch enabled labels for multiple accounts concurrently.
 
+    Args:
+        gads_service (GoogleAdsService): Service used for label queries.
+        client (GoogleAdsClient): Authenticated API client.
+        accounts_info (dict[str, str]): Mapping of customer IDs to names.
+        **kwargs: 'concurrency' sets the number of accounts fetched at once.
 
-def camptype_report_single(
-    gads_service, client, start_date, end_date, time_seg, customer_id, **kwargs
-):
-    """Generate the campaign type performance report for a single account.
+    Returns:
+        tuple[list[list[str]], list[str], dict[str, dict[str, str]]]: Combined
+        table data, headers, and label ID to name mappings per customer ID.
+    """
+
+    label_table = []
+    labels_by_account = {}
+    for customer_id, account_descriptive, result in _fan_out_accounts(
+        lambda cid: get_labels(gads_service, client, cid),
+        accounts_info,
+        kwargs.get("concurrency"),
+    ):
+        if result is None:
+            continue
+        table, _, label_dict = result
+        labels_by_account[customer_id] = label_dict
+        label_table += [[account_descriptive, customer_id, *row] for row in table]
+    label_table.sort(key=lambda r: r[0])
+    label_table_headers = ["Account name", "Customer ID", "Label Name", "Label ID"]
+    return label_table, label_table_headers, labels_by_account
+
+
+def get_campaign_groups_all(gads_service, client, accounts_info, **kwargs):
+    """Fetch enabled campaign groups for multiple accounts concurrently.
 
     Args:
-        gads_service (GoogleAdsService): Service used to execute GAQL queries.
-        client (GoogleAdsClient): Authenticated API client for enum decoding.
-        start_date (str): Inclusive start date ('YYYY-MM-DD').
-        end_date (str): Inclusive end date ('YYYY-MM-DD').
-        time_seg (str): Time segmentation key (for example '"date"').
-        customer_id (str): Customer ID for the target account.
-        **kwargs: Optional toggles controlling channel, campaign, and ad group
-            inclusion.
+        gads_service (GoogleAdsService): Service used for GAQL queries.
+        client (GoogleAdsClient): Authenticated API client.
+        accounts_info (dict[str, str]): Mapping of customer IDs to names.
+        **kwargs: 'concurrency' sets the number of accounts fetched at once.
 
     Returns:
-        tuple[list[list], list[str]]: Table rows and corresponding headers.
+        tuple[list[list[str]], list[str], dict[str, dict[str, str]]]: Combined
+        table data, headers, and campaign group mappings per customer ID.
     """
 
-    # enum decoders
-    undecoded_enums = get_enums(client)
-    channel_type_enum, *extra = undecoded_enums
-    time_seg_string = f"segments.{time_seg}"
-    include_mac = kwargs.get("include_mac", False)
-    include_campaign_info = kwargs.get("include_campaign_info", False)
-    # GAQL query
-    camptype_report_query = queries.camptype_report_query(
-        start_date, end_date, time_seg_string, **kwargs
-    )
-    camptype_query_response = gads_service.search_stream(
-        customer_id=customer_id, query=camptype_report_query
-    )
-    # initialize empty list
-    table_data = []
-    # fetch data and populate list
-    for batch in camptype_query_response:
-        for row in batch.results:
-            mac = common.extract_mac(row.campaign.name)
-            channel_type = (
-                channel_type_enum.AdvertisingChannelType.Name(
-                    row.campaign.advertising_channel_type
-                )
-                if hasattr(row.campaign, "advertising_channel_type")
-                else "UNDEFINED"
-            )
-            date_value = getattr(row.segments, time_seg)
-            cost_value = common.micros_to_decimal(
-                row.metrics.cost_micros, Decimal("0.01")
-            )
-            # build dict, primary dims/metrics first
-            camptype_dict = {
-                "Date": date_value,
-                "Account name": row.customer.descriptive_name,
-                "Customer ID": row.customer.id,
-                "Campaign type": channel_type,
-                "Cost": cost_value,
-            }
-            # append campaign info if selected
-            if include_campaign_info:
-                camptype_dict["Campaign"] = row.campaign.name
-            # append mac types if selected
-            if include_mac:
-                camptype_dict["MAC"] = mac
-
-            # append dict
-            table_data.append(camptype_dict)
-    # define headers
-    headers = [
-        "Date",
+    camp_group_table = []
+    groups_by_account = {}
+    for customer_id, account_descriptive, result in _fan_out_accounts(
+        lambda cid: get_campaign_groups(gads_service, client, cid),
+        accounts_info,
+        kwargs.get("concurrency"),
+    ):
+        if result is None:
+            continue
+        table, _, camp_group_dict = result
+        groups_by_account[customer_id] = camp_group_dict
+        camp_group_table += [[account_descriptive, customer_id, *row] for row in table]
+    camp_group_table.sort(key=lambda r: r[0])
+    camp_group_headers = [
         "Account name",
         "Customer ID",
-        "Campaign type",
-    ]  # primary dimensions
-    if include_campaign_info:
-        headers.append("Campaign")
-    if include_mac:
-        headers.append("MAC")
-    headers.append("Cost")  # primary metrics
-    report_dimensions = headers[:-1]
-    # Aggregate by key
-    aggregated = defaultdict(lambda: Decimal("0.00"))
-    for row in table_data:
-        key = tuple(row.get(field) for field in report_dimensions)
-        aggregated[key] += row.get("Cost", Decimal("0.00"))
-    # convert aggregated dict into row of dicts
-    aggregated_rows = [
-        {**dict(zip(report_dimensions, key)), "Cost": total}
-        for key, total in aggregated.items()
+        "Campaign Group Name",
+        "Campaign Group ID",
     ]
-    # sort by date ascending, cost descending
-    table_data_sorted = sorted(
-        aggregated_rows,
-        key=lambda r: (r.get("Date"), r.get("Account name"), -float(r.get("Cost", 0))),
-    )
-    filtered_data = [[row.get(h) for h in headers] for row in table_data_sorted]
-    return filtered_data, headers
+    return camp_group_table, camp_group_headers, groups_by_account
 
 
-def camptype_report_all(
-    gads_service, client, start_date, end_date, time_seg, accounts_info, **kwargs
-):
-    """Generate the campaign type performance report for multiple accounts.
+def _unlabeled_summary(customer_id, account_descriptive, audit_dict):
+    """Count campaigns and ad groups without labels for one account.
+
+    Returns:
+        list: Rollup row matching 'UNLABELED_ROLLUP_HEADERS'.
+    """
+
+    campaigns = {}
+    unlabeled_ad_groups = 0
+    for entry in audit_dict.values():
+        campaigns[entry["campaign_id"]] = not entry["campaign_labels"]
+        if not entry["ad_group_labels"]:
+            unlabeled_ad_groups += 1
+    return [
+        customer_id,
+        account_descriptive,
+        len(campaigns),
+        sum(campaigns.values()),
+        len(audit_dict),
+        unlabeled_ad_groups,
+    ]
+
+
+UNLABELED_ROLLUP_HEADERS = [
+    "account id",
+    "account name",
+    "campaigns",
+    "unlabeled campaigns",
+    "ad_groups",
+    "unlabeled ad_groups",
+]
+
+
+def complete_labels_audit_all(gads_service, client, accounts_info, **kwargs):
+    """Compile label assignments across accounts with an unlabeled rollup.
+
+    Accounts are audited concurrently and each account's rows are folded
+    into the combined table as soon as it completes; only the per-account
+    rollup counts are kept from the structured audit dictionaries.
 
     Args:
-        gads_service (GoogleAdsService): Service used to execute GAQL queries.
-        client (GoogleAdsClient): Authenticated API client.
-        start_date (str): Inclusive start date ('YYYY-MM-DD').
-        end_date (str): Inclusive end date ('YYYY-MM-DD').
-        time_seg (str): Time segmentation key (for example '"date"').
+        gads_service (GoogleAdsService): Service used to run GAQL queries.
+        client (GoogleAdsClient): Authenticated client for enum decoding.
         accounts_info (dict[str, str]): Mapping of customer IDs to names.
-        **kwargs: Optional toggles controlling channel, campaign, and ad group
-            inclusion.
+        **kwargs: 'concurrency' sets the number of accounts audited at once;
+            'incremental' is passed through to 'complete_labels_audit'.
 
     Returns:
-        tuple[list[list], list[str]]: Combined table rows across accounts and
-        the shared headers.
+        tuple[list[list], list[str], list[list], list[str]]: Combined audit
+        rows and headers, followed by the unlabeled campaign rollup (one row
+        per account plus a total) and its headers.
     """
 
-    all_data = []
-    headers: list[str] | None = None
-    for customer_id, account_descriptive in accounts_info.items():
-        print(f"Processing {account_descriptive}...")
-        try:
-            table_data, current_headers = camptype_report_single(
-                gads_service,
-                client,
-                start_date,
-                end_date,
-                time_seg,
-                customer_id,
-                **kwargs,
-            )
-            if headers is None:
-                headers = current_headers
-            all_data.extend(table_data)
-        except Exception as e:
-            print(f"Error processing {account_descriptive} ({customer_id}): {e}")
-    if not all_data:
+    # per-account fetches keep their own small pool for labels and groups
+    account_kwargs = {k: v for k, v in kwargs.items() if k != "concurrency"}
+    audit_table = []
+    audit_headers = None
+    rollup_table = []
+    for customer_id, account_descriptive, result in _fan_out_accounts(
+        lambda cid: complete_labels_audit(gads_service, client, cid, **account_kwargs),
+        accounts_info,
+        kwargs.get("concurrency"),
+    ):
+        if result is None:
+            continue
+        table, audit_headers, audit_dict = result
+        audit_table += table
+        rollup_table.append(
+            _unlabeled_summary(customer_id, account_descriptive, audit_dict)
+        )
+    if audit_headers is None:
         print("No data returned for any accounts.")
-        return [], []
-    if headers is None:
-        print("Report headers could not be determined.")
-        return [], []
-    # sort by: time index (0), account name, descending cost
-    acct_idx = headers.index("Account name") if "Account name" in headers else 1
-    cost_idx = headers.index("Cost") if "Cost" in headers else -1
-    if cost_idx >= 0:
-        all_data_sorted = sorted(
-            all_data, key=lambda r: (r[0], r[acct_idx], -float(r[cost_idx]))
+        return [], [], [], []
+    # stable sort keeps each account's campaign and ad group order
+    audit_table.sort(key=lambda r: r[1])
+    rollup_table.sort(key=lambda r: (-r[3], r[1]))
+    rollup_table.append(
+        [
+            "",
+            "ALL ACCOUNTS",
+            *(sum(r[i] for r in rollup_table) for i in range(2, 6)),
+        ]
+    )
+    return audit_table, audit_headers, rollup_table, UNLABELED_ROLLUP_HEADERS
+
+
+"""
+ROW DECODERS
+
+Module-level decoders, accumulators, and finalizers for the report pipeline,
+so that decode workers (--processes) receive them by reference.
+"""
+
+
+def _channel_type(row, channel_type_enum):
+    """Return the campaign's advertising channel type name."""
+    if hasattr(row.campaign, "advertising_channel_type"):
+        return channel_type_enum.AdvertisingChannelType.Name(
+            row.campaign.advertising_channel_type
         )
-    else:
-        all_data_sorted = sorted(all_data, key=lambda r: (r[0], r[acct_idx]))
-    return all_data_sorted, headers
+    return "UNDEFINED"
 
 
-def mac_report_single(
-    gads_service, client, start_date, end_date, time_seg, customer_id, **kwargs
-):
-    """Generate the Marketing Attribution Codes report for a single account.
+def _entity_fields(row, enums, options, strings):
+    """Return the entity names and campaign type selected with a row.
+
+    ID-only queries ('options["id_only"]') select none of them; they are
+    joined from the account's metadata cache by 'pipeline.EntityJoiner'.
+    """
+
+    if options.get("id_only", False):
+        return {}
+    channel_type_enum, *extra = enums
+    return {
+        "Account name": strings.intern(row.customer.descriptive_name),
+        "Campaign name": strings.intern(row.campaign.name),
+        "Campaign type": _channel_type(row, channel_type_enum),
+        "Ad group name": strings.intern(row.ad_group.name),
+    }
+
+
+def _campaign_cost_row(row, enums, options, strings):
+    """Decode one campaign cost row (campaign type and MAC reports).
 
     Args:
-        gads_service (GoogleAdsService): Service used to execute GAQL queries.
-        client (GoogleAdsClient): Authenticated API client for enum decoding.
-        start_date (str): Inclusive start date ('YYYY-MM-DD').
-        end_date (str): Inclusive end date ('YYYY-MM-DD').
-        time_seg (str): Time segmentation key (for example '"date"').
-        customer_id (str): Customer ID for the target account.
-        **kwargs: Optional toggles controlling channel, campaign, and ad group
-            inclusion.
+        row (GoogleAdsRow): Row from the campaign type or MAC query.
+        enums (tuple): Enum containers returned by 'get_enums'.
+        options (dict): 'time_seg'.
+        strings (aggregation.StringDictionary): Per-run intern table.
 
     Returns:
-        tuple[list[list], list[str]]: Table rows and corresponding headers.
+        dict: Header-keyed values for the row.
     """
 
-    # enum decoders
-    undecoded_enums = get_enums(client)
-    channel_type_enum, *extra = undecoded_enums
-    time_seg_string = f"segments.{time_seg}"
-    include_channel_types = kwargs.get("include_channel_types", False)
-    include_campaign_info = kwargs.get("include_campaign_info", False)
-    # GAQL query
-    mac_report_query = queries.mac_report_query(
-        start_date, end_date, time_seg_string, **kwargs
-    )
-    mac_query_response = gads_service.search_stream(
-        customer_id=customer_id, query=mac_report_query
-    )
-    # initialize empty list
-    table_data = []
-    # fetch data and populate list
-    for batch in mac_query_response:
-        for row in batch.results:
-            mac = common.extract_mac(row.campaign.name)
-            channel_type = (
-                channel_type_enum.AdvertisingChannelType.Name(
-                    row.campaign.advertising_channel_type
-                )
-                if hasattr(row.campaign, "advertising_channel_type")
-                else "UNDEFINED"
-            )
-            date_value = getattr(row.segments, time_seg)
-            cost_value = common.micros_to_decimal(
-                row.metrics.cost_micros, Decimal("0.01")
-            )
-            # build dict, primary dims/metrics first
-            mac_dict = {
-                "Date": date_value,
-                "Account name": row.customer.descriptive_name,
-                "Customer ID": row.customer.id,
-                "MAC": mac,
-                "Cost": cost_value,
-            }
-            # append campaign info if selected
-            if include_campaign_info:
-                mac_dict["Campaign"] = row.campaign.name
-            # append channel types if selected
-            if include_channel_types:
-                mac_dict["Campaign type"] = channel_type
-
-            # append dict
-            table_data.append(mac_dict)
-    # define headers
-    headers = ["Date", "Account name", "Customer ID"]  # primary dimensions
-    if include_campaign_info:
-        headers.append("Campaign")
-    if include_channel_types:
-        headers.append("Campaign type")
-    headers += ["MAC", "Cost"]  # primary metrics
-    # aggregate if campaign info is not included
-    if not include_campaign_info:
-        # determine grouping keys
-        if include_channel_types:
-            group_keys = ["Date", "Account name", "Customer ID", "Campaign type", "MAC"]
-        else:
-            group_keys = ["Date", "Account name", "Customer ID", "MAC"]
-        # Aggregate by key
-        aggregated = defaultdict(
-            lambda: Decimal("0.00")
-        )  # <--- EVALUATE: this may be affecting cost calc
-        for row in table_data:
-            key = tuple(row[k] for k in group_keys)
-            aggregated[key] += row["Cost"]
-        # convert aggregated dict into row of dicts
-        table_data = [
-            dict(zip(group_keys, key), Cost=value) for key, value in aggregated.items()
-        ]
-        headers = group_keys + ["Cost"]
-    # sort by date ascending, cost descending
-    table_data_sorted = sorted(table_data, key=lambda r: (r["Date"], -float(r["Cost"])))
-    filtered_data = [[row.get(h) for h in headers] for row in table_data_sorted]
-    return filtered_data, headers
+    channel_type_enum, *extra = enums
+    campaign_name = strings.intern(row.campaign.name)
+    return {
+        "Date": strings.intern(getattr(row.segments, options["time_seg"])),
+        "Account name": strings.intern(row.customer.descriptive_name),
+        "Customer ID": row.customer.id,
+        "Campaign ID": row.campaign.id,
+        "Campaign name": campaign_name,
+        "Campaign": campaign_name,
+        "Campaign type": _channel_type(row, channel_type_enum),
+        "Cost": common.micros_to_decimal(row.metrics.cost_micros, Decimal("0.01")),
+    }
+
+
+def _cost_new_entry(key):
+    """Build an empty cost aggregate."""
+    return {"Cost": Decimal("0.00")}
+
+
+def _cost_accumulate(entry, row):
+    """Fold one decoded campaign cost row into its aggregate entry."""
+    entry["Cost"] += row.get("Cost", Decimal("0.00"))
+
+
+def _account_row(row, enums, options, strings):
+    """Decode one customer row into an account report row dict.
+
+    Args:
+        row (GoogleAdsRow): Row from the account report query.
+        enums (tuple): Unused; present for the row decoder signature.
+        options (dict): 'time_seg'.
+        strings (aggregation.StringDictionary): Per-run intern table.
+
+    Returns:
+        dict: Header-keyed values for the row.
+    """
+
+    impressions = getattr(row.metrics, "impressions", 0) or 0
+    abs_top_share = row.metrics.absolute_top_impression_percentage or 0
+    top_share = row.metrics.top_impression_percentage or 0
+    return {
+        "date": strings.intern(getattr(row.segments, options["time_seg"])),
+        "account": strings.intern(row.customer.descriptive_name),
+        "customer id": row.customer.id,
+        "cost": common.micros_to_decimal(row.metrics.cost_micros, Decimal("0.01")),
+        "clicks": getattr(row.metrics, "clicks", 0) or 0,
+        "invalid clicks": getattr(row.metrics, "invalid_clicks", 0) or 0,
+        "interactions": row.metrics.interactions,
+        "impressions": impressions,
+        "_abs_top_weight": Decimal(str(abs_top_share)) * impressions,
+        "_top_weight": Decimal(str(top_share)) * impressions,
+    }
+
+
+ACCOUNT_ADDITIVE_FIELDS = (
+    "cost",
+    "clicks",
+    "invalid clicks",
+    "interactions",
+    "impressions",
+    "_abs_top_weight",
+    "_top_weight",
+)
+
+
+def _account_new_entry(key):
+    """Build an empty account aggregate."""
+    entry = dict.fromkeys(ACCOUNT_ADDITIVE_FIELDS, 0)
+    entry["cost"] = Decimal("0.00")
+    return entry
+
+
+def _account_accumulate(entry, row):
+    """Fold one decoded account row into its aggregate entry."""
+    metrics.accumulate(entry, row, ACCOUNT_ADDITIVE_FIELDS)
+
+
+ACCOUNT_DERIVED = metrics.register(
+    "account",
+    ACCOUNT_ADDITIVE_FIELDS,
+    metrics.DerivedMetric(
+        "invalid click %", "invalid clicks", "clicks", default=Decimal("0.0000")
+    ),
+    metrics.ctr("ctr", "clicks", "impressions", default=Decimal("0.0000")),
+    metrics.average_cpc("avg cpc", "cost", "clicks"),
+    metrics.average_cpm("avg cpm", "cost", "impressions"),
+    metrics.weighted_share("abs top is", "_abs_top_weight", "impressions"),
+    metrics.weighted_share("top is %", "_top_weight", "impressions"),
+    order_by=("date", "account", "-cost"),
+)
+
+
+def _account_finalize(entry):
+    """Compute account ratios from the summed base counters."""
+    return metrics.derive(entry, ACCOUNT_DERIVED)
+
+
+AD_LEVEL_ADDITIVE_FIELDS = (
+    "Cost",
+    "Impr.",
+    "Interactions",
+    "Clicks",
+    "Video Views",
+    "Conversions",
+    "Conv. value",
+    "_abs_top_weight",
+    "_top_weight",
+)
+
+PAID_ORG_ADDITIVE_FIELDS = (
+    "org queries",
+    "org impr",
+    "org clicks",
+    "paid impr",
+    "paid clicks",
+    "total queries",
+    "total impr",
+    "total clicks",
+    "_total_cost",
+)
+
+
+def _ad_level_row(row, enums, options, strings):
+    """Decode one ad_group_ad or PMax campaign row into an ad-level row dict.
+
+    Args:
+        row (GoogleAdsRow): Row from the ad_group_ad or PMax campaign query.
+        enums (tuple): Enum containers returned by 'get_enums'.
+        options (dict): 'time_seg' and 'ad_scope' (False for campaign-scoped
+            PMax rows, which carry no ad group or ad type).
+        strings (aggregation.StringDictionary): Per-run intern table.
+
+    Returns:
+        dict: Header-keyed values for the row.
+    """
+
+    _, ad_group_type_enum, ad_type_enum, *extra = enums
+    ad_group_type = "UNDEFINED"
+    ad_type = "UNDEFINED"
+    if options.get("ad_scope", True):
+        if not options.get("id_only", False) and hasattr(row.ad_group, "type_"):
+            ad_group_type = ad_group_type_enum.AdGroupType.Name(row.ad_group.type_)
+        if hasattr(row.ad_group_ad.ad, "type_"):
+            ad_type = ad_type_enum.AdType.Name(row.ad_group_ad.ad.type_)
+    impressions = getattr(row.metrics, "impressions", 0) or 0
+    abs_top_share = row.metrics.absolute_top_impression_percentage or 0
+    top_share = row.metrics.top_impression_percentage or 0
+    conversions_metric = Decimal(str(getattr(row.metrics, "conversions", 0) or 0))
+    conv_value_metric = Decimal(
+        str(getattr(row.metrics, "conversions_value", 0) or 0)
+    ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    return {
+        "Date": strings.intern(getattr(row.segments, options["time_seg"])),
+        "Customer ID": row.customer.id,
+        "Campaign ID": row.campaign.id,
+        "Ad group ID": row.ad_group.id,
+        "Ad group type": ad_group_type,
+        **_entity_fields(row, enums, options, strings),
+        "Ad ID": row.ad_group_ad.ad.id,
+        "Ad type": ad_type,
+        "Cost": common.micros_to_decimal(row.metrics.cost_micros, Decimal("0.01")),
+        "Impr.": impressions,
+        "Interactions": getattr(row.metrics, "interactions", 0) or 0,
+        "Clicks": getattr(row.metrics, "clicks", 0) or 0,
+        "Video Views": getattr(row.metrics, "video_views", 0) or 0,
+        "Conversions": conversions_metric,
+        "Conv. value": conv_value_metric,
+        # impression shares are averaged by impressions, so their weights sum
+        "_abs_top_weight": Decimal(str(abs_top_share)) * impressions,
+        "_top_weight": Decimal(str(top_share)) * impressions,
+    }
+
+
+def _ad_level_new_entry(key):
+    """Build an empty ad-level aggregate (dimensions live in the encoded key)."""
+    return {
+        "Cost": Decimal("0.00"),
+        "Impr.": 0,
+        "Interactions": 0,
+        "Clicks": 0,
+        "Video Views": 0,
+        "Conversions": Decimal("0"),
+        "Conv. value": Decimal("0.00"),
+        "_abs_top_weight": Decimal("0"),
+        "_top_weight": Decimal("0"),
+    }
+
+
+def _ad_level_accumulate(entry, row):
+    """Fold one decoded ad-level row into its aggregate entry."""
+    metrics.accumulate(entry, row, AD_LEVEL_ADDITIVE_FIELDS)
+
+
+# ad -> ad group -> campaign -> account; MAC and channel follow the campaign
+_ACCOUNT_LEVEL = ("Date", "Account name", "Customer ID")
+_CAMPAIGN_LEVEL = _ACCOUNT_LEVEL + (
+    "Campaign ID",
+    "Campaign name",
+    "MAC",
+    "Campaign type",
+)
+_AD_GROUP_LEVEL = _CAMPAIGN_LEVEL + ("Ad group ID", "Ad group name", "Ad group type")
+AD_LEVEL_GROUPING_SETS = pipeline.GroupingSets(
+    levels=(
+        ("Account", _ACCOUNT_LEVEL),
+        ("Campaign", _CAMPAIGN_LEVEL),
+        ("Ad group", _AD_GROUP_LEVEL),
+        ("Ad", _AD_GROUP_LEVEL + ("Ad ID", "Ad type")),
+    ),
+    metric="Cost",
+)
+
+AD_LEVEL_DERIVED = metrics.register(
+    "ads",
+    AD_LEVEL_ADDITIVE_FIELDS,
+    metrics.average_cpc("Avg CPC", "Cost", "Clicks"),
+    metrics.average_cpm("Avg CPM", "Cost", "Impr."),
+    metrics.weighted_share("Abs Top Imp%", "_abs_top_weight", "Impr."),
+    metrics.weighted_share("Top Imp%", "_top_weight", "Impr."),
+    order_by=("Date", "Account name", "-Cost"),
+    grouping_sets=AD_LEVEL_GROUPING_SETS,
+)
+
+
+def _ad_level_finalize(entry):
+    """Round totals and compute ad-level ratios from the summed metrics."""
+    metrics.quantize(entry, ("Cost", "Conversions", "Conv. value"), metrics.CENTS)
+    return metrics.derive(entry, AD_LEVEL_DERIVED)
+
+
+def _click_view_row(row, enums, options, strings):
+    """Decode one click_view row into a row dict.
+
+    Args:
+        row (GoogleAdsRow): Row from the ClickView query.
+        enums (tuple): Enum containers returned by 'get_enums'.
+        options (dict): 'time_seg'.
+        strings (aggregation.StringDictionary): Per-run intern table.
+
+    Returns:
+        dict: Header-keyed values for the row.
+    """
+
+    (
+        *extra,
+        click_type_enum,
+        keyword_match_type_enum,
+        device_type_enum,
+    ) = enums
+    click_type = (
+        click_type_enum.ClickType.Name(row.segments.click_type)
+        if hasattr(row.segments, "click_type")
+        else "UNDEFINED"
+    )
+    keyword_match_type = (
+        keyword_match_type_enum.KeywordMatchType.Name(
+            row.click_view.keyword_info.match_type
+        )
+        if getattr(row.click_view, "keyword_info", None)
+        and hasattr(row.click_view.keyword_info, "match_type")
+        else "UNDEFINED"
+    )
+    device_type = (
+        device_type_enum.Device.Name(row.segments.device)
+        if hasattr(row.segments, "device")
+        else "UNDEFINED"
+    )
+    # cleaning needed for text, returning values with '=' (also '+' but those are bid modifiers from old targets)
+    keyword_text = (
+        (row.click_view.keyword_info.text).strip()
+        if getattr(row.click_view, "keyword_info", None)
+        else None
+    )
+    return {
+        "Date": strings.intern(getattr(row.segments, options["time_seg"])),
+        "Customer ID": row.customer.id,
+        "Campaign ID": row.campaign.id,
+        "Ad group ID": row.ad_group.id,
+        **_entity_fields(row, enums, options, strings),
+        # "Ad": row.click_view.ad_group_ad, # needs resource parsing
+        "gclid": row.click_view.gclid,
+        # "keyword target": row.click_view.keyword, # needs resource parsing
+        "keyword match type": keyword_match_type,
+        "keyword text": strings.intern(keyword_text),
+        "SERP #": row.click_view.page_number,
+        # "loc_country": row.click_view.location_of_presence.country,
+        # "loc_region": row.click_view.location_of_presence.region,
+        # "loc_metro": row.click_view.location_of_presence.metro,
+        # "loc_city": row.click_view.location_of_presence.city,
+        # "loc_specific": row.click_view.location_of_presence.most_specific,
+        # "interest_country": row.click_view.area_of_interest.country,
+        # "interest_region": row.click_view.area_of_interest.region,
+        # "interest_metro": row.click_view.area_of_interest.metro,
+        # "interest_city": row.click_view.area_of_interest.city,
+        # "interest_specific": row.click_view.area_of_interest.most_specific,
+        "device": device_type,
+        "click type": click_type,
+        "clicks": row.metrics.clicks,
+    }
+
+
+def _click_view_new_entry(key):
+    """Build an empty click aggregate."""
+    return {"clicks": 0}
+
+
+def _click_view_accumulate(entry, row):
+    """Fold one decoded click_view row into its aggregate entry."""
+    entry["clicks"] += row.get("clicks", 0) or 0
+
+
+def _paid_org_row(row, enums, options, strings):
+    """Decode one paid_organic_search_term_view row into a row dict.
+
+    Args:
+        row (GoogleAdsRow): Row from the paid and organic search term query.
+        enums (tuple): Enum containers returned by 'get_enums'.
+        options (dict): 'time_seg'.
+        strings (aggregation.StringDictionary): Per-run intern table.
+
+    Returns:
+        dict: Header-keyed values for the row.
+    """
+
+    (
+        *extra,
+        serp_type_enum,
+        click_type,
+        keyword_match_type_enum,
+        device_type_enum,
+    ) = enums
+    serp_type = (
+        serp_type_enum.SearchEngineResultsPageType.Name(
+            row.segments.search_engine_results_page_type
+        )
+        if hasattr(row.segments, "search_engine_results_page_type")
+        else "UNDEFINED"
+    )
+    keyword_match_type = (
+        keyword_match_type_enum.KeywordMatchType.Name(
+            row.segments.keyword.info.match_type
+        )
+        if getattr(row.segments, "keyword", None)
+        and hasattr(row.segments.keyword, "info")
+        and hasattr(row.segments.keyword.info, "match_type")
+        else "UNDEFINED"
+    )
+    device_type = (
+        device_type_enum.Device.Name(row.segments.device)
+        if hasattr(row.segments, "device")
+        else "UNDEFINED"
+    )
+    organic_impressions = getattr(row.metrics, "organic_impressions", 0) or 0
+    paid_impressions = getattr(row.metrics, "impressions", 0) or 0
+    paid_clicks = getattr(row.metrics, "clicks", 0) or 0
+    # the view reports no cost, so it is rebuilt from the average CPC
+    avg_cpc_value = (
+        common.micros_to_decimal(
+            getattr(row.metrics, "average_cpc", 0) or 0, Decimal("0.001")
+        )
+        if paid_clicks
+        else Decimal("0.000")
+    )
+    keyword_info = getattr(getattr(row.segments, "keyword", None), "info", None)
+    keyword_text = getattr(keyword_info, "text", None) if keyword_info else None
+    # build row dict with response
+    return {
+        "Date": strings.intern(getattr(row.segments, options["time_seg"])),
+        "Customer ID": row.customer.id,
+        "Campaign ID": row.campaign.id,
+        "Ad group ID": row.ad_group.id,
+        **_entity_fields(row, enums, options, strings),
+        "device": device_type,
+        "SERP type": serp_type,
+        "keyword match type": keyword_match_type,
+        "keyword text": strings.intern(keyword_text),
+        "org queries": getattr(row.metrics, "organic_queries", 0) or 0,
+        "org impr": organic_impressions,
+        "org clicks": getattr(row.metrics, "organic_clicks", 0) or 0,
+        "paid impr": paid_impressions,
+        "paid clicks": paid_clicks,
+        "total queries": getattr(row.metrics, "combined_queries", 0) or 0,
+        "total impr": organic_impressions + paid_impressions,
+        "total clicks": getattr(row.metrics, "combined_clicks", 0) or 0,
+        "_total_cost": avg_cpc_value * paid_clicks,
+    }
+
+
+def _paid_org_new_entry(key):
+    """Build an empty search term aggregate (dimensions live in the encoded key)."""
+    entry = {field: 0 for field in PAID_ORG_ADDITIVE_FIELDS}
+    entry["_total_cost"] = Decimal("0.00")
+    return entry
+
+
+def _paid_org_accumulate(entry, row):
+    """Fold one decoded paid/organic search term row into its aggregate entry."""
+    metrics.accumulate(entry, row, PAID_ORG_ADDITIVE_FIELDS)
+
+
+PAID_ORG_DERIVED = metrics.register(
+    "paid_organic_terms",
+    PAID_ORG_ADDITIVE_FIELDS + ("total cost",),
+    metrics.per_query("org impr per query", "org impr", "org queries"),
+    metrics.per_query("org clicks per query", "org clicks", "org queries"),
+    metrics.ctr("paid ctr", "paid clicks", "paid impr"),
+    metrics.average_cpc("avg cpc", "_total_cost", "paid clicks"),
+    metrics.per_query("total clicks per query", "total clicks", "total queries"),
+    order_by=("Date", "Account name", "-total clicks"),
+    totals=(("_total_cost", "total cost"),),
+)
+
+
+def _paid_org_finalize(entry):
+    """Compute search term ratios and total cost from the summed metrics."""
+    entry["total cost"] = entry["_total_cost"].quantize(
+        metrics.CENTS, rounding=ROUND_HALF_UP
+    )
+    return metrics.derive(entry, PAID_ORG_DERIVED)
+
+
+_CAMPAIGN_COST_SPEC = pipeline.RowSpec(
+    _campaign_cost_row, _cost_new_entry, _cost_accumulate, ("Cost",)
+)
+_ACCOUNT_SPEC = pipeline.RowSpec(
+    _account_row, _account_new_entry, _account_accumulate, ACCOUNT_ADDITIVE_FIELDS
+)
+_AD_LEVEL_SPEC = pipeline.RowSpec(
+    _ad_level_row, _ad_level_new_entry, _ad_level_accumulate, AD_LEVEL_ADDITIVE_FIELDS
+)
+_CLICK_VIEW_SPEC = pipeline.RowSpec(
+    _click_view_row, _click_view_new_entry, _click_view_accumulate, ("clicks",)
+)
+metrics.register("camptype", ("Cost",), order_by=("Date", "Account name", "-Cost"))
+metrics.register("mac", ("Cost",), order_by=("Date", "Account name", "-Cost"))
+metrics.register("clickview", ("clicks",), order_by=("Date", "Account name", "-clicks"))
+_PAID_ORG_SPEC = pipeline.RowSpec(
+    _paid_org_row, _paid_org_new_entry, _paid_org_accumulate, PAID_ORG_ADDITIVE_FIELDS
+)
+
+
+"""
+PERFORMANCE REPORTS
+"""
+
+
+def _run_strings(kwargs):
+    """Return the per-run string dictionary, or a fresh one for this call.
+
+    '*_all' reports place one dictionary in 'kwargs["strings"]' so every
+    account in the run shares the same intern table and key codes.
+    """
+    strings = kwargs.get("strings")
+    return strings if strings is not None else aggregation.StringDictionary()
+
+
+def _run_mac_resolver(kwargs, strings):
+    """Return the per-run MAC resolver, or a fresh one built from 'mac_rules'."""
+    macs = kwargs.get("mac_resolver")
+    if macs is None:
+        macs = common.MacResolver(kwargs.get("mac_rules"), strings=strings)
+    return macs
+
+
+def _load_mac_labels(gads_service, client, customer_id, macs, account_metadata=None):
+    """Fetch campaign label names for 'label:' MAC rules once per account.
+
+    Args:
+        gads_service (GoogleAdsService): Service used for GAQL queries.
+        client (GoogleAdsClient): Authenticated API client.
+        customer_id (str): Target customer ID.
+        macs (common.MacResolver): Resolver receiving the label names.
+        account_metadata (metadata.AccountMetadata | None): Synced metadata
+            cache to read them from instead of querying.
+    """
+
+    if not macs.needs_labels or customer_id in macs.labelled_customers:
+        return
+    if account_metadata is not None:
+        macs.add_campaign_labels(account_metadata.campaign_labels())
+        macs.labelled_customers.add(customer_id)
+        return
+    _, _, label_dict = get_labels(gads_service, client, customer_id)
+    response = gads_service.search_stream(
+        customer_id=customer_id, query=queries.campaign_label_query()
+    )
+    labels_by_campaign = {}
+    for batch in response:
+        for row in batch.results:
+            # resource names look like customers/{customer_id}/labels/{label_id}
+            names = (
+                label_dict.get(resource.rsplit("/", 1)[-1])
+                for resource in row.campaign.labels
+            )
+            labels_by_campaign[row.campaign.id] = tuple(n for n in names if n)
+    macs.add_campaign_labels(labels_by_campaign)
+    macs.labelled_customers.add(customer_id)
+
+
+def merge_account_results(result_sets, headers, metric_header):
+    """Merge per-account report outputs without re-sorting the combined rows.
+
+    Each '*_single' report returns rows sorted by time index and descending
+    metric for one account, so a k-way merge on (time index, account name,
+    descending metric) yields the same order as a global sort.
+
+    Args:
+        result_sets (list[list[list]]): Sorted table rows per account.
+        headers (list[str]): Shared report headers.
+        metric_header (str): Metric column ordered descending within a date.
+
+    Returns:
+        list[list]: Combined rows across accounts.
+    """
+
+    acct_header = "account" if "account" in headers else "Account name"
+    acct_idx = headers.index(acct_header) if acct_header in headers else 1
+    # grouping-sets rows are ordered by hierarchy within each account
+    if metric_header in headers and pipeline.LEVEL_FIELD not in headers:
+        metric_idx = headers.index(metric_header)
+
+        def sort_key(r):
+            return (r[0], r[acct_idx], -common.metric_sort_value(r[metric_idx]))
+    else:
+
+        def sort_key(r):
+            return (r[0], r[acct_idx])
+
+    return common.merge_sorted_results(
+        [rows for rows in result_sets if rows], key=sort_key
+    )
+
+
+def _each_account(fetch_single, accounts_info):
+    """Run 'fetch_single' for each account in turn.
+
+    Yields:
+        tuple[str, str, Any]: '(customer_id, account name, result)', with
+        'None' as the result when the account failed.
+    """
+
+    for customer_id, account_descriptive in accounts_info.items():
+        print(f"Processing {account_descriptive}...")
+        try:
+            result = fetch_single(customer_id)
+        except Exception as e:
+            print(f"Error processing {account_descriptive} ({customer_id}): {e}")
+            result = None
+        yield customer_id, account_descriptive, result
+
+
+def _combine_account_results(account_results, metric_header, result_sink=None):
+    """Combine per-account '(rows, headers)' results into one report.
+
+    With a 'result_sink' each account's rows are handed over as soon as the
+    account completes and are not kept, so memory stays bounded by the
+    accounts in flight; the combined table is then empty.
+
+    Args:
+        account_results (Iterable[tuple]): '(customer_id, account name,
+            (rows, headers) | None)' triples, as yielded by '_each_account'
+            or '_fan_out_accounts'.
+        metric_header (str): Metric column ordered descending within a date.
+        result_sink (Callable | None): Called with '(customer_id, account
+            name, rows, headers)' per account instead of merging.
+
+    Returns:
+        tuple[list[list], list[str]]: Combined table rows and headers.
+    """
+
+    result_sets = []
+    headers: list[str] | None = None
+    for customer_id, account_descriptive, result in account_results:
+        if result is None:
+            continue
+        table_data, current_headers = result
+        if headers is None:
+            headers = current_headers
+        if result_sink is not None:
+            if table_data:
+                result_sink(customer_id, account_descriptive, table_data, headers)
+            continue
+        result_sets.append(table_data)
+    if headers is None:
+        print("No data returned for any accounts.")
+        return [], []
+    if result_sink is not None:
+        return [], headers
+    if not any(result_sets):
+        print("No data returned for any accounts.")
+        return [], []
+    # k-way merge of per-account outputs already sorted by date, account, metric
+    return merge_account_results(result_sets, headers, metric_header), headers
+
+
+def _account_metadata(gads_service, client, customer_id, kwargs):
+    """Return the account's metadata cache, synced at most once per report.
+
+    Planning ('plan_sink') reads the cache as it stands, without requests.
+    """
+
+    account_metadata = kwargs.get("account_metadata")
+    if account_metadata is None:
+        if kwargs.get("plan_sink") is not None:
+            account_metadata = metadata.AccountMetadata.load(customer_id)
+        else:
+            account_metadata = sync_metadata(gads_service, client, customer_id)
+        kwargs["account_metadata"] = account_metadata
+    return account_metadata
+
+
+def _mac_enrichers(gads_service, client, customer_id, kwargs, strings, include_mac):
+    """Return the enrich stages adding a 'MAC' column, if it was requested."""
+    if not include_mac:
+        return []
+    macs = _run_mac_resolver(kwargs, strings)
+    # planning only ('--explain') must not issue requests
+    if kwargs.get("plan_sink") is None:
+        account_metadata = None
+        if kwargs.get("incremental", False) or kwargs.get("id_only", False):
+            account_metadata = _account_metadata(
+                gads_service, client, customer_id, kwargs
+            )
+        _load_mac_labels(gads_service, client, customer_id, macs, account_metadata)
+    return [pipeline.MacEnricher(macs)]
+
+
+def _entity_enrichers(gads_service, client, customer_id, kwargs):
+    """Return the enrich stage joining names onto ID-only rows, if requested.
+
+    With 'id_only', metric queries select IDs only and account, campaign,
+    and ad group names and types come from the account's metadata cache
+    ('sync_metadata'), so long names are not repeated on every row fetched.
+    """
+
+    if not kwargs.get("id_only", False):
+        return []
+    account_metadata = _account_metadata(gads_service, client, customer_id, kwargs)
+    campaigns, ad_groups = account_metadata.entity_names()
+    return [pipeline.EntityJoiner(account_metadata.customer_name, campaigns, ad_groups)]
+
+
+def _rollup_enrichers(time_seg, kwargs, field="Date"):
+    """Return the enrich stage rolling daily rows up to 'time_seg'."""
+    return rollup.enrichers(time_seg, field, kwargs.get("fiscal_year_start", 1))
+
+
+def _day_partitioned(report):
+    """Serve a performance '*_single' report through a 'result_store'.
+
+    With 'result_store' ('store.ResultStore') in the keyword arguments, the
+    stored days of the window are read back and only the missing ones are
+    fetched. Planning ('plan_sink') always sees the whole window.
+    """
+
+    def decorate(report_single):
+        @functools.wraps(report_single)
+        def wrapper(
+            gads_service, client, start_date, end_date, time_seg, customer_id, **kwargs
+        ):
+            result_store = kwargs.pop("result_store", None)
+            if result_store is None or kwargs.get("plan_sink") is not None:
+                return report_single(
+                    gads_service,
+                    client,
+                    start_date,
+                    end_date,
+                    time_seg,
+                    customer_id,
+                    **kwargs,
+                )
+            return result_store.serve(
+                report,
+                report_single,
+                gads_service,
+                client,
+                start_date,
+                end_date,
+                time_seg,
+                customer_id,
+                **kwargs,
+            )
+
+        return wrapper
+
+    return decorate
+
+
+def _run_plan(gads_service, client, customer_id, plan, strings, kwargs):
+    """Run a report plan with the run-wide options found in 'kwargs'.
+
+    A 'plan_sink' receives '(customer_id, plan)' instead of the plan being
+    executed; a 'run_history' recorder ('history.RunRecorder') receives the
+    account's row counts and duration.
+    """
+
+    plan_sink = kwargs.get("plan_sink")
+    if plan_sink is not None:
+        plan_sink(customer_id, plan)
+        return [], plan.headers
+    stats = {"api_rows": 0}
+    started = time.monotonic()
+    rows, headers = pipeline.run_report(
+        gads_service,
+        client,
+        customer_id,
+        plan,
+        strings,
+        memory_limit=kwargs.get("memory_limit"),
+        processes=kwargs.get("processes"),
+        stats=stats,
+    )
+    recorder = kwargs.get("run_history")
+    if recorder is not None:
+        recorder.record(
+            customer_id, stats["api_rows"], len(rows), time.monotonic() - started
+        )
+    return rows, headers
+
+
+@_day_partitioned("camptype")
+def camptype_report_single(
+    gads_service, client, start_date, end_date, time_seg, customer_id, **kwargs
+):
+    """Generate the campaign type performance report for a single account.
+
+    Args:
+        gads_service (GoogleAdsService): Service used to execute GAQL queries.
+        client (GoogleAdsClient): Authenticated API client for enum decoding.
+        start_date (str): Inclusive start date ('YYYY-MM-DD').
+        end_date (str): Inclusive end date ('YYYY-MM-DD').
+        time_seg (str): Time segmentation key (for example '"date"').
+        customer_id (str): Customer ID for the target account.
+        **kwargs: Optional toggles controlling channel, campaign, and ad group
+            inclusion.
+
+    Returns:
+        tuple[list[list], list[str]]: Table rows and corresponding headers.
+    """
+
+    # fetched by day; coarser segments are rolled up locally
+    time_seg_string = "segments.date"
+    include_mac = kwargs.get("include_mac", False)
+    include_campaign_info = kwargs.get("include_campaign_info", False)
+    strings = _run_strings(kwargs)
+    # define headers
+    headers = [
+        "Date",
+        "Account name",
+        "Customer ID",
+        "Campaign type",
+    ]  # primary dimensions
+    if include_campaign_info:
+        headers.append("Campaign")
+    if include_mac:
+        headers.append("MAC")
+    headers.append("Cost")  # primary metrics
+    plan = pipeline.ReportPlan(
+        row_spec=_CAMPAIGN_COST_SPEC,
+        queries=[
+            (
+                queries.camptype_report_query(
+                    start_date, end_date, time_seg_string, **kwargs
+                ),
+                {"time_seg": "date"},
+            )
+        ],
+        headers=headers,
+        dimensions=headers[:-1],
+        enrichers=_rollup_enrichers(time_seg, kwargs)
+        + _mac_enrichers(
+            gads_service, client, customer_id, kwargs, strings, include_mac
+        ),
+        # sort by date ascending, cost descending
+        order_by=["Date", "Account name", "-Cost"],
+    )
+    return _run_plan(gads_service, client, customer_id, plan, strings, kwargs)
+
+
+def camptype_report_all(
+    gads_service, client, start_date, end_date, time_seg, accounts_info, **kwargs
+):
+    """Generate the campaign type performance report for multiple accounts.
+
+    Args:
+        gads_service (GoogleAdsService): Service used to execute GAQL queries.
+        client (GoogleAdsClient): Authenticated API client.
+        start_date (str): Inclusive start date ('YYYY-MM-DD').
+        end_date (str): Inclusive end date ('YYYY-MM-DD').
+        time_seg (str): Time segmentation key (for example '"date"').
+        accounts_info (dict[str, str]): Mapping of customer IDs to names.
+        **kwargs: Optional toggles controlling channel, campaign, and ad group
+            inclusion.
+
+    Returns:
+        tuple[list[list], list[str]]: Combined table rows across accounts and
+        the shared headers.
+    """
+
+    # one intern table per run, shared by every account
+    kwargs.setdefault("strings", aggregation.StringDictionary())
+    kwargs.setdefault(
+        "mac_resolver",
+        common.MacResolver(kwargs.get("mac_rules"), strings=kwargs["strings"]),
+    )
+    return _combine_account_results(
+        _each_account(
+            lambda cid: camptype_report_single(
+                gads_service, client, start_date, end_date, time_seg, cid, **kwargs
+            ),
+            accounts_info,
+        ),
+        "Cost",
+        kwargs.get("result_sink"),
+    )
+
+
+@_day_partitioned("mac")
+def mac_report_single(
+    gads_service, client, start_date, end_date, time_seg, customer_id, **kwargs
+):
+    """Generate the Marketing Attribution Codes report for a single account.
+
+    Args:
+        gads_service (GoogleAdsService): Service used to execute GAQL queries.
+        client (GoogleAdsClient): Authenticated API client for enum decoding.
+        start_date (str): Inclusive start date ('YYYY-MM-DD').
+        end_date (str): Inclusive end date ('YYYY-MM-DD').
+        time_seg (str): Time segmentation key (for example '"date"').
+        customer_id (str): Customer ID for the target account.
+        **kwargs: Optional toggles controlling channel, campaign, and ad group
+            inclusion.
+
+    Returns:
+        tuple[list[list], list[str]]: Table rows and corresponding headers.
+    """
+
+    # fetched by day; coarser segments are rolled up locally
+    time_seg_string = "segments.date"
+    include_channel_types = kwargs.get("include_channel_types", False)
+    include_campaign_info = kwargs.get("include_campaign_info", False)
+    strings = _run_strings(kwargs)
+    # define headers
+    headers = ["Date", "Account name", "Customer ID"]  # primary dimensions
+    if include_campaign_info:
+        # campaigns sharing a name stay apart, also when rolled up locally
+        headers += ["Campaign ID", "Campaign"]
+    if include_channel_types:
+        headers.append("Campaign type")
+    headers += ["MAC", "Cost"]  # primary metrics
+    plan = pipeline.ReportPlan(
+        row_spec=_CAMPAIGN_COST_SPEC,
+        queries=[
+            (
+                queries.mac_report_query(
+                    start_date, end_date, time_seg_string, **kwargs
+                ),
+                {"time_seg": "date"},
+            )
+        ],
+        headers=headers,
+        dimensions=headers[:-1],
+        enrichers=_rollup_enrichers(time_seg, kwargs)
+        + _mac_enrichers(gads_service, client, customer_id, kwargs, strings, True),
+        # sort by date ascending, cost descending
+        order_by=["Date", "-Cost"],
+    )
+    return _run_plan(gads_service, client, customer_id, plan, strings, kwargs)
 
 
 def mac_report_all(
@@ -648,43 +1773,25 @@ def mac_report_all(
         the shared headers.
     """
 
-    all_data = []
-    headers: list[str] | None = None
-    for customer_id, account_descriptive in accounts_info.items():
-        print(f"Processing {account_descriptive}...")
-        try:
-            table_data, current_headers = mac_report_single(
-                gads_service,
-                client,
-                start_date,
-                end_date,
-                time_seg,
-                customer_id,
-                **kwargs,
-            )
-            if headers is None:
-                headers = current_headers
-            all_data.extend(table_data)
-        except Exception as e:
-            print(f"Error processing {account_descriptive} ({customer_id}): {e}")
-    if not all_data:
-        print("No data returned for any accounts.")
-        return [], []
-    if headers is None:
-        print("Report headers could not be determined.")
-        return [], []
-    # sort by: time index (0), account name, descending cost
-    acct_idx = headers.index("Account name") if "Account name" in headers else 1
-    cost_idx = headers.index("Cost") if "Cost" in headers else -1
-    if cost_idx >= 0:
-        all_data_sorted = sorted(
-            all_data, key=lambda r: (r[0], r[acct_idx], -float(r[cost_idx]))
-        )
-    else:
-        all_data_sorted = sorted(all_data, key=lambda r: (r[0], r[acct_idx]))
-    return all_data_sorted, headers
+    # one intern table per run, shared by every account
+    kwargs.setdefault("strings", aggregation.StringDictionary())
+    kwargs.setdefault(
+        "mac_resolver",
+        common.MacResolver(kwargs.get("mac_rules"), strings=kwargs["strings"]),
+    )
+    return _combine_account_results(
+        _each_account(
+            lambda cid: mac_report_single(
+                gads_service, client, start_date, end_date, time_seg, cid, **kwargs
+            ),
+            accounts_info,
+        ),
+        "Cost",
+        kwargs.get("result_sink"),
+    )
 
 
+@_day_partitioned("account")
 def account_report_single(
     gads_service, client, start_date, end_date, time_seg, customer_id, **kwargs
 ):
@@ -702,55 +1809,9 @@ def account_report_single(
     Returns:
         tuple[list[list], list[str]]: Table rows and headers.
     """
-    # enum decoders
-    time_seg_string = f"segments.{time_seg}"
-    # initialize an empty list to store the data
-    table_data = []
-    # GAQL query
-    account_report_query = queries.account_report_query(
-        start_date, end_date, time_seg_string
-    )
-    # fetch data and populate the table_data list
-    account_report_response = gads_service.search_stream(
-        customer_id=customer_id, query=account_report_query
-    )
-    for data in account_report_response:
-        for row in data.results:
-            date_value = getattr(row.segments, time_seg)
-            # build dict struct
-            clicks = getattr(row.metrics, "clicks", 0) or 0
-            invalid_clicks = getattr(row.metrics, "invalid_clicks", 0) or 0
-            invalid_click_pct = (
-                (Decimal(invalid_clicks) / Decimal(clicks)).quantize(
-                    Decimal("0.0001"), rounding=ROUND_HALF_UP
-                )
-                if clicks
-                else Decimal("0.0000")
-            )
-            account_report_dict = {
-                "date": date_value,
-                "account": row.customer.descriptive_name,
-                "customer id": row.customer.id,
-                "cost": common.micros_to_decimal(
-                    row.metrics.cost_micros, Decimal("0.01")
-                ),
-                "clicks": clicks,
-                "invalid clicks": invalid_clicks,
-                "invalid click %": invalid_click_pct,
-                "interactions": row.metrics.interactions,
-                "impressions": row.metrics.impressions,
-                "ctr": row.metrics.ctr,
-                "avg cpc": common.micros_to_decimal(
-                    row.metrics.average_cpc, Decimal("0.001")
-                ),
-                "avg cpm": common.micros_to_decimal(
-                    row.metrics.average_cpm, Decimal("0.001")
-                ),
-                "abs top is": row.metrics.absolute_top_impression_percentage,
-                "top is %": row.metrics.top_impression_percentage,
-            }
-            # append data
-            table_data.append(account_report_dict)
+    # fetched by day; coarser segments are rolled up locally
+    time_seg_string = "segments.date"
+    strings = _run_strings(kwargs)
     # define the headers for the table
     headers = ["date", "account", "customer id"]  # primary dimensions
     # seperate metric headers, in case needing to expand later
@@ -767,12 +1828,22 @@ def account_report_single(
         "abs top is",
         "top is %",
     ]
-    filtered_data = [[row[h] for h in headers] for row in table_data]
-    # sort by: time index (0), descending cost
-    table_data_sorted = sorted(
-        filtered_data, key=lambda r: (r[0], -float(r[headers.index("cost")]))
+    plan = pipeline.ReportPlan(
+        row_spec=_ACCOUNT_SPEC,
+        queries=[
+            (
+                queries.account_report_query(start_date, end_date, time_seg_string),
+                {"time_seg": "date"},
+            )
+        ],
+        headers=headers,
+        dimensions=headers[:3],
+        enrichers=_rollup_enrichers(time_seg, kwargs, field="date"),
+        finalize=_account_finalize,
+        # sort by: time index, descending cost
+        order_by=["date", "-cost"],
     )
-    return table_data_sorted, headers
+    return _run_plan(gads_service, client, customer_id, plan, strings, kwargs)
 
 
 def account_report_all(
@@ -788,43 +1859,40 @@ def account_report_all(
         time_seg (str): Time segmentation key.
         accounts_info (dict[str, str]): Mapping of customer IDs to account
             names.
-        **kwargs: Reserved for future report toggle options.
+        **kwargs: Run options passed to each account's report;
+            'concurrency' sets the number of accounts queried at once.
 
     Returns:
         tuple[list[list], list[str]]: Combined table rows and headers.
     """
-    all_data = []
-    headers: list[str] | None = None
-    for customer_id, account_descriptive in accounts_info.items():
-        print(f"Processing {account_descriptive}...")
-        try:
-            table_data, current_headers = account_report_single(
-                gads_service, client, start_date, end_date, time_seg, customer_id
-            )
-            if headers is None:
-                headers = current_headers
-            all_data.extend(table_data)
-        except Exception as e:
-            print(f"Error processing {account_descriptive} ({customer_id}): {e}")
-    if not all_data:
-        print("No data returned for any accounts.")
-        return [], []
-    if headers is None:
-        print("Report headers could not be determined.")
-        return [], []
-    # sort by: time index (0), account name (1), descending cost
-    cost_idx = headers.index("cost") if "cost" in headers else None
-    acct_idx = headers.index("account") if "account" in headers else None
-    if cost_idx is not None and acct_idx is not None:
-        all_data_sorted = sorted(
-            all_data, key=lambda r: (r[0], r[acct_idx], -float(r[cost_idx]))
-        )
-    else:
-        # fallback to date sort if error
-        all_data_sorted = sorted(all_data, key=lambda r: r[0])
-    return all_data_sorted, headers
+    # customer_client (the only cross-account resource at the manager) exposes
+    # no metrics, so each client is queried directly; requests run concurrently
+    # and each account keeps its own intern table since threads share nothing
+    account_kwargs = {
+        name: value
+        for name, value in kwargs.items()
+        if name not in ("strings", "mac_resolver")
+    }
+    return _combine_account_results(
+        _fan_out_accounts(
+            lambda cid: account_report_single(
+                gads_service,
+                client,
+                start_date,
+                end_date,
+                time_seg,
+                cid,
+                **account_kwargs,
+            ),
+            accounts_info,
+            kwargs.get("concurrency"),
+        ),
+        "cost",
+        kwargs.get("result_sink"),
+    )
 
 
+@_day_partitioned("ads")
 def ad_level_report_single(
     gads_service, client, start_date, end_date, time_seg, customer_id, **kwargs
 ):
@@ -838,174 +1906,25 @@ def ad_level_report_single(
         time_seg (str): Time segmentation key.
         customer_id (str): Target customer ID.
         **kwargs: Toggle options that control inclusion of channel, campaign,
-            and ad group metadata.
+            and ad group metadata, plus 'memory_limit' and 'processes'.
+            'grouping_sets' adds ad group, campaign, and account subtotal
+            rows, tagged by a 'Level' column, from the same fetch.
+            'id_only' joins names and types from the metadata cache onto
+            ID-only query rows.
 
     Returns:
         tuple[list[list], list[str]]: Table rows and headers.
     """
-    # enum decoders
-    undecoded_enums = get_enums(client)
-    channel_type_enum, ad_group_type_enum, ad_type_enum, *extra = undecoded_enums
     # time_seg transform
-    time_seg_string = f"segments.{time_seg}"
+    # fetched by day; coarser segments are rolled up locally
+    time_seg_string = "segments.date"
     # toggles unpack
+    grouping_sets = kwargs.get("grouping_sets", False)
     include_channel_types = kwargs.get("include_channel_types", False)
-    include_campaign_info = kwargs.get("include_campaign_info", False)
-    include_adgroup_info = kwargs.get("include_adgroup_info", False)
+    # grouping sets always run down to the ad
+    include_campaign_info = grouping_sets or kwargs.get("include_campaign_info", False)
+    include_adgroup_info = grouping_sets or kwargs.get("include_adgroup_info", False)
     include_mac = kwargs.get("include_mac", True)
-    table_data = []
-    # ad_group_ad scoped query, will not capture PMAX campaigns due to lack of ad or ad_group scope dimension in Pmax
-    ad_group_ad_query = queries.ad_group_ad_query(start_date, end_date, time_seg_string)
-    ad_group_ad_response = gads_service.search_stream(
-        customer_id=customer_id, query=ad_group_ad_query
-    )
-    for batch in ad_group_ad_response:
-        for row in batch.results:
-            mac = common.extract_mac(row.campaign.name)
-            channel_type = (
-                channel_type_enum.AdvertisingChannelType.Name(
-                    row.campaign.advertising_channel_type
-                )
-                if hasattr(row.campaign, "advertising_channel_type")
-                else "UNDEFINED"
-            )
-            ad_group_type = (
-                ad_group_type_enum.AdGroupType.Name(row.ad_group.type_)
-                if hasattr(row.ad_group, "type_")
-                else "UNDEFINED"
-            )
-            ad_type = (
-                ad_type_enum.AdType.Name(row.ad_group_ad.ad.type_)
-                if hasattr(row.ad_group_ad.ad, "type_")
-                else "UNDEFINED"
-            )
-            date_value = getattr(row.segments, time_seg)
-            # build dict struct
-            cost_value = common.micros_to_decimal(
-                row.metrics.cost_micros, Decimal("0.01")
-            )
-            impressions = getattr(row.metrics, "impressions", 0) or 0
-            avg_cpm_value = (
-                common.micros_to_decimal(row.metrics.average_cpm, Decimal("0.001"))
-                if impressions
-                else Decimal("0.000")
-            )
-            clicks = getattr(row.metrics, "clicks", 0) or 0
-            avg_cpc_value = (
-                common.micros_to_decimal(row.metrics.average_cpc, Decimal("0.001"))
-                if clicks
-                else Decimal("0.000")
-            )
-            video_views = getattr(row.metrics, "video_views", 0) or 0
-            conversions_metric = Decimal(
-                str(getattr(row.metrics, "conversions", 0) or 0)
-            )
-            conv_value_metric = Decimal(
-                str(getattr(row.metrics, "conversions_value", 0) or 0)
-            ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-            ad_group_ad_dict = {
-                "Date": date_value,
-                "Customer ID": row.customer.id,
-                "Account name": row.customer.descriptive_name,
-            }
-            if include_mac:
-                ad_group_ad_dict["MAC"] = mac
-            ad_group_ad_dict.update(
-                {
-                    "Campaign ID": row.campaign.id,
-                    "Campaign name": row.campaign.name,
-                    "Campaign type": channel_type,
-                    "Ad group ID": row.ad_group.id,
-                    "Ad group name": row.ad_group.name,
-                    "Ad group type": ad_group_type,
-                    "Ad ID": row.ad_group_ad.ad.id,
-                    "Ad type": ad_type,
-                    "Cost": cost_value,
-                    "Impr.": impressions,
-                    "Abs Top Imp%": row.metrics.absolute_top_impression_percentage,
-                    "Top Imp%": row.metrics.top_impression_percentage,
-                    "Avg CPM": avg_cpm_value,
-                    "Interactions": getattr(row.metrics, "interactions", 0) or 0,
-                    "Clicks": clicks,
-                    "Avg CPC": avg_cpc_value,
-                    "Video Views": video_views,
-                    "Conversions": conversions_metric,
-                    "Conv. value": conv_value_metric,
-                }
-            )
-            table_data.append(ad_group_ad_dict)
-    # campaign scoped query for pmax campaigns
-    pmax_campaign_query = queries.pmax_campaign_query(
-        start_date, end_date, time_seg_string
-    )
-    pmax_campaign_response = gads_service.search_stream(
-        customer_id=customer_id, query=pmax_campaign_query
-    )
-    for batch in pmax_campaign_response:
-        for row in batch.results:
-            # ENUM decoding with fallbacks
-            mac = common.extract_mac(row.campaign.name)
-            channel_type = (
-                channel_type_enum.AdvertisingChannelType.Name(
-                    row.campaign.advertising_channel_type
-                )
-                if hasattr(row.campaign, "advertising_channel_type")
-                else "UNDEFINED"
-            )
-            date_value = getattr(row.segments, time_seg)
-            cost_value = common.micros_to_decimal(
-                row.metrics.cost_micros, Decimal("0.01")
-            )
-            impressions = getattr(row.metrics, "impressions", 0) or 0
-            avg_cpm_value = (
-                common.micros_to_decimal(row.metrics.average_cpm, Decimal("0.001"))
-                if impressions
-                else Decimal("0.000")
-            )
-            clicks = getattr(row.metrics, "clicks", 0) or 0
-            avg_cpc_value = (
-                common.micros_to_decimal(row.metrics.average_cpc, Decimal("0.001"))
-                if clicks
-                else Decimal("0.000")
-            )
-            video_views = getattr(row.metrics, "video_views", 0) or 0
-            conversions_metric = Decimal(
-                str(getattr(row.metrics, "conversions", 0) or 0)
-            )
-            conv_value_metric = Decimal(
-                str(getattr(row.metrics, "conversions_value", 0) or 0)
-            ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-            pmax_dict = {
-                "Date": date_value,
-                "Customer ID": row.customer.id,
-                "Account name": row.customer.descriptive_name,
-            }
-            if include_mac:
-                pmax_dict["MAC"] = mac
-            pmax_dict.update(
-                {
-                    "Campaign ID": row.campaign.id,
-                    "Campaign name": row.campaign.name,
-                    "Campaign type": channel_type,
-                    "Ad group ID": row.ad_group.id,
-                    "Ad group name": row.ad_group.name,
-                    "Ad group type": ad_group_type,
-                    "Ad ID": row.ad_group_ad.ad.id,
-                    "Ad type": ad_type,
-                    "Cost": cost_value,
-                    "Impr.": impressions,
-                    "Abs Top Imp%": row.metrics.absolute_top_impression_percentage,
-                    "Top Imp%": row.metrics.top_impression_percentage,
-                    "Avg CPM": avg_cpm_value,
-                    "Interactions": getattr(row.metrics, "interactions", 0) or 0,
-                    "Clicks": clicks,
-                    "Avg CPC": avg_cpc_value,
-                    "Video Views": video_views,
-                    "Conversions": conversions_metric,
-                    "Conv. value": conv_value_metric,
-                }
-            )
-            table_data.append(pmax_dict)
     headers = ["Date", "Customer ID", "Account name"]  # primary dimensions
     if include_mac:
         headers.append("MAC")
@@ -1015,7 +1934,7 @@ def ad_level_report_single(
         headers.append("Campaign type")
     if include_adgroup_info:
         headers += ["Ad group ID", "Ad group name", "Ad group type", "Ad ID", "Ad type"]
-    headers += [  # metric headers
+    metric_fields = [
         "Cost",
         "Impr.",
         "Abs Top Imp%",
@@ -1028,112 +1947,45 @@ def ad_level_report_single(
         "Conversions",
         "Conv. value",
     ]
-    metric_fields = {
-        "Cost",
-        "Impr.",
-        "Abs Top Imp%",
-        "Top Imp%",
-        "Avg CPM",
-        "Interactions",
-        "Clicks",
-        "Avg CPC",
-        "Video Views",
-        "Conversions",
-        "Conv. value",
-    }
-    report_dimensions = [h for h in headers if h not in metric_fields]
-    aggregated = {}
-    for row in table_data:
-        key = tuple(row.get(field) for field in report_dimensions)
-        if key not in aggregated:
-            aggregated[key] = {field: row.get(field) for field in report_dimensions}
-            aggregated[key].update(
-                {
-                    "Cost": Decimal("0.00"),
-                    "Impr.": 0,
-                    "Interactions": 0,
-                    "Clicks": 0,
-                    "Video Views": 0,
-                    "Conversions": Decimal("0"),
-                    "Conv. value": Decimal("0.00"),
-                    "_abs_top_weight": Decimal("0"),
-                    "_top_weight": Decimal("0"),
-                }
-            )
-        entry = aggregated[key]
-        cost_value = row.get("Cost", Decimal("0.00"))
-        if not isinstance(cost_value, Decimal):
-            cost_value = Decimal(str(cost_value))
-        entry["Cost"] += cost_value
-        impressions = row.get("Impr.", 0) or 0
-        entry["Impr."] += impressions
-        entry["Interactions"] += row.get("Interactions", 0) or 0
-        clicks = row.get("Clicks", 0) or 0
-        entry["Clicks"] += clicks
-        entry["Video Views"] += row.get("Video Views", 0) or 0
-        conversions_value = row.get("Conversions", Decimal("0"))
-        if not isinstance(conversions_value, Decimal):
-            conversions_value = Decimal(str(conversions_value))
-        entry["Conversions"] += conversions_value
-        conv_value_metric = row.get("Conv. value", Decimal("0.00"))
-        if not isinstance(conv_value_metric, Decimal):
-            conv_value_metric = Decimal(str(conv_value_metric))
-        entry["Conv. value"] += conv_value_metric
-        abs_top_is_value = Decimal(str(row.get("Abs Top Imp%") or 0))
-        top_is_pct_value = Decimal(str(row.get("Top Imp%") or 0))
-        entry["_abs_top_weight"] += abs_top_is_value * Decimal(impressions)
-        entry["_top_weight"] += top_is_pct_value * Decimal(impressions)
-    aggregated_rows = []
-    for entry in aggregated.values():
-        impressions = entry.get("Impr.", 0)
-        clicks = entry.get("Clicks", 0)
-        cost_value = entry.get("Cost", Decimal("0.00"))
-        abs_top_weight = entry.pop("_abs_top_weight", Decimal("0"))
-        top_weight = entry.pop("_top_weight", Decimal("0"))
-        entry["Cost"] = cost_value.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-        conversions_value = entry.get("Conversions", Decimal("0"))
-        entry["Conversions"] = conversions_value.quantize(
-            Decimal("0.01"), rounding=ROUND_HALF_UP
-        )
-        conv_value_total = entry.get("Conv. value", Decimal("0.00"))
-        entry["Conv. value"] = conv_value_total.quantize(
-            Decimal("0.01"), rounding=ROUND_HALF_UP
-        )
-        entry["Avg CPC"] = (
-            (entry["Cost"] / Decimal(clicks)).quantize(
-                Decimal("0.001"), rounding=ROUND_HALF_UP
-            )
-            if clicks
-            else Decimal("0.000")
-        )
-        entry["Avg CPM"] = (
-            ((entry["Cost"] / Decimal(impressions)) * Decimal("1000")).quantize(
-                Decimal("0.001"), rounding=ROUND_HALF_UP
-            )
-            if impressions
-            else Decimal("0.000")
-        )
-        entry["Abs Top Imp%"] = (
-            (abs_top_weight / Decimal(impressions)).quantize(
-                Decimal("0.0001"), rounding=ROUND_HALF_UP
-            )
-            if impressions
-            else Decimal("0")
-        )
-        entry["Top Imp%"] = (
-            (top_weight / Decimal(impressions)).quantize(
-                Decimal("0.0001"), rounding=ROUND_HALF_UP
-            )
-            if impressions
-            else Decimal("0")
-        )
-        aggregated_rows.append(entry)
-    aggregated_rows_sorted = sorted(
-        aggregated_rows,
-        key=lambda r: (r.get("Date"), -float(r.get("Cost", Decimal("0")))),
+    report_dimensions = list(headers)
+    if grouping_sets:
+        headers.insert(3, pipeline.LEVEL_FIELD)
+    headers += metric_fields
+    strings = _run_strings(kwargs)
+    id_only = kwargs.get("id_only", False)
+    plan = pipeline.ReportPlan(
+        row_spec=_AD_LEVEL_SPEC,
+        queries=[
+            # ad_group_ad scoped query, will not capture PMAX campaigns due to lack of ad or ad_group scope dimension in Pmax
+            (
+                queries.ad_group_ad_query(
+                    start_date, end_date, time_seg_string, id_only=id_only
+                ),
+                {"time_seg": "date", "ad_scope": True, "id_only": id_only},
+            ),
+            # campaign scoped query for pmax campaigns
+            (
+                queries.pmax_campaign_query(
+                    start_date, end_date, time_seg_string, id_only=id_only
+                ),
+                {"time_seg": "date", "ad_scope": False, "id_only": id_only},
+            ),
+        ],
+        headers=headers,
+        dimensions=report_dimensions,
+        enrichers=_rollup_enrichers(time_seg, kwargs)
+        + _entity_enrichers(gads_service, client, customer_id, kwargs)
+        + _mac_enrichers(
+            gads_service, client, customer_id, kwargs, strings, include_mac
+        ),
+        finalize=_ad_level_finalize,
+        # sort by date ascending, cost descending
+        order_by=["Date", "-Cost"],
+        grouping_sets=(
+            AD_LEVEL_GROUPING_SETS.for_headers(headers) if grouping_sets else None
+        ),
     )
-    filtered_data = [[row.get(h) for h in headers] for row in aggregated_rows_sorted]
-    return filtered_data, headers
+    return _run_plan(gads_service, client, customer_id, plan, strings, kwargs)
 
 
 def ad_level_report_all(
@@ -1155,44 +2007,25 @@ def ad_level_report_all(
     Returns:
         tuple[list[list], list[str]]: Combined table rows and headers.
     """
-    all_data = []
-    headers: list[str] | None = None
-    for customer_id, account_descriptive in accounts_info.items():
-        print(f"Processing {account_descriptive}...")
-        try:
-            table_data, current_headers = ad_level_report_single(
-                gads_service,
-                client,
-                start_date,
-                end_date,
-                time_seg,
-                customer_id,
-                **kwargs,
-            )
-            if headers is None:
-                headers = current_headers
-            all_data.extend(table_data)
-        except Exception as e:
-            print(f"Error processing {account_descriptive} ({customer_id}): {e}")
-    if not all_data:
-        print("No data returned for any accounts.")
-        return [], []
-    if headers is None:
-        print("Report headers could not be determined.")
-        return [], []
-    # dynamic sort by cost, account name
-    cost_idx = headers.index("Cost") if "Cost" in headers else None
-    acct_idx = headers.index("Account name") if "Account name" in headers else None
-    if cost_idx is not None and acct_idx is not None:
-        all_data_sorted = sorted(
-            all_data, key=lambda r: (r[0], r[acct_idx], -float(r[cost_idx]))
-        )
-    else:
-        # fallback to date sort if error
-        all_data_sorted = sorted(all_data, key=lambda r: r[0])
-    return all_data_sorted, headers
+    # one intern table per run, shared by every account
+    kwargs.setdefault("strings", aggregation.StringDictionary())
+    kwargs.setdefault(
+        "mac_resolver",
+        common.MacResolver(kwargs.get("mac_rules"), strings=kwargs["strings"]),
+    )
+    return _combine_account_results(
+        _each_account(
+            lambda cid: ad_level_report_single(
+                gads_service, client, start_date, end_date, time_seg, cid, **kwargs
+            ),
+            accounts_info,
+        ),
+        "Cost",
+        kwargs.get("result_sink"),
+    )
 
 
+@_day_partitioned("clickview")
 def click_view_report_single(
     gads_service, client, start_date, end_date, time_seg, customer_id, **kwargs
 ):
@@ -1207,105 +2040,20 @@ def click_view_report_single(
         customer_id (str): Target customer ID.
         **kwargs: Toggle options that control inclusion of channel, campaign,
             ad group, and device metadata.
+            'id_only' joins names and types from the metadata cache onto
+            ID-only query rows.
 
     Returns:
         tuple[list[list], list[str]]: Table rows and headers.
     """
-    # enum decoders
-    time_seg_string = f"segments.{time_seg}"
-    undecoded_enums = get_enums(client)
-    (
-        channel_type_enum,
-        *extra,
-        click_type_enum,
-        keyword_match_type_enum,
-        device_type_enum,
-    ) = undecoded_enums
+    # fetched by day; coarser segments are rolled up locally
+    time_seg_string = "segments.date"
     # unpack toggles
     include_channel_types = kwargs.get("include_channel_types", False)
     include_campaign_info = kwargs.get("include_campaign_info", False)
     include_adgroup_info = kwargs.get("include_adgroup_info", False)
     include_device_info = kwargs.get("include_device_info", False)
     include_mac = kwargs.get("include_mac", False)
-    # GAQL query
-    click_view_query = queries.click_view_query(start_date, end_date, time_seg_string)
-    # fetch data
-    response = gads_service.search_stream(
-        customer_id=customer_id, query=click_view_query
-    )
-    # initialize an empty list to store the data
-    table_data = []
-    # populate the table_data list
-    for data in response:
-        for row in data.results:
-            date_value = getattr(row.segments, time_seg)
-            channel_type = (
-                channel_type_enum.AdvertisingChannelType.Name(
-                    row.campaign.advertising_channel_type
-                )
-                if hasattr(row.campaign, "advertising_channel_type")
-                else "UNDEFINED"
-            )
-            click_type = (
-                click_type_enum.ClickType.Name(row.segments.click_type)
-                if hasattr(row.segments, "click_type")
-                else "UNDEFINED"
-            )
-            keyword_match_type = (
-                keyword_match_type_enum.KeywordMatchType.Name(
-                    row.click_view.keyword_info.match_type
-                )
-                if getattr(row.click_view, "keyword_info", None)
-                and hasattr(row.click_view.keyword_info, "match_type")
-                else "UNDEFINED"
-            )
-            device_type = (
-                device_type_enum.Device.Name(row.segments.device)
-                if hasattr(row.segments, "device")
-                else "UNDEFINED"
-            )
-            # cleaning needed for text, returning values with '=' (also '+' but those are bid modifiers from old targets)
-            keyword_text = (
-                (row.click_view.keyword_info.text).strip()
-                if getattr(row.click_view, "keyword_info", None)
-                else None
-            )
-            if include_mac:
-                mac = common.extract_mac(row.campaign.name)
-            # build row dict with response
-            click_view_dict = {
-                "Date": date_value,
-                "Account name": row.customer.descriptive_name,
-                "Customer ID": row.customer.id,
-                "Campaign name": row.campaign.name,
-                "Campaign ID": row.campaign.id,
-                "Campaign type": channel_type,
-                "Ad group name": row.ad_group.name,
-                "Ad group ID": row.ad_group.id,
-                # "Ad": row.click_view.ad_group_ad, # needs resource parsing
-                "gclid": row.click_view.gclid,
-                # "keyword target": row.click_view.keyword, # needs resource parsing
-                "keyword match type": keyword_match_type,
-                "keyword text": keyword_text,
-                "SERP #": row.click_view.page_number,
-                # "loc_country": row.click_view.location_of_presence.country,
-                # "loc_region": row.click_view.location_of_presence.region,
-                # "loc_metro": row.click_view.location_of_presence.metro,
-                # "loc_city": row.click_view.location_of_presence.city,
-                # "loc_specific": row.click_view.location_of_presence.most_specific,
-                # "interest_country": row.click_view.area_of_interest.country,
-                # "interest_region": row.click_view.area_of_interest.region,
-                # "interest_metro": row.click_view.area_of_interest.metro,
-                # "interest_city": row.click_view.area_of_interest.city,
-                # "interest_specific": row.click_view.area_of_interest.most_specific,
-                "device": device_type,
-                "click type": click_type,
-                "clicks": row.metrics.clicks,
-            }
-            if include_mac:
-                click_view_dict["MAC"] = mac
-            # append dict
-            table_data.append(click_view_dict)
     # define the headers for the table
     headers = ["Date", "Account name", "Customer ID"]  # primary dimensions
     if include_mac:
@@ -1320,20 +2068,29 @@ def click_view_report_single(
     if include_device_info:
         headers.append("device")
     headers += ["click type", "clicks"]  # metrics
-    metric_fields = {"clicks"}
-    report_dimensions = [h for h in headers if h not in metric_fields]
-    aggregated = {}
-    for row in table_data:
-        key = tuple(row.get(field) for field in report_dimensions)
-        if key not in aggregated:
-            aggregated[key] = {field: row.get(field) for field in report_dimensions}
-            aggregated[key]["clicks"] = 0
-        aggregated[key]["clicks"] += row.get("clicks", 0) or 0
-    aggregated_rows = sorted(
-        aggregated.values(), key=lambda r: (r.get("Date"), -float(r.get("clicks", 0)))
+    strings = _run_strings(kwargs)
+    id_only = kwargs.get("id_only", False)
+    plan = pipeline.ReportPlan(
+        row_spec=_CLICK_VIEW_SPEC,
+        queries=[
+            (
+                queries.click_view_query(
+                    start_date, end_date, time_seg_string, id_only=id_only
+                ),
+                {"time_seg": "date", "id_only": id_only},
+            )
+        ],
+        headers=headers,
+        dimensions=headers[:-1],
+        enrichers=_rollup_enrichers(time_seg, kwargs)
+        + _entity_enrichers(gads_service, client, customer_id, kwargs)
+        + _mac_enrichers(
+            gads_service, client, customer_id, kwargs, strings, include_mac
+        ),
+        # sort by date ascending, clicks descending
+        order_by=["Date", "-clicks"],
     )
-    filtered_data = [[row.get(h) for h in headers] for row in aggregated_rows]
-    return filtered_data, headers
+    return _run_plan(gads_service, client, customer_id, plan, strings, kwargs)
 
 
 def click_view_report_all(
@@ -1342,56 +2099,38 @@ def click_view_report_all(
     """Generate a ClickView performance report for multiple accounts.
 
     Args:
-        gads_service (GoogleAdsService): Service used to execute GAQL queries.
-        client (GoogleAdsClient): Authenticated API client.
-        start_date (str): Inclusive start date ('YYYY-MM-DD').
-        end_date (str): Inclusive end date ('YYYY-MM-DD').
-        time_seg (str): Time segmentation key.
-        accounts_info (dict[str, str]): Mapping of customer IDs to account
-            names.
-        **kwargs: Toggle options that control inclusion of channel, campaign,
-            ad group, and device metadata.
-
-    Returns:
-        tuple[list[list], list[str]]: Combined table rows and headers.
-    """
-    all_data = []
-    headers: list[str] | None = None
-    for customer_id, account_descriptive in accounts_info.items():
-        print(f"Processing {account_descriptive}...")
-        try:
-            table_data, current_headers = click_view_report_single(
-                gads_service,
-                client,
-                start_date,
-                end_date,
-                time_seg,
-                customer_id,
-                **kwargs,
-            )
-            if headers is None:
-                headers = current_headers
-            all_data.extend(table_data)
-        except Exception as e:
-            print(f"Error processing {account_descriptive} ({customer_id}): {e}")
-    if not all_data:
-        print("No data returned for any accounts.")
-        return [], []
-    if headers is None:
-        print("Report headers could not be determined.")
-        return [], []
-    # sort by: time index (0), account name, descending clicks
-    acct_idx = headers.index("Account name") if "Account name" in headers else 1
-    clicks_idx = headers.index("clicks") if "clicks" in headers else -1
-    if clicks_idx >= 0:
-        all_data_sorted = sorted(
-            all_data, key=lambda r: (r[0], r[acct_idx], -float(r[clicks_idx]))
-        )
-    else:
-        all_data_sorted = sorted(all_data, key=lambda r: (r[0], r[acct_idx]))
-    return all_data_sorted, headers
+        gads_service (GoogleAdsService): Service used to execute GAQL queries.
+        client (GoogleAdsClient): Authenticated API client.
+        start_date (str): Inclusive start date ('YYYY-MM-DD').
+        end_date (str): Inclusive end date ('YYYY-MM-DD').
+        time_seg (str): Time segmentation key.
+        accounts_info (dict[str, str]): Mapping of customer IDs to account
+            names.
+        **kwargs: Toggle options that control inclusion of channel, campaign,
+            ad group, and device metadata.
+
+    Returns:
+        tuple[list[list], list[str]]: Combined table rows and headers.
+    """
+    # one intern table per run, shared by every account
+    kwargs.setdefault("strings", aggregation.StringDictionary())
+    kwargs.setdefault(
+        "mac_resolver",
+        common.MacResolver(kwargs.get("mac_rules"), strings=kwargs["strings"]),
+    )
+    return _combine_account_results(
+        _each_account(
+            lambda cid: click_view_report_single(
+                gads_service, client, start_date, end_date, time_seg, cid, **kwargs
+            ),
+            accounts_info,
+        ),
+        "clicks",
+        kwargs.get("result_sink"),
+    )
 
 
+@_day_partitioned("paid_organic_terms")
 def paid_org_search_term_report_single(
     gads_service, client, start_date, end_date, time_seg, customer_id, **kwargs
 ):
@@ -1404,127 +2143,21 @@ def paid_org_search_term_report_single(
         end_date (str): Inclusive end date ('YYYY-MM-DD').
         time_seg (str): Time segmentation key.
         customer_id (str): Target customer ID.
+        **kwargs: Toggle options that control inclusion of channel, campaign,
+            ad group, and device metadata. 'id_only' joins names and types
+            from the metadata cache onto ID-only query rows.
 
     Returns:
         tuple[list[list], list[str]]: Table rows and headers.
     """
-    # enum decoders
-    time_seg_string = f"segments.{time_seg}"
-    undecoded_enums = get_enums(client)
-    (
-        channel_type_enum,
-        *extra,
-        serp_type_enum,
-        click_type,
-        keyword_match_type_enum,
-        device_type_enum,
-    ) = undecoded_enums
+    # fetched by day; coarser segments are rolled up locally
+    time_seg_string = "segments.date"
     # unpack toggles
     include_channel_types = kwargs.get("include_channel_types", False)
     include_campaign_info = kwargs.get("include_campaign_info", False)
     include_adgroup_info = kwargs.get("include_adgroup_info", False)
     include_device_info = kwargs.get("include_device_info", False)
     include_mac = kwargs.get("include_mac", False)
-    # GAQL query
-    paid_org_search_term_query = queries.paid_organic_search_term_view_query(
-        start_date, end_date, time_seg_string
-    )
-    # fetch data and populate the table_data list
-    response = gads_service.search_stream(
-        customer_id=customer_id, query=paid_org_search_term_query
-    )
-    # initialize an empty list to store the data
-    table_data = []
-    # populate the table_data list
-    for data in response:
-        for row in data.results:
-            date_value = getattr(row.segments, time_seg)
-            channel_type = (
-                channel_type_enum.AdvertisingChannelType.Name(
-                    row.campaign.advertising_channel_type
-                )
-                if hasattr(row.campaign, "advertising_channel_type")
-                else "UNDEFINED"
-            )
-            serp_type = (
-                serp_type_enum.SearchEngineResultsPageType.Name(
-                    row.segments.search_engine_results_page_type
-                )
-                if hasattr(row.segments, "search_engine_results_page_type")
-                else "UNDEFINED"
-            )
-            keyword_match_type = (
-                keyword_match_type_enum.KeywordMatchType.Name(
-                    row.segments.keyword.info.match_type
-                )
-                if getattr(row.segments, "keyword", None)
-                and hasattr(row.segments.keyword, "info")
-                and hasattr(row.segments.keyword.info, "match_type")
-                else "UNDEFINED"
-            )
-            device_type = (
-                device_type_enum.Device.Name(row.segments.device)
-                if hasattr(row.segments, "device")
-                else "UNDEFINED"
-            )
-            organic_queries = getattr(row.metrics, "organic_queries", 0) or 0
-            organic_impressions = getattr(row.metrics, "organic_impressions", 0) or 0
-            organic_clicks = getattr(row.metrics, "organic_clicks", 0) or 0
-            paid_impressions = getattr(row.metrics, "impressions", 0) or 0
-            paid_clicks = getattr(row.metrics, "clicks", 0) or 0
-            combined_queries = getattr(row.metrics, "combined_queries", 0) or 0
-            combined_clicks = getattr(row.metrics, "combined_clicks", 0) or 0
-            combined_clicks_per_query = (
-                getattr(row.metrics, "combined_clicks_per_query", 0) or 0
-            )
-            organic_impr_per_query = (
-                getattr(row.metrics, "organic_impressions_per_query", 0) or 0
-            )
-            organic_clicks_per_query = (
-                getattr(row.metrics, "organic_clicks_per_query", 0) or 0
-            )
-            paid_ctr_raw = getattr(row.metrics, "ctr", 0) or 0
-            avg_cpc_micros = getattr(row.metrics, "average_cpc", 0) or 0
-            total_impressions = organic_impressions + paid_impressions
-            avg_cpc_value = (
-                common.micros_to_decimal(avg_cpc_micros, Decimal("0.001"))
-                if paid_clicks
-                else Decimal("0.000")
-            )
-            keyword_info = getattr(getattr(row.segments, "keyword", None), "info", None)
-            keyword_text = getattr(keyword_info, "text", None) if keyword_info else None
-            # build row dict with response
-            paid_org_search_term_dict = {
-                "Date": date_value,
-                "Account name": row.customer.descriptive_name,
-                "Customer ID": row.customer.id,
-                "Campaign name": row.campaign.name,
-                "Campaign ID": row.campaign.id,
-                "Campaign type": channel_type,
-                "Ad group name": row.ad_group.name,
-                "Ad group ID": row.ad_group.id,
-                "device": device_type,
-                "SERP type": serp_type,
-                "keyword match type": keyword_match_type,
-                "keyword text": keyword_text,
-                "org queries": organic_queries,
-                "org impr": organic_impressions,
-                "org impr per query": organic_impr_per_query,
-                "org clicks": organic_clicks,
-                "org clicks per query": organic_clicks_per_query,
-                "paid impr": paid_impressions,
-                "paid clicks": paid_clicks,
-                "paid ctr": paid_ctr_raw,
-                "avg cpc": avg_cpc_value,
-                "total queries": combined_queries,
-                "total impr": total_impressions,
-                "total clicks": combined_clicks,
-                "total clicks per query": combined_clicks_per_query,
-            }
-            if include_mac:
-                paid_org_search_term_dict["MAC"] = common.extract_mac(row.campaign.name)
-            # append dict
-            table_data.append(paid_org_search_term_dict)
     # define the headers for the table
     headers = ["Date", "Account name", "Customer ID"]  # primary dimensions
     if include_mac:
@@ -1537,11 +2170,10 @@ def paid_org_search_term_report_single(
         headers += ["Ad group name", "Ad group ID"]
     if include_device_info:
         headers.append("device")
+    headers += ["SERP type", "keyword match type", "keyword text"]
+    report_dimensions = list(headers)
     # metrics
     headers += [
-        "SERP type",
-        "keyword match type",
-        "keyword text",
         "org queries",
         "org impr",
         "org impr per query",
@@ -1557,106 +2189,30 @@ def paid_org_search_term_report_single(
         "total clicks",
         "total clicks per query",
     ]
-    metric_fields = {
-        "org queries",
-        "org impr",
-        "org impr per query",
-        "org clicks",
-        "org clicks per query",
-        "paid impr",
-        "paid clicks",
-        "paid ctr",
-        "avg cpc",
-        "total cost",
-        "total queries",
-        "total impr",
-        "total clicks",
-        "total clicks per query",
-    }
-    report_dimensions = [h for h in headers if h not in metric_fields]
-    aggregated = {}
-    for row in table_data:
-        key = tuple(row.get(field) for field in report_dimensions)
-        if key not in aggregated:
-            aggregated[key] = {field: row.get(field) for field in report_dimensions}
-            aggregated[key].update(
-                {
-                    "org queries": 0,
-                    "org impr": 0,
-                    "org clicks": 0,
-                    "paid impr": 0,
-                    "paid clicks": 0,
-                    "total queries": 0,
-                    "total impr": 0,
-                    "total clicks": 0,
-                    "_total_cost": Decimal("0.00"),
-                }
-            )
-        entry = aggregated[key]
-        entry["org queries"] += row.get("org queries", 0) or 0
-        entry["org impr"] += row.get("org impr", 0) or 0
-        entry["org clicks"] += row.get("org clicks", 0) or 0
-        entry["paid impr"] += row.get("paid impr", 0) or 0
-        paid_clicks = row.get("paid clicks", 0) or 0
-        entry["paid clicks"] += paid_clicks
-        entry["total queries"] += row.get("total queries", 0) or 0
-        entry["total impr"] += row.get("total impr", 0) or 0
-        entry["total clicks"] += row.get("total clicks", 0) or 0
-        avg_cpc_value = row.get("avg cpc", Decimal("0.000"))
-        if not isinstance(avg_cpc_value, Decimal):
-            avg_cpc_value = Decimal(str(avg_cpc_value))
-        entry["_total_cost"] += avg_cpc_value * Decimal(paid_clicks)
-    aggregated_rows = []
-    for entry in aggregated.values():
-        org_queries = entry.get("org queries", 0)
-        paid_impr = entry.get("paid impr", 0)
-        paid_clicks = entry.get("paid clicks", 0)
-        total_queries = entry.get("total queries", 0)
-        total_cost_raw = entry.pop("_total_cost", Decimal("0.00"))
-        entry["org impr per query"] = (
-            (Decimal(entry["org impr"]) / Decimal(org_queries)).quantize(
-                Decimal("0.0001"), rounding=ROUND_HALF_UP
-            )
-            if org_queries
-            else Decimal("0")
-        )
-        entry["org clicks per query"] = (
-            (Decimal(entry["org clicks"]) / Decimal(org_queries)).quantize(
-                Decimal("0.0001"), rounding=ROUND_HALF_UP
-            )
-            if org_queries
-            else Decimal("0")
-        )
-        entry["paid ctr"] = (
-            (Decimal(paid_clicks) / Decimal(paid_impr)).quantize(
-                Decimal("0.0001"), rounding=ROUND_HALF_UP
-            )
-            if paid_impr
-            else Decimal("0")
-        )
-        entry["avg cpc"] = (
-            (total_cost_raw / Decimal(paid_clicks)).quantize(
-                Decimal("0.001"), rounding=ROUND_HALF_UP
-            )
-            if paid_clicks
-            else Decimal("0.000")
-        )
-        entry["total cost"] = total_cost_raw.quantize(
-            Decimal("0.01"), rounding=ROUND_HALF_UP
-        )
-        entry["total clicks per query"] = (
-            (Decimal(entry["total clicks"]) / Decimal(total_queries)).quantize(
-                Decimal("0.0001"), rounding=ROUND_HALF_UP
+    strings = _run_strings(kwargs)
+    id_only = kwargs.get("id_only", False)
+    plan = pipeline.ReportPlan(
+        row_spec=_PAID_ORG_SPEC,
+        queries=[
+            (
+                queries.paid_organic_search_term_view_query(
+                    start_date, end_date, time_seg_string, id_only=id_only
+                ),
+                {"time_seg": "date", "id_only": id_only},
             )
-            if total_queries
-            else Decimal("0")
-        )
-        aggregated_rows.append(entry)
-    aggregated_rows_sorted = sorted(
-        aggregated_rows, key=lambda r: (r.get("Date"), -float(r.get("total clicks", 0)))
+        ],
+        headers=headers,
+        dimensions=report_dimensions,
+        enrichers=_rollup_enrichers(time_seg, kwargs)
+        + _entity_enrichers(gads_service, client, customer_id, kwargs)
+        + _mac_enrichers(
+            gads_service, client, customer_id, kwargs, strings, include_mac
+        ),
+        finalize=_paid_org_finalize,
+        # sort by date ascending, total clicks descending
+        order_by=["Date", "-total clicks"],
     )
-    filtered_data = [[row.get(h) for h in headers] for row in aggregated_rows_sorted]
-    return filtered_data, headers
+    return _run_plan(gads_service, client, customer_id, plan, strings, kwargs)
 
 
 def paid_org_search_term_report_all(
@@ -1677,45 +2233,22 @@ def paid_org_search_term_report_all(
     Returns:
         tuple[list[list], list[str]]: Combined table rows and headers.
     """
-    all_data = []
-    headers: list[str] | None = None
-    for customer_id, account_descriptive in accounts_info.items():
-        print(f"Processing {account_descriptive}...")
-        try:
-            table_data, current_headers = paid_org_search_term_report_single(
-                gads_service,
-                client,
-                start_date,
-                end_date,
-                time_seg,
-                customer_id,
-                **kwargs,
-            )
-            if headers is None:
-                headers = current_headers
-            all_data.extend(table_data)
-        except Exception as e:
-            print(f"Error processing {account_descriptive} ({customer_id}): {e}")
-    if not all_data:
-        print("No data returned for any accounts.")
-        return [], []
-    if headers is None:
-        print("Report headers could not be determined.")
-        return [], []
-    # sort by: time index (0), account name (1), descending total combined clicks
-    acct_idx = headers.index("Account name") if "Account name" in headers else 1
-    comb_clicks_idx = (
-        headers.index("total combined clicks")
-        if "total combined clicks" in headers
-        else -1
+    # one intern table per run, shared by every account
+    kwargs.setdefault("strings", aggregation.StringDictionary())
+    kwargs.setdefault(
+        "mac_resolver",
+        common.MacResolver(kwargs.get("mac_rules"), strings=kwargs["strings"]),
+    )
+    return _combine_account_results(
+        _each_account(
+            lambda cid: paid_org_search_term_report_single(
+                gads_service, client, start_date, end_date, time_seg, cid, **kwargs
+            ),
+            accounts_info,
+        ),
+        "total clicks",
+        kwargs.get("result_sink"),
     )
-    if comb_clicks_idx >= 0:
-        all_data_sorted = sorted(
-            all_data, key=lambda r: (r[0], r[acct_idx], -float(r[comb_clicks_idx]))
-        )
-    else:
-        all_data_sorted = sorted(all_data, key=lambda r: (r[0], r[acct_idx]))
-    return all_data_sorted, headers
 
 
 """
@@ -1723,42 +2256,648 @@ BUDGET REPORTS
 """
 
 
+BUDGET_PACING_HEADERS = [
+    "Account name",
+    "Customer ID",
+    "Budget ID",
+    "Budget name",
+    "Period",
+    "Shared",
+    "Campaigns",
+    "Daily budget",
+    "Monthly budget",
+    "MTD cost",
+    "Expected MTD",
+    "Pace %",
+    "Run rate",
+    "Projected EOM",
+    "Projected variance",
+    "Status",
+]
+
+ACCOUNT_PACING_HEADERS = [
+    "Account name",
+    "Customer ID",
+    "Monthly budget",
+    "MTD cost",
+    "Expected MTD",
+    "Pace %",
+    "Run rate",
+    "Projected EOM",
+    "Projected variance",
+    "Status",
+    "Account budget",
+    "Spending limit",
+    "Served to date",
+    "Remaining limit",
+    "Limit status",
+]
+
+
+def _active_account_budget(gads_service, customer_id, as_of):
+    """Return the approved account budget covering 'as_of', if any.
+
+    Account budgets only exist for accounts on monthly invoicing; other
+    accounts return no rows or reject the query, and get 'None'.
+    """
+
+    as_of = as_of.isoformat()
+    try:
+        response = gads_service.search_stream(
+            customer_id=customer_id, query=queries.account_budget_query()
+        )
+        for batch in response:
+            for row in batch.results:
+                budget = row.account_budget
+                # date times look like 'YYYY-MM-DD HH:MM:SS'; empty when open-ended
+                start = budget.approved_start_date_time[:10]
+                end = budget.approved_end_date_time[:10]
+                if (not start or start <= as_of) and (not end or end >= as_of):
+                    return budget
+    except GoogleAdsException:
+        return None
+    return None
+
+
+def _customer_name(gads_service, customer_id):
+    """Return an account's descriptive name (None if the query returns no row)."""
+    response = gads_service.search_stream(
+        customer_id=customer_id, query=queries.customer_name_query()
+    )
+    for batch in response:
+        for row in batch.results:
+            return row.customer.descriptive_name
+    return None
+
+
+def _fetch_budget_spend(gads_service, client, customer_id, window, account_name=None):
+    """Pull campaign budgets, daily spend, and the account budget for one account.
+
+    Args:
+        gads_service (GoogleAdsService): Service used for GAQL queries.
+        client (GoogleAdsClient): API client used for enum decoding.
+        customer_id (str): Target customer ID.
+        window (pacing.PacingWindow): Month being paced.
+        account_name (str | None): Account descriptive name, used when no
+            enabled budget row names the account; without it the name is
+            queried.
+
+    Returns:
+        tuple[list[dict], dict]: Campaign budget records with month-to-date
+        and run-rate spend, and the account record.
+    """
+
+    period_enum = client.enums.BudgetPeriodEnum
+    budgets = {}
+    account = {
+        "Account name": None,
+        "Customer ID": int(customer_id),
+        "_mtd_micros": 0,
+        "_recent_micros": 0,
+    }
+    response = gads_service.search_stream(
+        customer_id=customer_id, query=queries.campaign_budget_query()
+    )
+    for batch in response:
+        for row in batch.results:
+            budget = row.campaign_budget
+            record = budgets.get(budget.id)
+            if record is None:
+                period = period_enum.BudgetPeriod.Name(budget.period)
+                account["Account name"] = row.customer.descriptive_name
+                record = budgets[budget.id] = {
+                    "Account name": row.customer.descriptive_name,
+                    "Customer ID": row.customer.id,
+                    "Budget ID": budget.id,
+                    "Budget name": budget.name,
+                    "Period": period,
+                    "Shared": budget.explicitly_shared,
+                    "Campaigns": 0,
+                    # total (custom period) budgets have no daily amount to pace
+                    "Daily budget": (
+                        common.micros_to_decimal(budget.amount_micros, Decimal("0.01"))
+                        if period == "DAILY" and budget.amount_micros
+                        else None
+                    ),
+                    "_mtd_micros": 0,
+                    "_recent_micros": 0,
+                }
+            record["Campaigns"] += 1
+    if account["Account name"] is None:
+        # accounts without enabled budgets still report their spend
+        account["Account name"] = account_name or _customer_name(
+            gads_service, customer_id
+        )
+    month_start = window.month_start.isoformat()
+    run_rate_start = window.run_rate_start.isoformat()
+    # cost is keyed by budget rather than campaign status, so spend from
+    # campaigns paused mid-month still counts against their budget
+    response = gads_service.search_stream(
+        customer_id=customer_id,
+        query=queries.budget_daily_cost_query(
+            window.fetch_start.isoformat(), window.as_of.isoformat()
+        ),
+    )
+    for batch in response:
+        for row in batch.results:
+            day = row.segments.date
+            cost_micros = row.metrics.cost_micros
+            record = budgets.get(row.campaign_budget.id)
+            for target in (account, record):
+                if target is None:
+                    continue
+                if day >= month_start:
+                    target["_mtd_micros"] += cost_micros
+                if day >= run_rate_start:
+                    target["_recent_micros"] += cost_micros
+    account_budget = _active_account_budget(gads_service, customer_id, window.as_of)
+    if account_budget is not None:
+        limit_micros = (
+            account_budget.adjusted_spending_limit_micros
+            or account_budget.approved_spending_limit_micros
+        )
+        served = common.micros_to_decimal(
+            account_budget.amount_served_micros, Decimal("0.01")
+        )
+        # no limit in micros means an INFINITE spending limit type
+        limit = (
+            common.micros_to_decimal(limit_micros, Decimal("0.01"))
+            if limit_micros
+            else None
+        )
+        account.update(
+            {
+                "Account budget": account_budget.name,
+                "Spending limit": limit,
+                "Served to date": served,
+                "Remaining limit": limit - served if limit is not None else None,
+            }
+        )
+    return list(budgets.values()), account
+
+
+def _apply_pacing(records, window):
+    """Fill pacing columns for 'records' in one column-wise pass."""
+    mtd = [
+        common.micros_to_decimal(r.pop("_mtd_micros"), Decimal("0.01")) for r in records
+    ]
+    recent = [
+        common.micros_to_decimal(r.pop("_recent_micros"), Decimal("0.01"))
+        for r in records
+    ]
+    budgets = [r["Monthly budget"] for r in records]
+    columns = pacing.pace_columns(mtd, recent, budgets, window)
+    for idx, record in enumerate(records):
+        record["MTD cost"] = mtd[idx]
+        record["Expected MTD"] = columns["expected"][idx]
+        record["Pace %"] = columns["pace"][idx]
+        record["Run rate"] = columns["run_rate"][idx]
+        record["Projected EOM"] = columns["projected"][idx]
+        record["Projected variance"] = columns["variance"][idx]
+        record["Status"] = columns["status"][idx]
+
+
+def _budget_pacing_tables(results, window):
+    """Compute budget and account pacing tables for fetched account results.
+
+    Args:
+        results (list[tuple[list[dict], dict]]): '_fetch_budget_spend' output
+            per account.
+        window (pacing.PacingWindow): Month being paced.
+
+    Returns:
+        tuple[list[list], list[str], list[list], list[str]]: Budget pacing
+        rows and headers, then account pacing rows and headers.
+    """
+
+    budget_records = []
+    account_records = []
+    for budgets, account in results:
+        for record in budgets:
+            record["Monthly budget"] = pacing.monthly_budget(record["Daily budget"])
+        monthly = [r["Monthly budget"] for r in budgets if r["Monthly budget"]]
+        account["Monthly budget"] = sum(monthly) if monthly else None
+        budget_records.extend(budgets)
+        account_records.append(account)
+    # every budget across every account is paced in the same pass
+    _apply_pacing(budget_records, window)
+    _apply_pacing(account_records, window)
+    for account in account_records:
+        remaining = account.get("Remaining limit")
+        if "Account budget" not in account:
+            account["Limit status"] = None
+        elif remaining is None:
+            account["Limit status"] = "NO LIMIT"
+        elif account["Projected EOM"] - account["MTD cost"] > remaining:
+            account["Limit status"] = "AT RISK"
+        else:
+            account["Limit status"] = "OK"
+    budget_records.sort(
+        key=lambda r: (r["Account name"] or "", r["Customer ID"], -r["MTD cost"])
+    )
+    account_records.sort(key=lambda r: (r["Account name"] or "", r["Customer ID"]))
+    budget_table = [[r.get(h) for h in BUDGET_PACING_HEADERS] for r in budget_records]
+    account_table = [
+        [r.get(h) for h in ACCOUNT_PACING_HEADERS] for r in account_records
+    ]
+    return (
+        budget_table,
+        BUDGET_PACING_HEADERS,
+        account_table,
+        ACCOUNT_PACING_HEADERS,
+    )
+
+
 def budget_report_single(
-    gads_service, client, start_date, end_date, time_seg, customer_id
+    gads_service, client, start_date, end_date, time_seg, customer_id, **kwargs
 ):
-    """Placeholder for generating a budget report for one account.
+    """Generate the budget pacing report for one account.
+
+    Pacing covers the calendar month containing 'end_date', through
+    'end_date'; 'start_date' and 'time_seg' are accepted for menu symmetry.
 
     Args:
         gads_service (GoogleAdsService): Service used for GAQL queries.
         client (GoogleAdsClient): Authenticated API client.
         start_date (str): Inclusive start date ('YYYY-MM-DD').
-        end_date (str): Inclusive end date ('YYYY-MM-DD').
+        end_date (str): Last day of spend included ('YYYY-MM-DD').
         time_seg (str): Time segmentation key.
         customer_id (str): Target customer ID.
+        **kwargs: Reserved for runtime options.
 
     Returns:
-        None: This placeholder prints a confirmation message.
+        tuple[list[list], list[str], list[list], list[str]]: Budget pacing
+        rows and headers, then account pacing rows and headers.
     """
 
-    print("Budget report - single", "test complete!")
+    window = pacing.pacing_window(end_date)
+    result = _fetch_budget_spend(gads_service, client, customer_id, window)
+    return _budget_pacing_tables([result], window)
 
 
 def budget_report_all(
-    gads_service, client, start_date, end_date, time_seg, accounts_info
+    gads_service, client, start_date, end_date, time_seg, accounts_info, **kwargs
 ):
-    """Placeholder for generating a budget report across accounts.
+    """Generate the budget pacing report across accounts.
+
+    Accounts are fetched concurrently; pacing is then computed for every
+    budget in a single pass.
 
     Args:
         gads_service (GoogleAdsService): Service used for GAQL queries.
         client (GoogleAdsClient): Authenticated API client.
         start_date (str): Inclusive start date ('YYYY-MM-DD').
-        end_date (str): Inclusive end date ('YYYY-MM-DD').
+        end_date (str): Last day of spend included ('YYYY-MM-DD').
+        time_seg (str): Time segmentation key.
+        accounts_info (dict[str, str]): Mapping of customer IDs to account
+            names.
+        **kwargs: 'concurrency' sets the number of accounts queried at once.
+
+    Returns:
+        tuple[list[list], list[str], list[list], list[str]]: Budget pacing
+        rows and headers, then account pacing rows and headers.
+    """
+
+    window = pacing.pacing_window(end_date)
+    results = []
+    for customer_id, account_descriptive, result in _fan_out_accounts(
+        lambda cid: _fetch_budget_spend(
+            gads_service, client, cid, window, accounts_info[cid]
+        ),
+        accounts_info,
+        kwargs.get("concurrency"),
+    ):
+        if result is None:
+            continue
+        results.append(result)
+    if not results:
+        print("No data returned for any accounts.")
+        return [], [], [], []
+    return _budget_pacing_tables(results, window)
+
+
+FORECAST_HEADERS = [
+    "Account name",
+    "Customer ID",
+    "Campaign ID",
+    "Campaign",
+    "Last 7d cost",
+    "Last 28d cost",
+    "Forecast next 7d",
+    "Forecast next 30d",
+    "Forecast rest of month",
+]
+
+
+def _forecast_through(end_date):
+    """Return the last complete day to forecast from (never today)."""
+    yesterday = date.today() - timedelta(days=1)
+    return min(date.fromisoformat(end_date), yesterday)
+
+
+def _refresh_cost_history(gads_service, client, customer_id, through):
+    """Bring an account's cached daily cost history up to 'through'.
+
+    Only days after the cached end (plus a short overlap for restated cost)
+    are queried, using the campaign type report query and row decoder.
+
+    Returns:
+        forecast.CostHistory: The refreshed history.
+    """
+
+    history = forecast.CostHistory.load(customer_id)
+    missing = history.missing_range(through)
+    if missing is None:
+        return history
+    fetch_start, fetch_end = missing
+    query = queries.camptype_report_query(
+        fetch_start.isoformat(), fetch_end.isoformat(), "segments.date"
+    )
+    rows = pipeline.decode(
+        pipeline.source(gads_service, customer_id, query),
+        _CAMPAIGN_COST_SPEC,
+        get_enums(client),
+        {"time_seg": "date"},
+        aggregation.StringDictionary(),
+    )
+    history.update(rows, fetch_start, fetch_end)
+    history.save(customer_id)
+    return history
+
+
+def _forecast_table(histories, through):
+    """Forecast every campaign of the given '(customer_id, history)' pairs.
+
+    Forecasts start after 'through', even when the cached histories run on.
+    """
+
+    records = []
+    for customer_id, history in histories:
+        for record in forecast.forecast_history(history, through):
+            record["Customer ID"] = int(customer_id)
+            records.append(record)
+    records.sort(key=lambda r: (r["Account name"] or "", -r["Forecast next 30d"]))
+    return [[r.get(h) for h in FORECAST_HEADERS] for r in records], FORECAST_HEADERS
+
+
+def forecast_report_single(
+    gads_service, client, start_date, end_date, time_seg, customer_id, **kwargs
+):
+    """Forecast campaign spend for one account from its cached cost history.
+
+    Forecasts start after 'end_date' (or yesterday, whichever is earlier);
+    'start_date' and 'time_seg' are accepted for menu symmetry.
+
+    Args:
+        gads_service (GoogleAdsService): Service used for GAQL queries.
+        client (GoogleAdsClient): Authenticated API client.
+        start_date (str): Inclusive start date ('YYYY-MM-DD').
+        end_date (str): Last day of history used ('YYYY-MM-DD').
+        time_seg (str): Time segmentation key.
+        customer_id (str): Target customer ID.
+        **kwargs: Reserved for runtime options.
+
+    Returns:
+        tuple[list[list], list[str]]: Forecast rows and headers.
+    """
+
+    through = _forecast_through(end_date)
+    history = _refresh_cost_history(gads_service, client, customer_id, through)
+    return _forecast_table([(customer_id, history)], through)
+
+
+def forecast_report_all(
+    gads_service, client, start_date, end_date, time_seg, accounts_info, **kwargs
+):
+    """Forecast campaign spend across accounts from cached cost histories.
+
+    Histories are refreshed concurrently; forecasting itself is local.
+
+    Args:
+        gads_service (GoogleAdsService): Service used for GAQL queries.
+        client (GoogleAdsClient): Authenticated API client.
+        start_date (str): Inclusive start date ('YYYY-MM-DD').
+        end_date (str): Last day of history used ('YYYY-MM-DD').
+        time_seg (str): Time segmentation key.
+        accounts_info (dict[str, str]): Mapping of customer IDs to account
+            names.
+        **kwargs: 'concurrency' sets the number of accounts refreshed at once.
+
+    Returns:
+        tuple[list[list], list[str]]: Forecast rows and headers.
+    """
+
+    through = _forecast_through(end_date)
+    histories = []
+    for customer_id, account_descriptive, history in _fan_out_accounts(
+        lambda cid: _refresh_cost_history(gads_service, client, cid, through),
+        accounts_info,
+        kwargs.get("concurrency"),
+    ):
+        if history is None:
+            continue
+        if history.account_name is None:
+            history.account_name = account_descriptive
+        histories.append((customer_id, history))
+    if not histories:
+        print("No data returned for any accounts.")
+        return [], []
+    return _forecast_table(histories, through)
+
+
+ANOMALY_HEADERS = [
+    "Date",
+    "Account name",
+    "Customer ID",
+    "Level",
+    "ID",
+    "Name",
+    "Metric",
+    "Value",
+    "Expected",
+    "Median",
+    "EWMA z",
+    "Robust z",
+    "Direction",
+]
+
+# metrics tracked per series level
+ANOMALY_METRICS = {
+    "Account": ("Cost", "Clicks", "Invalid click %"),
+    "Campaign": ("Cost", "Clicks"),
+}
+
+
+def _anomaly_observations(account_table, account_headers, ad_table, ad_headers):
+    """Group account and campaign report rows into per-day series observations.
+
+    Returns:
+        dict[str, dict[str, dict]]: ISO day to series key to observation.
+    """
+
+    by_day = defaultdict(dict)
+    for values in account_table:
+        row = dict(zip(account_headers, values))
+        by_day[row["date"]][f"account:{row['customer id']}"] = {
+            "level": "Account",
+            "id": row["customer id"],
+            "name": row["account"],
+            "values": {
+                "Cost": row["cost"],
+                "Clicks": row["clicks"],
+                "Invalid click %": row["invalid click %"],
+            },
+        }
+    for values in ad_table:
+        row = dict(zip(ad_headers, values))
+        by_day[row["Date"]][f"campaign:{row['Campaign ID']}"] = {
+            "level": "Campaign",
+            "id": row["Campaign ID"],
+            "name": row["Campaign name"],
+            "values": {"Cost": row["Cost"], "Clicks": row["Clicks"]},
+        }
+    return by_day
+
+
+def _anomaly_options(kwargs):
+    """Return the run options the anomaly scans pass to their reports.
+
+    Report toggles such as 'grouping_sets' or 'id_only' are left out, so the
+    scans see plain daily rows whatever the caller's other options are.
+    """
+
+    return {name: kwargs.get(name) for name in ("memory_limit", "processes")}
+
+
+def _refresh_anomaly_state(gads_service, client, customer_id, through, options):
+    """Evaluate the days an account's detector has not seen yet, up to 'through'.
+
+    New days are fetched with the account and ad-level reports (campaign
+    dimensions only) and folded into the cached baselines one day at a time.
+    'options' come from '_anomaly_options'.
+
+    Returns:
+        anomaly.AnomalyDetector: The refreshed detector.
+    """
+
+    detector = anomaly.AnomalyDetector.load(customer_id)
+    missing = detector.missing_range(through)
+    if missing is None:
+        return detector
+    fetch_start, fetch_end = missing
+    start_date, end_date = fetch_start.isoformat(), fetch_end.isoformat()
+    account_table, account_headers = account_report_single(
+        gads_service, client, start_date, end_date, "date", customer_id, **options
+    )
+    ad_options = dict(
+        options,
+        include_campaign_info=True,
+        include_channel_types=False,
+        include_adgroup_info=False,
+        include_mac=False,
+    )
+    ad_table, ad_headers = ad_level_report_single(
+        gads_service, client, start_date, end_date, "date", customer_id, **ad_options
+    )
+    if account_table:
+        detector.account_name = dict(zip(account_headers, account_table[0]))["account"]
+    by_day = _anomaly_observations(account_table, account_headers, ad_table, ad_headers)
+    day = fetch_start
+    while day <= fetch_end:
+        detector.observe_day(day, by_day.get(day.isoformat(), {}), ANOMALY_METRICS)
+        day += timedelta(days=1)
+    detector.prune()
+    detector.save(customer_id)
+    return detector
+
+
+def _anomaly_table(detectors, start_date, end_date):
+    """Tabulate retained alerts dated within 'start_date'..'end_date'."""
+    records = []
+    for customer_id, detector in detectors:
+        for alert in detector.alerts:
+            if start_date <= alert["Date"] <= end_date:
+                records.append(
+                    dict(
+                        alert,
+                        **{
+                            "Account name": detector.account_name,
+                            "Customer ID": int(customer_id),
+                        },
+                    )
+                )
+    # most recent first, strongest deviations first within a day
+    records.sort(key=lambda r: (r["Date"], abs(r["EWMA z"])), reverse=True)
+    return [[r.get(h) for h in ANOMALY_HEADERS] for r in records], ANOMALY_HEADERS
+
+
+def anomaly_report_single(
+    gads_service, client, start_date, end_date, time_seg, customer_id, **kwargs
+):
+    """Report daily anomalies in account and campaign cost, clicks, and invalid clicks.
+
+    Only days after the cached detector state (through 'end_date', or
+    yesterday if earlier) are fetched and evaluated; alerts dated within
+    'start_date'..'end_date' are returned. 'time_seg' is accepted for menu
+    symmetry; the detector always works on daily rows.
+
+    Args:
+        gads_service (GoogleAdsService): Service used for GAQL queries.
+        client (GoogleAdsClient): Authenticated API client.
+        start_date (str): First alert date shown ('YYYY-MM-DD').
+        end_date (str): Last day evaluated ('YYYY-MM-DD').
+        time_seg (str): Time segmentation key.
+        customer_id (str): Target customer ID.
+        **kwargs: 'memory_limit' and 'processes' for the underlying reports.
+
+    Returns:
+        tuple[list[list], list[str]]: Alert rows and headers.
+    """
+
+    detector = _refresh_anomaly_state(
+        gads_service,
+        client,
+        customer_id,
+        _forecast_through(end_date),
+        _anomaly_options(kwargs),
+    )
+    return _anomaly_table([(customer_id, detector)], start_date, end_date)
+
+
+def anomaly_report_all(
+    gads_service, client, start_date, end_date, time_seg, accounts_info, **kwargs
+):
+    """Report daily anomalies across accounts from cached detector states.
+
+    Args:
+        gads_service (GoogleAdsService): Service used for GAQL queries.
+        client (GoogleAdsClient): Authenticated API client.
+        start_date (str): First alert date shown ('YYYY-MM-DD').
+        end_date (str): Last day evaluated ('YYYY-MM-DD').
         time_seg (str): Time segmentation key.
         accounts_info (dict[str, str]): Mapping of customer IDs to account
             names.
+        **kwargs: 'concurrency' sets the number of accounts refreshed at once;
+            'memory_limit' and 'processes' apply to the underlying reports.
 
     Returns:
-        None: This placeholder prints a confirmation message.
+        tuple[list[list], list[str]]: Alert rows and headers.
     """
 
-    print("Budget report - all, test complete!")
+    through = _forecast_through(end_date)
+    options = _anomaly_options(kwargs)
+    detectors = []
+    for customer_id, account_descriptive, detector in _fan_out_accounts(
+        lambda cid: _refresh_anomaly_state(gads_service, client, cid, through, options),
+        accounts_info,
+        kwargs.get("concurrency"),
+    ):
+        if detector is None:
+            continue
+        if detector.account_name is None:
+            detector.account_name = account_descriptive
+        detectors.append((customer_id, detector))
+    if not detectors:
+        print("No data returned for any accounts.")
+        return [], []
+    return _anomaly_table(detectors, start_date, end_date)
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""Concurrent sessions across several credential profiles (manager accounts).
+
+Each profile YAML authenticates its own client under its own
+'login_customer_id'. Sessions issue requests through their own quota
+governor, so one manager account's rate limits never slow another's. Child
+accounts reachable from several profiles are assigned to the first profile
+listing them, so every account is reported exactly once.
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from google.api_core.exceptions import TooManyRequests
+
+from gar import services
+
+# API requests per second each profile may start when --profile-rate is not given
+DEFAULT_PROFILE_RATE = 5.0
+# streams a profile may hold open at once
+DEFAULT_MAX_IN_FLIGHT = 4
+# pause added to a profile's schedule after the API reports exhausted quota
+BACKOFF_SECONDS = 30.0
+
+ACCOUNT_HEADERS = ["account id", "account name", "profile"]
+
+
+class QuotaGovernor:
+    """Pace one profile's requests: a start rate and a cap on open streams.
+
+    Request starts are spaced '1 / rate' seconds apart; a quota error
+    pushes the next start back by 'BACKOFF_SECONDS'.
+
+    Args:
+        rate (float): Requests started per second.
+        max_in_flight (int): Requests (streams) open at once.
+    """
+
+    def __init__(self, rate=DEFAULT_PROFILE_RATE, max_in_flight=DEFAULT_MAX_IN_FLIGHT):
+        self.interval = 1.0 / rate
+        self.slots = threading.BoundedSemaphore(max_in_flight)
+        self.next_start = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may start."""
+        self.slots.acquire()
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self.next_start)
+            self.next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+    def release(self):
+        """Free the slot of a finished request."""
+        self.slots.release()
+
+    def backoff(self):
+        """Delay further requests after a quota error."""
+        with self._lock:
+            self.next_start = max(self.next_start, time.monotonic()) + BACKOFF_SECONDS
+
+
+class GovernedService:
+    """'GoogleAdsService' wrapper routing queries through a 'QuotaGovernor'.
+
+    Args:
+        gads_service (GoogleAdsService): Wrapped service.
+        governor (QuotaGovernor): The profile's governor.
+    """
+
+    def __init__(self, gads_service, governor):
+        self.gads_service = gads_service
+        self.governor = governor
+
+    def search_stream(self, *args, **kwargs):
+        """Stream a query, holding a governor slot until the stream ends."""
+        self.governor.acquire()
+        try:
+            yield from self.gads_service.search_stream(*args, **kwargs)
+        except TooManyRequests:
+            self.governor.backoff()
+            raise
+        finally:
+            self.governor.release()
+
+    def search(self, *args, **kwargs):
+        """Run a paged search under the governor."""
+        self.governor.acquire()
+        try:
+            return self.gads_service.search(*args, **kwargs)
+        except TooManyRequests:
+            self.governor.backoff()
+            raise
+        finally:
+            self.governor.release()
+
+    def __getattr__(self, name):
+        return getattr(self.gads_service, name)
+
+
+class Session:
+    """One authenticated credential profile and the accounts it reaches.
+
+    Args:
+        name (str): Profile name (the YAML file stem).
+        gads_service (GovernedService): Governed query service.
+        customer_service (CustomerService): Service for customer lookups.
+        client (GoogleAdsClient): Authenticated API client.
+    """
+
+    def __init__(self, name, gads_service, customer_service, client):
+        self.name = name
+        self.gads_service = gads_service
+        self.customer_service = customer_service
+        self.client = client
+        self.customer_dict = {}
+
+    def load_accounts(self):
+        """Fetch the child accounts of the profile's manager account."""
+        _, _, self.customer_dict, _ = services.get_accounts(
+            self.gads_service, self.customer_service, self.client
+        )
+        return self
+
+
+def open_sessions(yaml_paths, rate=None):
+    """Authenticate every profile and load their accounts concurrently.
+
+    Args:
+        yaml_paths (list[str]): Credential YAML per profile.
+        rate (float | None): Requests per second per profile.
+
+    Returns:
+        list[Session]: Sessions in profile order.
+    """
+
+    missing = [path for path in yaml_paths if not os.path.exists(path)]
+    if missing:
+        print(f"Profile YAML file(s) not found: {', '.join(missing)}")
+        sys.exit(1)
+    sessions = []
+    for path in yaml_paths:
+        gads_service, customer_service, client = services.generate_services(path)
+        governor = QuotaGovernor(rate or DEFAULT_PROFILE_RATE)
+        sessions.append(
+            Session(
+                Path(path).stem,
+                GovernedService(gads_service, governor),
+                customer_service,
+                client,
+            )
+        )
+    with ThreadPoolExecutor(max_workers=len(sessions)) as executor:
+        return list(executor.map(Session.load_accounts, sessions))
+
+
+def assign_accounts(sessions):
+    """De-duplicate child accounts across sessions.
+
+    Returns:
+        dict[str, Session]: Owning session per customer ID; the first
+        profile listing an account owns it.
+    """
+
+    owners = {}
+    for session in sessions:
+        for customer_id in session.customer_dict:
+            owners.setdefault(customer_id, session)
+    return owners
+
+
+class RoutingService:
+    """Query service that sends each request to the session owning the account.
+
+    Lets every existing report run unchanged over the merged account list.
+
+    Args:
+        sessions (list[Session]): Open sessions, in profile order.
+    """
+
+    def __init__(self, sessions):
+        self.sessions = sessions
+        self.owners = assign_accounts(sessions)
+
+    def session_for(self, customer_id):
+        """Return the owning session ('customer_id' may be a manager)."""
+        return self.owners.get(str(customer_id), self.sessions[0])
+
+    def search_stream(self, *args, customer_id=None, **kwargs):
+        service = self.session_for(customer_id).gads_service
+        return service.search_stream(*args, customer_id=customer_id, **kwargs)
+
+    def search(self, *args, request=None, **kwargs):
+        customer_id = getattr(request, "customer_id", kwargs.get("customer_id"))
+        service = self.session_for(customer_id).gads_service
+        return service.search(*args, request=request, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.sessions[0].gads_service, name)
+
+    def accounts_info(self):
+        """Return the merged account table, headers, lookup dict, and count."""
+        customer_dict = {}
+        customer_list = []
+        for customer_id, session in self.owners.items():
+            name = session.customer_dict[customer_id]
+            customer_dict[customer_id] = name
+            customer_list.append([customer_id, name, session.name])
+        return customer_list, list(ACCOUNT_HEADERS), customer_dict, len(customer_dict)
+
+    def partition(self, accounts_info):
+        """Split '{customer id: name}' into per-session account dicts."""
+        parts = {}
+        for customer_id, name in accounts_info.items():
+            session = self.session_for(customer_id)
+            parts.setdefault(session, {})[customer_id] = name
+        return parts
+
+
+def run_all(
+    report_all,
+    routing,
+    start_date,
+    end_date,
+    time_seg,
+    accounts_info,
+    metric_header,
+    **kwargs,
+):
+    """Run a '*_all' report in every session concurrently and merge the rows.
+
+    Args:
+        report_all (Callable): The report's '*_all' function.
+        routing (RoutingService): Sessions and account owners.
+        start_date (str): Inclusive start date ('YYYY-MM-DD').
+        end_date (str): Inclusive end date ('YYYY-MM-DD').
+        time_seg (str): Time segmentation key.
+        accounts_info (dict[str, str]): Accounts to report.
+        metric_header (str): Metric the report orders descending per date.
+        **kwargs: Report toggles and run options.
+
+    Returns:
+        tuple[list[list], list[str]]: Combined table rows and headers.
+    """
+
+    parts = routing.partition(accounts_info)
+    with ThreadPoolExecutor(max_workers=len(parts) or 1) as executor:
+        futures = [
+            executor.submit(
+                report_all,
+                session.gads_service,
+                session.client,
+                start_date,
+                end_date,
+                time_seg,
+                accounts,
+                **kwargs,
+            )
+            for session, accounts in parts.items()
+        ]
+        results = [future.result() for future in futures]
+    headers = next((headers for _, headers in results if headers), [])
+    if kwargs.get("result_sink") is not None:
+        return [], headers
+    result_sets = [rows for rows, _ in results if rows]
+    if not result_sets:
+        return [], headers
+    return services.merge_account_results(result_sets, headers, metric_header), headers
@@ -0,0 +1,425 @@
+# -*- coding: utf-8 -*-
+"""Day-partitioned local store for daily performance report tables.
+
+Performance reports fetch by day, so a finished daily table splits cleanly
+into one partition per (customer, report shape, day). A request is served
+from the stored partitions and only its missing days are queried: today's
+last 30 days and yesterday's overlap by 29 days, so the second run costs
+one day of API rows.
+
+Partitions are small columnar files read through 'mmap'. Integer columns
+and fixed-scale decimal columns are stored as int64 arrays, and any other
+column is dictionary encoded, so values round-trip exactly. The most recent
+days are still revised by the API, so they are kept apart as fresh
+partitions, served only for a few hours after they were fetched (and only
+when the store is opened with 'fresh_hours').
+"""
+
+import array
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from gar import cache, history, rollup
+
+STORE_DIR = "store"
+# bump when a stored report's columns change, so old partitions are ignored
+FORMAT_VERSION = 2
+MAGIC = b"GARCOL1\n"
+# days newer than this are refetched on every run (late conversions, etc.)
+SETTLE_DAYS = 3
+# hours an unsettled day is served after a fetch (a night's warm-up, 'warm')
+FRESH_HOURS = 12
+# report options that change a report's rows; run options are left out
+SHAPE_OPTIONS = (
+    "include_channel_types",
+    "include_campaign_info",
+    "include_adgroup_info",
+    "include_device_info",
+    "include_mac",
+    "mac_rules",
+    "grouping_sets",
+)
+
+_HEADER_LENGTH = struct.Struct("<I")
+_ALIGN = 8
+
+
+def shape_options(options):
+    """Return the 'SHAPE_OPTIONS' of report keyword arguments, JSON-safe.
+
+    MAC rules are kept as their '--mac-rule' specs ('common.parse_mac_rule').
+    """
+
+    shape = {name: options.get(name) for name in SHAPE_OPTIONS}
+    if shape["mac_rules"]:
+        shape["mac_rules"] = [getattr(r, "spec", r) for r in shape["mac_rules"]]
+    return shape
+
+
+def shape_key(report, options):
+    """Return a short key naming a report's query shape.
+
+    Args:
+        report (str): Report option keyword (for example 'ads').
+        options (dict): Report keyword arguments; only 'SHAPE_OPTIONS' count.
+
+    Returns:
+        str: Report name and a digest of the shape options.
+    """
+
+    shape = shape_options(options)
+    shape["version"] = FORMAT_VERSION
+    digest = hashlib.sha1(json.dumps(shape, sort_keys=True).encode("utf-8")).hexdigest()
+    return f"{report}-{digest[:12]}"
+
+
+def _days(start_date, end_date):
+    """Yield each ISO day from 'start_date' through 'end_date'."""
+    day = date.fromisoformat(start_date)
+    last = date.fromisoformat(end_date)
+    while day <= last:
+        yield day.isoformat()
+        day += timedelta(days=1)
+
+
+def missing_ranges(stored_days, start_date, end_date):
+    """Group the days of a window that are not stored into contiguous ranges.
+
+    Args:
+        stored_days (set[str]): ISO days already stored.
+        start_date (str): Inclusive start date ('YYYY-MM-DD').
+        end_date (str): Inclusive end date ('YYYY-MM-DD').
+
+    Returns:
+        list[tuple[str, str]]: Inclusive '(start, end)' ranges to fetch.
+    """
+
+    ranges = []
+    for day in _days(start_date, end_date):
+        if day in stored_days:
+            continue
+        previous = (date.fromisoformat(day) - timedelta(days=1)).isoformat()
+        if ranges and ranges[-1][1] == previous:
+            ranges[-1] = (ranges[-1][0], day)
+        else:
+            ranges.append((day, day))
+    return ranges
+
+
+"""
+COLUMNAR PARTITIONS
+"""
+
+
+def _encode_value(value):
+    """Make a dictionary value JSON-safe, keeping Decimals distinguishable."""
+    if isinstance(value, Decimal):
+        return {"d": str(value)}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        return Decimal(value["d"])
+    return value
+
+
+def _encode_column(values):
+    """Encode one column as '(meta, payload bytes)'.
+
+    Returns:
+        tuple[dict, bytes]: Column metadata and its packed values.
+    """
+
+    try:
+        if values and all(type(v) is int for v in values):
+            return {"kind": "int"}, array.array("q", values).tobytes()
+        exponents = {v.as_tuple().exponent for v in values if isinstance(v, Decimal)}
+        if (
+            values
+            and len(exponents) == 1
+            and all(isinstance(v, Decimal) and v.is_finite() for v in values)
+        ):
+            exponent = exponents.pop()
+            scaled = [int(v.scaleb(-exponent)) for v in values]
+            return {"kind": "decimal", "exponent": exponent}, array.array(
+                "q", scaled
+            ).tobytes()
+    except OverflowError:
+        # beyond int64; dictionary encoding keeps the exact values
+        pass
+    codes = {}
+    dictionary = []
+    encoded = []
+    for value in values:
+        key = (type(value).__name__, value)
+        code = codes.get(key)
+        if code is None:
+            code = codes[key] = len(dictionary)
+            dictionary.append(_encode_value(value))
+        encoded.append(code)
+    return {"kind": "dictionary", "values": dictionary}, array.array(
+        "i", encoded
+    ).tobytes()
+
+
+def _decode_column(meta, payload):
+    """Decode a column payload (a 'memoryview' over the mapped file)."""
+    kind = meta["kind"]
+    if kind == "int":
+        return payload.cast("q").tolist()
+    if kind == "decimal":
+        exponent = meta["exponent"]
+        return [Decimal(v).scaleb(exponent) for v in payload.cast("q")]
+    dictionary = [_decode_value(v) for v in meta["values"]]
+    return [dictionary[code] for code in payload.cast("i")]
+
+
+def write_partition(path, headers, rows):
+    """Atomically write one day's rows as a columnar partition file.
+
+    Args:
+        path (Path): Destination file.
+        headers (list[str]): Table headers.
+        rows (list[list]): The day's rows, in report order.
+    """
+
+    columns = []
+    payloads = []
+    offset = 0
+    for idx in range(len(headers)):
+        meta, payload = _encode_column([row[idx] for row in rows])
+        meta.update(offset=offset, length=len(payload))
+        columns.append(meta)
+        padding = -len(payload) % _ALIGN
+        payloads.append(payload + b"\0" * padding)
+        offset += len(payload) + padding
+    header = json.dumps(
+        {"headers": headers, "rows": len(rows), "columns": columns}
+    ).encode("utf-8")
+    header += b" " * (-(len(MAGIC) + _HEADER_LENGTH.size + len(header)) % _ALIGN)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(MAGIC + _HEADER_LENGTH.pack(len(header)) + header)
+            for payload in payloads:
+                tmp_file.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def read_partition(path):
+    """Read a columnar partition file through 'mmap'.
+
+    Returns:
+        tuple[list[str], list[list]]: Headers and rows.
+
+    Raises:
+        ValueError: If the file is not a partition.
+    """
+
+    with open(path, "rb") as partition_file:
+        size = os.fstat(partition_file.fileno()).st_size
+        if size < len(MAGIC) + _HEADER_LENGTH.size:
+            raise ValueError(f"Truncated partition: {path}")
+        with mmap.mmap(partition_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if mapped[: len(MAGIC)] != MAGIC:
+                raise ValueError(f"Not a partition file: {path}")
+            (header_length,) = _HEADER_LENGTH.unpack_from(mapped, len(MAGIC))
+            start = len(MAGIC) + _HEADER_LENGTH.size
+            header = json.loads(mapped[start : start + header_length])
+            base = start + header_length
+            view = memoryview(mapped)
+            try:
+                columns = [
+                    _decode_column(
+                        meta,
+                        view[
+                            base + meta["offset"] : base
+                            + meta["offset"]
+                            + meta["length"]
+                        ],
+                    )
+                    for meta in header["columns"]
+                ]
+            finally:
+                view.release()
+    rows = [list(row) for row in zip(*columns)] if columns else []
+    return header["headers"], rows
+
+
+"""
+STORE
+"""
+
+
+class ResultStore:
+    """Daily report tables partitioned by customer, report shape, and day.
+
+    Args:
+        root (Path | None): Store directory; defaults to 'store' under the
+            cache directory ('~/.gar' or '$GAR_CACHE_DIR').
+        settle_days (int): Days before today that are still refetched.
+        fresh_hours (float): Hours an unsettled day is served after it was
+            fetched; 0 refetches unsettled days on every run.
+        today (date | None): Reference day, for tests.
+    """
+
+    def __init__(self, root=None, settle_days=SETTLE_DAYS, fresh_hours=0, today=None):
+        self.root = Path(root) if root else cache.cache_dir() / STORE_DIR
+        self.settle_days = settle_days
+        self.fresh_hours = fresh_hours
+        self.today = today
+
+    def settled(self, day):
+        """Return whether an ISO day is old enough to be stored."""
+        today = self.today or date.today()
+        return date.fromisoformat(day) <= today - timedelta(days=self.settle_days)
+
+    def partition_path(self, customer_id, shape, day, fresh=False):
+        suffix = ".fresh.col" if fresh else ".col"
+        return self.root / str(customer_id) / shape / f"{day}{suffix}"
+
+    def stored_path(self, customer_id, shape, day):
+        """Return the partition serving a day, or None if it must be fetched."""
+        path = self.partition_path(customer_id, shape, day)
+        if path.exists():
+            return path
+        if not self.fresh_hours or self.settled(day):
+            # a fresh partition of a now settled day may predate revisions
+            return None
+        path = self.partition_path(customer_id, shape, day, fresh=True)
+        try:
+            age = time.time() - path.stat().st_mtime
+        except OSError:
+            return None
+        return path if age <= self.fresh_hours * 3600 else None
+
+    def stored_days(self, customer_id, shape, start_date, end_date):
+        """Return the days of a window with a servable partition."""
+        return {
+            day
+            for day in _days(start_date, end_date)
+            if self.stored_path(customer_id, shape, day) is not None
+        }
+
+    def missing(self, customer_id, shape, start_date, end_date):
+        """Return the ranges of a window that would be fetched."""
+        stored = self.stored_days(customer_id, shape, start_date, end_date)
+        return missing_ranges(stored, start_date, end_date)
+
+    def write(self, customer_id, shape, headers, rows, start_date, end_date):
+        """Store the settled days of a daily table fetched for a window.
+
+        Days of the window without rows are stored empty, so they are not
+        fetched again. With 'fresh_hours', unsettled days before today are
+        stored as fresh partitions.
+        """
+
+        date_idx = next(
+            (headers.index(h) for h in rollup.DATE_HEADERS if h in headers), 0
+        )
+        by_day = {day: [] for day in _days(start_date, end_date)}
+        for row in rows:
+            by_day.setdefault(str(row[date_idx]), []).append(row)
+        today = (self.today or date.today()).isoformat()
+        for day, day_rows in by_day.items():
+            if self.settled(day):
+                write_partition(
+                    self.partition_path(customer_id, shape, day), headers, day_rows
+                )
+                self.partition_path(customer_id, shape, day, fresh=True).unlink(
+                    missing_ok=True
+                )
+            elif self.fresh_hours and day < today:
+                path = self.partition_path(customer_id, shape, day, fresh=True)
+                write_partition(path, headers, day_rows)
+        return by_day
+
+    def serve(
+        self,
+        report,
+        report_single,
+        gads_service,
+        client,
+        start_date,
+        end_date,
+        time_seg,
+        customer_id,
+        **kwargs,
+    ):
+        """Run a '*_single' report from stored days plus the missing ones.
+
+        Missing ranges are fetched by day with 'report_single'; the combined
+        daily table is then rolled up to 'time_seg' locally. A 'run_history'
+        recorder receives one record per account covering the fetched days
+        only, so partial hits do not dilute row estimates.
+
+        Returns:
+            tuple[list[list], list[str]]: Table rows and headers.
+        """
+
+        run_history = kwargs.pop("run_history", None)
+        shape = shape_key(report, kwargs)
+        headers = None
+        by_day = {}
+        fetched = []
+        for day in _days(start_date, end_date):
+            path = self.stored_path(customer_id, shape, day)
+            if path is None:
+                continue
+            try:
+                headers, by_day[day] = read_partition(path)
+            except (OSError, ValueError) as e:
+                # an unreadable partition is fetched again
+                print(f"Ignoring stored partition {day} for {customer_id}: {e}")
+        for fetch_start, fetch_end in missing_ranges(by_day, start_date, end_date):
+            recorder = None
+            if run_history is not None:
+                recorder = history.RunRecorder(report, fetch_start, fetch_end)
+                fetched.append(recorder)
+            rows, fetched_headers = report_single(
+                gads_service,
+                client,
+                fetch_start,
+                fetch_end,
+                "date",
+                customer_id,
+                run_history=recorder,
+                **kwargs,
+            )
+            if not fetched_headers:
+                # the fetch failed; nothing is stored for these days
+                continue
+            headers = fetched_headers
+            by_day.update(
+                self.write(customer_id, shape, headers, rows, fetch_start, fetch_end)
+            )
+        records = [record for recorder in fetched for record in recorder.records]
+        if records:
+            run_history.record(
+                customer_id,
+                sum(record["api_rows"] for record in records),
+                sum(record["rows"] for record in records),
+                sum(record["seconds"] for record in records),
+                days=sum(record["days"] for record in records),
+            )
+        if headers is None:
+            return [], []
+        rows = [row for day in sorted(by_day) for row in by_day[day]]
+        rows = rollup.roll_up_table(
+            rows, headers, report, time_seg, kwargs.get("fiscal_year_start", 1)
+        )
+        return rows, headers
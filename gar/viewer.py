@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""Interactive viewer that renders large report tables one page at a time."""
+
+import shutil
+from decimal import Decimal
+
+# rows sampled (evenly across the table) to size columns
+WIDTH_SAMPLE_ROWS = 1000
+# widest a column may render; longer cells are truncated
+MAX_COLUMN_WIDTH = 40
+COLUMN_GAP = "  "
+# lines reserved for the header, separator, status line, and prompt
+CHROME_LINES = 5
+
+HELP_TEXT = """\
+Commands:
+  ENTER / n        next page            p            previous page
+  g <row>          jump to row          g / G        first / last page
+  > / <            scroll columns       / <text>     filter rows containing text
+  f <col> <text>   filter a column      s <col>      sort by column (s -<col> descending)
+  c                clear filter/sort    h            help
+  q                quit
+Columns are referenced by number (1 = first) or header name."""
+
+
+def format_cell(value):
+    """Return the display text of a cell ('None' renders blank)."""
+    return "" if value is None else str(value)
+
+
+def _is_numeric(value):
+    return isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
+
+
+def sort_value(value):
+    """Sort key that orders numbers numerically before text."""
+    if _is_numeric(value):
+        return (0, value)
+    return (1, str(value))
+
+
+def sample_widths(table_data, headers, sample_rows=WIDTH_SAMPLE_ROWS):
+    """Estimate column widths from the headers and an even sample of rows.
+
+    Args:
+        table_data (Sequence[Sequence]): Table rows.
+        headers (Sequence[str]): Column headers.
+        sample_rows (int): Maximum rows inspected.
+
+    Returns:
+        list[int]: Width per column, capped at 'MAX_COLUMN_WIDTH'.
+    """
+
+    widths = [len(str(header)) for header in headers]
+    head = sample_rows // 2
+    step = max(1, (len(table_data) - head) // (sample_rows - head))
+    # leading rows plus an even stride through the rest of the table
+    for rows in (table_data[:head], table_data[head::step]):
+        widen(widths, rows)
+    return [min(width, MAX_COLUMN_WIDTH) for width in widths]
+
+
+def widen(widths, rows):
+    """Grow 'widths' in place to fit 'rows' (capped at 'MAX_COLUMN_WIDTH')."""
+    for row in rows:
+        for column, value in enumerate(row):
+            length = min(len(format_cell(value)), MAX_COLUMN_WIDTH)
+            if length > widths[column]:
+                widths[column] = length
+
+
+def render_row(row, widths, columns):
+    """Render one row for the given column indices (numbers right-aligned)."""
+    cells = []
+    for column in columns:
+        value = row[column]
+        text = format_cell(value)
+        width = widths[column]
+        if len(text) > width:
+            text = text[: width - 3] + "..."
+        cells.append(text.rjust(width) if _is_numeric(value) else text.ljust(width))
+    return COLUMN_GAP.join(cells).rstrip()
+
+
+def render_header(headers, widths, columns):
+    """Render the header line and its separator."""
+    header = COLUMN_GAP.join(
+        str(headers[column])[: widths[column]].ljust(widths[column])
+        for column in columns
+    ).rstrip()
+    rule = COLUMN_GAP.join("-" * widths[column] for column in columns)
+    return [header, rule]
+
+
+def stream_table(table_data, headers, write=print):
+    """Write a whole table with sampled widths, without buffering the output."""
+    widths = sample_widths(table_data, headers)
+    columns = range(len(headers))
+    for line in render_header(headers, widths, columns):
+        write(line)
+    for row in table_data:
+        write(render_row(row, widths, columns))
+
+
+class TableViewer:
+    """Page through a table, rendering only the rows on screen.
+
+    Filtering and sorting work on a list of row indices, so the source rows
+    are never copied or re-rendered as a whole.
+
+    Args:
+        table_data (Sequence[Sequence]): Table rows.
+        headers (Sequence[str]): Column headers.
+        page_size (int | None): Rows per page (default: fit the terminal).
+        width (int | None): Characters per line (default: terminal width).
+    """
+
+    def __init__(self, table_data, headers, page_size=None, width=None):
+        terminal = shutil.get_terminal_size()
+        self.table_data = table_data
+        self.headers = list(headers)
+        self.page_size = page_size or max(1, terminal.lines - CHROME_LINES)
+        self.width = width or terminal.columns
+        self.widths = sample_widths(table_data, self.headers)
+        self.order = range(len(table_data))
+        self.position = 0
+        self.first_column = 0
+        self.steps = []
+
+    def visible_columns(self):
+        """Return the column indices that fit on screen from 'first_column'."""
+        columns = []
+        used = 0
+        for column in range(self.first_column, len(self.headers)):
+            needed = self.widths[column] + (len(COLUMN_GAP) if columns else 0)
+            if columns and used + needed > self.width:
+                break
+            columns.append(column)
+            used += needed
+        return columns
+
+    def render(self):
+        """Return the lines of the current page."""
+        page = self.order[self.position : self.position + self.page_size]
+        # the sample can miss wide cells; widen as pages reveal them
+        widen(self.widths, (self.table_data[index] for index in page))
+        columns = self.visible_columns()
+        lines = render_header(self.headers, self.widths, columns)
+        lines.extend(
+            render_row(self.table_data[index], self.widths, columns) for index in page
+        )
+        total = len(self.order)
+        last = min(self.position + self.page_size, total)
+        status = f"rows {self.position + 1 if total else 0}-{last} of {total}"
+        if total != len(self.table_data):
+            status += f" (filtered from {len(self.table_data)})"
+        status += (
+            f" | columns {columns[0] + 1}-{columns[-1] + 1} of {len(self.headers)}"
+        )
+        if self.steps:
+            status += f" | {', '.join(self.steps)}"
+        lines.append(status)
+        return lines
+
+    def column_index(self, reference):
+        """Resolve a 1-based column number or header name to an index."""
+        reference = reference.strip()
+        if reference.isdigit() and 1 <= int(reference) <= len(self.headers):
+            return int(reference) - 1
+        lowered = [str(header).lower() for header in self.headers]
+        if reference.lower() in lowered:
+            return lowered.index(reference.lower())
+        raise ValueError(f"Unknown column '{reference}'.")
+
+    def jump(self, row_number):
+        """Move so that 1-based 'row_number' is the first row shown."""
+        last_page = max(0, len(self.order) - self.page_size)
+        self.position = min(max(0, row_number - 1), last_page)
+
+    def filter(self, text, column=None):
+        """Keep rows whose cell (or any cell) contains 'text', case-insensitively."""
+        needle = text.lower()
+        rows = self.table_data
+        if column is None:
+            self.order = [
+                index
+                for index in self.order
+                if any(needle in format_cell(v).lower() for v in rows[index])
+            ]
+            self.steps.append(f"filter '{text}'")
+        else:
+            self.order = [
+                index
+                for index in self.order
+                if needle in format_cell(rows[index][column]).lower()
+            ]
+            self.steps.append(f"{self.headers[column]} ~ '{text}'")
+        self.position = 0
+
+    def sort(self, column, descending=False):
+        """Order the current rows by one column (blank cells always last)."""
+        rows = self.table_data
+        blank = [i for i in self.order if rows[i][column] in (None, "")]
+        filled = [i for i in self.order if rows[i][column] not in (None, "")]
+        filled.sort(key=lambda i: sort_value(rows[i][column]), reverse=descending)
+        self.order = filled + blank
+        direction = "desc" if descending else "asc"
+        self.steps.append(f"sorted {self.headers[column]} {direction}")
+        self.position = 0
+
+    def reset(self):
+        """Clear filters and sorting."""
+        self.order = range(len(self.table_data))
+        self.position = 0
+        self.steps = []
+
+    def handle(self, command):
+        """Apply one command; return False when the viewer should close.
+
+        Raises:
+            ValueError: If the command or its column reference is invalid.
+        """
+
+        command = command.strip()
+        name, _, argument = command.partition(" ")
+        argument = argument.strip()
+        if command in ("", "n"):
+            if self.position + self.page_size < len(self.order):
+                self.position += self.page_size
+        elif command == "p":
+            self.position = max(0, self.position - self.page_size)
+        elif command == "g":
+            self.position = 0
+        elif command == "G":
+            self.jump(len(self.order))
+        elif name == "g" and argument.isdigit():
+            self.jump(int(argument))
+        elif command == ">":
+            if self.visible_columns()[-1] < len(self.headers) - 1:
+                self.first_column += 1
+        elif command == "<":
+            self.first_column = max(0, self.first_column - 1)
+        elif command.startswith("/") and command[1:].strip():
+            self.filter(command[1:].strip())
+        elif name == "f" and " " in argument:
+            reference, text = argument.split(" ", 1)
+            self.filter(text.strip(), self.column_index(reference))
+        elif name == "s" and argument:
+            descending = argument.startswith("-")
+            self.sort(self.column_index(argument.lstrip("-")), descending)
+        elif command == "c":
+            self.reset()
+        elif command == "h":
+            print(HELP_TEXT)
+        elif command.lower() in ("q", "quit"):
+            return False
+        else:
+            raise ValueError(f"Unknown command '{command}' (type 'h' for help).")
+        return True
+
+    def run(self, prompt=None):
+        """Show pages and read commands until the user quits."""
+        # resolved per call so the 'exit'-aware input wrapper is used
+        prompt = prompt or input
+        print(HELP_TEXT)
+        while True:
+            print("\n".join(self.render()))
+            try:
+                command = prompt(": ")
+            except EOFError:
+                return
+            try:
+                if not self.handle(command):
+                    return
+            except ValueError as exc:
+                print(exc)
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""Warm the local store ahead of recurring performance report runs.
+
+Every interactive performance run is recorded in the run history with its
+report options ('history.RunRecorder'). Runs that recur on several days (the
+same report, options, and window relative to the run day, such as the last
+30 days or last calendar month) are replayed off-peak, for example from
+cron, into the day-partitioned store ('store'). The most frequent runs go
+first, and replay stops once the estimated API rows reach a budget. The next
+'--store' run then reads those days from disk.
+"""
+
+import json
+from datetime import date, datetime, timedelta
+from typing import NamedTuple
+
+from gar import common, history, store
+
+# days of run history a warm-up learns from
+LOOKBACK_DAYS = 14
+# distinct days a run must recur on before it is warmed
+MIN_RUN_DAYS = 2
+# estimated API rows one warm-up may fetch
+DEFAULT_BUDGET = 1000000
+
+
+class WarmRun(NamedTuple):
+    """A recurring report run learned from the run history.
+
+    Attributes:
+        report (str): Report option keyword (for example 'mac').
+        window (tuple): Window relative to the run day ('window_pattern').
+        options (dict): Report options it was run with ('store.shape_options').
+        customer_ids (tuple[str, ...]): Accounts it covered.
+        run_days (int): Distinct days it was run on.
+        last_run (float): Timestamp of the latest run.
+    """
+
+    report: str
+    window: tuple
+    options: dict
+    customer_ids: tuple
+    run_days: int
+    last_run: float
+
+
+def window_pattern(start_date, end_date, run_day):
+    """Describe a report window relative to the day it was run.
+
+    Args:
+        start_date (str): Inclusive start date ('YYYY-MM-DD').
+        end_date (str): Inclusive end date ('YYYY-MM-DD').
+        run_day (date): Day the report was run.
+
+    Returns:
+        tuple: '("month", months back)' for a whole calendar month, otherwise
+        '("days", days before the run day it ends, length in days)'.
+    """
+
+    start = date.fromisoformat(str(start_date))
+    end = date.fromisoformat(str(end_date))
+    if (
+        start.day == 1
+        and (end + timedelta(days=1)).day == 1
+        and (start.year, start.month) == (end.year, end.month)
+    ):
+        return ("month", (run_day.year - start.year) * 12 + run_day.month - start.month)
+    return ("days", (run_day - end).days, (end - start).days + 1)
+
+
+def pattern_window(window, today):
+    """Return the '(start, end)' ISO dates a window pattern covers on 'today'."""
+    if window[0] == "month":
+        months = today.year * 12 + today.month - 1 - window[1]
+        start = date(months // 12, months % 12 + 1, 1)
+        end = (start + timedelta(days=31)).replace(day=1) - timedelta(days=1)
+    else:
+        _, lag, days = window
+        end = today - timedelta(days=lag)
+        start = end - timedelta(days=days - 1)
+    return start.isoformat(), end.isoformat()
+
+
+def recurring_runs(records, today, lookback_days=LOOKBACK_DAYS):
+    """Group recorded runs and return those worth warming, most frequent first.
+
+    Args:
+        records (list[dict]): Recorded runs ('history.load').
+        today (date): Reference day.
+        lookback_days (int): Days of history considered.
+
+    Returns:
+        list[WarmRun]: Runs recurring on at least 'MIN_RUN_DAYS' days.
+    """
+
+    since = today - timedelta(days=lookback_days)
+    groups = {}
+    for record in records:
+        options = record.get("options")
+        if options is None:
+            # recorded before options were kept; it cannot be replayed
+            continue
+        run_day = datetime.fromtimestamp(record["recorded_at"]).date()
+        if run_day < since:
+            continue
+        window = window_pattern(record["start"], record["end"], run_day)
+        key = (record["report"], window, json.dumps(options, sort_keys=True))
+        days, customer_ids, last_run = groups.get(key, (set(), set(), 0))
+        days.add(run_day)
+        customer_ids.add(record["customer_id"])
+        groups[key] = (days, customer_ids, max(last_run, record["recorded_at"]))
+    runs = [
+        WarmRun(
+            report, window, json.loads(options), tuple(sorted(ids)), len(days), last
+        )
+        for (report, window, options), (days, ids, last) in groups.items()
+        if len(days) >= MIN_RUN_DAYS
+    ]
+    runs.sort(key=lambda run: (-run.run_days, -run.last_run))
+    return runs
+
+
+def plan_warmup(runs, result_store, records, budget, today):
+    """Pick the account windows to fetch, most frequent runs first.
+
+    Accounts whose window is fully stored are skipped; an account whose
+    estimate would exceed what is left of the budget is skipped too, so
+    smaller fetches further down can still use it. An account without row
+    history is charged the run's mean daily rows per account, or skipped
+    when no account of the run has history.
+
+    Args:
+        runs (list[WarmRun]): Candidate runs ('recurring_runs').
+        result_store (store.ResultStore): Store being warmed.
+        records (list[dict]): Recorded runs, for row estimates.
+        budget (int): Estimated API rows the warm-up may fetch.
+        today (date): Reference day.
+
+    Returns:
+        list[tuple[WarmRun, str, str, str, int]]: Run, start date, end date,
+        customer ID, and estimated API rows of each fetch.
+    """
+
+    fetches = []
+    spent = 0
+    for run in runs:
+        start_date, end_date = pattern_window(run.window, today)
+        shape = store.shape_key(run.report, run.options)
+        missing_days = {}
+        for customer_id in run.customer_ids:
+            missing = result_store.missing(customer_id, shape, start_date, end_date)
+            days = sum(history.window_days(*window) for window in missing)
+            if days:
+                missing_days[customer_id] = days
+        estimates = {
+            customer_id: history.estimate(records, run.report, customer_id, days)
+            for customer_id, days in missing_days.items()
+        }
+        daily_rows = [
+            estimate[0] / missing_days[customer_id]
+            for customer_id, estimate in estimates.items()
+            if estimate is not None
+        ]
+        for customer_id, days in missing_days.items():
+            estimate = estimates[customer_id]
+            if estimate is not None:
+                api_rows = estimate[0]
+            elif daily_rows:
+                api_rows = round(sum(daily_rows) / len(daily_rows) * days)
+                print(
+                    f"No row history for {run.report} on {customer_id}; "
+                    f"assuming ~{api_rows:,} API rows"
+                )
+            else:
+                print(
+                    f"No row history for {run.report} on {customer_id}; " "not warmed"
+                )
+                continue
+            if spent + api_rows > budget:
+                continue
+            spent += api_rows
+            fetches.append((run, start_date, end_date, customer_id, api_rows))
+    return fetches
+
+
+def replay_options(options):
+    """Turn recorded report options back into report keyword arguments."""
+    kwargs = {name: value for name, value in options.items() if value is not None}
+    if kwargs.get("mac_rules"):
+        kwargs["mac_rules"] = tuple(
+            common.parse_mac_rule(spec) for spec in kwargs["mac_rules"]
+        )
+    return kwargs
+
+
+def warm(
+    report_singles,
+    gads_service,
+    client,
+    budget=DEFAULT_BUDGET,
+    result_store=None,
+    today=None,
+):
+    """Replay recurring runs into the store within a row budget.
+
+    Warm-up fetches are not recorded in the run history, so they never make
+    a run look more frequent than analysts made it.
+
+    Args:
+        report_singles (dict[str, Callable]): '*_single' report per report
+            option keyword.
+        gads_service (GoogleAdsService): Service used for GAQL queries.
+        client (GoogleAdsClient): Authenticated API client.
+        budget (int): Estimated API rows the warm-up may fetch.
+        result_store (store.ResultStore | None): Store to fill; defaults to
+            the cache directory's, serving unsettled days for
+            'store.FRESH_HOURS'.
+        today (date | None): Reference day, for tests.
+
+    Returns:
+        list[tuple[WarmRun, str, str, str, int]]: The fetches made
+        ('plan_warmup').
+    """
+
+    today = today or date.today()
+    if result_store is None:
+        result_store = store.ResultStore(fresh_hours=store.FRESH_HOURS)
+    records = history.load()
+    runs = recurring_runs(records, today)
+    fetches = plan_warmup(runs, result_store, records, budget, today)
+    if not fetches:
+        print(
+            f"Nothing to warm: {len(runs)} recurring run(s), each stored or "
+            "over budget."
+        )
+    for run, start_date, end_date, customer_id, api_rows in fetches:
+        print(
+            f"Warming {run.report} {start_date} to {end_date} for {customer_id} "
+            f"(~{api_rows:,} API rows, run on {run.run_days} days)"
+        )
+        report_singles[run.report](
+            gads_service,
+            client,
+            start_date,
+            end_date,
+            "date",
+            customer_id,
+            result_store=result_store,
+            **replay_options(run.options),
+        )
+    return fetches
@@ -0,0 +1,112 @@
+"""Tests covering the spill-capable aggregator in ``aggregation``."""
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from gar import aggregation
+
+
+def _build(memory_limit):
+    def new_entry(key):
+        return {"term": key[0], "device": key[1], "clicks": 0, "cost": Decimal("0")}
+
+    return aggregation.SpillingAggregator(
+        new_entry, ("clicks", "cost"), memory_limit=memory_limit
+    )
+
+
+def _feed(aggregator, rows):
+    for term, device, clicks, cost in rows:
+        entry = aggregator.entry((term, device))
+        entry["clicks"] += clicks
+        entry["cost"] += cost
+
+
+def test_spilled_aggregation_matches_in_memory_result():
+    """Spilling runs to disk should not change the aggregated totals."""
+
+    rng = random.Random(7)
+    rows = [
+        (
+            rng.choice([None, *[f"term {i}" for i in range(400)]]),
+            rng.choice(["MOBILE", "DESKTOP"]),
+            rng.randint(0, 5),
+            Decimal(rng.randint(0, 500)) / 100,
+        )
+        for _ in range(5000)
+    ]
+    in_memory = _build(None)
+    _feed(in_memory, rows)
+    spilling = _build(4096)
+    _feed(spilling, rows)
+
+    assert spilling.spilled_runs > 0
+    expected = {key: entry for key, entry in in_memory.items()}
+    merged = dict(spilling.items())
+    assert merged == expected
+
+
+def test_no_limit_never_spills():
+    """Without a memory limit the aggregator stays a plain dict walk."""
+
+    aggregator = _build(None)
+    _feed(aggregator, [("a", "MOBILE", 1, Decimal("1"))] * 10)
+    assert aggregator.spilled_runs == 0
+    assert [entry["clicks"] for entry in aggregator.values()] == [10]
+
+
+def test_merged_partials_match_single_pass():
+    """Merging per-batch partial aggregates equals one aggregation pass."""
+
+    rng = random.Random(11)
+    rows = [
+        (f"term {rng.randint(0, 50)}", "MOBILE", 1, Decimal("0.25")) for _ in range(600)
+    ]
+    single = _build(None)
+    _feed(single, rows)
+    combined = _build(2048)
+    for start in range(0, len(rows), 100):
+        partial = _build(None)
+        _feed(partial, rows[start : start + 100])
+        for key, entry in partial.items():
+            combined.merge(key, entry)
+
+    assert dict(combined.items()) == dict(single.items())
+
+
+def test_map_bounded_limits_pending_tasks():
+    """No more than 'max_in_flight' payloads are pulled ahead of results."""
+
+    pulled = []
+
+    def payloads():
+        for value in range(10):
+            pulled.append(value)
+            yield value
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = []
+        for result in aggregation.map_bounded(
+            executor, lambda v: v * 2, payloads(), max_in_flight=3
+        ):
+            assert len(pulled) - len(results) <= 3 + 1
+            results.append(result)
+
+    assert sorted(results) == [value * 2 for value in range(10)]
+
+
+def test_string_dictionary_round_trips_keys():
+    """Encoded keys decode to the original values and share one instance."""
+
+    strings = aggregation.StringDictionary()
+    first = "".join(["Brand", " campaign"])
+    second = "".join(["Brand ", "campaign"])
+    assert first is not second
+
+    key = strings.encode_key(("2025-01-01", first, 123, None))
+    assert key == strings.encode_key(("2025-01-01", second, 123, None))
+    assert all(isinstance(code, int) for code in key)
+    assert strings.decode_key(key) == ("2025-01-01", first, 123, None)
+    assert strings.intern(second) is first
+    assert strings.intern(None) is None
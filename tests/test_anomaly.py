@@ -0,0 +1,87 @@
+"""Tests covering incremental baselines and alerts in ``anomaly``."""
+
+from datetime import date, timedelta
+
+from gar import anomaly, cache, services
+
+METRICS = {"Campaign": ("Cost",)}
+
+
+def _observation(cost):
+    return {
+        "campaign:1": {
+            "level": "Campaign",
+            "id": 1,
+            "name": "Brand",
+            "values": {"Cost": cost},
+        }
+    }
+
+
+def test_spike_is_flagged_after_warmup_only():
+    """A spike raises one alert once the baseline has enough history."""
+
+    detector = anomaly.AnomalyDetector()
+    start = date(2025, 3, 1)
+    costs = [10, 11, 9, 10, 12, 10, 8, 11, 10, 9, 10, 11, 10, 9, 10, 60]
+    raised = []
+    for offset, cost in enumerate(costs):
+        raised += detector.observe_day(
+            start + timedelta(days=offset), _observation(cost), METRICS
+        )
+
+    (alert,) = raised
+    assert alert["Date"] == "2025-03-16"
+    assert alert["Direction"] == anomaly.DIRECTION_SPIKE
+    assert alert["Median"] == 10
+    assert detector.end == date(2025, 3, 16)
+
+
+def test_state_resumes_from_cache_without_reevaluating(monkeypatch, tmp_path):
+    """A saved state only asks for days after its end, and missing rows are zeros."""
+
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, str(tmp_path))
+    detector = anomaly.AnomalyDetector.load("123")
+    through = date(2025, 4, 30)
+    start, end = detector.missing_range(through)
+    assert (end - start).days + 1 == anomaly.WARMUP_DAYS
+    day = start
+    while day <= end:
+        detector.observe_day(day, _observation(100 + day.day % 3), METRICS)
+        day += timedelta(days=1)
+    detector.save("123")
+
+    detector = anomaly.AnomalyDetector.load("123")
+    assert detector.missing_range(through) is None
+    assert detector.missing_range(date(2025, 5, 1)) == (
+        date(2025, 5, 1),
+        date(2025, 5, 1),
+    )
+    (alert,) = detector.observe_day(date(2025, 5, 1), {}, METRICS)
+    assert alert["Direction"] == anomaly.DIRECTION_DROP
+    assert detector.end == date(2025, 5, 1)
+
+
+def test_single_and_all_scans_run_the_same_report_options(monkeypatch, tmp_path):
+    """Report toggles never reach the scans; run options do, in both scopes."""
+
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, str(tmp_path))
+    calls = []
+
+    def report_single(gads, client, start, end, time_seg, customer_id, **kwargs):
+        calls.append((customer_id, kwargs))
+        return [], []
+
+    monkeypatch.setattr(services, "account_report_single", report_single)
+    monkeypatch.setattr(services, "ad_level_report_single", report_single)
+    options = {"grouping_sets": True, "id_only": True, "memory_limit": 1024}
+    args = (None, None, "2025-03-01", "2025-03-10", "date")
+
+    services.anomaly_report_single(*args, "1", **options)
+    services.anomaly_report_all(*args, {"2": "Beta"}, **options)
+
+    single = [kwargs for customer_id, kwargs in calls if customer_id == "1"]
+    every = [kwargs for customer_id, kwargs in calls if customer_id == "2"]
+    assert single == every
+    assert all("grouping_sets" not in kwargs for kwargs in single)
+    assert single[0] == {"memory_limit": 1024, "processes": None}
@@ -2,6 +2,7 @@
 
 import os
 from argparse import ArgumentParser
+from decimal import Decimal
 
 import pytest
 
@@ -148,6 +149,90 @@ def test_output_csv(parser):
     assert normalized.output_mode == "csv"
 
 
+# ------------------------------
+# Ranking options
+# ------------------------------
+def test_top_and_min_cost(parser):
+    args = parser.parse_args(["--top", "500", "--min-cost", "12.50"])
+    normalized = normalize_cli_args(parser, args)
+    assert normalized.top == 500
+    assert normalized.min_cost == Decimal("12.50")
+    assert normalized.cli_mode is True
+
+
+@pytest.mark.parametrize("value", ["0", "-3", "abc"])
+def test_invalid_top_rejected(parser, value):
+    with pytest.raises(SystemExit):
+        parser.parse_args(["--top", value])
+
+
+@pytest.mark.parametrize("value", ["-1", "abc", "nan", "inf"])
+def test_invalid_min_cost_rejected(parser, value):
+    with pytest.raises(SystemExit):
+        parser.parse_args(["--min-cost", value])
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("512MB", 512 * 1024**2), ("2g", 2 * 1024**3), ("750", 750 * 1024**2)],
+)
+def test_memory_limit_parsing(parser, value, expected):
+    args = parser.parse_args(["--memory-limit", value])
+    assert args.memory_limit == expected
+    assert common.resolve_report_options(args) == {"memory_limit": expected}
+
+
+def test_invalid_memory_limit_rejected(parser):
+    with pytest.raises(SystemExit):
+        parser.parse_args(["--memory-limit", "lots"])
+
+
+def test_processes_parsing(parser):
+    args = parser.parse_args(["--processes", "4"])
+    assert common.resolve_report_options(args) == {"processes": 4}
+    # one worker is the in-process path; no pool option is forwarded
+    args = parser.parse_args(["--processes", "1"])
+    assert common.resolve_report_options(args) == {}
+
+
+@pytest.mark.parametrize("value", ["0", "-2", "many"])
+def test_invalid_processes_rejected(parser, value):
+    with pytest.raises(SystemExit):
+        parser.parse_args(["--processes", value])
+
+
+def test_mac_rules_collected_in_order(parser):
+    args = parser.parse_args(
+        [
+            "--mac-rule",
+            "label:mac=",
+            "--mac-rule",
+            "delimiter:|@2",
+            "--mac-rule",
+            "suffix",
+        ]
+    )
+    rules = common.resolve_report_options(args)["mac_rules"]
+    assert [rule.kind for rule in rules] == ["label", "delimiter", "suffix"]
+    assert (rules[1].delimiter, rules[1].index) == ("|", 2)
+
+
+def test_concurrency_and_incremental_options(parser):
+    args = parser.parse_args(["--concurrency", "6", "--incremental"])
+    assert common.resolve_report_options(args) == {
+        "concurrency": 6,
+        "incremental": True,
+    }
+    with pytest.raises(SystemExit):
+        parser.parse_args(["--concurrency", "0"])
+
+
+@pytest.mark.parametrize("value", ["regex:(", "label:", "prefix:x"])
+def test_invalid_mac_rule_rejected(parser, value):
+    with pytest.raises(SystemExit):
+        parser.parse_args(["--mac-rule", value])
+
+
 # ------------------------------
 # CLI entrypoint behavior
 # ------------------------------
@@ -0,0 +1,184 @@
+"""Tests covering the label and campaign group audits in ``services``."""
+
+from types import SimpleNamespace
+
+from gar import cache, services
+
+_NAMES = SimpleNamespace(Name=lambda value: value)
+_CLIENT = SimpleNamespace(
+    enums=SimpleNamespace(
+        AdvertisingChannelTypeEnum=SimpleNamespace(AdvertisingChannelType=_NAMES),
+        AdGroupTypeEnum=SimpleNamespace(AdGroupType=_NAMES),
+        AdTypeEnum=None,
+        SearchEngineResultsPageTypeEnum=None,
+        ClickTypeEnum=None,
+        KeywordMatchTypeEnum=None,
+        DeviceEnum=None,
+    )
+)
+
+
+def _row(customer_id, account, campaign, ad_group=None):
+    campaign_id, name, group, labels = campaign
+    row = SimpleNamespace(
+        customer=SimpleNamespace(id=int(customer_id), descriptive_name=account),
+        campaign=SimpleNamespace(
+            id=campaign_id,
+            name=name,
+            advertising_channel_type="SEARCH",
+            campaign_group=group and f"customers/{customer_id}/campaignGroups/{group}",
+            labels=[f"customers/{customer_id}/labels/{label}" for label in labels],
+        ),
+    )
+    if ad_group is not None:
+        ad_group_id, ad_group_name, ad_group_labels = ad_group
+        row.ad_group = SimpleNamespace(
+            id=ad_group_id,
+            name=ad_group_name,
+            type_="SEARCH_STANDARD",
+            labels=[f"customers/{customer_id}/labels/{x}" for x in ad_group_labels],
+        )
+    return row
+
+
+class _AuditService:
+    """Serve label audit queries for a few accounts; one account fails."""
+
+    def __init__(self):
+        self.accounts = {
+            "1": {
+                "name": "Alpha",
+                "campaigns": [(1, "Brand", "5", [7]), (2, "Generic", "", [])],
+                # (campaign ID, ad group ID, name, label IDs); 9 is not a label
+                "ad_groups": [(1, 11, "Broad", [9]), (1, 10, "Exact", [8])]
+                + [(2, 20, "Alpha", [])],
+                "labels": {7: "Core", 8: "Top"},
+                "groups": {5: "Search"},
+            },
+            "2": {
+                "name": "Beta",
+                "campaigns": [(3, "Video", "", [])],
+                "ad_groups": [(3, 30, "All", [])],
+                "labels": {},
+                "groups": {},
+            },
+        }
+        self.changed = []
+
+    def search_stream(self, customer_id, query):
+        if customer_id not in self.accounts:
+            raise RuntimeError("permission denied")
+        account = self.accounts[customer_id]
+        campaigns = {campaign[0]: campaign for campaign in account["campaigns"]}
+        source = query.split("FROM")[1].split()[0]
+        if source == "label":
+            rows = [
+                SimpleNamespace(label=SimpleNamespace(id=i, name=n))
+                for i, n in account["labels"].items()
+            ]
+        elif source == "campaign_group":
+            rows = [
+                SimpleNamespace(campaign_group=SimpleNamespace(id=i, name=n))
+                for i, n in account["groups"].items()
+            ]
+        elif source == "change_status":
+            rows = [
+                SimpleNamespace(
+                    change_status=SimpleNamespace(
+                        campaign=f"customers/{customer_id}/campaigns/{c}"
+                    )
+                )
+                for c in self.changed
+            ]
+        elif source == "campaign":
+            rows = [_row(customer_id, account["name"], c) for c in campaigns.values()]
+        else:
+            rows = [
+                _row(customer_id, account["name"], campaigns[c], (i, n, labels))
+                for c, i, n, labels in account["ad_groups"]
+            ]
+            if "ORDER BY" in query:
+                rows.sort(key=lambda r: (r.campaign.name, r.ad_group.name))
+        if "campaign.id IN (" in query:
+            ids = query.split("campaign.id IN (")[1].split(")")[0].split(", ")
+            rows = [row for row in rows if str(row.campaign.id) in ids]
+        return [SimpleNamespace(results=rows)]
+
+
+def test_incremental_audit_matches_the_full_audit(monkeypatch, tmp_path):
+    """Cached records resolve and order exactly like a streamed audit."""
+
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, str(tmp_path))
+    service = _AuditService()
+    full, headers, full_dict = services.complete_labels_audit(service, _CLIENT, "1")
+    cold = services.complete_labels_audit(service, _CLIENT, "1", incremental=True)
+    service.changed = [1]
+    warm = services.complete_labels_audit(service, _CLIENT, "1", incremental=True)
+
+    assert cold[0] == warm[0] == full
+    assert cold[2] == warm[2] == full_dict
+    assert [row[8] for row in full] == ["Broad", "Exact", "Alpha"]
+    brand = dict(zip(headers, full[1]))
+    assert brand["campaign group"] == "Search"
+    assert brand["campaign labels"] == "Core"
+    assert brand["ad_group labels"] == "Top"
+    assert dict(zip(headers, full[0]))["ad_group labels"] == "UNDEFINED"
+    assert dict(zip(headers, full[2]))["campaign group"] == "UNDEFINED"
+
+
+def test_resource_names_resolve_by_full_name_or_id():
+    """Any spelling of a resource resolves; unknown IDs are 'UNDEFINED'."""
+
+    resolve = services._resource_name_resolver("1", "labels", {"7": "Core"})
+
+    assert resolve("customers/1/labels/7") == "Core"
+    assert resolve("labels/7") == resolve("labels/7") == "Core"
+    assert resolve("customers/1/labels/9") == "UNDEFINED"
+    assert resolve("") == "UNDEFINED"
+
+
+_ACCOUNTS = {"1": "Alpha", "2": "Beta", "3": "Gamma"}
+
+
+def test_label_and_group_fan_outs_merge_accounts_and_skip_failures():
+    """Each account's rows are tagged and merged; a failed account is left out."""
+
+    service = _AuditService()
+
+    labels, label_headers, labels_by_account = services.get_labels_all(
+        service, _CLIENT, _ACCOUNTS, concurrency=2
+    )
+    groups, _, groups_by_account = services.get_campaign_groups_all(
+        service, _CLIENT, _ACCOUNTS, concurrency=2
+    )
+
+    assert label_headers == ["Account name", "Customer ID", "Label Name", "Label ID"]
+    assert sorted(labels) == [["Alpha", "1", "Core", "7"], ["Alpha", "1", "Top", "8"]]
+    assert labels_by_account == {"1": {"7": "Core", "8": "Top"}, "2": {}}
+    assert groups == [["Alpha", "1", "Search", "5"]]
+    assert groups_by_account == {"1": {"5": "Search"}, "2": {}}
+
+
+def test_audit_fan_out_rolls_up_unlabeled_entities(monkeypatch, tmp_path):
+    """The rollup counts unlabeled entities per account and across all."""
+
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, str(tmp_path))
+    service = _AuditService()
+
+    table, headers, rollup_table, rollup_headers = services.complete_labels_audit_all(
+        service, _CLIENT, _ACCOUNTS, concurrency=2
+    )
+
+    assert headers[1] == "account name"
+    assert [(row[1], row[8]) for row in table] == [
+        ("Alpha", "Broad"),
+        ("Alpha", "Exact"),
+        ("Alpha", "Alpha"),
+        ("Beta", "All"),
+    ]
+    assert rollup_headers == services.UNLABELED_ROLLUP_HEADERS
+    assert rollup_table == [
+        ["1", "Alpha", 2, 1, 3, 1],
+        ["2", "Beta", 1, 1, 1, 1],
+        ["", "ALL ACCOUNTS", 3, 2, 4, 2],
+    ]
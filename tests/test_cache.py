@@ -0,0 +1,23 @@
+"""Tests covering the on-disk state helpers in ``cache``."""
+
+from gar import cache
+
+
+def test_save_and_load_round_trip(monkeypatch, tmp_path):
+    """Saved documents load back unchanged from GAR_CACHE_DIR."""
+
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, str(tmp_path / "state"))
+    document = {"checked_at": "2025-01-01T00:00:00", "campaigns": {"1": [1, 2]}}
+    cache.save_json("audit.json", document)
+
+    assert cache.load_json("audit.json") == document
+    assert [p.name for p in (tmp_path / "state").iterdir()] == ["audit.json"]
+
+
+def test_missing_or_corrupt_state_returns_default(monkeypatch, tmp_path):
+    """Unreadable state is treated as a cold start."""
+
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, str(tmp_path))
+    assert cache.load_json("missing.json", default={}) == {}
+    (tmp_path / "broken.json").write_text("{not json", encoding="utf-8")
+    assert cache.load_json("broken.json") is None
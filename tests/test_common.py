@@ -0,0 +1,89 @@
+"""Tests covering the data helpers in ``common``."""
+
+from decimal import Decimal
+
+from gar import aggregation, common
+
+HEADERS = ["Date", "Account name", "Cost"]
+
+
+def test_rank_rows_selects_top_n_by_metric():
+    """Top-N selection should return the largest rows in descending order."""
+
+    rows = [
+        ["2025-01-01", "A", Decimal("5.00")],
+        ["2025-01-01", "B", Decimal("50.00")],
+        ["2025-01-02", "A", Decimal("20.00")],
+        ["2025-01-02", "B", Decimal("1.00")],
+    ]
+    ranked = common.rank_rows(rows, HEADERS, "Cost", top_n=2)
+    assert [r[2] for r in ranked] == [Decimal("50.00"), Decimal("20.00")]
+
+
+def test_rank_rows_min_value_preserves_order():
+    """Threshold filtering alone should keep the original report order."""
+
+    rows = [
+        ["2025-01-01", "A", Decimal("5.00")],
+        ["2025-01-01", "B", Decimal("50.00")],
+        ["2025-01-02", "A", Decimal("20.00")],
+    ]
+    kept = common.rank_rows(rows, HEADERS, "Cost", min_value=Decimal("10"))
+    assert kept == [rows[1], rows[2]]
+
+
+def test_merge_sorted_results_matches_global_sort():
+    """K-way merge of sorted account outputs should equal a full re-sort."""
+
+    def key(r):
+        return (r[0], r[1], -r[2])
+
+    account_a = sorted(
+        [["2025-01-01", "A", Decimal("3")], ["2025-01-02", "A", Decimal("9")]],
+        key=key,
+    )
+    account_b = sorted(
+        [["2025-01-01", "B", Decimal("7")], ["2025-01-02", "B", Decimal("1")]],
+        key=key,
+    )
+    merged = common.merge_sorted_results([account_a, account_b], key=key)
+    assert merged == sorted(account_a + account_b, key=key)
+
+
+def test_extract_mac_interns_with_run_dictionary():
+    """MACs extracted with a run dictionary are shared string instances."""
+
+    strings = aggregation.StringDictionary()
+    first = common.extract_mac("Brand | Search :mac01", strings)
+    second = common.extract_mac("Generic | Search: mac01 ", strings)
+    assert first == "mac01"
+    assert first is second
+    assert common.extract_mac("No suffix", strings) == "UNDEFINED"
+
+
+def test_mac_resolver_applies_rules_in_order():
+    """The first matching rule wins; unmatched campaigns are UNDEFINED."""
+
+    rules = [
+        common.parse_mac_rule("label:mac="),
+        common.parse_mac_rule("delimiter:|@1"),
+        common.parse_mac_rule(r"regex:\[(\w+)\]"),
+    ]
+    resolver = common.MacResolver(rules)
+    resolver.add_campaign_labels({1: ("team=search", "mac=lbl01")})
+    assert resolver.resolve(1, "Brand | del01 | [rx01]") == "lbl01"
+    assert resolver.resolve(2, "Brand | del01 | [rx01]") == "del01"
+    assert resolver.resolve(3, "Generic [rx01]") == "rx01"
+    assert resolver.resolve(4, "Generic") == "UNDEFINED"
+
+
+def test_mac_resolver_caches_by_campaign_id():
+    """Resolution is cached per campaign ID with least-recently-used eviction."""
+
+    resolver = common.MacResolver(maxsize=2)
+    assert resolver.resolve(1, "Brand :mac01") == "mac01"
+    # cached by ID, so a renamed row still reports the first MAC
+    assert resolver.resolve(1, "Brand :mac99") == "mac01"
+    resolver.resolve(2, "Generic :mac02")
+    resolver.resolve(3, "Display :mac03")
+    assert resolver.resolve(1, "Brand :mac99") == "mac99"
@@ -0,0 +1,106 @@
+"""Tests covering run history estimates and dry-run plans in ``explain``."""
+
+from types import SimpleNamespace
+
+from gar import cache, explain, history, services
+
+
+class _CountingService:
+    def __init__(self, counts):
+        self.counts = counts
+        self.requests = []
+
+    def search(self, request):
+        self.requests.append(request)
+        return SimpleNamespace(total_results_count=self.counts[request.customer_id])
+
+    def search_stream(self, **kwargs):
+        raise AssertionError("explain must not stream report data")
+
+
+_CLIENT = SimpleNamespace(get_type=lambda name: SimpleNamespace())
+
+
+def test_recorded_runs_scale_to_the_window(monkeypatch, tmp_path):
+    """History is saved once per run and scaled by window length."""
+
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, str(tmp_path))
+    recorder = history.RunRecorder("ads", "2025-01-01", "2025-01-10")
+    recorder.record("111", api_rows=5000, rows=800, seconds=2.0)
+    recorder.save()
+
+    records = history.load()
+    assert len(records) == 1
+    assert history.estimate(records, "ads", "111", 30) == (15000, 2400, 6.0)
+    assert history.estimate(records, "ads", "222", 30) is None
+    assert history.rows_per_second(records) == 2500
+
+
+def test_unwritable_history_is_reported_not_raised(monkeypatch, tmp_path, capsys):
+    """A finished run never fails on saving its history."""
+
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, str(blocker))
+    recorder = history.RunRecorder("ads", "2025-01-01", "2025-01-10")
+    recorder.record("111", api_rows=5000, rows=800, seconds=2.0)
+
+    recorder.save()
+
+    assert capsys.readouterr().out.startswith("Run history not saved:")
+
+
+def test_explain_prints_queries_and_counts_without_history(monkeypatch, tmp_path):
+    """Accounts without history are sized by a counting pre-query."""
+
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, str(tmp_path))
+    recorder = history.RunRecorder("account", "2025-01-01", "2025-01-31")
+    recorder.record("111", api_rows=31, rows=31, seconds=1.0)
+    recorder.save()
+    gads_service = _CountingService({"222": 400})
+
+    lines = explain.explain_report(
+        "account",
+        services.account_report_single,
+        gads_service,
+        _CLIENT,
+        "2025-02-01",
+        "2025-02-28",
+        "date",
+        {"111": "Alpha", "222": "Beta"},
+        concurrency=2,
+    )
+
+    assert [request.customer_id for request in gads_service.requests] == ["222"]
+    assert any("FROM customer" in line for line in lines)
+    (alpha,) = [line for line in lines if line.startswith("Alpha")]
+    assert alpha.split()[3:5] == ["28", "28"]
+    (beta,) = [line for line in lines if line.startswith("Beta")]
+    assert beta.split()[-1] == "count"
+    assert "Accounts: 2 queried concurrently" in lines
+    assert "Estimated API rows: 428" in lines
+
+
+def test_account_fan_out_forwards_run_options(monkeypatch):
+    """Each concurrently queried account runs with the caller's run options."""
+
+    calls = []
+
+    def run_report(gads_service, client, customer_id, plan, strings, **kwargs):
+        calls.append((customer_id, kwargs["memory_limit"], kwargs["processes"]))
+        return [], plan.headers
+
+    monkeypatch.setattr(services.pipeline, "run_report", run_report)
+    services.account_report_all(
+        None,
+        _CLIENT,
+        "2025-02-01",
+        "2025-02-28",
+        "date",
+        {"111": "Alpha", "222": "Beta"},
+        concurrency=2,
+        memory_limit=1024,
+        processes=4,
+    )
+
+    assert sorted(calls) == [("111", 1024, 4), ("222", 1024, 4)]
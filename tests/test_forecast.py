@@ -0,0 +1,90 @@
+"""Tests covering cost history caching and forecasts in ``forecast``."""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from gar import cache, forecast, services
+
+
+def _rows(start, costs, campaign_id=1):
+    return [
+        {
+            "Date": (start + timedelta(days=offset)).isoformat(),
+            "Account name": "Acct",
+            "Campaign ID": campaign_id,
+            "Campaign name": f"Campaign {campaign_id}",
+            "Cost": Decimal(cost),
+        }
+        for offset, cost in enumerate(costs)
+    ]
+
+
+def test_history_refresh_only_fetches_new_days(monkeypatch, tmp_path):
+    """A warm history re-fetches the overlap window and replaces those days."""
+
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, str(tmp_path))
+    history = forecast.CostHistory.load("123")
+    through = date(2025, 3, 10)
+    fetch_start, fetch_end = history.missing_range(through)
+    assert (fetch_end - fetch_start).days + 1 == forecast.HISTORY_DAYS
+    history.update(_rows(date(2025, 3, 1), ["1.00"] * 10), fetch_start, fetch_end)
+    history.save("123")
+
+    history = forecast.CostHistory.load("123")
+    assert history.missing_range(through) is None
+    fetch_start, fetch_end = history.missing_range(date(2025, 3, 12))
+    assert fetch_start == date(2025, 3, 8)
+    history.update(_rows(fetch_start, ["2.00"] * 5), fetch_start, fetch_end)
+
+    assert history.end == date(2025, 3, 12)
+    assert history.days == forecast.HISTORY_DAYS
+    assert history.campaigns["1"]["cost"][-7:] == [100, 100, 200, 200, 200, 200, 200]
+
+
+def test_forecast_follows_level_and_weekday_pattern():
+    """A steady weekly pattern is projected forward on the right weekdays."""
+
+    end = date(2025, 3, 30)  # a Sunday
+    start = end - timedelta(days=forecast.FIT_DAYS - 1)
+    costs = [
+        "20.00" if (start + timedelta(days=d)).weekday() < 5 else "6.00"
+        for d in range(forecast.FIT_DAYS)
+    ]
+    history = forecast.CostHistory()
+    history.update(_rows(start, costs), start, end)
+
+    model = forecast.fit_series([c / 100 for c in history.campaigns["1"]["cost"]], end)
+    daily = forecast.project(model, end, 7)
+    assert all(abs(value - 20) < 0.5 for value in daily[:5])
+    assert all(abs(value - 6) < 0.5 for value in daily[5:])
+
+    (record,) = forecast.forecast_history(history)
+    assert record["Last 7d cost"] == Decimal("112.00")
+    assert abs(record["Forecast next 7d"] - Decimal("112")) < 2
+    # only March 31st remains after the history end
+    assert record["Forecast rest of month"] == forecast._money(daily[0])
+
+
+def test_forecast_starts_after_an_earlier_end_date(monkeypatch, tmp_path):
+    """A warm history running past 'end_date' is cut back, not re-fetched."""
+
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, str(tmp_path))
+    end = date(2025, 3, 16)
+    start = end - timedelta(days=forecast.FIT_DAYS - 1)
+    history = forecast.CostHistory()
+    history.update(_rows(start, ["10.00"] * forecast.FIT_DAYS), start, end)
+    expected = forecast.forecast_history(history)
+    later = end + timedelta(days=14)
+    after = end + timedelta(days=1)
+    history.update(_rows(after, ["90.00"] * 14), after, later)
+    history.save("123")
+
+    rows, headers = services.forecast_report_single(
+        None, None, start.isoformat(), end.isoformat(), "date", "123"
+    )
+
+    (row,) = [dict(zip(headers, row)) for row in rows]
+    assert row["Last 7d cost"] == expected[0]["Last 7d cost"] == Decimal("70.00")
+    assert row["Forecast next 7d"] == expected[0]["Forecast next 7d"]
+    assert row["Forecast rest of month"] == expected[0]["Forecast rest of month"]
+    assert forecast.CostHistory.load("123").end == later
@@ -0,0 +1,125 @@
+"""Tests covering the change_status-driven entity cache in ``metadata``."""
+
+from types import SimpleNamespace
+
+from gar import cache, metadata, queries, services
+
+_NAMES = SimpleNamespace(Name=lambda value: value)
+_CLIENT = SimpleNamespace(
+    enums=SimpleNamespace(
+        AdvertisingChannelTypeEnum=SimpleNamespace(AdvertisingChannelType=_NAMES),
+        AdGroupTypeEnum=SimpleNamespace(AdGroupType=_NAMES),
+        AdTypeEnum=None,
+        SearchEngineResultsPageTypeEnum=None,
+        ClickTypeEnum=None,
+        KeywordMatchTypeEnum=None,
+        DeviceEnum=None,
+    )
+)
+
+
+def _campaign(campaign_id, name, labels=()):
+    return SimpleNamespace(
+        customer=SimpleNamespace(descriptive_name="Alpha"),
+        campaign=SimpleNamespace(
+            id=campaign_id,
+            name=name,
+            advertising_channel_type="SEARCH",
+            campaign_group="",
+            labels=[f"customers/1/labels/{label}" for label in labels],
+        ),
+    )
+
+
+def _ad_group(campaign_id, ad_group_id, name):
+    return SimpleNamespace(
+        campaign=SimpleNamespace(id=campaign_id),
+        ad_group=SimpleNamespace(id=ad_group_id, name=name, type_="SEARCH", labels=[]),
+    )
+
+
+class _EntityService:
+    def __init__(self):
+        self.campaigns = [_campaign(1, "Brand :br", [7]), _campaign(2, "Generic :gn")]
+        self.ad_groups = [_ad_group(1, 10, "Exact"), _ad_group(2, 20, "Broad")]
+        self.changed = []
+        self.queries = []
+
+    def search_stream(self, customer_id, query):
+        source = query.split("FROM")[1].split()[0]
+        self.queries.append(source)
+        rows = {
+            "campaign": self.campaigns,
+            "ad_group": self.ad_groups,
+            "label": [SimpleNamespace(label=SimpleNamespace(id=7, name="Core"))],
+            "campaign_group": [],
+            "change_status": [
+                SimpleNamespace(
+                    change_status=SimpleNamespace(campaign=f"customers/1/campaigns/{c}")
+                )
+                for c in self.changed
+            ],
+        }[source]
+        if "campaign.id IN (" in query:
+            ids = query.split("campaign.id IN (")[1].split(")")[0].split(", ")
+            rows = [row for row in rows if str(row.campaign.id) in ids]
+        return [SimpleNamespace(results=rows)]
+
+
+def test_sync_refetches_only_changed_campaigns(monkeypatch, tmp_path):
+    """A warm cache polls change_status and re-fetches the campaigns it names."""
+
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, str(tmp_path))
+    service = _EntityService()
+    services.sync_metadata(service, _CLIENT, "1")
+    assert service.queries == ["campaign", "ad_group", "label", "campaign_group"]
+
+    service.queries = []
+    service.changed = [2]
+    service.campaigns[1] = _campaign(2, "Generic :gn2")
+    synced = services.sync_metadata(service, _CLIENT, "1")
+
+    assert service.queries == ["change_status", "campaign", "ad_group"]
+    assert synced.campaigns["2"]["name"] == "Generic :gn2"
+    assert synced.campaign_labels() == {1: ("Core",), 2: ()}
+    assert metadata.AccountMetadata.load("1").campaigns == synced.campaigns
+
+
+def test_cached_records_rebuild_the_label_audit():
+    """Audit records group cached ad groups under their campaigns."""
+
+    account = metadata.AccountMetadata(
+        customer_name="Alpha",
+        campaigns={
+            "1": {"name": "Brand", "type": "SEARCH", "group": "", "labels": []},
+            "2": {"name": "PMax", "type": "PERFORMANCE_MAX", "group": "", "labels": []},
+        },
+        ad_groups={
+            "10": {"campaign_id": 1, "name": "Exact", "type": "X", "labels": []}
+        },
+    )
+    account.replace({}, {}, campaign_ids=[2])
+
+    records = account.label_audit_records("1")
+    assert list(records) == ["1"]
+    assert records["1"]["ad_groups"] == [[10, "Exact", "X", []]]
+    assert records["1"]["customer_name"] == "Alpha"
+    assert "2" not in account.campaigns
+
+
+def test_id_only_queries_leave_names_to_the_cache():
+    """ID-only queries drop entity attributes; the cache supplies them by ID."""
+
+    query = queries.click_view_query(
+        "2025-01-01", "2025-01-31", "segments.date", id_only=True
+    )
+    account = metadata.AccountMetadata(
+        campaigns={"1": {"name": "Brand", "type": "SEARCH", "group": "", "labels": []}},
+        ad_groups={
+            "10": {"campaign_id": 1, "name": "Exact", "type": "X", "labels": []}
+        },
+    )
+
+    assert "campaign.id" in query and "ad_group.id" in query
+    assert "descriptive_name" not in query and ".name" not in query
+    assert account.entity_names() == ({1: ("Brand", "SEARCH")}, {10: ("Exact", "X")})
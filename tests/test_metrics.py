@@ -0,0 +1,56 @@
+"""Tests covering derived metric evaluation in ``metrics``."""
+
+from decimal import Decimal
+
+from gar import metrics, services
+
+
+def test_derive_rounds_ratios_and_drops_private_sums():
+    """Ratios are computed from sums; zero denominators use the default."""
+
+    derived = (
+        metrics.average_cpc("Avg CPC", "Cost", "Clicks"),
+        metrics.average_cpm("Avg CPM", "Cost", "Impr."),
+        metrics.weighted_share("Top Imp%", "_top_weight", "Impr."),
+    )
+    entry = metrics.derive(
+        {
+            "Cost": Decimal("10.00"),
+            "Clicks": 3,
+            "Impr.": 0,
+            "_top_weight": Decimal("0"),
+        },
+        derived,
+    )
+
+    assert entry == {
+        "Cost": Decimal("10.00"),
+        "Clicks": 3,
+        "Impr.": 0,
+        "Avg CPC": Decimal("3.333"),
+        "Avg CPM": Decimal("0.000"),
+        "Top Imp%": Decimal("0"),
+    }
+
+
+def test_shares_are_weighted_by_impressions_after_aggregation():
+    """Summed weights give impression-weighted shares, not row averages."""
+
+    assert metrics.REGISTRY["ads"].derived is services.AD_LEVEL_DERIVED
+    entry = services._ad_level_new_entry(None)
+    for impressions, share in ((100, "0.5"), (300, "0.1")):
+        services._ad_level_accumulate(
+            entry,
+            {
+                "Impr.": impressions,
+                "Clicks": 1,
+                "Cost": Decimal("1.005"),
+                "_abs_top_weight": Decimal(share) * impressions,
+            },
+        )
+    entry = services._ad_level_finalize(entry)
+
+    assert entry["Abs Top Imp%"] == Decimal("0.2000")
+    assert entry["Cost"] == Decimal("2.01")
+    assert entry["Avg CPC"] == Decimal("1.005")
+    assert "_abs_top_weight" not in entry
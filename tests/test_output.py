@@ -0,0 +1,88 @@
+"""Tests covering headless output naming and writing in ``output``."""
+
+import builtins
+import csv
+
+from gar import common, output, services
+
+
+def _context(tmp_path, **overrides):
+    fields = dict(
+        report="mac",
+        account="all",
+        start="2025-01-01",
+        end="2025-01-31",
+        run_id="nightly",
+        directory=tmp_path,
+        headless=True,
+    )
+    fields.update(overrides)
+    return output.OutputContext(**fields)
+
+
+def test_file_names_follow_the_template(tmp_path):
+    """Names are deterministic and secondary tables never collide."""
+
+    context = _context(tmp_path)
+    assert output.file_name(context) == "mac_all_2025-01-01_2025-01-31_nightly.csv"
+    assert output.file_name(context._replace(table="account_pacing")) == (
+        "mac_all_2025-01-01_2025-01-31_nightly_account_pacing.csv"
+    )
+    custom = context._replace(template="{run_id}/{report}:{table}", table="rollup")
+    assert output.file_name(custom) == "nightlymacrollup.csv"
+
+
+def test_headless_csv_never_prompts_and_splits_accounts(tmp_path, monkeypatch):
+    """Headless saves skip input() and write one atomic file per account."""
+
+    def _no_input(prompt=""):
+        raise AssertionError("headless output must not prompt")
+
+    monkeypatch.setattr(builtins, "input", _no_input)
+    headers = ["Date", "Customer ID", "Cost"]
+    rows = [["2025-01-01", 111, 1], ["2025-01-01", 222, 2], ["2025-01-02", 111, 3]]
+    context = _context(tmp_path, per_account=True)
+    common.data_handling_options(
+        rows, headers, preselected_output="csv", output_context=context
+    )
+    assert output.wait_for_writes()
+
+    written = sorted(p.relative_to(tmp_path) for p in tmp_path.rglob("*.csv"))
+    assert [str(p) for p in written] == [
+        "111/mac_111_2025-01-01_2025-01-31_nightly.csv",
+        "222/mac_222_2025-01-01_2025-01-31_nightly.csv",
+    ]
+    with open(tmp_path / written[0], newline="") as csv_file:
+        assert list(csv.reader(csv_file)) == [
+            headers,
+            ["2025-01-01", "111", "1"],
+            ["2025-01-02", "111", "3"],
+        ]
+    assert not list(tmp_path.rglob(".*"))
+
+
+def test_shard_writer_writes_each_account_as_it_completes(tmp_path):
+    """Account results stream into per-date shards without a combined table."""
+
+    headers = ["Date", "Customer ID", "Cost"]
+    results = [
+        ("111", "A", ([["2025-01-01", 111, 5], ["2025-01-02", 111, 1]], headers)),
+        ("222", "B", None),
+        ("333", "C", ([["2025-01-01", 333, 7]], headers)),
+    ]
+    writer = output.ShardWriter(
+        _context(tmp_path),
+        partition="date",
+        writers=2,
+        row_filter=lambda rows, headers: [r for r in rows if r[2] >= 5],
+    )
+    table, combined_headers = services._combine_account_results(
+        iter(results), "Cost", writer
+    )
+    paths = writer.close()
+
+    assert table == [] and combined_headers == headers
+    assert sorted(str(p.relative_to(tmp_path)) for p in paths) == [
+        "2025-01-01/mac_111_2025-01-01_2025-01-31_nightly.csv",
+        "2025-01-01/mac_333_2025-01-01_2025-01-31_nightly.csv",
+    ]
@@ -0,0 +1,94 @@
+"""Tests covering budget pacing arithmetic in ``pacing``."""
+
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+
+from gar import pacing, services
+
+
+def test_pacing_window_spans_month_and_run_rate():
+    """Early in a month the run-rate window reaches into the previous month."""
+
+    window = pacing.pacing_window("2025-04-03")
+    assert window.month_start == date(2025, 4, 1)
+    assert window.days_elapsed == 3
+    assert window.days_in_month == 30
+    assert window.days_remaining == 27
+    assert window.run_rate_start == date(2025, 3, 28)
+    assert window.fetch_start == date(2025, 3, 28)
+
+
+def test_pace_columns_flags_over_under_and_unpaced_budgets():
+    """Projection uses the run rate; budgets without a cap are not paced."""
+
+    window = pacing.pacing_window("2025-04-10")
+    monthly = pacing.monthly_budget(Decimal("100"))
+    assert monthly == Decimal("3040.00")
+
+    columns = pacing.pace_columns(
+        [Decimal("1000"), Decimal("1000"), Decimal("300"), Decimal("5")],
+        [Decimal("1400"), Decimal("700"), Decimal("210"), Decimal("7")],
+        [monthly, monthly, monthly, None],
+        window,
+    )
+
+    assert columns["run_rate"] == [
+        Decimal("200.00"),
+        Decimal("100.00"),
+        Decimal("30.00"),
+        Decimal("1.00"),
+    ]
+    assert columns["projected"][0] == Decimal("5000.00")
+    assert columns["expected"][0] == Decimal("1013.33")
+    assert columns["pace"][0] == Decimal("0.9868")
+    assert columns["status"] == [
+        pacing.PACE_OVER,
+        pacing.PACE_ON,
+        pacing.PACE_UNDER,
+        pacing.PACE_NOT_PACED,
+    ]
+    assert columns["variance"][3] is None
+
+
+class _BudgetlessService:
+    """An account whose only spend comes from a budget that is not enabled."""
+
+    def __init__(self):
+        self.queries = []
+
+    def search_stream(self, customer_id, query):
+        source = query.split("FROM")[1].split()[0]
+        self.queries.append(source)
+        rows = []
+        if source == "customer":
+            rows = [SimpleNamespace(customer=SimpleNamespace(descriptive_name="Alpha"))]
+        elif source == "campaign" and "segments.date" in query:
+            rows = [
+                SimpleNamespace(
+                    segments=SimpleNamespace(date="2025-04-02"),
+                    campaign_budget=SimpleNamespace(id=5),
+                    metrics=SimpleNamespace(cost_micros=3000000),
+                )
+            ]
+        return [SimpleNamespace(results=rows)]
+
+
+def test_accounts_without_enabled_budgets_keep_their_name():
+    """The single and all scopes both name an account that has no budget rows."""
+
+    client = SimpleNamespace(enums=SimpleNamespace(BudgetPeriodEnum=None))
+    service = _BudgetlessService()
+
+    _, _, single, headers = services.budget_report_single(
+        service, client, "2025-04-01", "2025-04-10", "date", "1"
+    )
+    _, _, every, _ = services.budget_report_all(
+        service, client, "2025-04-01", "2025-04-10", "date", {"1": "Alpha"}
+    )
+
+    assert single == every
+    assert dict(zip(headers, single[0]))["Account name"] == "Alpha"
+    assert dict(zip(headers, single[0]))["MTD cost"] == Decimal("3.00")
+    # the name is only queried when no account list supplies it
+    assert service.queries.count("customer") == 1
@@ -0,0 +1,149 @@
+"""Tests covering the streaming report stages in ``pipeline``."""
+
+import pickle
+from types import SimpleNamespace
+
+from gar import aggregation, common, pipeline
+
+
+def _decode_row(row, enums, options, strings):
+    return {
+        "Date": strings.intern(row.date),
+        "Campaign ID": row.campaign_id,
+        "Campaign name": strings.intern(row.campaign),
+        "clicks": row.clicks * options.get("scale", 1),
+    }
+
+
+def _new_entry(key):
+    return {"clicks": 0}
+
+
+def _accumulate(entry, row):
+    entry["clicks"] += row["clicks"]
+
+
+def _double(entry):
+    entry["double"] = entry["clicks"] * 2
+    return entry
+
+
+SPEC = pipeline.RowSpec(_decode_row, _new_entry, _accumulate, ("clicks",))
+
+
+def _batches(*rows):
+    return [
+        SimpleNamespace(
+            results=[
+                SimpleNamespace(date=d, campaign_id=i, campaign=c, clicks=n)
+                for d, i, c, n in rows
+            ]
+        )
+    ]
+
+
+def test_stages_aggregate_finalize_and_sort():
+    """Stages chained by hand should sum, finalize, and order the table."""
+
+    strings = aggregation.StringDictionary()
+    batches = _batches(
+        ("2025-01-01", 1, "Brand_Search_BR", 2),
+        ("2025-01-02", 2, "Generic_Search_GN", 5),
+        ("2025-01-01", 1, "Brand_Search_BR", 3),
+        ("2025-01-01", 2, "Generic_Search_GN", 9),
+    )
+    rows = pipeline.decode(batches, SPEC, None, {"scale": 10}, strings)
+    aggregated = pipeline.aggregate(
+        rows,
+        SPEC,
+        ["Date", "Campaign name"],
+        strings,
+        aggregation.SpillingAggregator(_new_entry, ("clicks",)),
+    )
+    entries = pipeline.finalize(
+        pipeline.expand(aggregated, ["Date", "Campaign name"], strings), _double
+    )
+    headers = ["Date", "Campaign name", "clicks", "double"]
+    table = pipeline.sink(entries, headers, ["Date", "-clicks"])
+
+    assert table == [
+        ["2025-01-01", "Generic_Search_GN", 90, 180],
+        ["2025-01-01", "Brand_Search_BR", 50, 100],
+        ["2025-01-02", "Generic_Search_GN", 50, 100],
+    ]
+
+
+def test_mac_enricher_pickles_as_rules_and_reuses_worker_resolver():
+    """Unpickled enrichers share one resolver per rule set within a process."""
+
+    resolver = common.MacResolver()
+    enricher = pipeline.MacEnricher(resolver)
+    payload = pickle.dumps(enricher)
+
+    first = pickle.loads(payload)
+    second = pickle.loads(payload)
+    row = first({"Campaign ID": 7, "Campaign name": "Brand Search:BR"})
+
+    assert row["MAC"] == "BR"
+    assert first.resolver is second.resolver
+    assert first.resolver is not resolver
+    assert b"OrderedDict" not in payload
+
+
+def test_grouping_sets_emit_subtotals_before_their_children():
+    """Coarser levels are summed from one aggregate and ordered as a tree."""
+
+    strings = aggregation.StringDictionary()
+    batches = _batches(
+        ("2025-01-01", 1, "Brand", 2),
+        ("2025-01-01", 2, "Generic", 5),
+        ("2025-01-01", 2, "Generic", 4),
+        ("2025-01-02", 1, "Brand", 1),
+    )
+    dimensions = ["Date", "Campaign ID", "Campaign name"]
+    grouping_sets = pipeline.GroupingSets(
+        (("Day", ("Date",)), ("Campaign", ("Date", "Campaign ID", "Campaign name"))),
+        metric="clicks",
+    )
+    aggregated = pipeline.aggregate(
+        pipeline.decode(batches, SPEC, None, {}, strings),
+        SPEC,
+        dimensions,
+        strings,
+        aggregation.SpillingAggregator(_new_entry, ("clicks",)),
+    )
+    entries = pipeline.subtotal(
+        pipeline.expand(aggregated, dimensions, strings), SPEC, grouping_sets
+    )
+    headers = ["Date", pipeline.LEVEL_FIELD, "Campaign ID", "Campaign name", "clicks"]
+    table = pipeline.sink(entries, headers, ["Date"], grouping_sets)
+
+    assert table == [
+        ["2025-01-01", "Day", None, None, 11],
+        ["2025-01-01", "Campaign", 2, "Generic", 9],
+        ["2025-01-01", "Campaign", 1, "Brand", 2],
+        ["2025-01-02", "Day", None, None, 1],
+        ["2025-01-02", "Campaign", 1, "Brand", 1],
+    ]
+
+
+def test_entity_joiner_fills_id_only_rows_and_unpickles_once():
+    """Names come from the cache; workers reuse a joiner for the same payload."""
+
+    joiner = pipeline.EntityJoiner(
+        "Alpha", {7: ("Brand Search:BR", "SEARCH")}, {70: ("Exact", "SEARCH_STANDARD")}
+    )
+    payload = pickle.dumps(joiner)
+
+    first = pickle.loads(payload)
+    second = pickle.loads(payload)
+    row = first({"Campaign ID": 7, "Ad group ID": 70})
+    pmax = first({"Campaign ID": 8, "Ad group ID": 0})
+
+    assert row["Account name"] == "Alpha"
+    assert (row["Campaign name"], row["Ad group type"]) == (
+        "Brand Search:BR",
+        "SEARCH_STANDARD",
+    )
+    assert (pmax["Campaign name"], pmax["Ad group type"]) == ("", "UNDEFINED")
+    assert first is second
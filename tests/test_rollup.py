@@ -0,0 +1,109 @@
+"""Tests covering local time-segment rollups in ``rollup``."""
+
+from datetime import date
+from decimal import Decimal
+
+from gar import rollup, services  # noqa: F401  (services registers report metrics)
+
+
+def test_period_labels_follow_api_and_fiscal_calendars():
+    """Weeks start on Monday; fiscal quarters and years shift with the start month."""
+
+    assert rollup.period_label("2025-01-08", "week") == "2025-01-06"
+    assert rollup.period_label("2025-02-14", "month") == "2025-02-01"
+    assert rollup.period_label("2025-05-14", "quarter") == "2025-04-01"
+    assert rollup.period_label("2025-05-14", "year") == 2025
+    assert rollup.period_label("2025-02-14", "quarter", fiscal_year_start=4) == (
+        "2025-01-01"
+    )
+    assert rollup.period_label("2025-03-31", "year", fiscal_year_start=4) == "FY2025"
+    assert rollup.period_label("2025-04-01", "year", fiscal_year_start=4) == "FY2026"
+    assert rollup.period_start(date(2025, 1, 15), "quarter", 11) == date(2024, 11, 1)
+
+
+def test_daily_account_table_rolls_up_with_recomputed_ratios():
+    """Counters sum per month; ratios and weighted shares are re-derived."""
+
+    headers = [
+        "date",
+        "account",
+        "customer id",
+        "cost",
+        "clicks",
+        "invalid clicks",
+        "invalid click %",
+        "interactions",
+        "impressions",
+        "ctr",
+        "avg cpc",
+        "avg cpm",
+        "abs top is",
+        "top is %",
+    ]
+    daily = [
+        ["2025-01-01", "Alpha", 1, Decimal("2.00"), 1, 0, 0, 1, 100, 0, 0, 0,
+         Decimal("0.5000"), Decimal("1.0000")],
+        ["2025-01-02", "Alpha", 1, Decimal("6.00"), 3, 1, 0, 3, 300, 0, 0, 0,
+         Decimal("0.1000"), Decimal("0.5000")],
+        ["2025-02-01", "Alpha", 1, Decimal("1.00"), 0, 0, 0, 0, 0, 0, 0, 0,
+         Decimal("0"), Decimal("0")],
+    ]  # fmt: skip
+
+    rows = rollup.roll_up_table(daily, headers, "account", "month")
+
+    january = dict(zip(headers, rows[0]))
+    assert [row[0] for row in rows] == ["2025-01-01", "2025-02-01"]
+    assert january["cost"] == Decimal("8.00") and january["clicks"] == 4
+    assert january["invalid click %"] == Decimal("0.2500")
+    assert january["ctr"] == Decimal("0.0100")
+    assert january["avg cpc"] == Decimal("2.000")
+    assert january["abs top is"] == Decimal("0.2000")
+    assert january["top is %"] == Decimal("0.6250")
+    assert rows[1][headers.index("avg cpc")] == Decimal("0.000")
+
+
+def test_rolled_up_average_cpc_matches_the_summed_total_cost():
+    """A ratio over a column's private sum is re-derived from that column."""
+
+    headers = ["Date", "Account name", "paid clicks", "total cost", "avg cpc"]
+    daily = [
+        ["2025-01-01", "Alpha", 1, Decimal("0.01"), Decimal("0.010")],
+        ["2025-01-02", "Alpha", 7, Decimal("0.01"), Decimal("0.001")],
+    ]
+
+    [row] = rollup.roll_up_table(daily, headers, "paid_organic_terms", "month")
+
+    month = dict(zip(headers, row))
+    assert month["total cost"] == Decimal("0.02") and month["paid clicks"] == 8
+    # rebuilt from the rounded daily CPCs this would be 0.017 / 8 = 0.002
+    assert month["avg cpc"] == Decimal("0.003")
+
+
+def test_same_named_mac_campaigns_stay_apart_when_rolled_up():
+    """The MAC report keeps campaign IDs, so local rollups group on them."""
+
+    plans = []
+    services.mac_report_single(
+        None,
+        None,
+        "2025-01-01",
+        "2025-01-02",
+        "date",
+        "1",
+        include_campaign_info=True,
+        plan_sink=lambda customer_id, plan: plans.append(plan),
+    )
+    headers = plans[0].headers
+    daily = [
+        {"Date": day, "Account name": "Alpha", "Customer ID": 1, "Campaign ID": cid,
+         "Campaign": "Brand", "MAC": "brand", "Cost": Decimal("1.00")}
+        for day in ("2025-01-01", "2025-01-02")
+        for cid in (11, 12)
+    ]  # fmt: skip
+
+    rows = rollup.roll_up_table(
+        [[row[h] for h in headers] for row in daily], headers, "mac", "month"
+    )
+
+    assert [dict(zip(headers, row))["Campaign ID"] for row in rows] == [11, 12]
+    assert [row[-1] for row in rows] == [Decimal("2.00"), Decimal("2.00")]
@@ -0,0 +1,114 @@
+"""Tests covering request parsing and caching in ``server``."""
+
+import json
+import threading
+from decimal import Decimal
+from http.client import HTTPConnection
+from types import SimpleNamespace
+
+from gar import main, server
+
+
+def _serve(session, cache):
+    httpd = server.make_server(session, cache, port=0)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def _get(httpd, path):
+    connection = HTTPConnection(*httpd.server_address)
+    connection.request("GET", path)
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_report_requests_are_cached_and_reuse_the_session(monkeypatch):
+    """Repeated requests are answered from the cache without re-running reports."""
+
+    calls = []
+
+    def fake_forecast_all(gads, client, start, end, time_seg, accounts, **kwargs):
+        calls.append((gads, start, end, sorted(accounts)))
+        return [["Acct", 123, 5]], ["Account name", "Customer ID", "Forecast"]
+
+    monkeypatch.setitem(main.BUDGET_ALL_DISPATCH, "forecast", fake_forecast_all)
+    session = SimpleNamespace(
+        gads_service="gads",
+        client="client",
+        accounts_info=([], [], {"123": "Acct"}, 1),
+        customer_dict={"123": "Acct"},
+    )
+    httpd = _serve(session, server.ResponseCache(ttl=60))
+    try:
+        path = "/report?report=budget:forecast&account=all&date=specific:2025-01-15"
+        first = _get(httpd, path)
+        second = _get(httpd, path)
+        refreshed = _get(httpd, path + "&refresh=1")
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+    assert first[0] == 200 and first[1]["cached"] is False
+    assert second[1]["cached"] is True and refreshed[1]["cached"] is False
+    assert second[1]["tables"] == [
+        {
+            "name": "forecast",
+            "headers": ["Account name", "Customer ID", "Forecast"],
+            "rows": [["Acct", 123, 5]],
+        }
+    ]
+    assert calls == [("gads", "2025-01-15", "2025-01-15", ["123"])] * 2
+
+
+def test_invalid_requests_return_400_without_stopping_the_service():
+    """Bad parameters are reported to the client instead of exiting."""
+
+    session = SimpleNamespace(customer_dict={"123": "Acct"})
+    httpd = _serve(session, server.ResponseCache())
+    try:
+        unknown = _get(httpd, "/report?report=budget:budget&account=all&bogus=1")
+        no_account = _get(httpd, "/report?report=performance:mac")
+        foreign = _get(httpd, "/report?report=budget:budget&account=single:999")
+        health = _get(httpd, "/health")
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+    assert unknown[0] == no_account[0] == foreign[0] == 400
+    assert "account" in no_account[1]["error"]
+    assert health == (200, {"status": "ok", "accounts": 1})
+
+
+def test_performance_reports_are_cached_by_day_and_rolled_up(monkeypatch):
+    """A different time segment or --top reuses the cached daily pull."""
+
+    calls = []
+
+    def fake_camptype_all(gads, client, start, end, time_seg, accounts, **kwargs):
+        calls.append(time_seg)
+        rows = [
+            ["2025-01-06", "Acct", 123, "SEARCH", Decimal("2.00")],
+            ["2025-01-07", "Acct", 123, "SEARCH", Decimal("3.00")],
+            ["2025-01-13", "Acct", 123, "SEARCH", Decimal("4.00")],
+        ]
+        return rows, ["Date", "Account name", "Customer ID", "Campaign type", "Cost"]
+
+    monkeypatch.setitem(main.PERFORMANCE_ALL_DISPATCH, "camptype", fake_camptype_all)
+    session = SimpleNamespace(
+        gads_service="gads", client="client", customer_dict={"123": "Acct"}
+    )
+    httpd = _serve(session, server.ResponseCache(ttl=60))
+    try:
+        path = "/report?report=performance:camptype&account=all&date=range:2025-01-06,2025-01-19,"
+        daily = _get(httpd, path + "date")
+        weekly = _get(httpd, path + "week&top=1")
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+    assert calls == ["date"]
+    assert len(daily[1]["tables"][0]["rows"]) == 3
+    assert weekly[1]["cached"] is True
+    assert weekly[1]["tables"][0]["rows"] == [
+        ["2025-01-06", "Acct", 123, "SEARCH", 5.0]
+    ]
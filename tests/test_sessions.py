@@ -0,0 +1,79 @@
+"""Tests covering multi-profile routing and merging in ``sessions``."""
+
+from types import SimpleNamespace
+
+from gar import sessions
+
+
+class _StreamService:
+    def __init__(self, name):
+        self.name = name
+        self.calls = []
+
+    def search_stream(self, customer_id, query):
+        self.calls.append(customer_id)
+        yield SimpleNamespace(results=[(self.name, customer_id)])
+
+
+def _session(name, customer_dict):
+    session = sessions.Session(
+        name,
+        sessions.GovernedService(
+            _StreamService(name), sessions.QuotaGovernor(rate=1000)
+        ),
+        None,
+        SimpleNamespace(name=name),
+    )
+    session.customer_dict = customer_dict
+    return session
+
+
+def test_shared_accounts_are_routed_to_the_first_profile():
+    """An account under two MCCs is listed and queried once."""
+
+    first = _session("agency_a", {"1": "Alpha", "2": "Shared"})
+    second = _session("agency_b", {"2": "Shared", "3": "Gamma"})
+    routing = sessions.RoutingService([first, second])
+
+    customer_list, headers, customer_dict, count = routing.accounts_info()
+    assert count == 3
+    assert customer_list[1] == ["2", "Shared", "agency_a"]
+    assert headers[-1] == "profile"
+
+    for customer_id in customer_dict:
+        list(routing.search_stream(customer_id=customer_id, query="SELECT"))
+    assert first.gads_service.gads_service.calls == ["1", "2"]
+    assert second.gads_service.gads_service.calls == ["3"]
+
+
+def test_run_all_merges_session_results_in_report_order():
+    """Each profile runs its own accounts; rows merge by date then account."""
+
+    first = _session("agency_a", {"1": "Alpha"})
+    second = _session("agency_b", {"2": "Beta"})
+    routing = sessions.RoutingService([first, second])
+    seen = {}
+
+    def report_all(gads_service, client, start, end, time_seg, accounts, **kwargs):
+        seen[client.name] = list(accounts)
+        name = next(iter(accounts.values()))
+        rows = [["2025-01-01", name, 5], ["2025-01-02", name, 7]]
+        return rows, ["Date", "Account name", "Cost"]
+
+    rows, headers = sessions.run_all(
+        report_all,
+        routing,
+        "2025-01-01",
+        "2025-01-02",
+        "date",
+        {"1": "Alpha", "2": "Beta"},
+        "Cost",
+    )
+
+    assert seen == {"agency_a": ["1"], "agency_b": ["2"]}
+    assert [row[:2] for row in rows] == [
+        ["2025-01-01", "Alpha"],
+        ["2025-01-01", "Beta"],
+        ["2025-01-02", "Alpha"],
+        ["2025-01-02", "Beta"],
+    ]
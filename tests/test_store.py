@@ -0,0 +1,93 @@
+"""Tests covering the day-partitioned result store in ``store``."""
+
+from datetime import date
+from decimal import Decimal
+
+from gar import (  # noqa: F401  (services registers report metrics)
+    history,
+    services,
+    store,
+)
+
+
+def test_partitions_round_trip_values_and_types(tmp_path):
+    """Columns come back exactly, whichever encoding they were stored in."""
+
+    headers = ["date", "account", "customer id", "cost", "ctr", "flag"]
+    rows = [
+        ["2025-01-01", "Alpha", 1, Decimal("2.50"), Decimal("0"), None],
+        ["2025-01-01", "Beta", 2, Decimal("-0.75"), Decimal("0.1250"), True],
+    ]
+    path = tmp_path / "2025-01-01.col"
+    store.write_partition(path, headers, rows)
+    store.write_partition(tmp_path / "empty.col", headers, [])
+
+    assert store.read_partition(path) == (headers, rows)
+    assert store.read_partition(tmp_path / "empty.col") == (headers, [])
+    assert repr(store.read_partition(path)[1][0][4]) == "Decimal('0')"
+
+
+def test_serve_fetches_only_missing_days(tmp_path):
+    """Stored days are read back; unsettled days are always refetched."""
+
+    headers = ["date", "account", "customer id", "cost", "clicks"]
+    fetches = []
+
+    def report_single(gads, client, start, end, time_seg, customer_id, **kwargs):
+        fetches.append((start, end, time_seg))
+        rows = [
+            [day, "Alpha", 1, Decimal("1.00"), int(day[-2:])]
+            for day in store._days(start, end)
+        ]
+        return rows, headers
+
+    result_store = store.ResultStore(tmp_path, settle_days=2, today=date(2025, 1, 8))
+    serve = result_store.serve
+    args = (report_single, None, None)
+
+    first, _ = serve("account", *args, "2025-01-01", "2025-01-05", "date", "1")
+    second, _ = serve("account", *args, "2025-01-03", "2025-01-07", "date", "1")
+    monthly, _ = serve("account", *args, "2025-01-02", "2025-01-07", "month", "1")
+
+    assert fetches == [
+        ("2025-01-01", "2025-01-05", "date"),
+        ("2025-01-06", "2025-01-07", "date"),
+        ("2025-01-07", "2025-01-07", "date"),
+    ]
+    assert [row[0] for row in first] == [f"2025-01-0{d}" for d in range(1, 6)]
+    assert [row[4] for row in second] == [3, 4, 5, 6, 7]
+    assert monthly == [["2025-01-01", "Alpha", 1, Decimal("6.00"), 27]]
+
+
+def test_serve_records_only_the_fetched_days(tmp_path):
+    """A partial hit is recorded as the days it fetched, once per account."""
+
+    headers = ["date", "account", "customer id", "cost", "clicks"]
+
+    def report_single(gads, client, start, end, time_seg, customer_id, **kwargs):
+        rows = [
+            [day, "Alpha", 1, Decimal("1.00"), 1] for day in store._days(start, end)
+        ]
+        kwargs["run_history"].record(customer_id, len(rows) * 10, len(rows), 1.0)
+        return rows, headers
+
+    result_store = store.ResultStore(tmp_path, settle_days=0, today=date(2025, 1, 31))
+    for day in ("2025-01-10", "2025-01-20"):
+        result_store.write("1", store.shape_key("account", {}), headers, [], day, day)
+    recorder = history.RunRecorder("account", "2025-01-01", "2025-01-30")
+    result_store.serve(
+        "account",
+        report_single,
+        None,
+        None,
+        "2025-01-01",
+        "2025-01-30",
+        "date",
+        "1",
+        run_history=recorder,
+    )
+
+    [record] = recorder.records
+    assert (record["start"], record["end"]) == ("2025-01-01", "2025-01-30")
+    assert (record["days"], record["api_rows"], record["rows"]) == (28, 280, 28)
+    assert history.estimate(recorder.records, "account", "1", 30)[0] == 300
@@ -0,0 +1,52 @@
+"""Tests covering paging, filtering, and sorting in ``viewer``."""
+
+from decimal import Decimal
+
+from gar import viewer
+
+HEADERS = ["Date", "Campaign", "Cost"]
+
+
+def _table(count):
+    return [
+        ["2025-01-%02d" % (i % 28 + 1), f"Campaign {i % 5}", Decimal(i)]
+        for i in range(count)
+    ]
+
+
+def test_render_shows_only_the_current_page():
+    """Pages hold 'page_size' rows, and numbers are right-aligned."""
+
+    table = _table(1000)
+    table_viewer = viewer.TableViewer(table, HEADERS, page_size=3, width=80)
+    table_viewer.handle("g 500")
+    lines = table_viewer.render()
+
+    assert len(lines) == 2 + 3 + 1
+    assert lines[0].split() == HEADERS
+    assert lines[2].endswith(" 499")
+    assert lines[-1].startswith("rows 500-502 of 1000")
+
+    table_viewer.handle("G")
+    assert table_viewer.render()[-2].endswith(" 999")
+
+
+def test_filter_sort_and_reset_work_on_row_indices():
+    """Column filters and descending sorts reorder rows without copying them."""
+
+    table = _table(20) + [["2025-01-01", "Campaign 3", None]]
+    table_viewer = viewer.TableViewer(table, HEADERS, page_size=50, width=80)
+    table_viewer.handle("f campaign 3")
+    table_viewer.handle("s -cost")
+
+    assert [table[i][2] for i in table_viewer.order] == [
+        Decimal(18),
+        Decimal(13),
+        Decimal(8),
+        Decimal(3),
+        None,
+    ]
+    assert "filtered from 21" in table_viewer.render()[-1]
+
+    table_viewer.handle("c")
+    assert len(table_viewer.order) == 21
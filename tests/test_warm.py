@@ -0,0 +1,109 @@
+"""Tests covering run-history driven store warming in ``warm``."""
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from gar import cache, history, services, store, warm
+
+
+def test_window_patterns_replay_relative_to_the_run_day():
+    """Rolling windows keep their lag and length; calendar months stay whole."""
+
+    run_day = date(2025, 3, 10)
+    last30 = warm.window_pattern("2025-02-08", "2025-03-09", run_day)
+    last_month = warm.window_pattern("2025-02-01", "2025-02-28", run_day)
+
+    assert last30 == ("days", 1, 30)
+    assert last_month == ("month", 1)
+    assert warm.pattern_window(last30, date(2025, 3, 11)) == (
+        "2025-02-09",
+        "2025-03-10",
+    )
+    assert warm.pattern_window(last_month, date(2025, 1, 5)) == (
+        "2024-12-01",
+        "2024-12-31",
+    )
+
+
+def test_recurring_runs_are_warmed_within_the_budget(monkeypatch, tmp_path):
+    """Frequent runs go first; fetches beyond the budget are skipped."""
+
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, str(tmp_path))
+    today = date(2025, 3, 10)
+    options = store.shape_options({"include_mac": True})
+    records = []
+    for back, reports in (
+        (1, ("mac", "account")),
+        (2, ("mac", "account")),
+        (3, ("mac",)),
+    ):
+        run_day = today - timedelta(days=back)
+        recorded_at = datetime(run_day.year, run_day.month, run_day.day, 9).timestamp()
+        for report in reports:
+            records.append(
+                {
+                    "report": report,
+                    "customer_id": "1",
+                    "start": str(run_day - timedelta(days=1)),
+                    "end": str(run_day - timedelta(days=1)),
+                    "days": 1,
+                    "api_rows": 40 if report == "mac" else 20,
+                    "rows": 1,
+                    "seconds": 1.0,
+                    "recorded_at": recorded_at,
+                    "options": options,
+                }
+            )
+    cache.save_json(history.HISTORY_FILE, records)
+    fetches = []
+
+    def report_single(gads, client, start, end, time_seg, customer_id, **kwargs):
+        fetches.append((start, end, kwargs.get("include_mac")))
+        rows = [[start, "Alpha", 1, Decimal("1.00")]]
+        return rows, ["Date", "Account name", "Customer ID", "Cost"]
+
+    result_store = store.ResultStore(
+        tmp_path / "store", fresh_hours=store.FRESH_HOURS, today=today
+    )
+    singles = {
+        report: services._day_partitioned(report)(report_single)
+        for report in ("mac", "account")
+    }
+    warmed = warm.warm(singles, None, None, 50, result_store, today)
+
+    shape = store.shape_key("mac", {"include_mac": True})
+    assert [(run.report, run.run_days) for run, *_ in warmed] == [("mac", 3)]
+    assert fetches == [("2025-03-09", "2025-03-09", True)]
+    assert result_store.missing("1", shape, "2025-03-09", "2025-03-09") == []
+    # the next warm-up skips the stored day and spends its budget elsewhere
+    rewarmed = warm.warm(singles, None, None, 50, result_store, today)
+    assert [run.report for run, *_ in rewarmed] == ["account"]
+
+
+def test_accounts_without_history_are_charged_the_run_mean(tmp_path):
+    """Unknown fetches count against the budget instead of being free."""
+
+    today = date(2025, 3, 10)
+    records = [
+        {
+            "report": "account",
+            "customer_id": "1",
+            "start": "2025-03-09",
+            "end": "2025-03-09",
+            "days": 1,
+            "api_rows": 30,
+            "rows": 1,
+            "seconds": 1.0,
+            "recorded_at": 0,
+        }
+    ]
+    run = warm.WarmRun("account", ("days", 1, 2), {}, ("1", "2"), 2, 0)
+    result_store = store.ResultStore(tmp_path, today=today)
+
+    planned = warm.plan_warmup([run], result_store, records, 100, today)
+    both = warm.plan_warmup([run], result_store, records, 120, today)
+    unknown_run = run._replace(report="mac")
+
+    assert [(cid, rows) for _, _, _, cid, rows in planned] == [("1", 60)]
+    assert [(cid, rows) for _, _, _, cid, rows in both] == [("1", 60), ("2", 60)]
+    assert warm.plan_warmup([unknown_run], result_store, records, 1000, today) == []